@@ -131,7 +131,7 @@ class EndpointUpdateRequest(BaseModel):
 
 
 @router.put("/api/engine/endpoints/{endpoint_id}")
-def update_endpoint(endpoint_id: int, payload: EndpointUpdateRequest) -> dict[str, bool]:
+async def update_endpoint(endpoint_id: int, payload: EndpointUpdateRequest) -> dict[str, bool]:
     store = get_store()
     record = store.get_endpoint(endpoint_id)
     if record is None:
@@ -153,9 +153,20 @@ def update_endpoint(endpoint_id: int, payload: EndpointUpdateRequest) -> dict[st
 
     if updates:
         store.update_endpoint(endpoint_id, **updates)
+    if "config" in updates:
+        # Running listeners pick up allowlist and admission limits in place.
+        await get_manager(store).reload_endpoint(endpoint_id)
     return {"ok": True}
 
 
+@router.get("/api/engine/endpoints/{endpoint_id}/stats")
+def endpoint_stats(endpoint_id: int) -> dict[str, int]:
+    store = get_store()
+    if store.get_endpoint(endpoint_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="endpoint not found")
+    return get_manager(store).endpoint_stats(endpoint_id) or {}
+
+
 @router.post("/api/engine/endpoints/{endpoint_id}/start")
 async def start_endpoint(endpoint_id: int) -> dict[str, bool]:
     store = get_store()
@@ -135,6 +135,8 @@ def validate_pipeline(payload: PipelineValidateRequest) -> PipelineValidateRespo
     for sink in spec.sinks:
         if sink.type not in registry.get("sinks", {}):
             missing.append(f"sink:{sink.type}")
+    if spec.router.strategy not in registry.get("routers", {}):
+        missing.append(f"router:{spec.router.strategy}")
     if missing:
         raise HTTPException(
             status_code=400,
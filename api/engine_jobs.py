@@ -44,6 +44,9 @@ class JobInfo(BaseModel):
     max_attempts: int
     scheduled_at: datetime
     leased_by: str | None = None
+    heartbeat_at: datetime | None = None
+    progress: dict[str, Any] | None = None
+    checkpoint: dict[str, Any] | None = None
     run_id: int | None = None
     last_error: str | None = None
     created_at: datetime
@@ -76,6 +79,9 @@ def _serialize_job(job: JobRecord) -> JobInfo:
         "max_attempts": job.max_attempts,
         "scheduled_at": job.scheduled_at,
         "leased_by": job.leased_by,
+        "heartbeat_at": job.heartbeat_at,
+        "progress": job.progress,
+        "checkpoint": job.checkpoint,
         "run_id": job.run_id,
         "last_error": job.last_error,
         "created_at": job.created_at,
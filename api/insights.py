@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
 
 from insights.store import get_store
 
@@ -10,11 +12,19 @@ router = APIRouter()
 
 
 @router.get("/api/insights/summary", tags=["engine"], name="insights_summary")
-def insights_summary() -> dict[str, object]:
+def insights_summary(
+    limit: int | None = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    pipeline: str | None = None,
+) -> dict[str, object]:
     store = get_store()
     try:
         store.ensure_schema()
-        summary = store.summaries()
+        summary = store.summaries(
+            limit=limit, offset=offset, since=since, until=until, pipeline=pipeline
+        )
     except Exception as exc:  # pragma: no cover - FastAPI handles conversion
         raise HTTPException(status_code=500, detail=str(exc)) from exc
     return summary
@@ -23,7 +23,8 @@ from silhouette_core.interop.hl7_mutate import (
     load_template_text,
 )
 from silhouette_core.interop.deid import deidentify_message, apply_deid_with_template
-from silhouette_core.interop.mllp import send_mllp_batch
+from silhouette_core.interop.mllp import send_mllp_batch_async
+from silhouette_core.interop.mllp_pool import close_shared_pools
 from silhouette_core.interop.validate_workbook import validate_message, validate_with_template
 from api.activity_log import log_activity
 from api.debug_log import log_debug_message
@@ -2712,6 +2713,12 @@ async def api_validate(request: Request):
     return JSONResponse(model)
 
 
+@router.on_event("shutdown")
+async def _close_mllp_pools() -> None:
+    """Close the pooled MLLP connections ``api_mllp_send`` keeps between requests."""
+    await close_shared_pools()
+
+
 @router.post("/api/interop/mllp/send")
 async def api_mllp_send(request: Request):
     """Send messages over MLLP; accept JSON, form, multipart, or query."""
@@ -2736,12 +2743,41 @@ async def api_mllp_send(request: Request):
         messages_list = []
     if not messages_list:
         raise HTTPException(status_code=400, detail="No messages parsed from input")
-    acks = send_mllp_batch(host, port, messages_list, timeout=timeout)
+    window = body.get("window")
+    window = _to_int(8 if window in (None, "") else window, None)
+    if window is None or window < 1 or window > 256:
+        raise HTTPException(400, "window must be 1..256")
+    # Resends after a lost ACK can duplicate messages the peer already took.
+    retries = body.get("retries")
+    retries = _to_int(0 if retries in (None, "") else retries, None)
+    if retries is None or retries < 0 or retries > 10:
+        raise HTTPException(400, "retries must be 0..10")
+    results = await send_mllp_batch_async(
+        host, port, messages_list, timeout=timeout, window=window, retries=retries
+    )
+    failed = sum(1 for result in results if result.error)
     log_activity(
         "mllp_send",
         host=host,
         port=port,
         messages=len(messages_list),
         timeout=timeout,
+        failed=failed,
+    )
+    return JSONResponse(
+        {
+            "sent": len(messages_list) - failed,
+            "failed": failed,
+            "acks": [result.ack or "" for result in results],
+            "results": [
+                {
+                    "control_id": result.control_id,
+                    "code": result.code,
+                    "correlated": result.correlated,
+                    "attempts": result.attempts,
+                    "error": result.error,
+                }
+                for result in results
+            ],
+        }
     )
-    return JSONResponse({"sent": len(messages_list), "acks": acks})
@@ -6,31 +6,39 @@ import asyncio
 from dataclasses import dataclass
 from typing import AsyncIterator, Mapping
 
+from silhouette_core.interop.mllp_framing import (
+    MAX_FRAME_BYTES,
+    READ_SIZE,
+    IncompleteFrameError,
+    MLLPFrameDecoder,
+    MLLPFrameProtocol,
+)
+
 from ..contracts import Adapter, Message
 from ..registry import register_adapter
 
-_VT = 0x0B
-_FS = 0x1C
-_CR = 0x0D
-_FS_CR = bytes((_FS, _CR))
-
 
 @dataclass
 class MLLPAdapter(Adapter):
-    """Stream HL7 payloads framed with the Minimal Lower Layer Protocol."""
+    """Stream HL7 payloads framed with the Minimal Lower Layer Protocol.
+
+    Socket reads go straight into the frame decoder's buffer through
+    ``MLLPFrameProtocol``; ``read_size`` sets how much is read at a time.
+    """
 
     name: str
     host: str
     port: int
     connect_timeout: float = 3.0
+    read_size: int = READ_SIZE
+    max_frame_bytes: int = MAX_FRAME_BYTES
 
     async def stream(self) -> AsyncIterator[Message]:
-        reader: asyncio.StreamReader
-        writer: asyncio.StreamWriter
-
+        loop = asyncio.get_running_loop()
+        decoder = MLLPFrameDecoder(max_frame_bytes=self.max_frame_bytes, read_size=self.read_size)
         try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(self.host, self.port),
+            _, protocol = await asyncio.wait_for(
+                loop.create_connection(lambda: MLLPFrameProtocol(decoder), self.host, self.port),
                 timeout=self.connect_timeout,
             )
         except asyncio.TimeoutError as exc:  # pragma: no cover - connection failure
@@ -38,50 +46,27 @@ class MLLPAdapter(Adapter):
                 f"Timed out connecting to {self.host}:{self.port}"
             ) from exc
 
-        buffer = bytearray()
         counter = 0
-
         try:
             while True:
-                chunk = await reader.read(4096)
-                if not chunk:
-                    if buffer:
-                        raise RuntimeError("Connection closed while awaiting frame terminator")
+                try:
+                    frame = await protocol.read_frame()
+                except IncompleteFrameError as exc:
+                    raise RuntimeError("Connection closed while awaiting frame terminator") from exc
+                if frame is None:
                     break
-                buffer.extend(chunk)
-
-                while True:
-                    start_idx = buffer.find(_VT)
-                    if start_idx == -1:
-                        buffer.clear()
-                        break
-                    if start_idx > 0:
-                        del buffer[: start_idx]
-                    if not buffer or buffer[0] != _VT:
-                        break
-                    end_idx = buffer.find(_FS_CR)
-                    if end_idx == -1:
-                        break
-                    frame = bytes(buffer[1:end_idx])
-                    del buffer[: end_idx + len(_FS_CR)]
-                    counter += 1
-                    yield Message(
-                        id=f"mllp-{counter}",
-                        raw=frame,
-                        meta={
-                            "adapter": "mllp",
-                            "host": self.host,
-                            "port": self.port,
-                        },
-                    )
-        except asyncio.CancelledError:
-            raise
+                counter += 1
+                yield Message(
+                    id=f"mllp-{counter}",
+                    raw=frame,
+                    meta={
+                        "adapter": "mllp",
+                        "host": self.host,
+                        "port": self.port,
+                    },
+                )
         finally:
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:  # pragma: no cover - best effort close
-                pass
+            protocol.close()
 
 
 @register_adapter("mllp")
@@ -93,4 +78,11 @@ def _mllp_adapter(config: Mapping[str, object]) -> Adapter:
     role = str(config.get("role") or "client").strip().lower()
     if role != "client":
         raise ValueError("Phase 1 MLLP adapter only supports the 'client' role")
-    return MLLPAdapter(name="mllp", host=host, port=port, connect_timeout=timeout)
+    return MLLPAdapter(
+        name="mllp",
+        host=host,
+        port=port,
+        connect_timeout=timeout,
+        read_size=int(config.get("read_size") or READ_SIZE),
+        max_frame_bytes=int(config.get("max_frame_bytes") or MAX_FRAME_BYTES),
+    )
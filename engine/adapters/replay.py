@@ -2,17 +2,21 @@
 from __future__ import annotations
 
 import base64
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, AsyncIterator
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Iterable
 
 from ..contracts import Adapter, Message
 from ..registry import register_adapter
-from insights.models import MessageRecord  # type: ignore
+from insights.models import MessageRecord, PayloadBlobRecord  # type: ignore
 from sqlalchemy import select
 
 if TYPE_CHECKING:  # pragma: no cover - import for type checking only
     from insights.store import InsightsStore
 
+DEFAULT_PAGE_SIZE = int(os.getenv("ENGINE_REPLAY_PAGE_SIZE", "500"))
+
 
 def _try_b64_decode(text: str) -> bytes:
     """Decode payload saved by Insights (may be plain text or base64)."""
@@ -25,32 +29,89 @@ def _try_b64_decode(text: str) -> bytes:
 
 @dataclass
 class ReplayAdapter(Adapter):
-    """Streams messages that were persisted in a previous run."""
+    """Streams messages that were persisted in a previous run.
+
+    Messages are read in keyset pages of ``page_size`` rows (``id >
+    last_id``), and the session is released before a page is yielded. A long
+    replay therefore neither pins the whole run in memory nor holds a read
+    transaction open against writers. ``after_id`` resumes after a source
+    message id. With ``checkpointing`` set, ``acknowledge`` turns persisted
+    results back into a contiguous checkpoint position; otherwise yielded ids
+    are not tracked at all, so memory stays bounded by the page.
+    """
 
     name: str
     run_id: int
     max_messages: int | None = None
+    page_size: int = DEFAULT_PAGE_SIZE
+    after_id: int = 0
+    checkpointing: bool = False
+    position: int = field(init=False)
+    acknowledged: int = field(default=0, init=False)
+    _yielded: deque[int] = field(default_factory=deque, init=False, repr=False)
+    _acked: set[int] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.page_size = max(1, self.page_size)
+        self.position = self.after_id
 
     async def stream(self) -> AsyncIterator[Message]:
         from insights.store import get_store  # local import to avoid circular dependency
 
         store: "InsightsStore" = get_store()
+        last_id = self.after_id
         count = 0
-        with store.session() as session:
-            query = (
-                select(MessageRecord)
-                .where(MessageRecord.run_id == self.run_id)
-                .order_by(MessageRecord.id.asc())
-            )
-            for record in session.execute(query).scalars():
-                raw = _try_b64_decode(record.payload or "")
-                meta = dict(record.meta or {})
-                meta.setdefault("replay", True)
-                meta.setdefault("source_run_id", self.run_id)
-                yield Message(id=str(record.message_id), raw=raw, meta=meta)
+        while self.max_messages is None or count < self.max_messages:
+            limit = self.page_size
+            if self.max_messages is not None:
+                limit = min(limit, self.max_messages - count)
+            with store.session() as session:
+                rows = session.execute(
+                    select(MessageRecord, PayloadBlobRecord)
+                    .outerjoin(
+                        PayloadBlobRecord, MessageRecord.payload_blob_id == PayloadBlobRecord.id
+                    )
+                    .where(MessageRecord.run_id == self.run_id, MessageRecord.id > last_id)
+                    .order_by(MessageRecord.id.asc())
+                    .limit(limit)
+                ).all()
+                page = [self._message(store, session, record, blob) for record, blob in rows]
+            for source_id, message in page:
+                if self.checkpointing:
+                    self._yielded.append(source_id)
+                yield message
                 count += 1
-                if self.max_messages is not None and count >= self.max_messages:
-                    break
+            if len(page) < limit:
+                return
+            last_id = page[-1][0]
+
+    def _message(self, store, session, record: MessageRecord, blob) -> tuple[int, Message]:
+        if blob is not None:
+            raw = store.decode_payload_blob(session, blob)
+        else:  # legacy row: base64 text in ``payload``
+            raw = _try_b64_decode(record.payload or "")
+        meta = dict(record.meta or {})
+        meta.setdefault("replay", True)
+        meta.setdefault("source_run_id", self.run_id)
+        meta["source_message_pk"] = record.id
+        return record.id, Message(id=str(record.message_id), raw=raw, meta=meta)
+
+    def acknowledge(self, source_ids: Iterable[int | None]) -> int:
+        """Mark source messages as persisted; return the checkpoint position.
+
+        Results may be persisted out of order (``ordering: unordered``), so
+        the position only advances over a contiguous prefix of what was
+        yielded. Resuming from it can repeat a few messages but never skips one.
+        Requires ``checkpointing``; set it before streaming.
+        """
+
+        self._acked.update(source_id for source_id in source_ids if source_id is not None)
+        while self._yielded and self._yielded[0] in self._acked:
+            source_id = self._yielded.popleft()
+            self._acked.discard(source_id)
+            self.position = source_id
+            self.acknowledged += 1
+        return self.position
 
 
 @register_adapter("replay")
@@ -60,4 +121,10 @@ def _replay_adapter(config) -> Adapter:  # type: ignore[override]
     max_messages = None
     if max_messages_value not in (None, ""):
         max_messages = int(max_messages_value)
-    return ReplayAdapter(name="replay", run_id=run_id, max_messages=max_messages)
+    return ReplayAdapter(
+        name="replay",
+        run_id=run_id,
+        max_messages=max_messages,
+        page_size=int(config.get("page_size") or DEFAULT_PAGE_SIZE),
+        after_id=int(config.get("after_id") or 0),
+    )
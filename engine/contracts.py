@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, AsyncIterator, Literal
+from typing import Any, AsyncIterator, Literal, Sequence
 
 
 @dataclass(slots=True)
@@ -66,3 +66,23 @@ class Sink(ABC):
     @abstractmethod
     async def write(self, result: Result) -> None:
         """Persist or forward the ``result`` to an external system."""
+
+    async def flush(self) -> None:
+        """Wait for writes still in flight; called when a run finishes."""
+
+    async def close(self) -> None:
+        """Release long-lived resources (connections); called on cache eviction."""
+
+
+class Router(ABC):
+    """Routers decide which sinks receive each processed result."""
+
+    name: str
+
+    @abstractmethod
+    def bind(self, sinks: Sequence[Sink]) -> None:
+        """Compile routing tables for the pipeline's ``sinks``."""
+
+    @abstractmethod
+    def route(self, result: Result) -> Sequence[Sink]:
+        """Return the sinks that should receive ``result``."""
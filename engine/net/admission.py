@@ -0,0 +1,252 @@
+"""Connection admission for inbound listeners: allowlists, caps and rate limits."""
+
+from __future__ import annotations
+
+import ipaddress
+import os
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+# Limits default to off; 0 disables a cap or rate.
+MAX_CONNECTIONS = max(int(os.getenv("ENGINE_MLLP_MAX_CONNECTIONS", "0")), 0)
+MAX_CONNECTIONS_PER_PEER = max(int(os.getenv("ENGINE_MLLP_MAX_CONNECTIONS_PER_PEER", "0")), 0)
+CONNECT_RATE = max(float(os.getenv("ENGINE_MLLP_CONNECT_RATE", "0")), 0.0)
+FRAME_RATE = max(float(os.getenv("ENGINE_MLLP_FRAME_RATE", "0")), 0.0)
+
+# Idle per-peer state is pruned once this many peers are tracked.
+_PRUNE_THRESHOLD = 1024
+
+
+class CidrAllowlist:
+    """CIDR networks compiled into sorted, merged integer ranges.
+
+    Lookups bisect the ranges for the address family, so checking a peer is
+    ``O(log n)`` and never re-parses the configured networks. Entries that do
+    not parse are skipped and listed in ``invalid``. IPv4-mapped IPv6 peers
+    (``::ffff:a.b.c.d``) are matched against the IPv4 ranges.
+    """
+
+    def __init__(self, cidrs: Iterable[str]) -> None:
+        self.source = tuple(str(raw) for raw in cidrs)
+        self.invalid: list[str] = []
+        spans: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+        for raw in self.source:
+            try:
+                network = ipaddress.ip_network(raw.strip(), strict=False)
+            except ValueError:
+                self.invalid.append(raw)
+                continue
+            spans[network.version].append(
+                (int(network.network_address), int(network.broadcast_address))
+            )
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+        for version, ranges in spans.items():
+            starts: list[int] = []
+            ends: list[int] = []
+            for start, end in sorted(ranges):
+                if ends and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self._starts[version] = starts
+            self._ends[version] = ends
+
+    def __bool__(self) -> bool:
+        return bool(self._starts[4] or self._starts[6])
+
+    def __len__(self) -> int:
+        """Number of merged ranges across both address families."""
+
+        return len(self._starts[4]) + len(self._starts[6])
+
+    def __contains__(self, peer_ip: object) -> bool:
+        try:
+            ip = ipaddress.ip_address(str(peer_ip))
+        except ValueError:
+            return False
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        value = int(ip)
+        starts = self._starts[ip.version]
+        idx = bisect_right(starts, value) - 1
+        return idx >= 0 and value <= self._ends[ip.version][idx]
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``burst``."""
+
+    rate: float
+    burst: float
+    tokens: float = field(init=False)
+    stamp: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.burst = max(self.burst, 1.0)
+        self.tokens = self.burst
+        self.stamp = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def take(self, now: float | None = None) -> bool:
+        """Consume one token if available and report whether it was."""
+
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+    def reserve(self, now: float | None = None) -> float:
+        """Consume one token, borrowing if needed; return seconds to wait."""
+
+        self._refill(time.monotonic() if now is None else now)
+        self.tokens -= 1.0
+        return 0.0 if self.tokens >= 0.0 else -self.tokens / self.rate
+
+    def idle(self, now: float | None = None) -> bool:
+        self._refill(time.monotonic() if now is None else now)
+        return self.tokens >= self.burst
+
+
+@dataclass
+class _PeerState:
+    connections: int = 0
+    connect_bucket: TokenBucket | None = None
+    frame_bucket: TokenBucket | None = None
+
+
+@dataclass
+class AdmissionControl:
+    """Per-listener connection caps and per-peer token-bucket rate limits.
+
+    ``admit`` is called once per accepted socket and returns the rejection
+    reason, or ``None`` when the connection may proceed; admitted
+    connections must be paired with ``release``. ``connect_rate`` limits
+    how often one peer may open connections, which stops a sender
+    reconnecting in a tight loop from starving other feeds.
+    ``frame_delay`` paces frames per peer: reads pause rather than NAK, so
+    the limit turns into TCP back-pressure on the sender. Rates are per
+    second, and each burst defaults to one second's worth of its rate.
+    """
+
+    max_connections: int = MAX_CONNECTIONS
+    max_connections_per_peer: int = MAX_CONNECTIONS_PER_PEER
+    connect_rate: float = CONNECT_RATE
+    connect_burst: float = 0.0
+    frame_rate: float = FRAME_RATE
+    frame_burst: float = 0.0
+    active: int = field(default=0, init=False)
+    accepted: int = field(default=0, init=False)
+    rejected: dict[str, int] = field(
+        default_factory=lambda: {"cidr": 0, "capacity": 0, "peer_limit": 0, "rate": 0},
+        init=False,
+    )
+    throttled_frames: int = field(default=0, init=False)
+    _peers: dict[str, _PeerState] = field(default_factory=dict, init=False, repr=False)
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "AdmissionControl":
+        """Build limits from endpoint config keys, falling back to env defaults."""
+
+        def _number(key: str, default: float) -> float:
+            value = config.get(key)
+            return default if value is None else max(float(value), 0.0)
+
+        return cls(
+            max_connections=int(_number("max_connections", MAX_CONNECTIONS)),
+            max_connections_per_peer=int(
+                _number("max_connections_per_peer", MAX_CONNECTIONS_PER_PEER)
+            ),
+            connect_rate=_number("connect_rate_per_sec", CONNECT_RATE),
+            connect_burst=_number("connect_burst", 0.0),
+            frame_rate=_number("frame_rate_per_sec", FRAME_RATE),
+            frame_burst=_number("frame_burst", 0.0),
+        )
+
+    def update(self, other: "AdmissionControl") -> None:
+        """Adopt the limits of ``other`` while keeping counters and live state."""
+
+        self.max_connections = other.max_connections
+        self.max_connections_per_peer = other.max_connections_per_peer
+        self.connect_rate = other.connect_rate
+        self.connect_burst = other.connect_burst
+        self.frame_rate = other.frame_rate
+        self.frame_burst = other.frame_burst
+        for state in self._peers.values():
+            state.connect_bucket = None
+            state.frame_bucket = None
+
+    def admit(self, peer_ip: str) -> str | None:
+        state = self._peers.get(peer_ip)
+        if state is None:
+            if len(self._peers) >= _PRUNE_THRESHOLD:
+                self._prune()
+            state = self._peers[peer_ip] = _PeerState()
+        if self.connect_rate > 0:
+            if state.connect_bucket is None:
+                state.connect_bucket = TokenBucket(
+                    self.connect_rate, self.connect_burst or self.connect_rate
+                )
+            if not state.connect_bucket.take():
+                return self.reject("rate")
+        if self.max_connections and self.active >= self.max_connections:
+            return self.reject("capacity")
+        if self.max_connections_per_peer and state.connections >= self.max_connections_per_peer:
+            return self.reject("peer_limit")
+        state.connections += 1
+        self.active += 1
+        self.accepted += 1
+        return None
+
+    def release(self, peer_ip: str) -> None:
+        state = self._peers.get(peer_ip)
+        if state is None or state.connections <= 0:
+            return
+        state.connections -= 1
+        self.active -= 1
+
+    def frame_delay(self, peer_ip: str) -> float:
+        """Seconds the caller should wait before handling the peer's next frame."""
+
+        if self.frame_rate <= 0:
+            return 0.0
+        state = self._peers.setdefault(peer_ip, _PeerState())
+        if state.frame_bucket is None:
+            state.frame_bucket = TokenBucket(self.frame_rate, self.frame_burst or self.frame_rate)
+        delay = state.frame_bucket.reserve()
+        if delay > 0:
+            self.throttled_frames += 1
+        return delay
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "active_connections": self.active,
+            "accepted_connections": self.accepted,
+            "tracked_peers": len(self._peers),
+            "throttled_frames": self.throttled_frames,
+            **{f"rejected_{reason}": count for reason, count in self.rejected.items()},
+        }
+
+    def reject(self, reason: str) -> str:
+        """Count a rejection decided outside ``admit`` (e.g. the allowlist)."""
+
+        self.rejected[reason] += 1
+        return reason
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for peer_ip, state in list(self._peers.items()):
+            if state.connections:
+                continue
+            if state.connect_bucket is not None and not state.connect_bucket.idle(now):
+                continue
+            if state.frame_bucket is not None and not state.frame_bucket.idle(now):
+                continue
+            del self._peers[peer_ip]
@@ -16,7 +16,8 @@ from engine.operators.transform import TransformOperator
 from engine.runtime import EngineRuntime
 from insights.store import InsightsStore
 
-from .mllp_server import MLLPServer
+from .admission import AdmissionControl
+from .mllp_server import BATCH_MS, BATCH_SIZE, MLLPServer
 
 logger = logging.getLogger(__name__)
 
@@ -101,13 +102,33 @@ class EndpointManager:
             async def _handler(payload: bytes, meta: dict[str, str]) -> None:
                 await self._process_incoming(endpoint_id, payload, meta)
 
+            config = record.config or {}
+            throughput = config.get("mode") == "throughput"
+            # ``0`` is a valid batch_ms (commit without waiting); only a missing
+            # or null value falls back to the default.
+            batch_ms = config.get("batch_ms")
+            handler = _handler
+            if (
+                throughput
+                and record.pipeline_id is not None
+                and self._resolve_runtime(record.pipeline_id) is None
+            ):
+                # Plain enqueue endpoints can hand frames straight to the
+                # server's staging ring instead of one transaction per frame.
+                handler = None
             server = MLLPServer(
                 host=host,
                 port=port,
                 allow_cidrs=allow_cidrs,
                 pipeline_id=record.pipeline_id,
                 store=self.store,
-                message_handler=_handler,
+                message_handler=handler,
+                throughput=throughput,
+                hl7_ack=config.get("hl7_ack"),
+                ack_policy=str(config.get("ack_policy") or "commit"),
+                batch_size=int(config.get("batch_size") or BATCH_SIZE),
+                batch_ms=BATCH_MS if batch_ms is None else float(batch_ms),
+                admission=AdmissionControl.from_config(config),
             )
             try:
                 await server.start()
@@ -129,6 +150,27 @@ class EndpointManager:
                 self._servers[endpoint_id] = server
                 self.store.update_endpoint(endpoint_id, status="running", last_error=None)
 
+    async def reload_endpoint(self, endpoint_id: int) -> bool:
+        """Apply allowlist and admission limits to a running listener in place.
+
+        Returns ``False`` when the endpoint is not running. Other settings
+        (bind address, pipeline, batching) still need a refresh.
+        """
+
+        async with self._lock:
+            server = self._servers.get(endpoint_id)
+            record = self.store.get_endpoint(endpoint_id)
+            if server is None or record is None:
+                return False
+            config = record.config or {}
+            server.set_allow_cidrs(config.get("allow_cidrs") or [])
+            server.admission.update(AdmissionControl.from_config(config))
+            return True
+
+    def endpoint_stats(self, endpoint_id: int) -> dict[str, int] | None:
+        server = self._servers.get(endpoint_id)
+        return server.stats() if server is not None else None
+
     async def stop_endpoint(self, endpoint_id: int) -> None:
         async with self._lock:
             server = self._servers.pop(endpoint_id, None)
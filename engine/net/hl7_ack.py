@@ -0,0 +1,75 @@
+"""Build HL7 v2 ACK messages straight from an inbound MSH segment.
+
+Only the first segment is split, so acknowledging a message costs a few
+byte operations regardless of its size.
+"""
+
+from __future__ import annotations
+
+import itertools
+import re
+from datetime import datetime
+
+_DEFAULT_ENCODING = b"^~\\&"
+_SEGMENT_END = re.compile(rb"[\r\n]")
+_ACK_SEQUENCE = itertools.count(1)
+
+
+def _clean(value: bytes, separators: bytes) -> bytes:
+    """Drop delimiter characters from free text placed in an ACK field."""
+
+    return bytes(byte for byte in value if byte not in separators)
+
+
+def build_ack(
+    message: bytes,
+    code: str = "AA",
+    *,
+    text: str | None = None,
+    now: datetime | None = None,
+) -> bytes | None:
+    """Return an ``ACK`` for ``message`` with ``MSA-1`` set to ``code``.
+
+    Sending and receiving application/facility are swapped, ``MSA-2`` echoes
+    ``MSH-10``, and processing id and version are copied from the inbound
+    header. Returns ``None`` when ``message`` does not start with an MSH.
+    """
+
+    match = _SEGMENT_END.search(message)
+    header = message[: match.start()] if match else message
+    if not header.startswith(b"MSH") or len(header) < 8:
+        return None
+    separator = header[3:4]
+    fields = header.split(separator)
+
+    def field(number: int) -> bytes:
+        # fields[1] is MSH-2 because MSH-1 is the separator itself.
+        return fields[number - 1] if len(fields) >= number else b""
+
+    encoding = field(2) or _DEFAULT_ENCODING
+    component = encoding[:1]
+    message_type = field(9).split(component)
+    trigger = message_type[1] if len(message_type) > 1 else b""
+    stamp = (now or datetime.utcnow()).strftime("%Y%m%d%H%M%S").encode("ascii")
+    control_id = stamp + b"%04d" % (next(_ACK_SEQUENCE) % 10000)
+
+    msh = separator.join(
+        [
+            b"MSH",
+            encoding,
+            field(5),
+            field(6),
+            field(3),
+            field(4),
+            stamp,
+            b"",
+            component.join([b"ACK", trigger, b"ACK"]) if trigger else b"ACK",
+            control_id,
+            field(11) or b"P",
+            field(12) or b"2.5",
+        ]
+    )
+    msa = [b"MSA", code.encode("ascii"), field(10)]
+    if text:
+        msa.append(_clean(text.encode("utf-8", "replace"), separator + encoding))
+    return msh + b"\r" + separator.join(msa) + b"\r"
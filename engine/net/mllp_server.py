@@ -4,39 +4,33 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import ipaddress
+import functools
 import logging
 import os
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Awaitable, Callable, Iterable
+from typing import Any, Awaitable, Callable, Iterable
 
 from insights.store import InsightsStore, QueueFullError
+from silhouette_core.interop.mllp_framing import FS_CR, VT, FrameTooLargeError, StreamFrameReader
 
-logger = logging.getLogger(__name__)
+from .admission import AdmissionControl, CidrAllowlist
+from .hl7_ack import build_ack
 
-VT = b"\x0b"
-FS_CR = b"\x1c\x0d"
+logger = logging.getLogger(__name__)
 
 _READ_TIMEOUT_SECS = max(float(os.getenv("ENGINE_MLLP_READ_TIMEOUT_SECS", "30")), 0.1)
-_MAX_FRAME_BYTES = max(int(os.getenv("ENGINE_MLLP_MAX_FRAME_BYTES", "1000000")), 1)
 
+# Throughput mode: staged enqueues are committed every N frames or T ms.
+BATCH_SIZE = max(int(os.getenv("ENGINE_MLLP_BATCH_SIZE", "100")), 1)
+BATCH_MS = max(float(os.getenv("ENGINE_MLLP_BATCH_MS", "20")), 0.0)
+STAGE_CAPACITY = max(int(os.getenv("ENGINE_MLLP_STAGE_CAPACITY", "1000")), 1)
+ACK_POLICIES = ("commit", "receive")
 
-def _allowed(peer_ip: str, cidrs: Iterable[str]) -> bool:
-    """Return ``True`` when ``peer_ip`` is contained in one of ``cidrs``."""
 
-    try:
-        ip = ipaddress.ip_address(peer_ip)
-    except ValueError:
-        return False
-
-    for raw in cidrs:
-        try:
-            network = ipaddress.ip_network(raw, strict=False)
-        except ValueError:
-            continue
-        if ip in network:
-            return True
-    return False
+def _consume_outcome(future: asyncio.Future[None]) -> None:
+    if not future.cancelled():
+        future.exception()
 
 
 async def _send_ack(writer: asyncio.StreamWriter, code: bytes) -> None:
@@ -47,9 +41,135 @@ async def _send_ack(writer: asyncio.StreamWriter, code: bytes) -> None:
         logger.debug("mllp.ack.write_failed", exc_info=True)
 
 
+class EnqueueStager:
+    """Bounded staging ring that turns inbound frames into batched enqueues.
+
+    ``submit`` parks a job payload and returns a future that resolves once the
+    batch holding it is committed. A single flusher drains up to
+    ``batch_size`` items, waiting at most ``batch_ms`` for a batch to fill, and
+    commits them with ``InsightsStore.enqueue_jobs`` on a worker thread so the
+    event loop keeps reading sockets meanwhile. Frames that arrive during a
+    commit form the next batch. When ``capacity`` items are waiting, ``submit``
+    blocks, and the pause propagates to senders as TCP back-pressure.
+    """
+
+    def __init__(
+        self,
+        store: InsightsStore,
+        pipeline_id: int,
+        *,
+        batch_size: int = BATCH_SIZE,
+        batch_ms: float = BATCH_MS,
+        capacity: int = STAGE_CAPACITY,
+    ) -> None:
+        self.store = store
+        self.pipeline_id = pipeline_id
+        self.batch_size = max(1, batch_size)
+        self.batch_delay = max(0.0, batch_ms) / 1000
+        self.capacity = max(self.batch_size, capacity)
+        self.batches = 0
+        self.committed = 0
+        self.failed = 0
+        self._items: deque[tuple[dict[str, Any], asyncio.Future[None]]] = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._flusher: asyncio.Task[None] | None = None
+        self._closing = False
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    async def submit(self, payload: dict[str, Any]) -> asyncio.Future[None]:
+        if self._closing:
+            raise RuntimeError("stager is closed")
+        while len(self._items) >= self.capacity:
+            self._space.clear()
+            await self._space.wait()
+        if self._flusher is None:
+            self._flusher = asyncio.get_running_loop().create_task(self._run())
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._items.append((payload, future))
+        self._ready.set()
+        return future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._items:
+                if self._closing:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            deadline = loop.time() + self.batch_delay
+            while len(self._items) < self.batch_size and not self._closing:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._ready.clear()
+                try:
+                    await asyncio.wait_for(self._ready.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            count = min(len(self._items), self.batch_size)
+            batch = [self._items.popleft() for _ in range(count)]
+            self._space.set()
+            await self._commit(batch)
+
+    async def _commit(self, batch: list[tuple[dict[str, Any], asyncio.Future[None]]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self.store.enqueue_jobs,
+                    pipeline_id=self.pipeline_id,
+                    payloads=[payload for payload, _ in batch],
+                    kind="ingest",
+                    priority=0,
+                    max_attempts=3,
+                ),
+            )
+        except Exception as exc:
+            self.failed += len(batch)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.batches += 1
+        self.committed += len(batch)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def close(self) -> None:
+        """Commit everything still staged, then stop the flusher."""
+
+        self._closing = True
+        self._ready.set()
+        if self._flusher is not None:
+            await self._flusher
+            self._flusher = None
+
+
 @dataclass
 class MLLPServer:
-    """Inbound MLLP listener submitting jobs to the Engine queue."""
+    """Inbound MLLP listener submitting jobs to the Engine queue.
+
+    By default every frame is enqueued in its own transaction before a bare
+    ``AA``/``AE`` is returned. ``throughput=True`` stages frames in an
+    ``EnqueueStager`` and replies with real HL7 ACKs built from the inbound
+    MSH. ``ack_policy="commit"`` acknowledges a frame only after its batch has
+    committed. ``"receive"`` acknowledges as soon as the frame is staged and
+    trades the last ``batch_ms`` of traffic on a crash for lower latency.
+    ``hl7_ack`` enables the HL7 ACK format on its own.
+
+    Peers are checked against ``allow_cidrs`` (compiled once, recompiled
+    when the list changes) and then by ``admission``, which enforces
+    connection caps and per-peer rate limits.
+    """
 
     host: str
     port: int
@@ -59,15 +179,62 @@ class MLLPServer:
     message_handler: Callable[[bytes, dict[str, str]], Awaitable[None]] | None = field(
         default=None
     )
+    throughput: bool = False
+    hl7_ack: bool | None = None
+    ack_policy: str = "commit"
+    batch_size: int = BATCH_SIZE
+    batch_ms: float = BATCH_MS
+    stage_capacity: int = STAGE_CAPACITY
+    admission: AdmissionControl = field(default_factory=AdmissionControl)
     _server: asyncio.AbstractServer | None = field(default=None, init=False)
+    _allowlist: CidrAllowlist = field(init=False, repr=False)
+    _stager: EnqueueStager | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.ack_policy not in ACK_POLICIES:
+            raise ValueError(f"ack_policy must be one of {ACK_POLICIES}")
+        if self.hl7_ack is None:
+            self.hl7_ack = self.throughput
+        self.set_allow_cidrs(self.allow_cidrs)
+
+    def set_allow_cidrs(self, cidrs: Iterable[str]) -> None:
+        """Replace the allowlist; connections already open are unaffected."""
+
+        self.allow_cidrs = list(cidrs)
+        self._allowlist = CidrAllowlist(self.allow_cidrs)
+        if self._allowlist.invalid:
+            logger.warning(
+                "mllp.allowlist.invalid",
+                extra={"host": self.host, "port": self.port, "cidrs": self._allowlist.invalid},
+            )
+
+    def allows(self, peer_ip: str) -> bool:
+        # ``allow_cidrs`` may be reassigned or edited in place; recompile then.
+        if self._allowlist.source != tuple(self.allow_cidrs):
+            self.set_allow_cidrs(self.allow_cidrs)
+        return peer_ip in self._allowlist
 
     async def start(self) -> None:
         if self._server:
             return
+        if self.throughput and self.message_handler is None and self.pipeline_id is not None:
+            self._stager = EnqueueStager(
+                self.store,
+                self.pipeline_id,
+                batch_size=self.batch_size,
+                batch_ms=self.batch_ms,
+                capacity=self.stage_capacity,
+            )
         self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
         logger.info(
             "mllp.listen.start",
-            extra={"host": self.host, "port": self.port, "pipeline_id": self.pipeline_id},
+            extra={
+                "host": self.host,
+                "port": self.port,
+                "pipeline_id": self.pipeline_id,
+                "staged": self._stager is not None,
+                "ack_policy": self.ack_policy,
+            },
         )
 
     async def stop(self) -> None:
@@ -77,11 +244,33 @@ class MLLPServer:
         server.close()
         await server.wait_closed()
         self._server = None
+        if self._stager is not None:
+            await self._stager.close()
+            self._stager = None
         logger.info(
             "mllp.listen.stop",
             extra={"host": self.host, "port": self.port, "pipeline_id": self.pipeline_id},
         )
 
+    def stats(self) -> dict[str, int]:
+        stats = self.admission.stats()
+        stager = self._stager
+        if stager is not None:
+            stats.update(
+                staged=stager.depth,
+                batches=stager.batches,
+                committed=stager.committed,
+                failed=stager.failed,
+            )
+        return stats
+
+    def _ack(self, payload: bytes, code: str, text: str | None = None) -> bytes:
+        if self.hl7_ack:
+            ack = build_ack(payload, code, text=text)
+            if ack is not None:
+                return ack
+        return code.encode("ascii")
+
     async def _handle_client(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
@@ -94,10 +283,14 @@ class MLLPServer:
             extra={"host": self.host, "port": self.port, "peer": peer_ip},
         )
 
-        if not self.allow_cidrs or not _allowed(peer_ip, self.allow_cidrs):
+        if not self.allows(peer_ip):
+            reason = self.admission.reject("cidr")
+        else:
+            reason = self.admission.admit(peer_ip)
+        if reason is not None:
             logger.warning(
                 "mllp.client.rejected",
-                extra={"host": self.host, "port": self.port, "peer": peer_ip},
+                extra={"host": self.host, "port": self.port, "peer": peer_ip, "reason": reason},
             )
             await _send_ack(writer, b"AE")
             try:
@@ -108,63 +301,13 @@ class MLLPServer:
             return
 
         try:
-            while True:
-                try:
-                    frame = await asyncio.wait_for(reader.readuntil(FS_CR), timeout=_READ_TIMEOUT_SECS)
-                except asyncio.TimeoutError:
-                    logger.warning(
-                        "mllp.client.timeout",
-                        extra={"host": self.host, "port": self.port, "peer": peer_ip},
-                    )
-                    await _send_ack(writer, b"AE")
-                    break
-                except asyncio.IncompleteReadError:
-                    break
-                if not frame:
-                    break
-                payload = frame[:-2]
-                if payload.startswith(VT):
-                    payload = payload[1:]
-                if len(payload) > _MAX_FRAME_BYTES:
-                    logger.warning(
-                        "mllp.client.frame_too_large",
-                        extra={
-                            "host": self.host,
-                            "port": self.port,
-                            "peer": peer_ip,
-                            "size": len(payload),
-                        },
-                    )
-                    await _send_ack(writer, b"AE")
-                    break
-                if not payload:
-                    continue
-
-                metadata = {"peer_ip": peer_ip, "transport": "mllp"}
-                try:
-                    await self._dispatch_payload(payload, metadata)
-                except QueueFullError as exc:
-                    logger.warning(
-                        "mllp.client.backpressure",
-                        extra={
-                            "host": self.host,
-                            "port": self.port,
-                            "peer": peer_ip,
-                            "error": str(exc),
-                        },
-                    )
-                    await _send_ack(writer, b"AE")
-                    break
-                except Exception:
-                    logger.exception(
-                        "mllp.client.enqueue_failed",
-                        extra={"host": self.host, "port": self.port, "peer": peer_ip},
-                    )
-                    await _send_ack(writer, b"AE")
-                    break
-                else:
-                    await _send_ack(writer, b"AA")
+            frames = StreamFrameReader(reader)
+            if self._stager is not None:
+                await self._serve_staged(frames, writer, peer_ip, self._stager)
+            else:
+                await self._serve(frames, writer, peer_ip)
         finally:
+            self.admission.release(peer_ip)
             try:
                 writer.close()
                 await writer.wait_closed()
@@ -175,6 +318,162 @@ class MLLPServer:
                 extra={"host": self.host, "port": self.port, "peer": peer_ip},
             )
 
+    async def _read_frame(
+        self, frames: StreamFrameReader, writer: asyncio.StreamWriter, peer_ip: str
+    ) -> bytes | None:
+        """Return the next non-empty payload, or ``None`` when the client is done."""
+
+        while True:
+            try:
+                payload = await asyncio.wait_for(frames.read_frame(), timeout=_READ_TIMEOUT_SECS)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "mllp.client.timeout",
+                    extra={"host": self.host, "port": self.port, "peer": peer_ip},
+                )
+                await _send_ack(writer, b"AE")
+                return None
+            except FrameTooLargeError as exc:
+                logger.warning(
+                    "mllp.client.frame_too_large",
+                    extra={
+                        "host": self.host,
+                        "port": self.port,
+                        "peer": peer_ip,
+                        "size": exc.size,
+                    },
+                )
+                await _send_ack(writer, b"AE")
+                return None
+            except ConnectionError:
+                return None
+            if payload is None:
+                return None
+            if payload:
+                delay = self.admission.frame_delay(peer_ip)
+                if delay:
+                    # Pausing reads pushes back on the sender through TCP.
+                    await asyncio.sleep(delay)
+                return payload
+
+    async def _serve(
+        self, frames: StreamFrameReader, writer: asyncio.StreamWriter, peer_ip: str
+    ) -> None:
+        while True:
+            payload = await self._read_frame(frames, writer, peer_ip)
+            if payload is None:
+                return
+            metadata = {"peer_ip": peer_ip, "transport": "mllp"}
+            try:
+                await self._dispatch_payload(payload, metadata)
+            except QueueFullError as exc:
+                logger.warning(
+                    "mllp.client.backpressure",
+                    extra={
+                        "host": self.host,
+                        "port": self.port,
+                        "peer": peer_ip,
+                        "error": str(exc),
+                    },
+                )
+                await _send_ack(writer, self._ack(payload, "AE", "queue full"))
+                return
+            except Exception:
+                logger.exception(
+                    "mllp.client.enqueue_failed",
+                    extra={"host": self.host, "port": self.port, "peer": peer_ip},
+                )
+                await _send_ack(writer, self._ack(payload, "AE", "enqueue failed"))
+                return
+            else:
+                await _send_ack(writer, self._ack(payload, "AA"))
+
+    async def _serve_staged(
+        self,
+        frames: StreamFrameReader,
+        writer: asyncio.StreamWriter,
+        peer_ip: str,
+        stager: EnqueueStager,
+    ) -> None:
+        """Stage frames while a companion task writes ACKs in frame order.
+
+        Reading never waits on a commit, so a client that pipelines frames
+        fills whole batches even over a single connection.
+        """
+
+        acks: asyncio.Queue[tuple[bytes, asyncio.Future[None]] | None] = asyncio.Queue()
+        ack_writer = asyncio.create_task(self._write_staged_acks(writer, peer_ip, acks))
+        try:
+            while not ack_writer.done():
+                payload = await self._read_frame(frames, writer, peer_ip)
+                if payload is None:
+                    break
+                encoded = base64.b64encode(payload).decode("ascii")
+                future = await stager.submit(
+                    {"message_b64": encoded, "meta": {"peer_ip": peer_ip, "transport": "mllp"}}
+                )
+                if self.ack_policy == "receive":
+                    future.add_done_callback(functools.partial(self._log_dropped, peer_ip))
+                    await _send_ack(writer, self._ack(payload, "AA"))
+                else:
+                    acks.put_nowait((payload, future))
+        finally:
+            acks.put_nowait(None)
+            await ack_writer
+            # Frames left behind after an AE closed the connection were never
+            # acknowledged; the sender resends them, so only consume outcomes.
+            while not acks.empty():
+                item = acks.get_nowait()
+                if item is not None:
+                    item[1].add_done_callback(_consume_outcome)
+
+    async def _write_staged_acks(
+        self,
+        writer: asyncio.StreamWriter,
+        peer_ip: str,
+        acks: asyncio.Queue[tuple[bytes, asyncio.Future[None]] | None],
+    ) -> None:
+        while True:
+            item = await acks.get()
+            if item is None:
+                return
+            payload, future = item
+            try:
+                await future
+            except QueueFullError as exc:
+                logger.warning(
+                    "mllp.client.backpressure",
+                    extra={"host": self.host, "port": self.port, "peer": peer_ip, "error": str(exc)},
+                )
+                await _send_ack(writer, self._ack(payload, "AE", "queue full"))
+                writer.close()
+                return
+            except Exception:
+                logger.exception(
+                    "mllp.client.enqueue_failed",
+                    extra={"host": self.host, "port": self.port, "peer": peer_ip},
+                )
+                await _send_ack(writer, self._ack(payload, "AE", "enqueue failed"))
+                writer.close()
+                return
+            await _send_ack(writer, self._ack(payload, "AA"))
+
+    def _log_dropped(self, peer_ip: str, future: asyncio.Future[None]) -> None:
+        if future.cancelled() or future.exception() is None:
+            return
+        # ACK-on-receive already answered AA; the frame is lost unless the
+        # sender can replay it, so make the failure loud.
+        logger.error(
+            "mllp.stage.dropped",
+            extra={
+                "host": self.host,
+                "port": self.port,
+                "peer": peer_ip,
+                "pipeline_id": self.pipeline_id,
+                "error": str(future.exception()),
+            },
+        )
+
     async def _dispatch_payload(self, payload: bytes, meta: dict[str, str]) -> None:
         if self.message_handler is not None:
             await self.message_handler(payload, meta)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 # Phase 0 built-ins
 from . import builtins  # noqa: F401
+from . import routers  # noqa: F401
 
 # Phase 0.5 / Phase 1 scaffolding
 from .adapters import file as file_adapter  # noqa: F401
@@ -16,6 +17,7 @@ from .sinks import mllp_target as mllp_target_sink  # noqa: F401
 
 __all__ = [
     "builtins",
+    "routers",
     "file_adapter",
     "inline_adapter",
     "mllp_adapter",
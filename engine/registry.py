@@ -5,11 +5,12 @@ from __future__ import annotations
 from collections.abc import Callable
 from typing import Any, Dict, Mapping, MutableMapping, TypeVar
 
-from .contracts import Adapter, Operator, Sink
+from .contracts import Adapter, Operator, Router, Sink
 
 AdapterFactory = Callable[[Mapping[str, Any]], Adapter]
 OperatorFactory = Callable[[Mapping[str, Any]], Operator]
 SinkFactory = Callable[[Mapping[str, Any]], Sink]
+RouterFactory = Callable[[Mapping[str, Any]], Router]
 
 
 _T = TypeVar("_T")
@@ -48,6 +49,7 @@ class _ComponentRegistry:
 _adapters = _ComponentRegistry()
 _operators = _ComponentRegistry()
 _sinks = _ComponentRegistry()
+_routers = _ComponentRegistry()
 
 
 def register_adapter(name: str) -> Callable[[AdapterFactory], AdapterFactory]:
@@ -77,6 +79,15 @@ def register_sink(name: str) -> Callable[[SinkFactory], SinkFactory]:
     return decorator
 
 
+def register_router(name: str) -> Callable[[RouterFactory], RouterFactory]:
+    """Decorator to register a router strategy factory."""
+
+    def decorator(factory: RouterFactory) -> RouterFactory:
+        return _routers.register(name, factory)
+
+    return decorator
+
+
 def create_adapter(name: str, config: Mapping[str, Any]) -> Adapter:
     return _adapters.create(name, config)
 
@@ -89,6 +100,10 @@ def create_sink(name: str, config: Mapping[str, Any]) -> Sink:
     return _sinks.create(name, config)
 
 
+def create_router(name: str, config: Mapping[str, Any]) -> Router:
+    return _routers.create(name, config)
+
+
 def dump_registry() -> dict[str, dict[str, str]]:
     """Return the registry contents for diagnostics."""
 
@@ -99,6 +114,7 @@ def dump_registry() -> dict[str, dict[str, str]]:
         "adapters": to_names(_adapters.registered()),
         "operators": to_names(_operators.registered()),
         "sinks": to_names(_sinks.registered()),
+        "routers": to_names(_routers.registered()),
     }
 
 
@@ -108,3 +124,4 @@ def reset_registry() -> None:
     _adapters.clear()
     _operators.clear()
     _sinks.clear()
+    _routers.clear()
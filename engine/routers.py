@@ -0,0 +1,291 @@
+"""Built-in router strategies deciding which sinks receive each result."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import re
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from .contracts import Result, Router, Sink
+from .registry import register_router
+
+_FIELD_PATH_RE = re.compile(r"^([A-Z][A-Z0-9]{2})-(\d+)(?:\.(\d+))?$")
+
+
+@dataclass(frozen=True, slots=True)
+class FieldPath:
+    """Pre-parsed HL7 field reference such as ``PID-3`` or ``MSH-9.1``."""
+
+    segment: str
+    field: int
+    component: int | None = None
+
+    @classmethod
+    def parse(cls, path: str) -> "FieldPath":
+        match = _FIELD_PATH_RE.match(str(path).strip().upper())
+        if not match:
+            raise ValueError(f"invalid HL7 field path {path!r}")
+        segment, field_no, component = match.groups()
+        if int(field_no) < 1:
+            raise ValueError(f"invalid HL7 field path {path!r}")
+        return cls(segment, int(field_no), int(component) if component else None)
+
+    def extract(self, raw: bytes) -> str:
+        """Return the value at this path from the first matching segment."""
+
+        return self.lookup(split_segments(raw))
+
+    def lookup(self, segments: Mapping[str, list[str]]) -> str:
+        """Like ``extract`` but on segments already split by ``split_segments``."""
+
+        fields = segments.get(self.segment)
+        if fields is None:
+            return ""
+        # MSH-1 is the field separator itself, so MSH values sit one slot left.
+        index = self.field - 1 if self.segment == "MSH" else self.field
+        if index >= len(fields):
+            return ""
+        value = fields[index]
+        if self.component is None:
+            return value
+        components = value.split("~", 1)[0].split("^")
+        if self.component > len(components):
+            return ""
+        return components[self.component - 1]
+
+
+def split_segments(raw: bytes) -> dict[str, list[str]]:
+    """Split ``raw`` once into the fields of the first segment of each type."""
+
+    segments: dict[str, list[str]] = {}
+    text = raw.decode("utf-8", errors="replace")
+    for line in text.replace("\n", "\r").split("\r"):
+        if len(line) > 3 and line[3] == "|" and line[:3] not in segments:
+            segments[line[:3]] = line.split("|")
+    return segments
+
+
+def _stable_hash(value: str) -> int:
+    """Process-independent hash (``hash()`` is salted per interpreter)."""
+
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _sink_aliases(sink: Sink) -> set[str]:
+    aliases = {str(getattr(sink, "name", "") or "")}
+    for attr in ("label", "target_name"):
+        value = getattr(sink, attr, None)
+        if value:
+            aliases.add(str(value))
+    aliases.discard("")
+    return aliases
+
+
+def _resolve_sinks(refs: Any, sinks: Sequence[Sink], *, option: str) -> list[Sink]:
+    """Resolve sink references (list indexes or names) against ``sinks``."""
+
+    if refs is None:
+        return list(sinks)
+    if isinstance(refs, (str, int)):
+        refs = [refs]
+    resolved: list[Sink] = []
+    for ref in refs:
+        if isinstance(ref, int) and not isinstance(ref, bool):
+            if not 0 <= ref < len(sinks):
+                raise ValueError(f"router {option}: sink index {ref} out of range")
+            matches = [sinks[ref]]
+        else:
+            matches = [sink for sink in sinks if str(ref) in _sink_aliases(sink)]
+            if not matches:
+                raise ValueError(f"router {option}: unknown sink {ref!r}")
+        for sink in matches:
+            if not any(sink is existing for existing in resolved):
+                resolved.append(sink)
+    return resolved
+
+
+@dataclass
+class BroadcastRouter(Router):
+    """Deliver every result to every sink (the historical behaviour)."""
+
+    name: str = "broadcast"
+    _sinks: list[Sink] = field(default_factory=list, init=False, repr=False)
+
+    def bind(self, sinks: Sequence[Sink]) -> None:
+        self._sinks = list(sinks)
+
+    def route(self, result: Result) -> Sequence[Sink]:
+        return self._sinks
+
+
+@dataclass
+class RoundRobinRouter(Router):
+    """Rotate results across interchangeable sink replicas."""
+
+    name: str = "round-robin"
+    sink_refs: Any = None
+    _targets: list[Sink] = field(default_factory=list, init=False, repr=False)
+    _cursor: int = field(default=0, init=False, repr=False)
+
+    def bind(self, sinks: Sequence[Sink]) -> None:
+        self._targets = _resolve_sinks(self.sink_refs, sinks, option="sinks")
+        self._cursor = 0
+
+    def route(self, result: Result) -> Sequence[Sink]:
+        if not self._targets:
+            return ()
+        sink = self._targets[self._cursor % len(self._targets)]
+        self._cursor += 1
+        return (sink,)
+
+
+@dataclass
+class HashRouter(Router):
+    """Consistent hashing on an HL7 field so related messages stay on one sink.
+
+    Each sink owns ``vnodes`` points on a hash ring; a message goes to the first
+    point clockwise from the hash of its key field. Adding or removing a sink
+    only remaps the keys adjacent to its points, so a patient's events keep
+    landing on the same downstream shard.
+    """
+
+    name: str = "hash"
+    field_path: FieldPath = field(default_factory=lambda: FieldPath("PID", 3))
+    vnodes: int = 64
+    sink_refs: Any = None
+    _ring: list[int] = field(default_factory=list, init=False, repr=False)
+    _owners: list[Sink] = field(default_factory=list, init=False, repr=False)
+
+    def bind(self, sinks: Sequence[Sink]) -> None:
+        targets = _resolve_sinks(self.sink_refs, sinks, option="sinks")
+        seen: dict[str, int] = {}
+        points: list[tuple[int, int]] = []
+        for position, sink in enumerate(targets):
+            label = str(getattr(sink, "target_name", None) or sink.name)
+            seen[label] = seen.get(label, 0) + 1
+            key = f"{label}:{seen[label]}"
+            points.extend((_stable_hash(f"{key}#{vnode}"), position) for vnode in range(self.vnodes))
+        points.sort()
+        self._ring = [point for point, _ in points]
+        self._owners = [targets[position] for _, position in points]
+
+    def route(self, result: Result) -> Sequence[Sink]:
+        if not self._ring:
+            return ()
+        key = self.field_path.extract(result.message.raw)
+        slot = bisect.bisect(self._ring, _stable_hash(key)) % len(self._ring)
+        return (self._owners[slot],)
+
+
+Predicate = Callable[[str], bool]
+
+
+def _compile_predicates(rule: Mapping[str, Any]) -> list[Predicate]:
+    predicates: list[Predicate] = []
+    if "equals" in rule:
+        expected = str(rule["equals"])
+        predicates.append(lambda value: value == expected)
+    if "in" in rule:
+        allowed = frozenset(str(item) for item in rule["in"] or ())
+        predicates.append(lambda value: value in allowed)
+    if "prefix" in rule:
+        prefix = str(rule["prefix"])
+        predicates.append(lambda value: value.startswith(prefix))
+    if "matches" in rule:
+        pattern = re.compile(str(rule["matches"]))
+        predicates.append(lambda value: pattern.search(value) is not None)
+    if "exists" in rule:
+        wanted = bool(rule["exists"])
+        predicates.append(lambda value: bool(value) is wanted)
+    if not predicates:
+        raise ValueError("content router rules need equals, in, prefix, matches, or exists")
+    return predicates
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    path: FieldPath
+    predicates: tuple[Predicate, ...]
+    targets: tuple[Sink, ...]
+
+    def matches(self, segments: Mapping[str, list[str]]) -> bool:
+        value = self.path.lookup(segments)
+        return all(predicate(value) for predicate in self.predicates)
+
+
+@dataclass
+class ContentRouter(Router):
+    """Route on field predicates compiled once when the pipeline is built."""
+
+    name: str = "content"
+    rules: list[Mapping[str, Any]] = field(default_factory=list)
+    default_refs: Any = ()
+    first_match: bool = True
+    _compiled: list[_CompiledRule] = field(default_factory=list, init=False, repr=False)
+    _default: tuple[Sink, ...] = field(default=(), init=False, repr=False)
+
+    def bind(self, sinks: Sequence[Sink]) -> None:
+        compiled: list[_CompiledRule] = []
+        for index, rule in enumerate(self.rules):
+            if not isinstance(rule, Mapping) or "field" not in rule:
+                raise ValueError(f"content router rule {index} requires a field")
+            compiled.append(
+                _CompiledRule(
+                    path=FieldPath.parse(rule["field"]),
+                    predicates=tuple(_compile_predicates(rule)),
+                    targets=tuple(
+                        _resolve_sinks(rule.get("sinks"), sinks, option=f"rules[{index}].sinks")
+                    ),
+                )
+            )
+        self._compiled = compiled
+        self._default = tuple(_resolve_sinks(self.default_refs, sinks, option="default"))
+
+    def route(self, result: Result) -> Sequence[Sink]:
+        # Every rule reads the same message: split it once.
+        segments = split_segments(result.message.raw)
+        selected: list[Sink] = []
+        for rule in self._compiled:
+            if not rule.matches(segments):
+                continue
+            if self.first_match:
+                return rule.targets
+            selected.extend(sink for sink in rule.targets if not any(sink is s for s in selected))
+        return selected or self._default
+
+
+@register_router("broadcast")
+def _broadcast_router(config: Mapping[str, Any]) -> Router:
+    return BroadcastRouter()
+
+
+@register_router("round-robin")
+def _round_robin_router(config: Mapping[str, Any]) -> Router:
+    return RoundRobinRouter(sink_refs=config.get("sinks"))
+
+
+@register_router("hash")
+def _hash_router(config: Mapping[str, Any]) -> Router:
+    path = FieldPath.parse(str(config.get("field") or "PID-3"))
+    vnodes = int(config.get("vnodes", 64))
+    if vnodes < 1:
+        raise ValueError("hash router vnodes must be positive")
+    return HashRouter(field_path=path, vnodes=vnodes, sink_refs=config.get("sinks"))
+
+
+@register_router("content")
+def _content_router(config: Mapping[str, Any]) -> Router:
+    rules = config.get("rules") or []
+    if not isinstance(rules, list):
+        raise TypeError("content router rules must be a list")
+    match_mode = str(config.get("match") or "first").strip().lower()
+    if match_mode not in {"first", "all"}:
+        raise ValueError("content router match must be 'first' or 'all'")
+    return ContentRouter(
+        rules=list(rules),
+        default_refs=config.get("default") or (),
+        first_match=match_mode == "first",
+    )
@@ -4,17 +4,66 @@ import asyncio
 import logging
 import os
 import socket
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any
 
-from engine.runtime import EngineRuntime
-from engine.spec import dump_pipeline_spec, load_pipeline_spec
+from engine.adapters.replay import ReplayAdapter
+from engine.contracts import Result
+from engine.runtime import PipelineRuntime, RuntimeCache
+from engine.spec import ComponentSpec
+from insights import notify
 from insights.store import InsightsStore, JobNotFoundError, JobRecord
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_CONCURRENCY = int(os.getenv("ENGINE_RUNNER_CONCURRENCY", "2"))
 LEASE_TTL_SECS = int(os.getenv("ENGINE_RUNNER_LEASE_TTL_SECS", "60"))
+# Heartbeats must land well inside the lease TTL; the reaper can run less often.
+HEARTBEAT_INTERVAL_SECS = float(
+    os.getenv("ENGINE_RUNNER_HEARTBEAT_INTERVAL_SECS", str(max(LEASE_TTL_SECS / 3, 0.5)))
+)
+REAP_INTERVAL_SECS = float(
+    os.getenv("ENGINE_RUNNER_REAP_INTERVAL_SECS", str(max(LEASE_TTL_SECS / 2, 1.0)))
+)
 POLL_INTERVAL_SECS = float(os.getenv("ENGINE_RUNNER_POLL_INTERVAL_SECS", "0.5"))
+RUNTIME_CACHE_SIZE = int(os.getenv("ENGINE_RUNNER_RUNTIME_CACHE_SIZE", "32"))
+# Idle polls back off from POLL_INTERVAL_SECS up to this ceiling. Without a
+# cross-process notify channel the ceiling stays at the base interval so jobs
+# enqueued by other processes are not picked up any later than before.
+MAX_POLL_INTERVAL_SECS = os.getenv("ENGINE_RUNNER_MAX_POLL_INTERVAL_SECS")
+
+
+def _job_adapter_spec(
+    kind: str, payload: dict, checkpoint: dict | None = None
+) -> ComponentSpec | None:
+    """Return the adapter override for replay/ingest jobs (``None`` keeps the spec's).
+
+    A replay ``checkpoint`` resumes after its ``after_id`` source message.
+    """
+
+    if kind == "replay":
+        replay_run_id = int(payload.get("replay_run_id") or 0)
+        if not replay_run_id:
+            raise JobNotFoundError("replay requires payload.replay_run_id")
+        replay_config = {"run_id": replay_run_id}
+        if payload.get("max_messages"):
+            replay_config["max_messages"] = payload.get("max_messages")
+        if payload.get("page_size"):
+            replay_config["page_size"] = payload.get("page_size")
+        if checkpoint and checkpoint.get("after_id"):
+            replay_config["after_id"] = checkpoint["after_id"]
+        return ComponentSpec(type="replay", config=replay_config)
+    if kind == "ingest":
+        message_b64 = payload.get("message_b64")
+        if not isinstance(message_b64, str) or not message_b64:
+            raise JobNotFoundError("ingest requires payload.message_b64")
+        return ComponentSpec(
+            type="inline",
+            config={"message_b64": message_b64, "meta": payload.get("meta") or {}},
+        )
+    return None
 
 
 def _backoff_secs(attempts: int) -> int:
@@ -23,48 +72,214 @@ def _backoff_secs(attempts: int) -> int:
     return min(300, base + jitter or 1)
 
 
+@dataclass
+class _ActiveJob:
+    """A job leased by this runner, tracked for heartbeats and progress."""
+
+    job_id: int
+    leased_at: float = field(default_factory=time.monotonic)
+    task: asyncio.Task[None] | None = None
+    runtime: PipelineRuntime | None = None
+
+    def progress(self) -> dict[str, Any]:
+        metrics = self.runtime.metrics() if self.runtime is not None else {}
+        return {
+            "processed": metrics.get("processed", 0),
+            "in_flight": metrics.get("in_flight", 0),
+            "elapsed_secs": round(time.monotonic() - self.leased_at, 3),
+        }
+
+
 class EngineRunner:
-    """Background worker that leases and executes Engine jobs."""
+    """Background worker that leases and executes Engine jobs.
+
+    While a job is leased the runner heartbeats it every
+    ``heartbeat_interval`` seconds, publishing progress counters and cancelling
+    the job if the lease was lost (canceled or reaped). A reaper requeues jobs
+    whose holders stopped heartbeating, so ``lease_ttl_secs`` can stay short.
+    """
 
-    def __init__(self, store: InsightsStore, concurrency: int = DEFAULT_CONCURRENCY) -> None:
+    def __init__(
+        self,
+        store: InsightsStore,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        *,
+        poll_interval: float = POLL_INTERVAL_SECS,
+        max_poll_interval: float | None = None,
+        lease_ttl_secs: int = LEASE_TTL_SECS,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL_SECS,
+        reap_interval: float = REAP_INTERVAL_SECS,
+    ) -> None:
         self.store = store
         self.concurrency = max(1, concurrency)
         self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.runtime_cache = RuntimeCache(max_entries=RUNTIME_CACHE_SIZE)
+        self.poll_interval = max(0.01, poll_interval)
+        if max_poll_interval is None:
+            if MAX_POLL_INTERVAL_SECS is not None:
+                max_poll_interval = float(MAX_POLL_INTERVAL_SECS)
+            elif notify.has_remote_channel():
+                max_poll_interval = 5.0
+            else:
+                max_poll_interval = self.poll_interval
+        self.max_poll_interval = max(self.poll_interval, max_poll_interval)
+        self.lease_ttl_secs = max(1, lease_ttl_secs)
+        self.heartbeat_interval = heartbeat_interval
+        self.reap_interval = reap_interval
+        self._active: dict[int, _ActiveJob] = {}
         self._stopped = asyncio.Event()
+        self._wakeup = asyncio.Event()
 
     async def run_forever(self) -> None:
         """Continuously lease jobs and execute them until stopped."""
 
         sem = asyncio.Semaphore(self.concurrency)
         tasks: set[asyncio.Task[None]] = set()
+        unsubscribes = [
+            await channel.subscribe(self._wakeup) for channel in notify.get_channels()
+        ]
+        idle_interval = self.poll_interval
+        maintenance = [
+            asyncio.create_task(self._every(self.heartbeat_interval, self.heartbeat)),
+            asyncio.create_task(self._every(self.reap_interval, self.reap)),
+        ]
 
         try:
             while not self._stopped.is_set():
+                # Clear before leasing: a wakeup that races with an empty lease
+                # leaves the event set, so the wait below returns immediately.
+                self._wakeup.clear()
                 now = datetime.utcnow()
                 leased = self.store.lease_jobs(
                     worker_id=self.worker_id,
                     now=now,
-                    lease_ttl_secs=LEASE_TTL_SECS,
+                    lease_ttl_secs=self.lease_ttl_secs,
                     limit=self.concurrency,
                 )
                 if not leased:
-                    await asyncio.sleep(POLL_INTERVAL_SECS)
+                    await self._wait_for_work(idle_interval)
+                    idle_interval = min(idle_interval * 2, self.max_poll_interval)
                     continue
+                idle_interval = self.poll_interval
 
+                # Track leases before waiting for a slot so queued-up jobs keep
+                # heartbeating instead of expiring behind busy ones.
+                for job in leased:
+                    self._active[job.id] = _ActiveJob(job_id=job.id)
                 for job in leased:
                     await sem.acquire()
+                    active = self._active.get(job.id)
+                    if active is None:  # lease lost while waiting for a slot
+                        sem.release()
+                        continue
                     task = asyncio.create_task(self._execute_job(job, sem))
+                    active.task = task
                     tasks.add(task)
                     task.add_done_callback(tasks.discard)
         finally:
+            for unsubscribe in unsubscribes:
+                unsubscribe()
             if tasks:
                 await asyncio.gather(*tasks, return_exceptions=True)
+            for task in maintenance:
+                task.cancel()
+            await asyncio.gather(*maintenance, return_exceptions=True)
 
     async def stop(self) -> None:
         self._stopped.set()
+        self._wakeup.set()
+
+    async def _wait_for_work(self, timeout: float) -> None:
+        """Sleep until a notify channel fires or ``timeout`` elapses."""
+
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _every(self, interval: float, action) -> None:
+        while not self._stopped.is_set():
+            try:
+                await asyncio.wait_for(self._stopped.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopped.is_set():
+                return
+            try:
+                action()
+            except Exception:  # pragma: no cover - keep maintenance running
+                logger.exception("runner.maintenance.error", extra={"action": action.__name__})
+
+    def heartbeat(self) -> None:
+        """Extend leases of every tracked job and publish its progress."""
+
+        now = datetime.utcnow()
+        for active in list(self._active.values()):
+            kept = self.store.heartbeat_job(
+                active.job_id,
+                self.worker_id,
+                now,
+                self.lease_ttl_secs,
+                progress=active.progress(),
+            )
+            if kept:
+                continue
+            logger.warning("job.lease_lost", extra={"job_id": active.job_id})
+            self._active.pop(active.job_id, None)
+            if active.task is not None:
+                active.task.cancel()
+
+    def reap(self) -> None:
+        """Requeue jobs (from any worker) whose leases lapsed without a heartbeat."""
+
+        for job in self.store.reap_expired_leases(datetime.utcnow()):
+            logger.warning(
+                "job.reaped",
+                extra={"job_id": job.id, "status": job.status, "attempts": job.attempts},
+            )
+
+    def _replay_checkpointer(
+        self, job_id: int, run_id: int, adapter: ReplayAdapter, resumed: int
+    ):
+        """Return a ``ResultBuffer.on_flush`` hook that checkpoints replay progress.
+
+        Checkpoints follow committed batches, so a resumed replay may repeat
+        at most the results that were buffered when the worker died.
+        """
+
+        adapter.checkpointing = True
+
+        def _checkpoint(batch: list[Result]) -> None:
+            before = adapter.position
+            # Operators that replace the message drop ``source_message_pk``;
+            # the checkpoint then stalls rather than skipping messages.
+            position = adapter.acknowledge(
+                result.message.meta.get("source_message_pk") for result in batch
+            )
+            if position == before:
+                return
+            self.store.checkpoint_job(
+                job_id,
+                self.worker_id,
+                {"run_id": run_id, "after_id": position, "processed": resumed + adapter.acknowledged},
+            )
+
+        return _checkpoint
+
+    def _discard_partial_run(self, run_id: int | None) -> None:
+        """Drop a failed attempt's output run; a retry re-runs the whole input."""
+
+        if run_id is None:
+            return
+        try:
+            self.store.discard_run(run_id)
+        except Exception:  # pragma: no cover - keep the original failure visible
+            logger.exception("job.discard_run_failed", extra={"run_id": run_id})
 
     async def _execute_job(self, job: JobRecord, sem: asyncio.Semaphore) -> None:
         started: JobRecord | None = None
+        # Output run started by this attempt that a retry could not resume.
+        partial_run_id: int | None = None
         try:
             started = self.store.start_job(job.id, self.worker_id, now=datetime.utcnow())
             if started is None:
@@ -87,49 +302,67 @@ class EngineRunner:
             if pipeline is None:
                 raise JobNotFoundError(f"pipeline {started.pipeline_id} not found")
 
-            spec = load_pipeline_spec(pipeline.yaml)
-            job_payload = started.payload or {}
-            if started.kind == "replay":
-                replay_run_id = int(job_payload.get("replay_run_id") or 0)
-                if not replay_run_id:
-                    raise JobNotFoundError("replay requires payload.replay_run_id")
-                raw_spec = dump_pipeline_spec(spec)
-                replay_config = {"run_id": replay_run_id}
-                if job_payload.get("max_messages"):
-                    replay_config["max_messages"] = job_payload.get("max_messages")
-                raw_spec["adapter"] = {
-                    "type": "replay",
-                    "config": replay_config,
-                }
-                spec = load_pipeline_spec(raw_spec)
-            elif started.kind == "ingest":
-                message_b64 = job_payload.get("message_b64")
-                if not isinstance(message_b64, str) or not message_b64:
-                    raise JobNotFoundError("ingest requires payload.message_b64")
-                raw_spec = dump_pipeline_spec(spec)
-                raw_spec["adapter"] = {
-                    "type": "inline",
-                    "config": {
-                        "message_b64": message_b64,
-                        "meta": job_payload.get("meta") or {},
-                    },
-                }
-                spec = load_pipeline_spec(raw_spec)
-
-            max_messages = job_payload.get("max_messages")
+            warm = self.runtime_cache.get(pipeline.id, pipeline.yaml)
+            job_payload = dict(started.payload or {})
             persist = job_payload.get("persist", True)
 
-            runtime = EngineRuntime(spec)
-            results = await runtime.run(max_messages=max_messages)
+            # A replay that was interrupted resumes into the same output run
+            # after the last source message its checkpoint recorded.
+            checkpoint = None
+            if started.kind == "replay" and persist and started.checkpoint:
+                checkpoint = started.checkpoint
+            resumed = int(checkpoint.get("processed", 0)) if checkpoint else 0
+            max_messages = job_payload.get("max_messages")
+            if checkpoint and max_messages:
+                max_messages = int(max_messages) - resumed
+                if max_messages <= 0:
+                    self.store.complete_job(started.id, checkpoint.get("run_id"))
+                    return
+                job_payload["max_messages"] = max_messages
+            adapter_spec = _job_adapter_spec(started.kind, job_payload, checkpoint)
 
+            # Results stream into a write-behind buffer as they are produced,
+            # so persistence overlaps the run and commits once per batch.
             run_id = None
+            buffer = None
             if persist:
-                run_id = self.store.persist_run_results(
-                    pipeline_name=pipeline.name,
-                    results=results,
+                self.store.ensure_schema()
+                if checkpoint and checkpoint.get("run_id"):
+                    run_id = int(checkpoint["run_id"])
+                    logger.info(
+                        "job.resume",
+                        extra={"job_id": started.id, "run_id": run_id, "checkpoint": checkpoint},
+                    )
+                else:
+                    run_id = self.store.start_run(pipeline.name).id
+                    if started.kind == "replay":
+                        # Retries resume into this run rather than starting another.
+                        self.store.checkpoint_job(
+                            started.id, self.worker_id, {"run_id": run_id, "processed": 0}
+                        )
+                    else:
+                        partial_run_id = run_id
+                buffer = self.store.result_buffer(run_id)
+
+            runtime = warm.runtime(adapter_spec, persist_result=buffer)
+            if buffer is not None and isinstance(runtime.adapter, ReplayAdapter):
+                buffer.on_flush = self._replay_checkpointer(
+                    started.id, run_id, runtime.adapter, resumed
                 )
+            active = self._active.get(started.id)
+            if active is not None:
+                active.runtime = runtime
+            reuse = False
+            try:
+                results = await runtime.run(max_messages=max_messages)
+                reuse = True
+            finally:
+                await warm.release(runtime, reuse=reuse)
+                if buffer is not None:
+                    buffer.close()
 
             self.store.complete_job(started.id, run_id)
+            partial_run_id = None
             logger.info(
                 "job.success",
                 extra={
@@ -138,6 +371,11 @@ class EngineRunner:
                     "processed": len(results),
                 },
             )
+        except asyncio.CancelledError:
+            # Lease lost (or shutdown): the job is requeued for a fresh attempt.
+            logger.warning("job.cancelled", extra={"job_id": job.id})
+            self._discard_partial_run(partial_run_id)
+            raise
         except JobNotFoundError as exc:
             logger.error(
                 "job.error",
@@ -147,6 +385,7 @@ class EngineRunner:
                     "error": str(exc),
                 },
             )
+            self._discard_partial_run(partial_run_id)
             self.store.fail_job_and_maybe_retry(
                 job_id=job.id,
                 error=str(exc),
@@ -161,6 +400,7 @@ class EngineRunner:
                     "status": getattr(started, "status", getattr(job, "status", None)),
                 },
             )
+            self._discard_partial_run(partial_run_id)
             self.store.fail_job_and_maybe_retry(
                 job_id=job.id,
                 error=str(exc),
@@ -168,6 +408,7 @@ class EngineRunner:
                 backoff_secs=_backoff_secs(job.attempts),
             )
         finally:
+            self._active.pop(job.id, None)
             sem.release()
 
 
@@ -3,16 +3,90 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import time
+from collections import OrderedDict
 from collections.abc import AsyncIterator, Awaitable, Callable
-from typing import Any, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Iterable, TypeVar
 
 from . import plugins  # noqa: F401  # ensure built-ins and stubs registered
-from .contracts import Adapter, Issue, Message, Operator, Result, Sink
-from .registry import create_adapter, create_operator, create_sink
-from .spec import ComponentSpec, PipelineSpec
+from .contracts import Adapter, Issue, Message, Operator, Result, Router, Sink
+from .registry import create_adapter, create_operator, create_router, create_sink
+from .spec import ComponentSpec, PipelineSpec, load_pipeline_spec
 
 ResultWriter = Callable[[Result], Awaitable[None]]
 
+_T = TypeVar("_T")
+
+
+_END = object()
+
+
+class _StageQueue:
+    """Bounded queue with high/low watermarks gating upstream producers.
+
+    Producers stall once the depth reaches ``high_water`` and resume only when
+    consumers drain it back to ``low_water``; the hysteresis keeps a lagging
+    stage from flapping its producer on every item.
+    """
+
+    def __init__(self, name: str, *, capacity: int, high_water: int, low_water: int) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.high_water = min(high_water, capacity)
+        self.low_water = min(low_water, self.high_water - 1)
+        self.peak_depth = 0
+        self.stalls = 0
+        self.stalled_secs = 0.0
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=capacity)
+        self._open = asyncio.Event()
+        self._open.set()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def paused(self) -> bool:
+        return not self._open.is_set()
+
+    async def put(self, item: Any) -> None:
+        if not self._open.is_set():
+            self.stalls += 1
+            started = time.perf_counter()
+            await self._open.wait()
+            self.stalled_secs += time.perf_counter() - started
+        await self._queue.put(item)
+        depth = self._queue.qsize()
+        self.peak_depth = max(self.peak_depth, depth)
+        if depth >= self.high_water:
+            self._open.clear()
+
+    async def close(self, consumers: int = 1) -> None:
+        """Signal end-of-stream to ``consumers`` readers, bypassing the gate."""
+
+        for _ in range(consumers):
+            await self._queue.put(_END)
+
+    async def get(self) -> Any:
+        item = await self._queue.get()
+        if not self._open.is_set() and self._queue.qsize() <= self.low_water:
+            self._open.set()
+        return item
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "capacity": self.capacity,
+            "high_water": self.high_water,
+            "low_water": self.low_water,
+            "peak_depth": self.peak_depth,
+            "paused": self.paused,
+            "stalls": self.stalls,
+            "stalled_secs": round(self.stalled_secs, 6),
+        }
+
 
 class PipelineRuntime:
     """In-process runtime for a single pipeline."""
@@ -25,16 +99,54 @@ class PipelineRuntime:
         operators: Iterable[Operator],
         sinks: Iterable[Sink],
         persist_result: ResultWriter | None = None,
+        router: Router | None = None,
     ) -> None:
         self.spec = spec
         self.adapter = adapter
         self.operators = list(operators)
         self.sinks = list(sinks)
         self._persist_result = persist_result
+        if router is None:
+            router = create_router(spec.router.strategy, spec.router.config)
+            router.bind(self.sinks)
+        self.router = router
+        self._stages: dict[str, _StageQueue] = {}
+        self._processed = 0
+        self._in_flight = 0
+
+    def metrics(self) -> dict[str, Any]:
+        """Return queue depths and stall counters for monitoring.
+
+        Stage entries are only populated for ``staged`` execution; they keep
+        their final values after a run so callers can inspect peak depths.
+        """
+
+        adapter_stage = self._stages.get("ingress")
+        return {
+            "mode": self.spec.execution.mode,
+            "processed": self._processed,
+            "in_flight": self._in_flight,
+            "adapter_paused": bool(adapter_stage and adapter_stage.paused),
+            "adapter_stalls": adapter_stage.stalls if adapter_stage else 0,
+            "stages": {name: stage.snapshot() for name, stage in self._stages.items()},
+        }
 
     async def run(self, *, max_messages: int | None = 1) -> list[Result]:
         """Execute the pipeline for ``max_messages`` messages."""
 
+        self._processed = 0
+        if self.spec.execution.mode == "batched":
+            results = await self._run_batched(max_messages=max_messages)
+        elif self.spec.execution.mode == "staged":
+            results = await self._run_staged(max_messages=max_messages)
+        else:
+            results = await self._run_sequential(max_messages=max_messages)
+        # Sinks that pipeline writes (e.g. ``mllp_target`` with a window) only
+        # report delivery failures once their outstanding writes settle.
+        await _gather_or_cancel(sink.flush() for sink in self.sinks)
+        return results
+
+    async def _run_sequential(self, *, max_messages: int | None) -> list[Result]:
         results: list[Result] = []
         count = 0
         async for message in self._iterate_messages():
@@ -44,10 +156,157 @@ class PipelineRuntime:
                 await self._persist_result(result)
             results.append(result)
             count += 1
+            self._processed = count
             if max_messages is not None and count >= max_messages:
                 break
         return results
 
+    async def _run_batched(self, *, max_messages: int | None) -> list[Result]:
+        """Pull micro-batches from the adapter and fan them out concurrently.
+
+        Operators run for every message of a batch under the ``max_in_flight``
+        limit. With ``ordering: strict`` each sink still observes results in
+        adapter order; ``unordered`` lets sink writes complete in any order.
+        """
+
+        execution = self.spec.execution
+        limit = asyncio.Semaphore(execution.max_in_flight)
+        results: list[Result] = []
+        batch: list[Message] = []
+        self._in_flight = 0
+        count = 0
+        async for message in self._iterate_messages():
+            batch.append(message)
+            count += 1
+            reached = max_messages is not None and count >= max_messages
+            if len(batch) >= execution.batch_size or reached:
+                results.extend(await self._run_batch(batch, limit))
+                batch = []
+            if reached:
+                break
+        if batch:
+            results.extend(await self._run_batch(batch, limit))
+        return results
+
+    async def _run_batch(
+        self, batch: list[Message], limit: asyncio.Semaphore
+    ) -> list[Result]:
+        async def _bounded_process(message: Message) -> Result:
+            async with limit:
+                self._in_flight += 1
+                try:
+                    return await self._process_message(message)
+                finally:
+                    self._in_flight -= 1
+
+        async def _bounded_write(sink: Sink, result: Result) -> None:
+            async with limit:
+                await sink.write(result)
+
+        async def _write_in_order(sink: Sink) -> None:
+            for result, targets in routed:
+                if any(target is sink for target in targets):
+                    await sink.write(result)
+
+        results = await _gather_or_cancel(_bounded_process(message) for message in batch)
+        # Route sequentially so stateful strategies (round-robin) stay deterministic.
+        routed = [(result, self.router.route(result)) for result in results]
+        if self.spec.execution.ordering == "strict":
+            await _gather_or_cancel(_write_in_order(sink) for sink in self.sinks)
+        else:
+            await _gather_or_cancel(
+                _bounded_write(sink, result) for result, targets in routed for sink in targets
+            )
+        if self._persist_result:
+            for result in results:
+                await self._persist_result(result)
+        self._processed += len(results)
+        return results
+
+    async def _run_staged(self, *, max_messages: int | None) -> list[Result]:
+        """Run adapter, operators, and sinks as stages linked by bounded queues.
+
+        The adapter feeds ``ingress``; ``max_in_flight`` operator workers drain
+        it into ``egress``; a single sink stage dispatches results. A slow sink
+        fills ``egress``, which stalls the workers, which fills ``ingress`` and
+        finally pauses the adapter. Under ``ordering: strict`` results are
+        re-sequenced before dispatch; a window semaphore bounds how far the
+        workers may run ahead of the oldest undispatched message.
+        """
+
+        execution = self.spec.execution
+        workers = execution.max_in_flight
+        capacity = execution.queue_size
+        ingress = _StageQueue(
+            "ingress",
+            capacity=capacity,
+            high_water=execution.high_water,
+            low_water=execution.low_water,
+        )
+        egress = _StageQueue(
+            "egress",
+            capacity=capacity,
+            high_water=execution.high_water,
+            low_water=execution.low_water,
+        )
+        self._stages = {"ingress": ingress, "egress": egress}
+        # Room for both queues, every worker, the result being emitted, and a
+        # reorder buffer of one queue's worth; watermarks normally trip first.
+        window = asyncio.Semaphore(3 * capacity + workers + 1)
+        collected: dict[int, Result] = {}
+
+        async def _adapter_stage() -> None:
+            count = 0
+            async for message in self._iterate_messages():
+                await window.acquire()
+                self._in_flight += 1
+                await ingress.put((count, message))
+                count += 1
+                if max_messages is not None and count >= max_messages:
+                    break
+            await ingress.close(workers)
+
+        async def _operator_worker() -> None:
+            while True:
+                item = await ingress.get()
+                if item is _END:
+                    return
+                index, message = item
+                await egress.put((index, await self._process_message(message)))
+
+        async def _operator_stage() -> None:
+            await _gather_or_cancel(_operator_worker() for _ in range(workers))
+            await egress.close()
+
+        async def _emit(index: int, result: Result) -> None:
+            await self._dispatch(result)
+            if self._persist_result:
+                await self._persist_result(result)
+            collected[index] = result
+            self._processed += 1
+            self._in_flight -= 1
+            window.release()
+
+        async def _sink_stage() -> None:
+            pending: dict[int, Result] = {}
+            next_index = 0
+            while True:
+                item = await egress.get()
+                if item is _END:
+                    return
+                index, result = item
+                if execution.ordering != "strict":
+                    await _emit(index, result)
+                    continue
+                pending[index] = result
+                while next_index in pending:
+                    await _emit(next_index, pending.pop(next_index))
+                    next_index += 1
+
+        self._in_flight = 0
+        await _gather_or_cancel((_adapter_stage(), _operator_stage(), _sink_stage()))
+        return [collected[index] for index in sorted(collected)]
+
     async def _iterate_messages(self) -> AsyncIterator[Message]:
         async for message in self.adapter.stream():
             yield message
@@ -62,7 +321,7 @@ class PipelineRuntime:
         return Result(message=current, issues=collected)
 
     async def _dispatch(self, result: Result) -> None:
-        for sink in self.sinks:
+        for sink in self.router.route(result):
             await sink.write(result)
 
 
@@ -116,6 +375,176 @@ class EngineRuntime:
         return msg.raw
 
 
+async def _gather_or_cancel(aws: Iterable[Awaitable[_T]]) -> list[_T]:
+    """Await ``aws`` concurrently, cancelling the siblings if one of them fails."""
+
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+@dataclass
+class WarmPipeline:
+    """Parsed spec plus long-lived operators, sinks, and router for reuse.
+
+    Operators are stateless and shared by every run. Sinks and the router
+    hold per-run state (in-flight writes, pending errors), so each run leases
+    its own set: an idle set from a previous run is reused, and a concurrent
+    run gets a freshly built one. Sets go back to the idle list on ``release``.
+    """
+
+    pipeline_id: int
+    digest: str
+    spec: PipelineSpec
+    operators: list[Operator]
+    _idle: list[tuple[list[Sink], Router]] = field(default_factory=list, repr=False)
+    _retired: bool = field(default=False, repr=False)
+
+    @classmethod
+    def build(cls, pipeline_id: int, yaml_text: str) -> "WarmPipeline":
+        spec = load_pipeline_spec(yaml_text)
+        operators = [_instantiate_component(op, create_operator) for op in spec.operators]
+        warm = cls(
+            pipeline_id=pipeline_id,
+            digest=spec_digest(yaml_text),
+            spec=spec,
+            operators=operators,
+        )
+        warm._idle.append(warm._build_outputs())
+        return warm
+
+    def _build_outputs(self) -> tuple[list[Sink], Router]:
+        sinks = [_instantiate_component(sink, create_sink) for sink in self.spec.sinks]
+        router = create_router(self.spec.router.strategy, self.spec.router.config)
+        router.bind(sinks)
+        return sinks, router
+
+    async def close(self) -> None:
+        """Close idle sinks now; leased ones are closed when their run releases them."""
+
+        self._retired = True
+        idle, self._idle = self._idle, []
+        await _close_sinks(sinks for sinks, _ in idle)
+
+    def runtime(
+        self,
+        adapter_spec: ComponentSpec | None = None,
+        *,
+        persist_result: ResultWriter | None = None,
+    ) -> PipelineRuntime:
+        """Return a ``PipelineRuntime`` with a fresh adapter and leased warm components."""
+
+        adapter = _instantiate_component(adapter_spec or self.spec.adapter, create_adapter)
+        sinks, router = self._idle.pop() if self._idle else self._build_outputs()
+        return PipelineRuntime(
+            spec=self.spec,
+            adapter=adapter,
+            operators=self.operators,
+            sinks=sinks,
+            persist_result=persist_result,
+            router=router,
+        )
+
+    async def release(self, runtime: PipelineRuntime, *, reuse: bool = True) -> None:
+        """Return ``runtime``'s sinks and router for the next run.
+
+        A failed run (``reuse=False``) or a retired entry closes them instead.
+        """
+
+        if reuse and not self._retired:
+            self._idle.append((runtime.sinks, runtime.router))
+            return
+        await _close_sinks([runtime.sinks])
+
+
+async def _close_sinks(sink_sets: Iterable[list[Sink]]) -> None:
+    await asyncio.gather(
+        *(sink.close() for sinks in sink_sets for sink in sinks), return_exceptions=True
+    )
+
+
+class RuntimeCache:
+    """LRU of ``WarmPipeline`` entries keyed by pipeline id and YAML digest.
+
+    Adapters are per-run streams and are always rebuilt; the parsed spec and
+    operators, plus idle sink/router sets, are reused until the stored YAML
+    changes.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[int, WarmPipeline] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def get(self, pipeline_id: int, yaml_text: str) -> WarmPipeline:
+        digest = spec_digest(yaml_text)
+        cached = self._entries.get(pipeline_id)
+        if cached is not None and cached.digest == digest:
+            self._entries.move_to_end(pipeline_id)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        if cached is not None:
+            self.invalidations += 1
+            self._retire(self._entries.pop(pipeline_id))
+        warm = WarmPipeline.build(pipeline_id, yaml_text)
+        if self.max_entries:
+            self._entries[pipeline_id] = warm
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._retire(evicted)
+                self.evictions += 1
+        return warm
+
+    def invalidate(self, pipeline_id: int | None = None) -> None:
+        if pipeline_id is None:
+            retired = list(self._entries.values())
+            self._entries.clear()
+        else:
+            retired = [self._entries.pop(pipeline_id)] if pipeline_id in self._entries else []
+        for warm in retired:
+            self._retire(warm)
+
+    def _retire(self, warm: WarmPipeline) -> None:
+        """Close a dropped pipeline's sinks on the running loop, if any.
+
+        A run that still holds the entry keeps its leased sinks until it
+        releases them, at which point they are closed too.
+        """
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(warm.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+def spec_digest(yaml_text: str) -> str:
+    """Content hash used to detect edits to a stored pipeline spec."""
+
+    return hashlib.sha256(yaml_text.encode("utf-8")).hexdigest()
+
+
 def _instantiate_component(
     component: ComponentSpec,
     factory: Callable[[str, dict[str, Any]], Any],
@@ -3,42 +3,112 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
 
 from engine.contracts import Result, Sink
 from engine.registry import register_sink
-from insights.store import InsightsStore
-
-VT = b"\x0b"
-FS_CR = b"\x1c\x0d"
-
-
-async def _send(host: str, port: int, payload: bytes) -> None:
-    reader, writer = await asyncio.open_connection(host, port)
-    try:
-        writer.write(VT + payload + FS_CR)
-        await writer.drain()
-        await reader.readuntil(FS_CR)
-    finally:
-        writer.close()
-        await writer.wait_closed()
+from insights.store import get_store
+from silhouette_core.interop.mllp_pool import MLLPConnectionPool
 
 
 @dataclass
 class MLLPTargetSink(Sink):
+    """Forward results to the ``mllp_out`` endpoint named ``target_name``.
+
+    The sink keeps a pool of persistent connections to the endpoint. The
+    endpoint is looked up on the first write of each run (after ``flush``)
+    and the pool is rebuilt if its host or port was edited in the meantime.
+    With ``window`` above 1, ``write`` returns once the frame is sent and
+    ACKs are collected in the background; the first delivery failure is
+    raised from a later ``write`` or from ``flush`` at the end of the run.
+    NAKs are counted in ``stats()`` and only fail the run when
+    ``fail_on_nak`` is set.
+    """
+
     name: str
     target_name: str
+    pool_size: int = 2
+    window: int = 1
+    connect_timeout: float = 5.0
+    ack_timeout: float = 30.0
+    max_idle_secs: float = 60.0
+    fail_on_nak: bool = False
+    _pool: MLLPConnectionPool | None = field(default=None, init=False, repr=False)
+    _endpoint: tuple[str, int] | None = field(default=None, init=False, repr=False)
+    _recheck: bool = field(default=False, init=False, repr=False)
+    _inflight: set[asyncio.Future[bytes]] = field(default_factory=set, init=False, repr=False)
+    _error: BaseException | None = field(default=None, init=False, repr=False)
 
     async def write(self, result: Result) -> None:
-        store = InsightsStore.from_env()
-        target = store.get_endpoint_by_name(self.target_name)
+        self._raise_pending_error()
+        pool = await self._resolve_pool()
+        if self.window <= 1:
+            await pool.send(result.message.raw)
+            return
+        future = await pool.submit(result.message.raw)
+        self._inflight.add(future)
+        future.add_done_callback(self._settled)
+
+    async def flush(self) -> None:
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+        self._recheck = self._pool is not None
+        self._raise_pending_error()
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    def stats(self) -> dict[str, Any]:
+        return self._pool.stats() if self._pool is not None else {}
+
+    async def _resolve_pool(self) -> MLLPConnectionPool:
+        if self._pool is not None and not self._recheck:
+            return self._pool
+        self._recheck = False
+        endpoint = self._lookup_endpoint()
+        if self._pool is not None and endpoint != self._endpoint:
+            await self._pool.close()
+            self._pool = None
+        if self._pool is None:
+            host, port = endpoint
+            self._pool = MLLPConnectionPool(
+                host=host,
+                port=port,
+                size=self.pool_size,
+                window=self.window,
+                connect_timeout=self.connect_timeout,
+                ack_timeout=self.ack_timeout,
+                max_idle_secs=self.max_idle_secs,
+                fail_on_nak=self.fail_on_nak,
+            )
+            self._endpoint = endpoint
+        return self._pool
+
+    def _lookup_endpoint(self) -> tuple[str, int]:
+        target = get_store().get_endpoint_by_name(self.target_name)
         if target is None or target.kind != "mllp_out":
             raise RuntimeError(f"target {self.target_name!r} not found")
         host = str(target.config.get("host") or "").strip()
         port = int(target.config.get("port") or 0)
         if not host or port <= 0:
             raise RuntimeError("target missing host/port configuration")
-        await _send(host, port, result.message.raw)
+        return host, port
+
+    def _settled(self, future: asyncio.Future[bytes]) -> None:
+        self._inflight.discard(future)
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None and self._error is None:
+            self._error = exc
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            exc, self._error = self._error, None
+            raise exc
 
 
 @register_sink("mllp_target")
@@ -46,4 +116,13 @@ def _factory(config: dict) -> Sink:
     target_name = config.get("target_name")
     if not isinstance(target_name, str) or not target_name.strip():
         raise ValueError("mllp_target sink requires target_name")
-    return MLLPTargetSink(name="mllp_target", target_name=target_name.strip())
+    return MLLPTargetSink(
+        name="mllp_target",
+        target_name=target_name.strip(),
+        pool_size=int(config.get("pool_size") or 2),
+        window=int(config.get("window") or 1),
+        connect_timeout=float(config.get("connect_timeout_secs") or 5.0),
+        ack_timeout=float(config.get("ack_timeout_secs") or 30.0),
+        max_idle_secs=float(config.get("max_idle_secs") or 60.0),
+        fail_on_nak=bool(config.get("fail_on_nak", False)),
+    )
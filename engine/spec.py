@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping, MutableMapping
+from typing import Any, Dict, Mapping, MutableMapping, Optional
 
 import yaml
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, root_validator, validator
 
 
 class ComponentSpec(BaseModel):
@@ -38,7 +38,59 @@ class RouterSpec(BaseModel):
 
     @validator("strategy")
     def _normalize_strategy(cls, value: str) -> str:
-        return value.strip().lower() or "broadcast"
+        return value.strip().lower().replace("_", "-") or "broadcast"
+
+
+EXECUTION_MODES = ("serial", "batched", "staged")
+ORDERING_POLICIES = ("strict", "unordered")
+
+
+class ExecutionSpec(BaseModel):
+    """Runtime tuning knobs controlling how messages flow through a pipeline."""
+
+    mode: str = Field("serial", description="Execution mode: serial, batched, or staged")
+    batch_size: int = Field(32, ge=1, description="Messages pulled per micro-batch")
+    max_in_flight: int = Field(8, ge=1, description="Concurrent operator/sink tasks")
+    ordering: str = Field("strict", description="Sink ordering policy: strict or unordered")
+    queue_size: int = Field(256, ge=1, description="Capacity of each staged queue")
+    high_water: Optional[int] = Field(
+        None, ge=1, description="Queue depth that pauses upstream producers"
+    )
+    low_water: Optional[int] = Field(
+        None, ge=0, description="Queue depth at which paused producers resume"
+    )
+
+    class Config:
+        extra = "ignore"
+
+    @validator("mode")
+    def _normalize_mode(cls, value: str) -> str:
+        normalized = value.strip().lower() or "serial"
+        if normalized not in EXECUTION_MODES:
+            raise ValueError(f"unknown execution mode {value!r}")
+        return normalized
+
+    @validator("ordering")
+    def _normalize_ordering(cls, value: str) -> str:
+        normalized = value.strip().lower() or "strict"
+        if normalized not in ORDERING_POLICIES:
+            raise ValueError(f"unknown ordering policy {value!r}")
+        return normalized
+
+    @root_validator(skip_on_failure=True)
+    def _resolve_watermarks(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        capacity = values["queue_size"]
+        high = values.get("high_water") or capacity
+        low = values.get("low_water")
+        if low is None:
+            low = high // 2
+        if high > capacity:
+            raise ValueError("high_water cannot exceed queue_size")
+        if low >= high:
+            raise ValueError("low_water must be below high_water")
+        values["high_water"] = high
+        values["low_water"] = low
+        return values
 
 
 class PipelineSpec(BaseModel):
@@ -50,6 +102,7 @@ class PipelineSpec(BaseModel):
     operators: list[ComponentSpec] = Field(default_factory=list)
     router: RouterSpec = Field(default_factory=RouterSpec)
     sinks: list[ComponentSpec] = Field(default_factory=list)
+    execution: ExecutionSpec = Field(default_factory=ExecutionSpec)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
     class Config:
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251120_job_heartbeats"
+down_revision = "20251112_failed_messages"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("engine_jobs", sa.Column("heartbeat_at", sa.DateTime, nullable=True))
+    op.add_column("engine_jobs", sa.Column("progress", sa.JSON, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("engine_jobs", "progress")
+    op.drop_column("engine_jobs", "heartbeat_at")
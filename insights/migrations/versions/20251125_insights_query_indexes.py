@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251125_insights_query_indexes"
+down_revision = "20251120_job_heartbeats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Anomaly/assist windows filter runs by pipeline and time; summaries sort by time.
+    op.create_index("ix_engine_runs_created", "engine_runs", ["created_at"])
+    op.create_index(
+        "ix_engine_runs_pipeline_created",
+        "engine_runs",
+        ["pipeline_name", "created_at"],
+    )
+    # Replay and per-run counts read messages of one run in id order.
+    op.create_index("ix_engine_messages_run", "engine_messages", ["run_id", "id"])
+    # Issue joins from messages: per-run severity counts and code/segment rollups.
+    op.create_index(
+        "ix_engine_issues_message_severity",
+        "engine_issues",
+        ["message_id", "severity"],
+    )
+    op.create_index(
+        "ix_engine_issues_message_code",
+        "engine_issues",
+        ["message_id", "code", "segment"],
+    )
+    # Reaper and expired-lease reclaim; list_jobs / lease queue ordering.
+    op.create_index(
+        "ix_engine_jobs_status_lease",
+        "engine_jobs",
+        ["status", "lease_expires_at"],
+    )
+    op.create_index(
+        "ix_engine_jobs_queue_order",
+        "engine_jobs",
+        ["status", sa.text("priority DESC"), "scheduled_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_engine_jobs_queue_order", table_name="engine_jobs")
+    op.drop_index("ix_engine_jobs_status_lease", table_name="engine_jobs")
+    op.drop_index("ix_engine_issues_message_code", table_name="engine_issues")
+    op.drop_index("ix_engine_issues_message_severity", table_name="engine_issues")
+    op.drop_index("ix_engine_messages_run", table_name="engine_messages")
+    op.drop_index("ix_engine_runs_pipeline_created", table_name="engine_runs")
+    op.drop_index("ix_engine_runs_created", table_name="engine_runs")
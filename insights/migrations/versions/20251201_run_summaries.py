@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251201_run_summaries"
+down_revision = "20251125_insights_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "engine_run_summaries",
+        sa.Column(
+            "run_id",
+            sa.Integer,
+            sa.ForeignKey("engine_runs.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("pipeline_name", sa.String(200), nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+        sa.Column("messages", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("issues", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("errors", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("warnings", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("passed", sa.Integer, nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime,
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.create_index(
+        "ix_engine_run_summaries_created", "engine_run_summaries", ["created_at"]
+    )
+    op.create_index(
+        "ix_engine_run_summaries_pipeline_created",
+        "engine_run_summaries",
+        ["pipeline_name", "created_at"],
+    )
+    # Backfill existing history so the rollup can be switched on immediately.
+    op.execute(
+        """
+        INSERT INTO engine_run_summaries
+            (run_id, pipeline_name, created_at, messages, issues, errors, warnings, passed,
+             updated_at)
+        SELECT r.id, r.pipeline_name, r.created_at,
+               COALESCE(m.messages, 0), COALESCE(i.issues, 0), COALESCE(i.errors, 0),
+               COALESCE(i.warnings, 0), COALESCE(i.passed, 0), CURRENT_TIMESTAMP
+        FROM engine_runs r
+        LEFT JOIN (
+            SELECT run_id, COUNT(id) AS messages FROM engine_messages GROUP BY run_id
+        ) m ON m.run_id = r.id
+        LEFT JOIN (
+            SELECT em.run_id AS run_id,
+                   COUNT(ei.id) AS issues,
+                   SUM(CASE WHEN ei.severity = 'error' THEN 1 ELSE 0 END) AS errors,
+                   SUM(CASE WHEN ei.severity = 'warning' THEN 1 ELSE 0 END) AS warnings,
+                   SUM(CASE WHEN ei.severity = 'passed' THEN 1 ELSE 0 END) AS passed
+            FROM engine_issues ei
+            JOIN engine_messages em ON em.id = ei.message_id
+            GROUP BY em.run_id
+        ) i ON i.run_id = r.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_engine_run_summaries_pipeline_created", table_name="engine_run_summaries"
+    )
+    op.drop_index("ix_engine_run_summaries_created", table_name="engine_run_summaries")
+    op.drop_table("engine_run_summaries")
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251205_payload_blobs"
+down_revision = "20251201_run_summaries"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "engine_payload_dictionaries",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("codec", sa.String(16), nullable=False),
+        sa.Column("data", sa.LargeBinary, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime,
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.create_table(
+        "engine_payload_blobs",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("digest", sa.String(64), nullable=False, unique=True),
+        sa.Column("codec", sa.String(16), nullable=False),
+        sa.Column(
+            "dictionary_id",
+            sa.Integer,
+            sa.ForeignKey("engine_payload_dictionaries.id"),
+            nullable=True,
+        ),
+        sa.Column("size", sa.Integer, nullable=False),
+        sa.Column("data", sa.LargeBinary, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime,
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    # SQLite cannot relax NOT NULL in place; batch mode rebuilds the table.
+    with op.batch_alter_table("engine_messages") as batch:
+        batch.add_column(sa.Column("payload_blob_id", sa.Integer, nullable=True))
+        batch.create_foreign_key(
+            "fk_engine_messages_payload_blob",
+            "engine_payload_blobs",
+            ["payload_blob_id"],
+            ["id"],
+        )
+        batch.alter_column("payload", existing_type=sa.Text, nullable=True)
+
+
+def downgrade() -> None:
+    # Messages must be converted back to base64 text (scripts/backfill_message_payloads.py
+    # --format base64) before downgrading, or their payloads are lost.
+    with op.batch_alter_table("engine_messages") as batch:
+        batch.drop_constraint("fk_engine_messages_payload_blob", type_="foreignkey")
+        batch.drop_column("payload_blob_id")
+        batch.alter_column("payload", existing_type=sa.Text, nullable=False)
+    op.drop_table("engine_payload_blobs")
+    op.drop_table("engine_payload_dictionaries")
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251210_job_checkpoints"
+down_revision = "20251205_payload_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("engine_jobs", sa.Column("checkpoint", sa.JSON, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("engine_jobs", "checkpoint")
@@ -5,7 +5,17 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import JSON, DateTime, ForeignKey, Integer, LargeBinary, String, Text, func
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -15,6 +25,10 @@ class Base(DeclarativeBase):
 
 class RunRecord(Base):
     __tablename__ = "engine_runs"
+    __table_args__ = (
+        Index("ix_engine_runs_created", "created_at"),
+        Index("ix_engine_runs_pipeline_created", "pipeline_name", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     pipeline_name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -23,22 +37,63 @@ class RunRecord(Base):
     messages: Mapped[list["MessageRecord"]] = relationship("MessageRecord", back_populates="run")
 
 
+class PayloadDictionaryRecord(Base):
+    """Shared compression dictionary for payload blobs (newest per codec is active)."""
+
+    __tablename__ = "engine_payload_dictionaries"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class PayloadBlobRecord(Base):
+    """Content-addressed message payload, shared by every message with that content."""
+
+    __tablename__ = "engine_payload_blobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    digest: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    dictionary_id: Mapped[int | None] = mapped_column(
+        ForeignKey("engine_payload_dictionaries.id"), nullable=True
+    )
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class MessageRecord(Base):
     __tablename__ = "engine_messages"
+    __table_args__ = (
+        Index("ix_engine_messages_run", "run_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     run_id: Mapped[int] = mapped_column(ForeignKey("engine_runs.id", ondelete="CASCADE"), nullable=False)
     message_id: Mapped[str] = mapped_column(String(255), nullable=False)
-    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    # Legacy base64 text; ``None`` when the payload lives in ``engine_payload_blobs``.
+    payload: Mapped[str | None] = mapped_column(Text, nullable=True)
+    payload_blob_id: Mapped[int | None] = mapped_column(
+        ForeignKey("engine_payload_blobs.id"), nullable=True
+    )
     meta: Mapped[dict[str, Any] | None] = mapped_column(JSON, default=None)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     run: Mapped[RunRecord] = relationship("RunRecord", back_populates="messages")
+    payload_blob: Mapped[PayloadBlobRecord | None] = relationship("PayloadBlobRecord")
     issues: Mapped[list["IssueRecord"]] = relationship("IssueRecord", back_populates="message")
 
 
 class IssueRecord(Base):
     __tablename__ = "engine_issues"
+    __table_args__ = (
+        Index("ix_engine_issues_severity", "severity"),
+        Index("ix_engine_issues_code", "code"),
+        Index("ix_engine_issues_message_severity", "message_id", "severity"),
+        Index("ix_engine_issues_message_code", "message_id", "code", "segment"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     message_id: Mapped[int] = mapped_column(ForeignKey("engine_messages.id", ondelete="CASCADE"), nullable=False)
@@ -54,6 +109,30 @@ class IssueRecord(Base):
     message: Mapped[MessageRecord] = relationship("MessageRecord", back_populates="issues")
 
 
+class RunSummaryRecord(Base):
+    """Per-run counters maintained as results are persisted (summary rollup)."""
+
+    __tablename__ = "engine_run_summaries"
+    __table_args__ = (
+        Index("ix_engine_run_summaries_created", "created_at"),
+        Index("ix_engine_run_summaries_pipeline_created", "pipeline_name", "created_at"),
+    )
+
+    run_id: Mapped[int] = mapped_column(
+        ForeignKey("engine_runs.id", ondelete="CASCADE"), primary_key=True
+    )
+    pipeline_name: Mapped[str] = mapped_column(String(200), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    messages: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    issues: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    errors: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    warnings: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    passed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+
 class EngineModuleProfile(Base):
     __tablename__ = "engine_module_profiles"
 
@@ -129,6 +208,11 @@ class PipelineRecord(Base):
 
 class JobRecord(Base):
     __tablename__ = "engine_jobs"
+    __table_args__ = (
+        Index("ix_engine_jobs_status_sched_prio", "status", "scheduled_at", "priority"),
+        Index("ix_engine_jobs_pipeline_status", "pipeline_id", "status"),
+        Index("ix_engine_jobs_status_lease", "status", "lease_expires_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -148,6 +232,10 @@ class JobRecord(Base):
     )
     leased_by: Mapped[str | None] = mapped_column(String(64))
     lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime)
+    progress: Mapped[dict[str, Any] | None] = mapped_column(JSON, default=None)
+    # Resume point for interrupted work (replay: output run id + last source id).
+    checkpoint: Mapped[dict[str, Any] | None] = mapped_column(JSON, default=None)
 
     run_id: Mapped[int | None] = mapped_column(
         ForeignKey("engine_runs.id"), nullable=True
@@ -167,6 +255,17 @@ class JobRecord(Base):
     run: Mapped["RunRecord"] = relationship("RunRecord")
 
 
+# Matches the list_jobs / lease ordering (priority descending) so queued jobs can
+# be read in queue order straight off the index.
+Index(
+    "ix_engine_jobs_queue_order",
+    JobRecord.status,
+    JobRecord.priority.desc(),
+    JobRecord.scheduled_at,
+    JobRecord.id,
+)
+
+
 class EndpointRecord(Base):
     __tablename__ = "engine_endpoints"
 
@@ -214,6 +313,9 @@ class AgentActionRecord(Base):
 
 class EndpointMessageRecord(Base):
     __tablename__ = "engine_endpoint_messages"
+    __table_args__ = (
+        Index("ix_engine_endpoint_messages_endpoint", "endpoint_id", "received_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     endpoint_id: Mapped[int] = mapped_column(
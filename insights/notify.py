@@ -0,0 +1,207 @@
+"""Wake-up channels that let job runners react to enqueues without polling."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_NOTIFY_DIR = Path("data") / "engine-notify"
+_WAKE = b"\x01"
+
+Unsubscribe = Callable[[], None]
+
+
+class JobNotifier(ABC):
+    """A channel that carries "jobs may be runnable" signals to runners."""
+
+    name: str
+
+    @abstractmethod
+    def notify(self) -> None:
+        """Signal waiting runners; must be cheap and never raise."""
+
+    @abstractmethod
+    async def subscribe(self, event: asyncio.Event) -> Unsubscribe:
+        """Set ``event`` on every notification until the callback is invoked."""
+
+
+class LocalNotifier(JobNotifier):
+    """Wake runners living in this process (e.g. next to ``MLLPServer``).
+
+    Producers may run on any thread or event loop, so wakeups are delivered via
+    ``call_soon_threadsafe`` on the subscriber's own loop.
+    """
+
+    name = "local"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waiters: dict[int, tuple[asyncio.AbstractEventLoop, asyncio.Event]] = {}
+
+    def notify(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters.values())
+        for loop, event in waiters:
+            if loop.is_closed():
+                continue
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # pragma: no cover - loop closed concurrently
+                continue
+
+    async def subscribe(self, event: asyncio.Event) -> Unsubscribe:
+        key = id(event)
+        with self._lock:
+            self._waiters[key] = (asyncio.get_running_loop(), event)
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                self._waiters.pop(key, None)
+
+        return _unsubscribe
+
+
+class _WakeProtocol(asyncio.DatagramProtocol):
+    def __init__(self, event: asyncio.Event) -> None:
+        self._event = event
+
+    def datagram_received(self, data: bytes, addr) -> None:  # type: ignore[override]
+        self._event.set()
+
+
+class SocketNotifier(JobNotifier):
+    """Fan wakeups out to runner processes over loopback UDP.
+
+    Each subscribed runner binds an ephemeral ``127.0.0.1`` port and advertises
+    it as a ``*.port`` file in ``directory``; producers send one datagram per
+    advertised port. Lost datagrams only cost latency because runners keep a
+    fallback poll.
+    """
+
+    name = "socket"
+
+    def __init__(self, directory: Path | str | None = None) -> None:
+        self.directory = Path(directory or _DEFAULT_NOTIFY_DIR)
+        self._lock = threading.Lock()
+        self._sock: socket.socket | None = None
+        self._ports: list[int] = []
+        self._listing_mtime: int | None = None
+
+    def notify(self) -> None:
+        try:
+            ports = self._advertised_ports()
+        except OSError:
+            return
+        if not ports:
+            return
+        with self._lock:
+            if self._sock is None:
+                self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._sock.setblocking(False)
+            for port in ports:
+                try:
+                    self._sock.sendto(_WAKE, ("127.0.0.1", port))
+                except OSError:
+                    continue
+
+    async def subscribe(self, event: asyncio.Event) -> Unsubscribe:
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _WakeProtocol(event), local_addr=("127.0.0.1", 0)
+        )
+        port = transport.get_extra_info("sockname")[1]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        marker = self.directory / f"{os.getpid()}-{port}.port"
+        marker.write_text(str(port), encoding="ascii")
+
+        def _unsubscribe() -> None:
+            transport.close()
+            try:
+                marker.unlink()
+            except FileNotFoundError:
+                pass
+
+        return _unsubscribe
+
+    def _advertised_ports(self) -> list[int]:
+        # The directory mtime changes whenever a runner (un)registers, so the
+        # listing is only re-read when the set of subscribers actually moved.
+        mtime = os.stat(self.directory).st_mtime_ns
+        with self._lock:
+            if mtime == self._listing_mtime:
+                return self._ports
+        ports: list[int] = []
+        for marker in self.directory.glob("*.port"):
+            try:
+                ports.append(int(marker.read_text(encoding="ascii").strip()))
+            except (OSError, ValueError):
+                continue
+        with self._lock:
+            self._ports = ports
+            self._listing_mtime = mtime
+        return ports
+
+    def close(self) -> None:
+        with self._lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+
+
+_LOCAL = LocalNotifier()
+_CHANNELS: list[JobNotifier] | None = None
+
+
+def _channels_from_env() -> list[JobNotifier]:
+    names = {
+        name.strip().lower()
+        for name in os.getenv("ENGINE_JOB_NOTIFY", "local").split(",")
+        if name.strip()
+    }
+    channels: list[JobNotifier] = []
+    if "none" in names:
+        return channels
+    channels.append(_LOCAL)
+    if "socket" in names:
+        channels.append(SocketNotifier(os.getenv("ENGINE_JOB_NOTIFY_DIR") or None))
+    return channels
+
+
+def get_channels() -> list[JobNotifier]:
+    """Return the configured channels (``ENGINE_JOB_NOTIFY=local,socket``)."""
+
+    global _CHANNELS
+    if _CHANNELS is None:
+        _CHANNELS = _channels_from_env()
+    return list(_CHANNELS)
+
+
+def set_channels(channels: list[JobNotifier] | None) -> None:
+    """Override the configured channels; ``None`` re-reads the environment."""
+
+    global _CHANNELS
+    _CHANNELS = list(channels) if channels is not None else None
+
+
+def has_remote_channel() -> bool:
+    """``True`` when some channel reaches runners in other processes."""
+
+    return any(not isinstance(channel, LocalNotifier) for channel in get_channels())
+
+
+def publish() -> None:
+    """Notify every configured channel that new jobs may be runnable."""
+
+    for channel in get_channels():
+        try:
+            channel.notify()
+        except Exception:  # pragma: no cover - wakeups are best effort
+            logger.debug("job.notify.failed", extra={"channel": channel.name}, exc_info=True)
@@ -0,0 +1,153 @@
+"""Binary payload codecs for ``MessageRecord`` storage.
+
+Payloads are stored once per distinct content (keyed by SHA-256) in
+``engine_payload_blobs``, either raw or compressed with zlib/zstd, optionally
+primed with a dictionary trained on HL7 traffic. ``base64`` keeps the legacy
+text column.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import zlib
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - zstd support is optional
+    zstandard = None  # type: ignore[assignment]
+
+PAYLOAD_FORMATS = ("base64", "raw", "zlib", "zstd")
+DEFAULT_DICTIONARY_SIZE = 32 * 1024
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 3
+_SEGMENT_SPLIT = re.compile(rb"[\r\n]+")
+
+
+def payload_format() -> str:
+    """Return the configured ``INSIGHTS_PAYLOAD_FORMAT`` (default ``base64``)."""
+
+    value = (os.getenv("INSIGHTS_PAYLOAD_FORMAT") or "base64").strip().lower()
+    if value not in PAYLOAD_FORMATS:
+        raise ValueError(
+            f"unsupported INSIGHTS_PAYLOAD_FORMAT {value!r}; expected one of {PAYLOAD_FORMATS}"
+        )
+    return value
+
+
+def _require_zstd() -> Any:
+    if zstandard is None:
+        raise RuntimeError("the zstd payload format requires the 'zstandard' package")
+    return zstandard
+
+
+def payload_digest(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    digest: str
+    codec: str
+    dictionary_id: int | None
+    size: int
+    data: bytes
+
+
+@dataclass
+class PayloadCodec:
+    """Encoder for one storage format and (optionally) one dictionary."""
+
+    codec: str
+    dictionary_id: int | None = None
+    dictionary: bytes | None = None
+    _zstd: Any = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.codec not in ("raw", "zlib", "zstd"):
+            raise ValueError(f"unsupported payload codec {self.codec!r}")
+        if self.codec == "zstd":
+            zstd = _require_zstd()
+            dict_data = zstd.ZstdCompressionDict(self.dictionary) if self.dictionary else None
+            self._zstd = zstd.ZstdCompressor(level=_ZSTD_LEVEL, dict_data=dict_data)
+
+    def encode(self, raw: bytes, *, digest: str | None = None) -> EncodedPayload:
+        if self.codec == "raw":
+            data = raw
+        elif self.codec == "zlib":
+            if self.dictionary:
+                compressor = zlib.compressobj(_ZLIB_LEVEL, zdict=self.dictionary)
+                data = compressor.compress(raw) + compressor.flush()
+            else:
+                data = zlib.compress(raw, _ZLIB_LEVEL)
+        else:
+            data = self._zstd.compress(raw)
+        dictionary_id = self.dictionary_id if self.dictionary and self.codec != "raw" else None
+        return EncodedPayload(
+            digest=digest or payload_digest(raw),
+            codec=self.codec,
+            dictionary_id=dictionary_id,
+            size=len(raw),
+            data=data,
+        )
+
+
+def decode_payload(codec: str, data: bytes, dictionary: bytes | None = None) -> bytes:
+    """Inverse of ``PayloadCodec.encode`` for a stored blob."""
+
+    if codec == "raw":
+        return bytes(data)
+    if codec == "zlib":
+        if dictionary:
+            decompressor = zlib.decompressobj(zdict=dictionary)
+            return decompressor.decompress(data) + decompressor.flush()
+        return zlib.decompress(data)
+    if codec == "zstd":
+        zstd = _require_zstd()
+        dict_data = zstd.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstd.ZstdDecompressor(dict_data=dict_data).decompress(data)
+    raise ValueError(f"unsupported payload codec {codec!r}")
+
+
+def train_dictionary(
+    samples: Iterable[bytes], *, codec: str, size: int = DEFAULT_DICTIONARY_SIZE
+) -> bytes:
+    """Build a shared compression dictionary from sample payloads.
+
+    zstd uses its own trainer. zlib only supports a preset dictionary, so the
+    most valuable recurring HL7 segments and segment headers are packed into
+    ``size`` bytes, most valuable last (zlib matches nearer bytes more cheaply).
+    """
+
+    corpus = [bytes(sample) for sample in samples if sample]
+    if not corpus:
+        raise ValueError("cannot train a payload dictionary without samples")
+    if codec == "zstd":
+        return _require_zstd().train_dictionary(size, corpus).as_bytes()
+    if codec != "zlib":
+        raise ValueError(f"dictionaries are only used by zlib/zstd, not {codec!r}")
+
+    scores: Counter[bytes] = Counter()
+    for sample in corpus:
+        for segment in _SEGMENT_SPLIT.split(sample):
+            if len(segment) < 4:
+                continue
+            scores[segment + b"\r"] += len(segment)
+            header = b"|".join(segment.split(b"|")[:4])
+            if header != segment:
+                scores[header + b"|"] += len(header)
+    chosen: list[bytes] = []
+    used = 0
+    for token, score in scores.most_common():
+        if score <= len(token):  # seen once: no benefit over the message itself
+            continue
+        if used + len(token) > size:
+            continue
+        chosen.append(token)
+        used += len(token)
+    return b"".join(reversed(chosen))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""Rewrite stored message payloads into a different storage format.
+
+Legacy rows keep their payload as base64 text in ``engine_messages.payload``.
+This moves them into content-addressed ``engine_payload_blobs`` (raw, zlib or
+zstd), optionally training a shared dictionary from a sample first. Work is
+done in keyset batches by message id, one transaction per batch, so the tool
+can be interrupted and re-run. ``--format base64`` converts blob rows back to
+inline text (required before downgrading the ``20251205_payload_blobs``
+migration).
+
+    python scripts/backfill_message_payloads.py --format zlib --train-dictionary 2000
+    python scripts/backfill_message_payloads.py --format raw --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _sample_payloads(store, limit: int) -> list[bytes]:
+    from sqlalchemy import select
+
+    from engine.adapters.replay import _try_b64_decode
+    from insights.models import MessageRecord
+
+    with store.session() as session:
+        rows = session.scalars(
+            select(MessageRecord.payload)
+            .where(MessageRecord.payload_blob_id.is_(None), MessageRecord.payload.is_not(None))
+            .order_by(MessageRecord.id.desc())
+            .limit(limit)
+        )
+        return [_try_b64_decode(text) for text in rows]
+
+
+def _to_blobs(store, *, batch: int, dry_run: bool) -> dict:
+    from sqlalchemy import select, update
+
+    from engine.adapters.replay import _try_b64_decode
+    from insights.models import MessageRecord
+
+    stats = {"messages": 0, "bytes_before": 0}
+    last_id = 0
+    while True:
+        with store.session() as session:
+            rows = session.execute(
+                select(MessageRecord.id, MessageRecord.payload)
+                .where(MessageRecord.payload_blob_id.is_(None), MessageRecord.id > last_id)
+                .order_by(MessageRecord.id.asc())
+                .limit(batch)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            raws = [_try_b64_decode(row.payload or "") for row in rows]
+            stats["messages"] += len(rows)
+            stats["bytes_before"] += sum(len(row.payload or "") for row in rows)
+            if dry_run:
+                continue
+            blob_ids = store.store_payload_blobs(session, raws)
+            session.execute(
+                update(MessageRecord),
+                [
+                    {"id": row.id, "payload": None, "payload_blob_id": blob_id}
+                    for row, blob_id in zip(rows, blob_ids)
+                ],
+            )
+    return stats
+
+
+def _to_base64(store, *, batch: int, dry_run: bool) -> dict:
+    from sqlalchemy import select, update
+
+    from insights.models import MessageRecord, PayloadBlobRecord
+    from insights.store import _encode_payload
+
+    stats = {"messages": 0}
+    last_id = 0
+    while True:
+        with store.session() as session:
+            rows = session.execute(
+                select(MessageRecord.id, PayloadBlobRecord)
+                .join(PayloadBlobRecord, MessageRecord.payload_blob_id == PayloadBlobRecord.id)
+                .where(MessageRecord.id > last_id)
+                .order_by(MessageRecord.id.asc())
+                .limit(batch)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            stats["messages"] += len(rows)
+            if dry_run:
+                continue
+            session.execute(
+                update(MessageRecord),
+                [
+                    {
+                        "id": message_id,
+                        "payload": _encode_payload(store.decode_payload_blob(session, blob)),
+                        "payload_blob_id": None,
+                    }
+                    for message_id, blob in rows
+                ],
+            )
+    return stats
+
+
+def backfill(
+    store,
+    *,
+    fmt: str,
+    batch: int = 500,
+    train_dictionary: int = 0,
+    dry_run: bool = False,
+) -> dict:
+    """Convert every message payload in ``store`` to ``fmt``; return counters."""
+
+    from insights import payloads
+
+    if fmt not in payloads.PAYLOAD_FORMATS:
+        raise ValueError(f"unsupported payload format {fmt!r}")
+    batch = max(1, batch)
+    if fmt == "base64":
+        return {"format": fmt, "dry_run": dry_run, **_to_base64(store, batch=batch, dry_run=dry_run)}
+
+    stats: dict = {"format": fmt, "dry_run": dry_run, "dictionary_id": None}
+    if train_dictionary and fmt in ("zlib", "zstd"):
+        samples = _sample_payloads(store, train_dictionary)
+        if samples and not dry_run:
+            data = payloads.train_dictionary(samples, codec=fmt)
+            stats["dictionary_id"] = store.save_payload_dictionary(codec=fmt, data=data).id
+    store.payload_format = fmt
+    store._payload_codec = None
+    stats.update(_to_blobs(store, batch=batch, dry_run=dry_run))
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", required=True, choices=("base64", "raw", "zlib", "zstd"))
+    parser.add_argument("--batch", type=int, default=500, help="messages per transaction")
+    parser.add_argument(
+        "--train-dictionary",
+        type=int,
+        default=0,
+        metavar="N",
+        help="train a zlib/zstd dictionary from the N newest legacy payloads first",
+    )
+    parser.add_argument("--url", help="database URL (defaults to INSIGHTS_DB_URL)")
+    parser.add_argument("--dry-run", action="store_true", help="count rows without writing")
+    parser.add_argument("--json", type=Path, help="write counters to this JSON file")
+    args = parser.parse_args(argv)
+
+    import engine.runtime  # noqa: F401  # resolve engine <-> insights import order
+    from insights.store import InsightsStore
+
+    store = InsightsStore.from_env(url=args.url)
+    stats = backfill(
+        store,
+        fmt=args.format,
+        batch=args.batch,
+        train_dictionary=args.train_dictionary,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(stats))
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(stats, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,430 @@
+#!/usr/bin/env python
+"""Cross-platform benchmark suite for ``tools/hl7_qa.py``.
+
+``generate`` writes a deterministic synthetic corpus (ADT^A01 / ORU^R01 /
+ORM^O01 mix, configurable OBR/OBX counts, field repetitions and defect rate).
+``run`` validates it with each engine at every ``--workers`` x ``--chunk``
+setting, one child process per run, and reports msgs/sec, peak RSS (largest
+process, workers included) and p50/p99 per-message latency (measured serially
+on a sample). With ``--baseline`` the results are compared against a stored
+baseline and the exit code is 1 when any metric regresses past the baseline's
+thresholds. ``--update-baseline`` rewrites the baseline from this run.
+
+    python scripts/bench_hl7_qa.py generate --messages 100000 --out corpus.hl7
+    python scripts/bench_hl7_qa.py run --messages 20000 --workers 0,2 --chunk 500
+    python scripts/bench_hl7_qa.py run --baseline config/bench/hl7_qa_baseline.json
+    python scripts/bench_hl7_qa.py run --baseline my_node.json --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+try:
+    import psutil  # type: ignore
+except ImportError:  # pragma: no cover
+    psutil = None  # type: ignore[assignment]
+
+DEFAULT_RULES = ROOT / "tests" / "hl7" / "rules" / "rules.yaml"
+DEFAULT_BASELINE = ROOT / "config" / "bench" / "hl7_qa_baseline.json"
+DEFAULT_THRESHOLDS = {
+    "msgs_per_sec_drop_pct": 20.0,
+    "p50_ms_rise_pct": 30.0,
+    "p99_ms_rise_pct": 50.0,
+    "peak_rss_mb_rise_pct": 25.0,
+}
+# metric -> (threshold key, True when larger values are better)
+_METRICS = {
+    "msgs_per_sec": ("msgs_per_sec_drop_pct", True),
+    "p50_ms": ("p50_ms_rise_pct", False),
+    "p99_ms": ("p99_ms_rise_pct", False),
+    "peak_rss_mb": ("peak_rss_mb_rise_pct", False),
+}
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus
+# ---------------------------------------------------------------------------
+
+_LAST = ("SMITH", "JONES", "GARCIA", "NGUYEN", "PATEL", "MILLER", "DAVIS", "LOPEZ")
+_FIRST = ("ANA", "JOHN", "MARIA", "WEI", "OMAR", "LINDA", "RAJ", "ELENA")
+_TESTS = (
+    ("718-7", "Hemoglobin", "NM", "g/dL", "12.0-16.0"),
+    ("2345-7", "Glucose", "NM", "mg/dL", "70-99"),
+    ("6690-2", "WBC", "NM", "10*3/uL", "4.0-11.0"),
+    ("883-9", "ABO group", "CWE", "", ""),
+    ("8310-5", "Body temperature", "NM", "Cel", "36.1-37.2"),
+    ("11502-2", "Lab report", "TX", "", ""),
+)
+
+
+def parse_mix(spec: str) -> list[tuple[str, float]]:
+    """``"ADT=0.3,ORU=0.5,ORM=0.2"`` -> normalized weights."""
+
+    pairs = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        kind, _, weight = item.partition("=")
+        kind = kind.strip().upper()
+        if kind not in ("ADT", "ORU", "ORM"):
+            raise ValueError(f"unknown message type in mix: {kind}")
+        pairs.append((kind, float(weight or 1)))
+    total = sum(weight for _, weight in pairs)
+    if not pairs or total <= 0:
+        raise ValueError(f"empty message mix: {spec!r}")
+    return [(kind, weight / total) for kind, weight in pairs]
+
+
+class CorpusGenerator:
+    """Deterministic HL7 v2 message factory; same seed, same bytes."""
+
+    def __init__(
+        self,
+        *,
+        seed: int = 1,
+        mix: str = "ADT=0.3,ORU=0.5,ORM=0.2",
+        obr: int = 1,
+        obx: int = 5,
+        repeats: int = 1,
+        defect_rate: float = 0.05,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.mix = parse_mix(mix)
+        self.obr = max(obr, 1)
+        self.obx = max(obx, 0)
+        self.repeats = max(repeats, 1)
+        self.defect_rate = defect_rate
+
+    def _ts(self, length: int = 14) -> str:
+        rng = self.rng
+        stamp = (
+            f"{rng.randint(2015, 2025):04d}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+            f"{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}{rng.randint(0, 59):02d}"
+        )
+        return stamp[:length]
+
+    def _pid(self, seq: int, defect: bool) -> str:
+        rng = self.rng
+        ids = "~".join(f"{seq * 10 + rep:09d}^^^HOSP^MR" for rep in range(self.repeats))
+        sex = "" if defect and rng.random() < 0.5 else rng.choice("MF")
+        name = f"{rng.choice(_LAST)}^{rng.choice(_FIRST)}"
+        return f"PID|1||{ids}||{name}||{self._ts(8)}|{sex}|||{rng.randint(1, 999)} MAIN ST^^CITY^ST^{rng.randint(10000, 99999)}"
+
+    def _pv1(self) -> str:
+        return f"PV1|1|{self.rng.choice('IOE')}|WARD^{self.rng.randint(100, 499)}^1||||1234^ATTEND^DOC"
+
+    def _obr(self, set_id: int, seq: int, defect: bool) -> str:
+        ts = self._ts(10 if defect and self.rng.random() < 0.5 else 14)
+        return f"OBR|{set_id}|PL{seq:08d}|FL{seq:08d}|CBC^Complete blood count^LN|||{ts}|||||||{self._ts()}||||||||{self._ts()}|||F"
+
+    def _obx(self, set_id: int, defect: bool) -> str:
+        code, label, kind, units, ref = self.rng.choice(_TESTS)
+        if kind == "NM":
+            value = "HIGH" if defect and self.rng.random() < 0.3 else f"{self.rng.uniform(1, 300):.1f}"
+        elif kind == "CWE":
+            value = f"{self.rng.choice('ABO')}^{self.rng.choice('ABO')} group^LN"
+        else:
+            value = "Within normal limits"
+        return f"OBX|{set_id}|{kind}|{code}^{label}^LN||{value}|{units}|{ref}|N|||F|||{self._ts()}"
+
+    def message(self, seq: int) -> bytes:
+        rng = self.rng
+        roll, kind = rng.random(), self.mix[-1][0]
+        for name, weight in self.mix:
+            if roll < weight:
+                kind = name
+                break
+            roll -= weight
+        defect = rng.random() < self.defect_rate
+        event = {"ADT": "ADT^A01", "ORU": "ORU^R01", "ORM": "ORM^O01"}[kind]
+        segs = [f"MSH|^~\\&|SENDER|HOSP|QA|HOSP|{self._ts()}||{event}|MSG{seq:010d}|P|2.5.1"]
+        if kind == "ADT":
+            segs += [f"EVN|A01|{self._ts()}", self._pid(seq, defect), self._pv1()]
+        elif kind == "ORU":
+            segs += [self._pid(seq, defect), self._pv1()]
+            for group in range(1, self.obr + 1):
+                segs.append(self._obr(group, seq, defect))
+                segs += [self._obx(idx, defect) for idx in range(1, self.obx + 1)]
+        else:
+            segs += [self._pid(seq, defect), self._pv1(), f"ORC|NW|PL{seq:08d}||||||||{self._ts()}"]
+            segs += [self._obr(group, seq, defect) for group in range(1, self.obr + 1)]
+        return ("\r".join(segs) + "\r").encode("ascii")
+
+
+def generate_corpus(path: Path, messages: int, **options) -> int:
+    """Write ``messages`` synthetic messages to ``path``; return bytes written."""
+
+    gen = CorpusGenerator(**options)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, "wb", buffering=1024 * 1024) as fh:
+        for start in range(0, messages, 1000):
+            block = b"".join(gen.message(seq) for seq in range(start, min(start + 1000, messages)))
+            fh.write(block)
+            written += len(block)
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Child processes (one per measurement, so peak RSS is per run)
+# ---------------------------------------------------------------------------
+
+def _peak_rss_mb() -> float | None:
+    if resource is not None:
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        workers = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return max(own, workers) / scale
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    return None
+
+
+def _child_cli(argv: list[str]) -> dict:
+    from tools import hl7_qa
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        code = hl7_qa.main(argv)
+    return {"exit": code, "secs": time.perf_counter() - started, "peak_rss_mb": _peak_rss_mb()}
+
+
+def _engine_mode(engine: str) -> tuple[str, str]:
+    """Split a suite engine name such as ``hl7apy-lazy`` into (--engine, --hl7apy-parse)."""
+    name, _, mode = engine.partition("-")
+    return name, mode or "full"
+
+
+def _child_latency(corpus: str, rules: str, engine: str, sample: int) -> dict:
+    from tools.hl7_qa import RulePlan, RuleSet, ValidationContext, configure_hl7apy_logging, iter_messages, validate_message
+
+    configure_hl7apy_logging(quiet=True)
+    plan = RulePlan.compile(RuleSet.load(rules))
+    name, mode = _engine_mode(engine)
+    ctx = ValidationContext(quiet_parse=True, hl7apy_validation="none", engine_pref=name, hl7apy_parse=mode)
+    timings = []
+    clock = time.perf_counter_ns
+    for raw in iter_messages(corpus):
+        if len(timings) >= sample:
+            break
+        started = clock()
+        validate_message(raw, plan, max_errors_per_msg=50, ctx=ctx)
+        timings.append(clock() - started)
+    timings.sort()
+    if not timings:
+        return {"p50_ms": None, "p99_ms": None}
+    pick = lambda q: timings[min(int(q * len(timings)), len(timings) - 1)] / 1e6  # noqa: E731
+    return {"p50_ms": round(pick(0.50), 4), "p99_ms": round(pick(0.99), 4), "sampled": len(timings)}
+
+
+def _spawn(args: list[str]) -> dict:
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "_child", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=str(ROOT),
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# ---------------------------------------------------------------------------
+# Runs and baseline comparison
+# ---------------------------------------------------------------------------
+
+def _split(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def run_key(result: dict) -> str:
+    return f"{result['engine']}/n{result['messages']}/w{result['workers']}/c{result['chunk']}"
+
+
+def run_suite(args: argparse.Namespace, corpus: Path) -> list[dict]:
+    results = []
+    latency: dict[str, dict] = {}
+    for engine in _split(args.engines):
+        messages = args.messages if engine == "fast" else min(args.messages, args.hl7apy_messages)
+        if engine not in latency:
+            latency[engine] = _spawn(["latency", str(corpus), str(args.rules), engine, str(min(args.latency_sample, messages))])
+        for workers in _split(args.workers):
+            for chunk in _split(args.chunk):
+                with tempfile.TemporaryDirectory() as tmp:
+                    argv = [
+                        str(corpus), "--rules", str(args.rules),
+                        "--engine", _engine_mode(engine)[0], "--hl7apy-parse", _engine_mode(engine)[1],
+                        "--workers", workers, "--chunk", chunk, "--limit", str(messages),
+                        "--max-print", "0", "--report", str(Path(tmp) / "report.csv"),
+                    ]
+                    if args.stream:
+                        argv.append("--stream")
+                    if args.shared_input:
+                        argv.append("--shared-input")
+                    run = _spawn(["cli", *argv])
+                if run["exit"] != 0:
+                    raise SystemExit(f"hl7_qa exited with {run['exit']} for {engine} workers={workers} chunk={chunk}")
+                result = {
+                    "engine": engine,
+                    "messages": messages,
+                    "workers": workers,
+                    "chunk": int(chunk),
+                    "secs": round(run["secs"], 3),
+                    "msgs_per_sec": round(messages / run["secs"], 1) if run["secs"] else 0.0,
+                    "peak_rss_mb": None if run["peak_rss_mb"] is None else round(run["peak_rss_mb"], 1),
+                    "p50_ms": latency[engine]["p50_ms"],
+                    "p99_ms": latency[engine]["p99_ms"],
+                }
+                results.append(result)
+                print(
+                    f"{engine:>11} n={messages:<8} workers={workers:<4} chunk={chunk:<5} "
+                    f"msgs/s={result['msgs_per_sec']:<9} p50={result['p50_ms']}ms p99={result['p99_ms']}ms "
+                    f"peak_rss={result['peak_rss_mb']}MiB"
+                )
+    return results
+
+
+def compare(results: list[dict], baseline: dict) -> list[str]:
+    """Return one message per metric that regressed past its threshold."""
+
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {})}
+    reference = baseline.get("results", {})
+    failures = []
+    for result in results:
+        base = reference.get(run_key(result))
+        if not base:
+            continue
+        for metric, (limit_key, higher_is_better) in _METRICS.items():
+            now, before = result.get(metric), base.get(metric)
+            if now is None or not before:
+                continue
+            change = (now - before) / before * 100
+            worse = -change if higher_is_better else change
+            if worse > thresholds[limit_key]:
+                failures.append(
+                    f"{run_key(result)} {metric}: {before} -> {now} "
+                    f"({worse:+.1f}% worse, limit {thresholds[limit_key]}%)"
+                )
+    return failures
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _cmd_generate(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    size = generate_corpus(
+        args.out, args.messages, seed=args.seed, mix=args.mix, obr=args.obr,
+        obx=args.obx, repeats=args.repeats, defect_rate=args.defect_rate,
+    )
+    print(f"[corpus] {args.messages} msgs, {size / 1e6:.1f} MB -> {args.out} ({time.perf_counter() - started:.1f}s)")
+    return 0
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = Path(tmp) / "corpus.hl7"
+            generate_corpus(
+                corpus, args.messages, seed=args.seed, mix=args.mix, obr=args.obr,
+                obx=args.obx, repeats=args.repeats, defect_rate=args.defect_rate,
+            )
+        results = run_suite(args, corpus)
+
+    report = {"environment": _environment(), "results": results}
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.baseline is None:
+        return 0
+    if args.update_baseline:
+        previous = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        stored = {
+            "thresholds": previous.get("thresholds", DEFAULT_THRESHOLDS),
+            "environment": report["environment"],
+            "results": {run_key(result): result for result in results},
+        }
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(stored, indent=2) + "\n", encoding="utf-8")
+        print(f"[baseline] wrote {args.baseline}")
+        return 0
+    failures = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+    for failure in failures:
+        print(f"[regression] {failure}")
+    print(f"[baseline] {len(failures)} regression(s) against {args.baseline}")
+    return 1 if failures else 0
+
+
+def _add_corpus_options(parser: argparse.ArgumentParser, messages: int) -> None:
+    parser.add_argument("--messages", type=int, default=messages)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mix", default="ADT=0.3,ORU=0.5,ORM=0.2", help="message type weights")
+    parser.add_argument("--obr", type=int, default=1, help="OBR groups per ORU/ORM")
+    parser.add_argument("--obx", type=int, default=5, help="OBX segments per OBR in ORU")
+    parser.add_argument("--repeats", type=int, default=1, help="PID-3 repetitions")
+    parser.add_argument("--defect-rate", type=float, default=0.05, help="share of messages with rule violations")
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["_child"]:
+        kind, rest = argv[1], argv[2:]
+        result = _child_cli(rest) if kind == "cli" else _child_latency(rest[0], rest[1], rest[2], int(rest[3]))
+        print(json.dumps(result))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="write a synthetic corpus")
+    _add_corpus_options(gen, 100_000)
+    gen.add_argument("--out", type=Path, required=True)
+
+    run = sub.add_parser("run", help="run the benchmark matrix")
+    _add_corpus_options(run, 20_000)
+    run.add_argument("--corpus", type=Path, help="existing corpus (default: generate one)")
+    run.add_argument("--rules", type=Path, default=DEFAULT_RULES)
+    run.add_argument("--engines", default="fast,hl7apy", help="comma-separated: fast, hl7apy, hl7apy-lazy")
+    run.add_argument("--workers", default="0,2", help="comma-separated --workers values")
+    run.add_argument("--chunk", default="500", help="comma-separated --chunk values")
+    run.add_argument("--hl7apy-messages", type=int, default=1000, help="cap for the (slow) hl7apy engine")
+    run.add_argument("--latency-sample", type=int, default=5000, help="messages timed for p50/p99")
+    run.add_argument("--stream", action="store_true", help="pass --stream to hl7_qa")
+    run.add_argument("--shared-input", action="store_true", help="pass --shared-input to hl7_qa")
+    run.add_argument("--json", type=Path, help="write results to this JSON file")
+    run.add_argument("--baseline", type=Path, help=f"baseline JSON to compare against (e.g. {DEFAULT_BASELINE.relative_to(ROOT)})")
+    run.add_argument("--update-baseline", action="store_true", help="store this run as the baseline instead")
+
+    args = parser.parse_args(argv)
+    return _cmd_generate(args) if args.command == "generate" else _cmd_run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
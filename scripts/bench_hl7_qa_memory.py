@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""Peak-memory benchmark for ``tools/hl7_qa.py`` input handling.
+
+Writes synthetic HL7 files of ``--sizes-mb`` megabytes and splits each one,
+in a fresh child process per run, with:
+
+* ``whole``  - ``fast_split_messages(read_file_bytes(path))`` (default CLI path)
+* ``mmap``   - ``iter_messages(path)`` over a memory map (``--stream``)
+* ``window`` - ``iter_messages(path, use_mmap=False)`` (``--stream --no-mmap``)
+
+Peak RSS comes from ``resource.getrusage`` (or ``psutil`` where ``resource``
+is unavailable). Streaming modes should stay flat as the file grows.
+
+    python scripts/bench_hl7_qa_memory.py
+    python scripts/bench_hl7_qa_memory.py --sizes-mb 64,512 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+try:
+    import psutil  # type: ignore
+except ImportError:  # pragma: no cover
+    psutil = None  # type: ignore[assignment]
+
+MODES = ("whole", "mmap", "window")
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    return None
+
+
+def write_corpus(path: Path, size_mb: float) -> int:
+    message = (
+        b"MSH|^~\\&|LAB|HOSP|EHR|HOSP|20240101120000||ORU^R01|CTRL%08d|P|2.5.1\r\n"
+        b"PID|1||12345^^^HOSP^MR||DOE^JANE||19800101|F\r\n"
+        b"OBR|1||ORD1|CBC^Complete blood count\r\n"
+        + b"OBX|1|NM|WBC^White cells||7.1|10*3/uL|4.0-11.0|N|||F\r\n" * 8
+    )
+    target = int(size_mb * 1024 * 1024)
+    count = written = 0
+    with open(path, "wb", buffering=1024 * 1024) as fh:
+        while written < target:
+            block = b"".join(message % (count + idx) for idx in range(1000))
+            fh.write(block)
+            written += len(block)
+            count += 1000
+    return count
+
+
+def _child(mode: str, path: str) -> None:
+    from tools.hl7_qa import fast_split_messages, iter_messages, read_file_bytes
+
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    if mode == "whole":
+        messages = sum(1 for _ in fast_split_messages(read_file_bytes(path)))
+    else:
+        messages = sum(1 for _ in iter_messages(path, use_mmap=mode == "mmap"))
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"messages": messages, "secs": elapsed, "baseline_mb": baseline, "peak_mb": _peak_rss_mb()}))
+
+
+def run_mode(mode: str, path: Path) -> dict:
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--child", mode, str(path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mb", default="16,64,256", help="corpus sizes in MiB")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--dir", type=Path, help="where to write corpora (default: a temp dir)")
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(*args.child)
+        return 0
+
+    sizes = [float(value) for value in args.sizes_mb.split(",") if value.strip()]
+    modes = [value.strip() for value in args.modes.split(",") if value.strip()]
+    results = []
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for size_mb in sizes:
+            path = Path(tmp) / f"corpus_{size_mb:g}mb.hl7"
+            expected = write_corpus(path, size_mb)
+            for mode in modes:
+                result = run_mode(mode, path)
+                result.update({"mode": mode, "size_mb": size_mb, "expected": expected})
+                results.append(result)
+                peak = result["peak_mb"]
+                growth = peak - result["baseline_mb"] if peak is not None else None
+                print(
+                    f"{mode:>6} size={size_mb:<6g}MiB msgs={result['messages']:<8} "
+                    f"peak_rss={peak if peak is None else round(peak, 1)}MiB "
+                    f"growth={growth if growth is None else round(growth, 1)}MiB "
+                    f"secs={round(result['secs'], 3)}"
+                )
+            path.unlink()
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 1 if any(result["messages"] != result["expected"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""Contention benchmark for ``InsightsStore.lease_jobs``.
+
+Seeds a queue of jobs, then drains it with 1, 4, and 16 competing runner
+processes sharing one database. Reports throughput, per-lease latency, lock
+errors, and verifies that no job was leased twice.
+
+    python scripts/bench_job_leasing.py --jobs 2000 --runners 1,4,16
+    python scripts/bench_job_leasing.py --strategy fallback --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+PIPELINE_YAML = "version: 1\nname: bench\nadapter:\n  type: sequence\n"
+
+
+def _open_store(url: str):
+    import engine.runtime  # noqa: F401  # resolve engine <-> insights import order
+    from insights.store import InsightsStore
+
+    return InsightsStore.from_env(url=url)
+
+
+def _seed(url: str, jobs: int) -> None:
+    store = _open_store(url)
+    if store.url.startswith("sqlite"):
+        with store.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    pipeline = store.save_pipeline(name="bench", yaml=PIPELINE_YAML, spec={})
+    for idx in range(jobs):
+        store.enqueue_job(pipeline_id=pipeline.id, priority=idx % 3)
+    store.engine.dispose()
+
+
+def _runner(url: str, worker_id: str, strategy: str, batch: int, barrier, out) -> None:
+    from sqlalchemy.exc import OperationalError
+
+    store = _open_store(url)
+    lease = {
+        "auto": store.lease_jobs,
+        "returning": store._lease_jobs_returning,
+        "fallback": store._lease_jobs_fallback,
+    }[strategy]
+    leased_ids: list[int] = []
+    latencies: list[float] = []
+    lock_errors = 0
+    empty_polls = 0
+    barrier.wait()
+    while empty_polls < 3:
+        started = time.perf_counter()
+        try:
+            jobs = lease(
+                worker_id=worker_id, now=datetime.utcnow(), lease_ttl_secs=300, limit=batch
+            )
+        except OperationalError:
+            lock_errors += 1
+            time.sleep(0.001)
+            continue
+        latencies.append(time.perf_counter() - started)
+        if not jobs:
+            empty_polls += 1
+            continue
+        empty_polls = 0
+        leased_ids.extend(job.id for job in jobs)
+    out.put({"ids": leased_ids, "latencies": latencies, "lock_errors": lock_errors})
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(*, runners: int, jobs: int, batch: int, strategy: str, workdir: Path) -> dict:
+    url = f"sqlite:///{workdir / f'lease_{strategy}_{runners}.db'}"
+    _seed(url, jobs)
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(runners + 1)
+    out = ctx.Queue()
+    procs = [
+        ctx.Process(target=_runner, args=(url, f"bench-{idx}", strategy, batch, barrier, out))
+        for idx in range(runners)
+    ]
+    for proc in procs:
+        proc.start()
+    barrier.wait()
+    started = time.perf_counter()
+    reports = [out.get() for _ in procs]
+    elapsed = time.perf_counter() - started
+    for proc in procs:
+        proc.join()
+
+    ids = [job_id for report in reports for job_id in report["ids"]]
+    latencies = [value for report in reports for value in report["latencies"]]
+    return {
+        "strategy": strategy,
+        "runners": runners,
+        "jobs": jobs,
+        "leased": len(ids),
+        "duplicates": len(ids) - len(set(ids)),
+        "elapsed_secs": round(elapsed, 4),
+        "jobs_per_sec": round(len(ids) / elapsed, 1) if elapsed else 0.0,
+        "lease_p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "lease_p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "lease_mean_ms": round(statistics.mean(latencies) * 1000, 3) if latencies else 0.0,
+        "lock_errors": sum(report["lock_errors"] for report in reports),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=8, help="lease limit per call")
+    parser.add_argument("--runners", default="1,4,16", help="comma-separated runner counts")
+    parser.add_argument(
+        "--strategy", choices=("auto", "returning", "fallback"), default="auto"
+    )
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    counts = [int(value) for value in args.runners.split(",") if value.strip()]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="lease-bench-") as tmp:
+        for runners in counts:
+            result = run_scenario(
+                runners=runners,
+                jobs=args.jobs,
+                batch=args.batch,
+                strategy=args.strategy,
+                workdir=Path(tmp),
+            )
+            results.append(result)
+            print(
+                f"{result['strategy']:>9} runners={runners:<3} "
+                f"jobs/s={result['jobs_per_sec']:<9} "
+                f"p50={result['lease_p50_ms']}ms p99={result['lease_p99_ms']}ms "
+                f"lock_errors={result['lock_errors']} duplicates={result['duplicates']}"
+            )
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 1 if any(result["duplicates"] or result["leased"] != result["jobs"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""Enqueue-to-start latency benchmark for ``EngineRunner`` wakeups.
+
+Enqueues jobs one at a time at a fixed interval while a single idle runner
+drains them, and reports how long each job waited between ``enqueue_job``
+returning and ``start_job`` being called. Channels:
+
+* ``poll``   - notifications disabled; runner in another process (old behaviour)
+* ``local``  - in-process notifier; runner on a thread next to the producer
+* ``socket`` - loopback UDP notifier; runner in another process
+
+    python scripts/bench_job_wakeup.py --jobs 50 --interval 0.2
+    python scripts/bench_job_wakeup.py --channels socket --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+PIPELINE_YAML = "version: 1\nname: bench\nadapter:\n  type: sequence\n"
+
+
+def _configure(channel: str, notify_dir: str) -> None:
+    import engine.runtime  # noqa: F401  # resolve engine <-> insights import order
+    from insights import notify
+
+    if channel == "poll":
+        notify.set_channels([])
+    elif channel == "local":
+        notify.set_channels([notify.LocalNotifier()])
+    else:
+        notify.set_channels([notify.LocalNotifier(), notify.SocketNotifier(notify_dir)])
+
+
+def _runner(url: str, channel: str, notify_dir: str, jobs: int, poll: float, ready, out) -> None:
+    _configure(channel, notify_dir)
+    from engine.runner import EngineRunner
+    from insights.store import InsightsStore
+
+    store = InsightsStore.from_env(url=url)
+    latencies: list[float] = []
+    runner = EngineRunner(store=store, concurrency=1, poll_interval=poll)
+    start_job = store.start_job
+
+    def _timed_start(job_id, worker_id, now):
+        job = start_job(job_id, worker_id, now=now)
+        if job is not None:
+            latencies.append(time.time() - float(job.payload["enqueued_at"]))
+        return job
+
+    store.start_job = _timed_start  # type: ignore[method-assign]
+
+    async def _drain() -> None:
+        task = asyncio.create_task(runner.run_forever())
+        await asyncio.sleep(0.2)  # subscribe to channels and go idle
+        ready.set()
+        while len(latencies) < jobs:
+            await asyncio.sleep(0.01)
+        await runner.stop()
+        await task
+
+    asyncio.run(_drain())
+    out.put(latencies)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(*, channel: str, jobs: int, interval: float, poll: float, workdir: Path) -> dict:
+    url = f"sqlite:///{workdir / f'wakeup_{channel}.db'}"
+    notify_dir = str(workdir / f"notify_{channel}")
+    _configure(channel, notify_dir)
+    from insights.store import InsightsStore
+
+    store = InsightsStore.from_env(url=url)
+    pipeline = store.save_pipeline(name="bench", yaml=PIPELINE_YAML, spec={})
+
+    if channel == "local":
+        import queue
+
+        ready, out = threading.Event(), queue.Queue()
+        worker = threading.Thread(
+            target=_runner, args=(url, channel, notify_dir, jobs, poll, ready, out)
+        )
+    else:
+        ctx = mp.get_context("spawn")
+        ready, out = ctx.Event(), ctx.Queue()
+        worker = ctx.Process(
+            target=_runner, args=(url, channel, notify_dir, jobs, poll, ready, out)
+        )
+    worker.start()
+    ready.wait()
+    for _ in range(jobs):
+        time.sleep(interval)
+        store.enqueue_job(
+            pipeline_id=pipeline.id, payload={"persist": False, "enqueued_at": time.time()}
+        )
+    latencies = out.get()
+    worker.join()
+    return {
+        "channel": channel,
+        "jobs": jobs,
+        "interval_secs": interval,
+        "poll_secs": poll,
+        "start_p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "start_p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "start_max_ms": round(max(latencies, default=0.0) * 1000, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=0.15, help="seconds between enqueues")
+    parser.add_argument("--poll", type=float, default=0.5, help="runner base poll interval")
+    parser.add_argument("--channels", default="poll,local,socket")
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="wakeup-bench-") as tmp:
+        for channel in [value.strip() for value in args.channels.split(",") if value.strip()]:
+            result = run_scenario(
+                channel=channel,
+                jobs=args.jobs,
+                interval=args.interval,
+                poll=args.poll,
+                workdir=Path(tmp),
+            )
+            results.append(result)
+            print(
+                f"{channel:>6} p50={result['start_p50_ms']}ms "
+                f"p99={result['start_p99_ms']}ms max={result['start_max_ms']}ms"
+            )
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""Microbenchmark for MLLP frame decoding over synthetic frame streams.
+
+Builds a stream of ``VT payload FS CR`` frames for each payload size, cuts it
+into reads of ``--read-sizes`` bytes and decodes it with:
+
+* ``legacy``  - the previous adapter loop (``bytearray`` + ``del`` prefix)
+* ``concat``  - ``data += chunk`` accumulation as in the old gateway
+* ``feed``    - ``MLLPFrameDecoder.feed`` (one copy into the decoder)
+* ``into``    - ``get_buffer``/``buffer_updated`` as driven by
+  ``recv_into`` or ``asyncio.BufferedProtocol``
+
+    python scripts/bench_mllp_framing.py
+    python scripts/bench_mllp_framing.py --sizes 512,1048576 --read-sizes 65536 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from silhouette_core.interop.mllp_framing import FS_CR, VT, MLLPFrameDecoder  # noqa: E402
+
+
+def _stream(payload_size: int, total_bytes: int) -> tuple[bytes, int]:
+    segment = b"OBX|1|TX|||" + b"x" * 60 + b"\r"
+    payload = (b"MSH|^~\\&|BENCH\r" + segment * (payload_size // len(segment) + 1))[:payload_size]
+    count = max(total_bytes // (payload_size + 3), 1)
+    return (VT + payload + FS_CR) * count, count
+
+
+def _legacy(chunks: list[memoryview]) -> int:
+    buffer = bytearray()
+    frames = 0
+    for chunk in chunks:
+        buffer.extend(chunk)
+        while True:
+            start = buffer.find(VT)
+            if start == -1:
+                buffer.clear()
+                break
+            if start > 0:
+                del buffer[:start]
+            end = buffer.find(FS_CR)
+            if end == -1:
+                break
+            bytes(buffer[1:end])
+            del buffer[: end + 2]
+            frames += 1
+    return frames
+
+
+def _concat(chunks: list[memoryview]) -> int:
+    data = b""
+    frames = 0
+    for chunk in chunks:
+        data += chunk
+        while True:
+            end = data.find(FS_CR)
+            if end == -1:
+                break
+            data[data.find(VT) + 1 : end]
+            data = data[end + 2 :]
+            frames += 1
+    return frames
+
+
+def _feed(chunks: list[memoryview], max_frame: int) -> int:
+    decoder = MLLPFrameDecoder(max_frame_bytes=max_frame)
+    return sum(len(decoder.feed(chunk)) for chunk in chunks)
+
+
+def _into(chunks: list[memoryview], max_frame: int, read_size: int) -> int:
+    decoder = MLLPFrameDecoder(max_frame_bytes=max_frame, read_size=read_size)
+    frames = 0
+    for chunk in chunks:
+        size = len(chunk)
+        decoder.get_buffer()[:size] = chunk
+        frames += len(decoder.buffer_updated(size))
+    return frames
+
+
+def run_scenario(*, payload_size: int, read_size: int, total_bytes: int, impls: list[str]) -> list[dict]:
+    stream, expected = _stream(payload_size, total_bytes)
+    view = memoryview(stream)
+    chunks = [view[idx : idx + read_size] for idx in range(0, len(stream), read_size)]
+    runners = {
+        "legacy": lambda: _legacy(chunks),
+        "concat": lambda: _concat(chunks),
+        "feed": lambda: _feed(chunks, payload_size),
+        "into": lambda: _into(chunks, payload_size, read_size),
+    }
+    results = []
+    for name in impls:
+        started = time.perf_counter()
+        frames = runners[name]()
+        elapsed = time.perf_counter() - started
+        results.append(
+            {
+                "impl": name,
+                "payload_bytes": payload_size,
+                "read_size": read_size,
+                "frames": frames,
+                "expected": expected,
+                "elapsed_secs": round(elapsed, 4),
+                "mb_per_sec": round(len(stream) / elapsed / 1e6, 1) if elapsed else 0.0,
+                "frames_per_sec": round(frames / elapsed, 1) if elapsed else 0.0,
+            }
+        )
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="256,4096,65536,1048576", help="payload sizes in bytes")
+    parser.add_argument("--read-sizes", default="4096,65536", help="bytes delivered per read")
+    parser.add_argument("--total-mb", type=float, default=16.0, help="stream size per scenario")
+    parser.add_argument("--impls", default="legacy,concat,feed,into")
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+    read_sizes = [int(value) for value in args.read_sizes.split(",") if value.strip()]
+    impls = [value.strip() for value in args.impls.split(",") if value.strip()]
+    total = int(args.total_mb * 1_000_000)
+    results = []
+    for payload_size in sizes:
+        for read_size in read_sizes:
+            for result in run_scenario(
+                payload_size=payload_size, read_size=read_size, total_bytes=total, impls=impls
+            ):
+                results.append(result)
+                print(
+                    f"{result['impl']:>6} payload={payload_size:<8} read={read_size:<6} "
+                    f"MB/s={result['mb_per_sec']:<8} frames/s={result['frames_per_sec']:<11} "
+                    f"secs={result['elapsed_secs']}"
+                )
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 1 if any(result["frames"] != result["expected"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
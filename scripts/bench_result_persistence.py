@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""Throughput benchmark for persisting run results into the insights store.
+
+Compares the per-message ``record_result`` path against the write-behind
+``ResultBuffer`` at several batch sizes, on a fresh SQLite file per case.
+
+    python scripts/bench_result_persistence.py --messages 2000
+    python scripts/bench_result_persistence.py --batches 1,50,500 --synchronous NORMAL --wal
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _results(count: int):
+    from engine.contracts import Issue, Message, Result
+
+    template = "MSH|^~\\&|SIL|HOSP|||||ADT^A01|{}|P|2.5\r"
+    return [
+        Result(
+            message=Message(id=f"m{idx}", raw=template.format(idx).encode()),
+            issues=[Issue(severity="warning", code="demo", segment="PID", field=3)] * (idx % 3),
+        )
+        for idx in range(count)
+    ]
+
+
+def run_case(*, path: Path, batch: int | None, messages: int) -> dict:
+    import engine.runtime  # noqa: F401  # resolve engine <-> insights import order
+    from insights.store import InsightsStore
+
+    store = InsightsStore.from_env(url=f"sqlite:///{path}")
+    results = _results(messages)
+    run = store.start_run("bench")
+    started = time.perf_counter()
+    if batch is None:
+        for result in results:
+            store.record_result(run_id=run.id, result=result)
+    else:
+        with store.result_buffer(run.id, max_messages=batch, max_delay_ms=0) as buffer:
+            for result in results:
+                buffer.add(result)
+    elapsed = time.perf_counter() - started
+    store.engine.dispose()
+    return {
+        "path": "record_result" if batch is None else f"buffer[{batch}]",
+        "messages": messages,
+        "elapsed_secs": round(elapsed, 4),
+        "messages_per_sec": round(messages / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--batches", default="1,50,200,1000", help="buffer batch sizes")
+    parser.add_argument("--synchronous", choices=("OFF", "NORMAL", "FULL", "EXTRA"))
+    parser.add_argument("--wal", action="store_true", help="use journal_mode=WAL")
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.synchronous:
+        os.environ["INSIGHTS_SQLITE_SYNCHRONOUS"] = args.synchronous
+    if args.wal:
+        os.environ["INSIGHTS_SQLITE_JOURNAL_MODE"] = "WAL"
+
+    cases: list[int | None] = [None] + [int(v) for v in args.batches.split(",") if v.strip()]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="persist-bench-") as tmp:
+        for idx, batch in enumerate(cases):
+            result = run_case(path=Path(tmp) / f"case{idx}.db", batch=batch, messages=args.messages)
+            results.append(result)
+            print(
+                f"{result['path']:>14} msgs/s={result['messages_per_sec']:<10} "
+                f"elapsed={result['elapsed_secs']}s"
+            )
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""Repair the ``engine_run_summaries`` rollup from the raw run tables.
+
+Writers keep the rollup current as results are persisted, and the
+``20251201`` migration backfills it for older runs. This tool repairs rows
+that still drifted (missing, stale or left behind by deleted runs), or with
+``--rebuild`` recomputes the whole rollup. It aggregates every run, message
+and issue and rewrites rollup rows without coordinating with live writers,
+so run it while engine runners and ingest listeners are stopped.
+
+    python scripts/sync_run_summaries.py
+    python scripts/sync_run_summaries.py --rebuild --url sqlite:///data/insights.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="database URL (defaults to INSIGHTS_DB_URL)")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recompute every rollup row instead of repairing"
+    )
+    args = parser.parse_args(argv)
+
+    import engine.runtime  # noqa: F401  # resolve engine <-> insights import order
+    from insights.store import InsightsStore
+
+    store = InsightsStore.from_env(url=args.url)
+    if args.rebuild:
+        stats = {"mode": "rebuild", "rows": store.rebuild_run_summaries()}
+    else:
+        stats = {"mode": "sync", "repaired": store.sync_run_summaries()}
+    print(json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -215,7 +215,8 @@ def fhir_group():
 @click.option("--message-endpoint", default=None, help="Endpoint for message bundle POST")
 @click.option("--notify-url", default=None, help="Webhook to notify on translation")
 @click.option("--deid", is_flag=True, help="Redact PHI such as names")
-
+@click.option("--workers", default=1, show_default=True, type=int, help="Translator processes")
+@click.option("--chunk", default=16, show_default=True, type=int, help="Messages per worker task")
 def fhir_translate_cmd(
     input_path,
     rules,
@@ -231,26 +232,33 @@ def fhir_translate_cmd(
     message_endpoint,
     notify_url,
     deid,
+    workers,
+    chunk,
 ):
     """Translate HL7 v2 messages to FHIR (stub)."""
     from .pipelines import hl7_to_fhir
 
-    hl7_to_fhir.translate(
-        input_path=input_path,
-        rules=rules,
-        map_path=map_path,
-        bundle=bundle,
-        out=out,
-        server=server,
-        token=token,
-        validate=validate,
-        dry_run=dry_run,
-        message_mode=message_mode,
-        partner=partner,
-        message_endpoint=message_endpoint,
-        notify_url=notify_url,
-        deidentify=deid,
-    )
+    try:
+        hl7_to_fhir.translate(
+            input_path=input_path,
+            rules=rules,
+            map_path=map_path,
+            bundle=bundle,
+            out=out,
+            server=server,
+            token=token,
+            validate=validate,
+            dry_run=dry_run,
+            message_mode=message_mode,
+            partner=partner,
+            message_endpoint=message_endpoint,
+            notify_url=notify_url,
+            deidentify=deid,
+            workers=workers,
+            chunk=chunk,
+        )
+    except FileNotFoundError as exc:
+        raise click.ClickException(str(exc)) from exc
 
 
 @fhir_group.command("validate")
@@ -5,4 +5,6 @@ __all__ = [
     "deid",
     "validate_workbook",
     "mllp",
+    "mllp_framing",
+    "mllp_pool",
 ]
@@ -1,29 +1,144 @@
 from __future__ import annotations
 
-import socket
+import asyncio
+from dataclasses import dataclass
 from typing import List
 
+from silhouette_core.interop.mllp_pool import (
+    MLLPConnectionPool,
+    MLLPNakError,
+    ack_code,
+    ack_control_id,
+    message_control_id,
+    shared_pool,
+)
+
 VT = b"\x0b"
 FS = b"\x1c"
 CR = b"\x0d"
 
+# Transport failures worth resending; NAKs are answers and are not retried.
+_RETRYABLE = (ConnectionError, TimeoutError, OSError)
+
 
 def _wrap_hl7(msg: str) -> bytes:
     return VT + msg.encode("utf-8") + FS + CR
 
 
+@dataclass
+class MLLPSendResult:
+    """Outcome of one message in a batch, in the order it was given."""
+
+    index: int
+    control_id: str | None
+    ack: str | None = None
+    code: str | None = None
+    error: str | None = None
+    attempts: int = 0
+
+    @property
+    def correlated(self) -> bool:
+        """``True`` when the ACK's MSA-2 names this message's MSH-10."""
+
+        if self.ack is None or self.control_id is None:
+            return False
+        echoed = ack_control_id(self.ack.encode("utf-8"))
+        return echoed is not None and echoed.decode("utf-8", "ignore") == self.control_id
+
+
+async def send_mllp_batch_async(
+    host: str,
+    port: int,
+    messages: List[str],
+    *,
+    timeout: float = 5.0,
+    window: int = 8,
+    connections: int = 1,
+    retries: int = 0,
+    retry_backoff: float = 0.2,
+    pool: MLLPConnectionPool | None = None,
+) -> list[MLLPSendResult]:
+    """Send ``messages`` over pooled MLLP connections without blocking the loop.
+
+    Up to ``window`` frames are in flight per connection and ACKs are matched
+    by MSH-10. With ``retries`` set, messages whose send fails in transport
+    (refused, closed, no ACK within ``timeout``) are resent up to that many
+    times with exponential backoff. Retries are off by default because a
+    peer that took a message but answered late receives it twice. NAKs are
+    reported, not retried. Connections come from the process-wide pool for
+    ``host:port`` unless ``pool`` is given.
+    """
+
+    if pool is None:
+        pool = shared_pool(
+            host,
+            port,
+            size=connections,
+            window=window,
+            connect_timeout=timeout,
+            ack_timeout=timeout,
+        )
+    payloads = [message.encode("utf-8") for message in messages]
+    results = []
+    for index, payload in enumerate(payloads):
+        control_id = message_control_id(payload)
+        results.append(
+            MLLPSendResult(
+                index=index,
+                control_id=control_id.decode("utf-8", "ignore") if control_id else None,
+            )
+        )
+
+    pending = list(range(len(payloads)))
+    for attempt in range(max(retries, 0) + 1):
+        if attempt:
+            await asyncio.sleep(retry_backoff * 2 ** (attempt - 1))
+        sends: list[tuple[int, asyncio.Future[bytes]]] = []
+        unsent: list[int] = []
+        for position, index in enumerate(pending):
+            results[index].attempts += 1
+            try:
+                sends.append((index, await pool.submit(payloads[index], timeout=timeout)))
+            except _RETRYABLE as exc:
+                # The pool already backed off; the rest would fail the same way.
+                for skipped in pending[position:]:
+                    results[skipped].error = str(exc)
+                unsent = pending[position:]
+                break
+        outcomes = await asyncio.gather(*(future for _, future in sends), return_exceptions=True)
+        retry = list(unsent)
+        for (index, _), outcome in zip(sends, outcomes):
+            result = results[index]
+            if isinstance(outcome, MLLPNakError):
+                result.ack = outcome.ack.decode("utf-8", "ignore")
+                result.code = outcome.code
+                result.error = None
+            elif isinstance(outcome, BaseException):
+                result.error = str(outcome) or type(outcome).__name__
+                if isinstance(outcome, _RETRYABLE):
+                    retry.append(index)
+            else:
+                result.ack = outcome.decode("utf-8", "ignore")
+                result.code = ack_code(outcome)
+                result.error = None
+        pending = sorted(retry)
+        if not pending:
+            break
+    return results
+
+
 def send_mllp_batch(host: str, port: int, messages: List[str], timeout: float = 5.0):
-    acks: list[str] = []
-    with socket.create_connection((host, port), timeout=timeout) as s:
-        for m in messages:
-            s.sendall(_wrap_hl7(m))
-            chunks: list[bytes] = []
-            while True:
-                b = s.recv(4096)
-                if not b:
-                    break
-                chunks.append(b)
-                if FS in b:
-                    break
-            acks.append(b"".join(chunks).decode("utf-8", "ignore"))
-    return acks
+    """Blocking wrapper returning one ACK string per message (``""`` on failure).
+
+    Do not call from a running event loop; use ``send_mllp_batch_async``.
+    """
+
+    async def _send() -> list[MLLPSendResult]:
+        # A private pool: shared ones belong to the long-lived server loop.
+        pool = MLLPConnectionPool(host, port, connect_timeout=timeout, ack_timeout=timeout)
+        try:
+            return await send_mllp_batch_async(host, port, messages, timeout=timeout, pool=pool)
+        finally:
+            await pool.close()
+
+    return [result.ack or "" for result in asyncio.run(_send())]
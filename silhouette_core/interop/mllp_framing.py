@@ -0,0 +1,274 @@
+"""Incremental MLLP frame decoding shared by listeners, clients and adapters.
+
+``MLLPFrameDecoder`` owns one reusable ``bytearray``. Socket reads land in it
+directly (``get_buffer``/``buffer_updated`` or ``recv_into``), frame
+boundaries are found with offset-based scans that never revisit bytes, and
+each payload is copied exactly once, out of a ``memoryview`` slice. Consumed
+bytes are reclaimed by compacting the live tail to the front instead of
+reallocating.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+
+VT = b"\x0b"
+FS_CR = b"\x1c\x0d"
+
+READ_SIZE = max(int(os.getenv("ENGINE_MLLP_READ_SIZE", "65536")), 512)
+MAX_FRAME_BYTES = max(int(os.getenv("ENGINE_MLLP_MAX_FRAME_BYTES", "1000000")), 1)
+
+
+class FrameTooLargeError(ValueError):
+    """A frame grew past the decoder's ``max_frame_bytes``."""
+
+    def __init__(self, size: int, limit: int) -> None:
+        super().__init__(f"MLLP frame of at least {size} bytes exceeds limit of {limit}")
+        self.size = size
+        self.limit = limit
+
+
+class IncompleteFrameError(ConnectionError):
+    """The peer closed the connection in the middle of a frame."""
+
+
+class MLLPFrameDecoder:
+    """Split a byte stream into MLLP payloads (``VT payload FS CR``).
+
+    Bytes before a ``VT`` are discarded and counted in ``discarded``. A frame
+    whose payload exceeds ``max_frame_bytes`` raises ``FrameTooLargeError``
+    as soon as the limit is crossed, so an unterminated frame never buffers
+    more than the limit plus one read. The oversized frame is dropped.
+    Frames completed in the same read are returned first, and the error is
+    raised by the next call.
+    """
+
+    __slots__ = (
+        "max_frame_bytes",
+        "read_size",
+        "frames",
+        "discarded",
+        "_buf",
+        "_view",
+        "_start",
+        "_end",
+        "_frame",
+        "_scan",
+        "_error",
+    )
+
+    def __init__(
+        self, *, max_frame_bytes: int = MAX_FRAME_BYTES, read_size: int = READ_SIZE
+    ) -> None:
+        self.max_frame_bytes = max(int(max_frame_bytes), 1)
+        self.read_size = max(int(read_size), 1)
+        self.frames = 0
+        self.discarded = 0
+        self._buf = bytearray(self.read_size)
+        self._view = memoryview(self._buf)
+        self._start = 0  # first unconsumed byte
+        self._end = 0  # end of received data
+        self._frame = -1  # payload start of the open frame, -1 while seeking VT
+        self._scan = 0  # where the FS CR search resumes
+        self._error: FrameTooLargeError | None = None
+
+    @property
+    def in_frame(self) -> bool:
+        """``True`` while a ``VT`` has been seen but its terminator has not."""
+
+        return self._frame >= 0
+
+    @property
+    def buffered(self) -> int:
+        return self._end - self._start
+
+    def get_buffer(self, sizehint: int = -1) -> memoryview:
+        """Return writable space at the end of the buffer for the next read."""
+
+        self._reserve(max(sizehint, self.read_size))
+        return self._view[self._end :]
+
+    def buffer_updated(self, nbytes: int) -> list[bytes]:
+        """Account for ``nbytes`` written into ``get_buffer`` and return new frames."""
+
+        self._end += nbytes
+        return self._drain()
+
+    def feed(self, data: bytes | bytearray | memoryview) -> list[bytes]:
+        """Copy ``data`` into the buffer and return the frames it completes."""
+
+        size = len(data)
+        self._reserve(size)
+        self._view[self._end : self._end + size] = data
+        self._end += size
+        return self._drain()
+
+    def _reserve(self, size: int) -> None:
+        if len(self._buf) - self._end >= size:
+            return
+        live = self._end - self._start
+        if self._start:
+            # Slide the unconsumed tail to the front; same-size slice
+            # assignment never resizes the bytearray under exported views.
+            self._view[:live] = self._view[self._start : self._end]
+            if self._frame >= 0:
+                self._frame -= self._start
+                self._scan -= self._start
+            self._start, self._end = 0, live
+            if len(self._buf) - self._end >= size:
+                return
+        grown = bytearray(max(len(self._buf) * 2, live + size))
+        grown[:live] = self._view[:live]
+        self._buf = grown
+        self._view = memoryview(grown)
+
+    def _drain(self) -> list[bytes]:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        frames: list[bytes] = []
+        buf, view, limit = self._buf, self._view, self.max_frame_bytes
+        start, end, frame, scan = self._start, self._end, self._frame, self._scan
+        # Hot loop on locals; state is written back before returning.
+        while start < end:
+            if frame < 0:
+                vt = buf.find(VT, start, end)
+                if vt < 0:
+                    self.discarded += end - start
+                    start = end
+                    break
+                self.discarded += vt - start
+                start = vt
+                frame = scan = vt + 1
+            fs = buf.find(FS_CR, scan, end)
+            if fs < 0:
+                # FS may be the last byte received, so rescan it next time.
+                scan = max(frame, end - 1)
+                if end - frame > limit + 1:
+                    self._error = FrameTooLargeError(end - frame, limit)
+                    # Drop what arrived; the rest is skipped until the next VT.
+                    start, frame = end, -1
+                break
+            if fs - frame > limit:
+                self._error = FrameTooLargeError(fs - frame, limit)
+                start, frame = fs + 2, -1
+                break
+            frames.append(bytes(view[frame:fs]))
+            start, frame = fs + 2, -1
+        if start == end:
+            start = end = 0
+        self._start, self._end, self._frame, self._scan = start, end, frame, scan
+        self.frames += len(frames)
+        if self._error is not None and not frames:
+            error, self._error = self._error, None
+            raise error
+        return frames
+
+
+class StreamFrameReader:
+    """Read MLLP payloads from an ``asyncio.StreamReader`` through a decoder.
+
+    Unlike ``readuntil`` this is not bound by the stream's 64 KiB buffer
+    limit, and a single ``read`` can yield several pipelined frames.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, decoder: MLLPFrameDecoder | None = None) -> None:
+        self.reader = reader
+        self.decoder = decoder or MLLPFrameDecoder()
+        self._frames: deque[bytes] = deque()
+
+    async def read_frame(self) -> bytes | None:
+        """Return the next payload, or ``None`` once the peer has closed.
+
+        Raises ``IncompleteFrameError`` when the stream ends mid-frame and
+        ``FrameTooLargeError`` for oversized frames.
+        """
+
+        while not self._frames:
+            data = await self.reader.read(self.decoder.read_size)
+            if not data:
+                if self.decoder.in_frame:
+                    raise IncompleteFrameError("connection closed while awaiting frame terminator")
+                return None
+            self._frames.extend(self.decoder.feed(data))
+        return self._frames.popleft()
+
+
+class MLLPFrameProtocol(asyncio.BufferedProtocol):
+    """``BufferedProtocol`` that has the event loop read straight into a decoder.
+
+    Frames queue inside the protocol and are consumed with ``read_frame``.
+    Reading is paused while more than ``high_water`` frames are waiting and
+    resumes once the backlog halves.
+    """
+
+    def __init__(self, decoder: MLLPFrameDecoder | None = None, *, high_water: int = 64) -> None:
+        self.decoder = decoder or MLLPFrameDecoder()
+        self.high_water = max(int(high_water), 1)
+        self.transport: asyncio.Transport | None = None
+        self._frames: deque[bytes] = deque()
+        self._waiter: asyncio.Future[None] | None = None
+        self._paused = False
+        self._closed = False
+        self._error: BaseException | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self.decoder.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes: int) -> None:
+        try:
+            frames = self.decoder.buffer_updated(nbytes)
+        except FrameTooLargeError as exc:
+            self._error = exc
+            self.transport.close()
+            return
+        if not frames:
+            return
+        self._frames.extend(frames)
+        if len(self._frames) > self.high_water and not self._paused:
+            self._paused = True
+            self.transport.pause_reading()
+        self._wake()
+
+    def eof_received(self) -> bool | None:
+        if self.decoder.in_frame and self._error is None:
+            self._error = IncompleteFrameError("connection closed while awaiting frame terminator")
+        return None
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._closed = True
+        if exc is not None and self._error is None:
+            self._error = exc
+        self._wake()
+
+    async def read_frame(self) -> bytes | None:
+        """Return the next payload, or ``None`` after a clean close."""
+
+        while not self._frames:
+            if self._closed:
+                if self._error is not None:
+                    raise self._error
+                return None
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        frame = self._frames.popleft()
+        if self._paused and len(self._frames) <= self.high_water // 2:
+            self._paused = False
+            self.transport.resume_reading()
+        return frame
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
@@ -0,0 +1,431 @@
+"""Persistent, pipelined MLLP client connections for outbound targets."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .mllp_framing import FS_CR, VT, FrameTooLargeError, StreamFrameReader
+
+logger = logging.getLogger(__name__)
+
+_NAK_CODES = {b"AE", b"AR", b"CE", b"CR"}
+
+SHARED_POOL_LIMIT = max(int(os.getenv("ENGINE_MLLP_SHARED_POOLS", "8")), 1)
+
+
+class MLLPNakError(RuntimeError):
+    """Raised when a peer answers a frame with a negative acknowledgement."""
+
+    def __init__(self, code: str, ack: bytes) -> None:
+        super().__init__(f"peer rejected message ({code})")
+        self.code = code
+        self.ack = ack
+
+
+def ack_code(ack: bytes) -> str | None:
+    """Return MSA-1 of ``ack`` (``AA``/``AE``/``AR``/...) or ``None`` if absent."""
+
+    for segment in ack.replace(b"\n", b"\r").split(b"\r"):
+        if segment.startswith(b"MSA") and len(segment) > 4:
+            return segment[4:].split(segment[3:4], 1)[0].decode("ascii", "replace")
+    return None
+
+
+def _field(segment: bytes, number: int) -> bytes | None:
+    parts = segment.split(segment[3:4]) if len(segment) > 3 else []
+    return (parts[number] or None) if len(parts) > number else None
+
+
+def message_control_id(message: bytes) -> bytes | None:
+    """Return MSH-10 of ``message`` or ``None`` when there is no MSH."""
+
+    header = message.split(b"\r", 1)[0].split(b"\n", 1)[0]
+    # MSH-1 is the separator itself, so MSH-10 is the ninth split field.
+    return _field(header, 9) if header.startswith(b"MSH") else None
+
+
+def ack_control_id(ack: bytes) -> bytes | None:
+    """Return MSA-2 of ``ack``, the control id of the message it answers."""
+
+    for segment in ack.replace(b"\n", b"\r").split(b"\r"):
+        if segment.startswith(b"MSA"):
+            return _field(segment, 2)
+    return None
+
+
+class _Connection:
+    """One open MLLP socket; a reader task matches ACKs to sends.
+
+    An ACK whose ``MSA-2`` names a control id in flight settles that send,
+    so peers answering out of order are handled. ACKs without a known
+    control id settle the oldest send.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        ack_timeout: float,
+        on_change: Callable[[], None],
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.ack_timeout = ack_timeout
+        self.pending: deque[tuple[bytes | None, asyncio.Future[bytes]]] = deque()
+        self._by_control: dict[bytes, asyncio.Future[bytes]] = {}
+        self.acked = 0
+        self.last_used = time.monotonic()
+        self.closed = False
+        self._on_change = on_change
+        # Reading continuously (even when idle) notices a peer-side close
+        # before the connection is handed out again.
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_acks())
+
+    @property
+    def healthy(self) -> bool:
+        return not self.closed and not self.writer.is_closing() and not self.reader.at_eof()
+
+    def send(
+        self,
+        payload: bytes,
+        *,
+        control_id: bytes | None = None,
+        timeout: float | None = None,
+    ) -> asyncio.Future[bytes]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bytes] = loop.create_future()
+        if control_id is not None and control_id in self._by_control:
+            control_id = None  # duplicate id in flight: fall back to order
+        if control_id is not None:
+            self._by_control[control_id] = future
+        self.pending.append((control_id, future))
+        self.writer.write(VT + payload + FS_CR)
+        self.last_used = time.monotonic()
+        expiry = loop.call_later(timeout or self.ack_timeout, self._expire, future)
+        future.add_done_callback(lambda _: expiry.cancel())
+        return future
+
+    def _settle(self, ack: bytes) -> asyncio.Future[bytes]:
+        control_id = ack_control_id(ack)
+        future = self._by_control.pop(control_id, None) if control_id else None
+        if future is not None:
+            self.pending.remove((control_id, future))
+            return future
+        if not self.pending:
+            raise ConnectionError("unsolicited MLLP frame")
+        control_id, future = self.pending.popleft()
+        if control_id is not None:
+            self._by_control.pop(control_id, None)
+        return future
+
+    def _expire(self, future: asyncio.Future[bytes]) -> None:
+        if not future.done():
+            # ACKs are positional; once one is missing the stream is unusable.
+            self._fail(TimeoutError(f"no ACK within {self.ack_timeout}s"))
+            self._reader_task.cancel()
+
+    async def _read_acks(self) -> None:
+        frames = StreamFrameReader(self.reader)
+        try:
+            while True:
+                ack = await frames.read_frame()
+                if ack is None:
+                    raise ConnectionError("peer closed the connection")
+                future = self._settle(ack)
+                self.acked += 1
+                self.last_used = time.monotonic()
+                if not future.done():
+                    future.set_result(ack)
+                self._on_change()
+        except asyncio.CancelledError:
+            self._fail(ConnectionError("connection closed"))
+            raise
+        except (OSError, FrameTooLargeError) as exc:
+            self._fail(exc if isinstance(exc, ConnectionError) else ConnectionError(str(exc)))
+
+    def _fail(self, exc: BaseException) -> None:
+        self.closed = True
+        self._by_control.clear()
+        while self.pending:
+            _, future = self.pending.popleft()
+            if not future.done():
+                future.set_exception(exc)
+        self.writer.close()
+        self._on_change()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._reader_task.cancel()
+            self.writer.close()
+
+
+@dataclass
+class MLLPConnectionPool:
+    """Keep up to ``size`` persistent MLLP connections to one ``host:port``.
+
+    ``window`` bounds the frames in flight per connection: ``1`` waits for each
+    ACK before reusing a connection, larger values pipeline frames and match
+    ACKs by ``MSA-2``/``MSH-10`` (in order when absent). Idle connections are health-checked (peer close, idle
+    expiry) before reuse; failed connects back off exponentially from
+    ``backoff_initial`` up to ``backoff_max``. Connections belong to the event
+    loop that opened them and are dropped if the pool is used from another.
+
+    A NAK (``MSA-1`` of AE/AR/CE/CR) is counted in ``naks`` and its ACK is
+    returned like any other; with ``fail_on_nak`` it raises ``MLLPNakError``.
+    """
+
+    host: str
+    port: int
+    size: int = 2
+    window: int = 1
+    connect_timeout: float = 5.0
+    ack_timeout: float = 30.0
+    max_idle_secs: float = 60.0
+    connect_retries: int = 3
+    backoff_initial: float = 0.1
+    backoff_max: float = 5.0
+    fail_on_nak: bool = False
+    connects: int = field(default=0, init=False)
+    connect_failures: int = field(default=0, init=False)
+    sent: int = field(default=0, init=False)
+    naks: int = field(default=0, init=False)
+    _connections: list[_Connection] = field(default_factory=list, init=False, repr=False)
+    _loop: asyncio.AbstractEventLoop | None = field(default=None, init=False, repr=False)
+    _changed: asyncio.Event | None = field(default=None, init=False, repr=False)
+    _opening: int = field(default=0, init=False, repr=False)
+    _backoff: float = field(default=0.0, init=False, repr=False)
+    _retry_at: float = field(default=0.0, init=False, repr=False)
+    _closed: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.size = max(1, self.size)
+        self.window = max(1, self.window)
+
+    async def send(self, payload: bytes, *, timeout: float | None = None) -> bytes:
+        """Send one frame and return its ACK (see ``fail_on_nak`` for NAKs)."""
+
+        conn, future = await self._submit(payload, timeout)
+        try:
+            ack = await future
+        except ConnectionError:
+            # A reused connection the peer closed between messages fails
+            # before any ACK arrives; resend once on a fresh connection.
+            if not conn.acked or self.window > 1:
+                raise
+            _, future = await self._submit(payload, timeout)
+            ack = await future
+        return self._check_ack(ack)
+
+    async def submit(self, payload: bytes, *, timeout: float | None = None) -> asyncio.Future[bytes]:
+        """Send one frame once a window slot is free; the future resolves to its ACK.
+
+        ``timeout`` overrides ``ack_timeout`` for this frame.
+        """
+
+        _, future = await self._submit(payload, timeout)
+        checked = asyncio.get_running_loop().create_future()
+
+        def _relay(done: asyncio.Future[bytes]) -> None:
+            if checked.done():
+                return
+            if done.cancelled():
+                checked.cancel()
+                return
+            exc = done.exception()
+            if exc is None:
+                try:
+                    checked.set_result(self._check_ack(done.result()))
+                except MLLPNakError as nak:
+                    checked.set_exception(nak)
+            else:
+                checked.set_exception(exc)
+
+        future.add_done_callback(_relay)
+        return checked
+
+    def _check_ack(self, ack: bytes) -> bytes:
+        code = ack_code(ack)
+        if code is None or code.encode("ascii", "replace") not in _NAK_CODES:
+            return ack
+        self.naks += 1
+        if self.fail_on_nak:
+            raise MLLPNakError(code, ack)
+        logger.warning(
+            "mllp.nak",
+            extra={"host": self.host, "port": self.port, "code": code},
+        )
+        return ack
+
+    async def _submit(
+        self, payload: bytes, timeout: float | None = None
+    ) -> tuple[_Connection, asyncio.Future[bytes]]:
+        conn = await self._acquire()
+        future = conn.send(payload, control_id=message_control_id(payload), timeout=timeout)
+        self.sent += 1
+        try:
+            await conn.writer.drain()
+        except ConnectionError as exc:
+            conn._fail(exc)
+        return conn, future
+
+    async def _acquire(self) -> _Connection:
+        self._bind_loop()
+        assert self._changed is not None
+        while True:
+            self._prune()
+            available = [conn for conn in self._connections if len(conn.pending) < self.window]
+            if available:
+                return min(available, key=lambda conn: len(conn.pending))
+            if len(self._connections) + self._opening < self.size:
+                return await self._open()
+            self._changed.clear()
+            await self._changed.wait()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for conn in list(self._connections):
+            idle_expired = not conn.pending and now - conn.last_used > self.max_idle_secs
+            if not conn.healthy or idle_expired:
+                conn.close()
+                self._connections.remove(conn)
+
+    async def _open(self) -> _Connection:
+        self._opening += 1
+        try:
+            attempt = 0
+            while True:
+                delay = self._retry_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), self.connect_timeout
+                    )
+                except (OSError, asyncio.TimeoutError) as exc:
+                    self.connect_failures += 1
+                    self._backoff = min(
+                        self.backoff_max, self._backoff * 2 if self._backoff else self.backoff_initial
+                    )
+                    self._retry_at = time.monotonic() + self._backoff
+                    attempt += 1
+                    logger.warning(
+                        "mllp.connect.failed",
+                        extra={
+                            "host": self.host,
+                            "port": self.port,
+                            "attempt": attempt,
+                            "backoff_secs": self._backoff,
+                            "error": str(exc),
+                        },
+                    )
+                    if attempt > self.connect_retries:
+                        raise ConnectionError(
+                            f"cannot connect to {self.host}:{self.port}: {exc}"
+                        ) from exc
+                    continue
+                self._backoff = 0.0
+                self._retry_at = 0.0
+                self.connects += 1
+                conn = _Connection(
+                    reader, writer, ack_timeout=self.ack_timeout, on_change=self._notify
+                )
+                self._connections.append(conn)
+                return conn
+        finally:
+            self._opening -= 1
+            self._notify()
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+        if self._closed:
+            # Connections still serving a run when the pool was closed are
+            # shut as soon as they go idle instead of being kept around.
+            for conn in list(self._connections):
+                if not conn.pending:
+                    conn.close()
+                    self._connections.remove(conn)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # Sockets opened on a previous (likely finished) loop are unusable here.
+        for conn in self._connections:
+            conn.closed = True
+        self._connections = []
+        self._opening = 0
+        self._loop = loop
+        self._changed = asyncio.Event()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "open": sum(1 for conn in self._connections if conn.healthy),
+            "in_flight": sum(len(conn.pending) for conn in self._connections),
+            "connects": self.connects,
+            "connect_failures": self.connect_failures,
+            "sent": self.sent,
+            "naks": self.naks,
+        }
+
+    async def close(self) -> None:
+        """Close idle connections now and busy ones once their ACKs arrive."""
+
+        self._closed = True
+        if self._loop is not asyncio.get_running_loop():
+            self._bind_loop()
+            return
+        self._notify()
+
+
+_SHARED: OrderedDict[tuple[Any, ...], MLLPConnectionPool] = OrderedDict()
+_RETIRING: set[asyncio.Task[None]] = set()
+
+
+def shared_pool(host: str, port: int, **options: Any) -> MLLPConnectionPool:
+    """Return the process-wide pool for ``host:port`` and ``options``, creating it on first use.
+
+    ``options`` are pool fields and part of the key: callers asking for a
+    different window or timeouts get their own pool rather than retuning one
+    that concurrent sends are using. At most ``SHARED_POOL_LIMIT`` pools are
+    kept; the least recently used one is closed when another is created.
+    """
+
+    key = (host, int(port), tuple(sorted(options.items())))
+    pool = _SHARED.get(key)
+    if pool is None or pool._closed:
+        pool = _SHARED[key] = MLLPConnectionPool(host, int(port), **options)
+    _SHARED.move_to_end(key)
+    while len(_SHARED) > SHARED_POOL_LIMIT:
+        _, evicted = _SHARED.popitem(last=False)
+        _retire(evicted)
+    return pool
+
+
+def _retire(pool: MLLPConnectionPool) -> None:
+    """Close an evicted pool on the running loop; its busy sends still settle."""
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        pool._closed = True
+        return
+    task = loop.create_task(pool.close())
+    _RETIRING.add(task)
+    task.add_done_callback(_RETIRING.discard)
+
+
+async def close_shared_pools() -> None:
+    pools = list(_SHARED.values())
+    _SHARED.clear()
+    for pool in pools:
+        await pool.close()
@@ -2,12 +2,16 @@
 from __future__ import annotations
 
 import csv
+import glob
 import json
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
 from uuid import UUID, uuid4, uuid5, NAMESPACE_URL
 
 import requests  # runtime dependency
@@ -160,67 +164,182 @@ def _run_qa(msg: Dict[str, List[List[str]]], rules_path: str | None) -> Dict[str
     # Real implementation would apply validation rules; keep stub for now
     return {"errors": 0, "warnings": 0}
 
-def translate(
-    input_path: str,
-    rules: str | None = None,
-    map_path: str | None = None,
-    bundle: str | None = None,
-    out: str = "out/",
-    server: str | None = None,
-    token: str | None = None,
-    validate: bool = False,
-    dry_run: bool = False,
-    message_mode: bool = False,
-    partner: str | None = None,
-    message_endpoint: str | None = None,
-    notify_url: str | None = None,
-    deidentify: bool = False,
-) -> None:
-    """Translate HL7 messages to FHIR resources."""
-
-    base = Path(out)
-    ndjson_dir = base / "fhir" / "ndjson"
-    bundle_dir = base / "fhir" / "bundles"
-    (base / "qa").mkdir(parents=True, exist_ok=True)
-    ndjson_dir.mkdir(parents=True, exist_ok=True)
-    bundle_dir.mkdir(parents=True, exist_ok=True)
-    (base / "deadletter").mkdir(parents=True, exist_ok=True)
-
-    if not map_path:
-        raise ValueError("map_path is required")
-    spec: MapSpec = load_map(map_path)
-
-    with open("config/fhir_target.yaml", "r", encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
-    with open("config/identifier_systems.yaml", "r", encoding="utf-8") as f:
-        id_systems = yaml.safe_load(f)
-    defaults = cfg.get("default_profiles", {})
-    if partner:
-        partner_path = Path("config/partners") / f"{partner}.yaml"
-        if partner_path.exists():
-            p_cfg = yaml.safe_load(partner_path.read_text(encoding="utf-8")) or {}
-            defaults.update(p_cfg.get("profiles", {}))
-
-    text = Path(input_path).read_text(encoding="utf-8")
+
+_METRICS_HEADER = [
+    "messageId",
+    "type",
+    "qaStatus",
+    "fhirCount",
+    "posted",
+    "latencyMs",
+    "txMisses",
+    "postedCount",
+    "deadLetter",
+]
+_AUDIT_BATCH = 500
+
+
+@dataclass
+class TranslateConfig:
+    """Mapping spec, target profiles and output options shared by every message.
+
+    Loaded once per run and handed to each worker process as-is.
+    """
+
+    spec: MapSpec
+    defaults: Dict[str, str]
+    id_systems: Dict[str, str]
+    rules: str | None = None
+    bundle: str | None = None
+    message_mode: bool = False
+    validate: bool = False
+    server: str | None = None
+    token: str | None = None
+    deidentify: bool = False
+
+    @classmethod
+    def load(cls, map_path: str | None, partner: str | None = None, **options: Any) -> "TranslateConfig":
+        if not map_path:
+            raise ValueError("map_path is required")
+        spec = load_map(map_path)
+        with open("config/fhir_target.yaml", "r", encoding="utf-8") as f:
+            cfg = yaml.safe_load(f)
+        with open("config/identifier_systems.yaml", "r", encoding="utf-8") as f:
+            id_systems = yaml.safe_load(f)
+        defaults = cfg.get("default_profiles", {})
+        if partner:
+            partner_path = Path("config/partners") / f"{partner}.yaml"
+            if partner_path.exists():
+                p_cfg = yaml.safe_load(partner_path.read_text(encoding="utf-8")) or {}
+                defaults.update(p_cfg.get("profiles", {}))
+        return cls(spec=spec, defaults=defaults, id_systems=id_systems, **options)
+
+
+@dataclass
+class TranslatedMessage:
+    """Resources and bundle produced for one HL7 message."""
+
+    message_id: str
+    msg_type: str
+    qa: Dict[str, int]
+    tx_miss: int
+    resources: List[Dict[str, Any]]
+    bundle: Dict[str, Any] | None
+
+
+def expand_inputs(input_path: str | Path) -> List[Path]:
+    """Resolve a file, directory (recursive ``*.hl7``) or glob to sorted input files."""
+    path = Path(input_path)
+    if path.is_file():
+        return [path]
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*.hl7") if p.is_file())
+    files: set[Path] = set()
+    for match in glob.glob(str(input_path), recursive=True):
+        p = Path(match)
+        if p.is_dir():
+            files.update(q for q in p.rglob("*.hl7") if q.is_file())
+        elif p.is_file():
+            files.add(p)
+    return sorted(files)
+
+
+def _is_message_start(line: str) -> bool:
+    return line.lstrip("\ufeff\x0b\x1c").startswith("MSH|")
+
+
+def split_messages(path: Path) -> Iterator[str]:
+    """Stream the messages in an HL7 file, one MSH-led block at a time.
+
+    Lines before the first MSH stay with the first message; a file without
+    any MSH segment is yielded whole, as a single message.
+    """
+    lines: List[str] = []
+    seen_msh = False
+    # newline="" splits on \r, \n and \r\n alike and keeps the originals.
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        for line in fh:
+            if _is_message_start(line):
+                if seen_msh:
+                    yield "".join(lines)
+                    lines = []
+                seen_msh = True
+            lines.append(line)
+    if lines:
+        yield "".join(lines)
+
+
+def iter_messages(paths: Iterable[Path]) -> Iterator[tuple[str, str]]:
+    """Yield ``(name, text)`` for every message in ``paths``.
+
+    A single-message file is named after its stem, as before; messages from a
+    multi-message file get ``<stem>_0001``, ``<stem>_0002``... Only one message
+    per file is held back to tell the two apart.
+    """
+    for path in paths:
+        messages = split_messages(path)
+        first = next(messages, None)
+        if first is None:
+            continue
+        second = next(messages, None)
+        if second is None:
+            yield path.stem, first
+            continue
+        yield f"{path.stem}_0001", first
+        yield f"{path.stem}_0002", second
+        for idx, text in enumerate(messages, start=3):
+            yield f"{path.stem}_{idx:04d}", text
+
+
+def _should_skip_resource(resource: Dict[str, Any]) -> bool:
+    r_type = resource.get("resourceType")
+    if not r_type:
+        return True
+    # Drop resources that only contain bookkeeping metadata.
+    keys = {k for k in resource.keys() if k not in {"resourceType", "meta"}}
+    if not keys:
+        return r_type not in {"Specimen"}
+    if r_type in {"Condition", "AllergyIntolerance", "Procedure"} and "code" not in resource:
+        return True
+    return False
+
+
+def _wrap_encounter_class(res: dict) -> None:
+    if res.get("resourceType") != "Encounter":
+        return
+    c = res.get("class")
+    if c is None or isinstance(c, list):
+        return
+    res["class"] = [c]
+
+
+def _ensure_provenance_agent_who(res: dict, default_ref: str | None) -> None:
+    # Ensure Provenance.agent[0].who exists; use default actor if missing
+    if res.get("resourceType") != "Provenance":
+        return
+    agents = res.get("agent")
+    if not isinstance(agents, list) or not agents:
+        if default_ref:
+            res["agent"] = [{"who": {"reference": default_ref}}]
+        return
+    first = agents[0]
+    if "who" not in first and default_ref:
+        first["who"] = {"reference": default_ref}
+
+
+def translate_message(text: str, config: TranslateConfig) -> TranslatedMessage:
+    """Translate one HL7 message; no files are written and nothing is posted."""
+    spec = config.spec
+    defaults = config.defaults
+    server, token = config.server, config.token
+
     msg = _parse_hl7(text)
     msg_type = msg.get("MSH", [])[0][8] if msg.get("MSH") and len(msg["MSH"][0]) > 8 else ""
-    qa = _run_qa(msg, rules)
+    qa = _run_qa(msg, config.rules)
     metrics: Dict[str, int] = {}
 
     resources: List[Dict[str, Any]] = []
 
-    def _should_skip_resource(resource: Dict[str, Any]) -> bool:
-        r_type = resource.get("resourceType")
-        if not r_type:
-            return True
-        # Drop resources that only contain bookkeeping metadata.
-        keys = {k for k in resource.keys() if k not in {"resourceType", "meta"}}
-        if not keys:
-            return r_type not in {"Specimen"}
-        if r_type in {"Condition", "AllergyIntolerance", "Procedure"} and "code" not in resource:
-            return True
-        return False
-
     for plan in spec.resourcePlan:
         res: Dict[str, Any] = {"resourceType": plan.resource}
         profile = defaults.get(plan.resource) or plan.profile
@@ -288,27 +407,6 @@ def translate(
 
     # --- Post-processing to normalize shapes & fill required references ---
 
-    def _wrap_encounter_class(res: dict) -> None:
-        if res.get("resourceType") != "Encounter":
-            return
-        c = res.get("class")
-        if c is None or isinstance(c, list):
-            return
-        res["class"] = [c]
-
-    def _ensure_provenance_agent_who(res: dict, default_ref: str | None) -> None:
-        # Ensure Provenance.agent[0].who exists; use default actor if missing
-        if res.get("resourceType") != "Provenance":
-            return
-        agents = res.get("agent")
-        if not isinstance(agents, list) or not agents:
-            if default_ref:
-                res["agent"] = [{"who": {"reference": default_ref}}]
-            return
-        first = agents[0]
-        if "who" not in first and default_ref:
-            first["who"] = {"reference": default_ref}
-
     # Decide a default 'who' reference. Prefer a real Practitioner/Organization if you emit one.
     default_who_ref = None
 
@@ -329,12 +427,12 @@ def translate(
         _wrap_encounter_class(_res)
         _ensure_provenance_agent_who(_res, default_who_ref)
 
-    if deidentify:
+    if config.deidentify:
         for r in resources:
             if r.get("resourceType") == "Patient":
                 r.pop("name", None)
 
-    if validate:
+    if config.validate:
         from ..validators.fhir_profile import (
             validate_structural_with_pydantic,
             validate_uscore_jsonschema,
@@ -398,7 +496,7 @@ def translate(
                         if fu:
                             ref["reference"] = fu
 
-    if validate:
+    if config.validate:
         from ..validators.fhir_profile import (
             validate_structural_with_pydantic,
             validate_uscore_jsonschema,
@@ -441,18 +539,8 @@ def translate(
     _ensure_provenance_agent_who(prov, default_who_ref)
     entries.append((prov, prov_fu))
 
-    # Write NDJSON
-    by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for r, _ in entries:
-        by_type[r["resourceType"]].append(r)
-    for rt, items in by_type.items():
-        p = ndjson_dir / f"{rt}.ndjson"
-        with p.open("w", encoding="utf-8") as fh:
-            for item in items:
-                fh.write(json.dumps(item) + "\n")
-
     bundle_res: Dict[str, Any] | None = None
-    if message_mode:
+    if config.message_mode:
         header = {
             "resourceType": "MessageHeader",
             "eventCoding": {"code": msg_type},
@@ -469,7 +557,7 @@ def translate(
         }
         for r, fu in entries:
             bundle_res["entry"].append({"fullUrl": fu, "resource": r})
-    elif bundle == "transaction":
+    elif config.bundle == "transaction":
         bundle_res = {
             "resourceType": "Bundle",
             "type": "transaction",
@@ -522,7 +610,7 @@ def translate(
                     entry["request"] = {"method": "POST", "url": "Appointment"}
             elif rt in ("Organization", "Practitioner", "PractitionerRole", "Location"):
                 ident = r.get("identifier", [{}])[0]
-                system = ident.get("system", "") or id_systems.get(rt.lower(), "")
+                system = ident.get("system", "") or config.id_systems.get(rt.lower(), "")
                 value = ident.get("value", "")
                 if system and value:
                     entry["request"] = {
@@ -535,105 +623,275 @@ def translate(
                 entry["request"] = {"method": "POST", "url": rt}
             bundle_res["entry"].append(entry)
 
-    if bundle_res:
-        out_path = bundle_dir / f"{Path(input_path).stem}.json"
-        out_path.write_text(json.dumps(bundle_res, indent=2), encoding="utf-8")
-
-        resource_counts = {k: len(v) for k, v in by_type.items()}
-        fhir_count = len(entries) + (1 if message_mode else 0)
-        tx_miss = metrics.get("tx-miss", 0)
-        qa_status = "ok" if qa.get("errors", 0) == 0 else "fail"
+    return TranslatedMessage(
+        message_id=str(msg_uuid),
+        msg_type=msg_type,
+        qa=qa,
+        tx_miss=metrics.get("tx-miss", 0),
+        resources=[r for r, _ in entries],
+        bundle=bundle_res,
+    )
+
+
+class _TranslateOutputs:
+    """Writers shared by every message of one run.
+
+    NDJSON files are opened once per resource type (truncated on first use,
+    as a single-file run always did), ``metrics.csv`` stays open for appends
+    and audit events are persisted in batches rather than one rewrite each.
+    """
+
+    def __init__(
+        self,
+        out: str,
+        config: TranslateConfig,
+        dry_run: bool = False,
+        message_endpoint: str | None = None,
+        notify_url: str | None = None,
+    ) -> None:
+        self.base = Path(out)
+        self.ndjson_dir = self.base / "fhir" / "ndjson"
+        self.bundle_dir = self.base / "fhir" / "bundles"
+        self.deadletter = self.base / "deadletter"
+        for path in (self.base / "qa", self.ndjson_dir, self.bundle_dir, self.deadletter):
+            path.mkdir(parents=True, exist_ok=True)
+        self.config = config
+        self.dry_run = dry_run
+        self.message_endpoint = message_endpoint
+        self.notify_url = notify_url
+        self._ndjson: Dict[str, TextIO] = {}
+        self._metrics: TextIO | None = None
+        self._metrics_writer: Any = None
+        self._names: Dict[str, int] = {}
+        self._audit: List[Dict[str, Any]] = []
+
+    def __enter__(self) -> "_TranslateOutputs":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _bundle_path(self, name: str) -> Path:
+        seen = self._names.get(name, 0)
+        self._names[name] = seen + 1
+        # Same-named files from different directories must not overwrite each other.
+        return self.bundle_dir / (f"{name}.json" if not seen else f"{name}-{seen + 1}.json")
+
+    def _write_metrics(self, row: List[Any]) -> None:
+        if self._metrics is None:
+            metrics_path = self.base / "metrics.csv"
+            new = not metrics_path.exists()
+            self._metrics = metrics_path.open("a", newline="", encoding="utf-8")
+            self._metrics_writer = csv.writer(self._metrics)
+            if new:
+                self._metrics_writer.writerow(_METRICS_HEADER)
+        self._metrics_writer.writerow(row)
+
+    def _post(self, bundle_res: Dict[str, Any], message_id: str) -> tuple[bool, int, int, bool]:
+        config = self.config
+        server, token = config.server, config.token
         posted = False
         status = 0
         latency_ms = 0
         dead_letter = False
 
-        if message_mode and message_endpoint and not dry_run:
+        if config.message_mode and self.message_endpoint and not self.dry_run:
             try:
-                resp = requests.post(message_endpoint, json=bundle_res)
+                resp = requests.post(self.message_endpoint, json=bundle_res)
                 status = resp.status_code
                 posted = resp.ok
             except requests.RequestException:
                 dead_letter = True
                 status = 0
-        elif server and not dry_run and not message_mode:
-            if validate:
+        elif server and not self.dry_run and not config.message_mode:
+            if config.validate:
                 try:
                     _remote_validate(server, token, bundle_res)
                 except requests.HTTPError as exc:
                     dead_letter = True
                     resp = exc.response
-                    dl = base / "deadletter"
-                    (dl / f"{msg_uuid}_request.json").write_text(
+                    (self.deadletter / f"{message_id}_request.json").write_text(
                         json.dumps(bundle_res, indent=2), encoding="utf-8"
                     )
                     body = resp.text if resp is not None else str(exc)
-                    (dl / f"{msg_uuid}_response.json").write_text(body, encoding="utf-8")
+                    (self.deadletter / f"{message_id}_response.json").write_text(body, encoding="utf-8")
                     status = resp.status_code if resp is not None else 0
                 else:
                     posted, status, latency_ms = post_transaction(
-                        bundle_res, server, token, deadletter_dir=str(base / "deadletter")
+                        bundle_res, server, token, deadletter_dir=str(self.deadletter)
                     )
                     dead_letter = not posted
             else:
                 posted, status, latency_ms = post_transaction(
-                    bundle_res, server, token, deadletter_dir=str(base / "deadletter")
+                    bundle_res, server, token, deadletter_dir=str(self.deadletter)
                 )
                 dead_letter = not posted
+        return posted, status, latency_ms, dead_letter
+
+    def emit(self, name: str, result: TranslatedMessage) -> None:
+        """Write, post and record one translated message."""
+        by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for r in result.resources:
+            by_type[r["resourceType"]].append(r)
+        for rt, items in by_type.items():
+            fh = self._ndjson.get(rt)
+            if fh is None:
+                fh = self._ndjson[rt] = (self.ndjson_dir / f"{rt}.ndjson").open("w", encoding="utf-8")
+            for item in items:
+                fh.write(json.dumps(item) + "\n")
 
-        metrics_path = base / "metrics.csv"
-        if not metrics_path.exists():
-            with metrics_path.open("w", newline="", encoding="utf-8") as fh:
-                writer = csv.writer(fh)
-                writer.writerow(
-                    [
-                        "messageId",
-                        "type",
-                        "qaStatus",
-                        "fhirCount",
-                        "posted",
-                        "latencyMs",
-                        "txMisses",
-                        "postedCount",
-                        "deadLetter",
-                    ]
-                )
-        with metrics_path.open("a", newline="", encoding="utf-8") as fh:
-            writer = csv.writer(fh)
-            writer.writerow(
-                [
-                    str(msg_uuid),
-                    msg_type,
-                    qa_status,
-                    fhir_count,
-                    posted,
-                    latency_ms,
-                    tx_miss,
-                    fhir_count if posted else 0,
-                    dead_letter,
-                ]
-            )
+        bundle_res = result.bundle
+        if not bundle_res:
+            return
+        self._bundle_path(name).write_text(json.dumps(bundle_res, indent=2), encoding="utf-8")
+
+        message_id = result.message_id
+        resource_counts = {k: len(v) for k, v in by_type.items()}
+        fhir_count = len(result.resources) + (1 if self.config.message_mode else 0)
+        qa_status = "ok" if result.qa.get("errors", 0) == 0 else "fail"
+        posted, status, latency_ms, dead_letter = self._post(bundle_res, message_id)
+
+        self._write_metrics(
+            [
+                message_id,
+                result.msg_type,
+                qa_status,
+                fhir_count,
+                posted,
+                latency_ms,
+                result.tx_miss,
+                fhir_count if posted else 0,
+                dead_letter,
+            ]
+        )
 
         log_entry = {
             "ts": datetime.now(tz=timezone.utc).isoformat().replace("+00:00", "Z"),
-            "messageId": str(msg_uuid),
+            "messageId": message_id,
             "phase": "post",
             "posted": posted,
             "status": status,
-            "txMisses": tx_miss,
+            "txMisses": result.tx_miss,
             "resourceCounts": resource_counts,
         }
         logger.info(json.dumps(log_entry))
 
-        if notify_url:
-            payload = {"messageId": str(msg_uuid), "resourceCounts": resource_counts}
+        if self.notify_url:
+            payload = {"messageId": message_id, "resourceCounts": resource_counts}
             for _ in range(3):
                 try:
-                    requests.post(notify_url, json=payload, timeout=5)
+                    requests.post(self.notify_url, json=payload, timeout=5)
                     break
                 except Exception:
                     continue
 
-        audit.emit_and_persist(
-            audit.fhir_audit_event("translate", "success", "cli", str(msg_uuid))
-        )
\ No newline at end of file
+        self._audit.append(audit.fhir_audit_event("translate", "success", "cli", message_id))
+        if len(self._audit) >= _AUDIT_BATCH:
+            self._flush_audit()
+
+    def _flush_audit(self) -> None:
+        if self._audit:
+            audit.emit_and_persist_many(self._audit)
+            self._audit = []
+
+    def close(self) -> None:
+        self._flush_audit()
+        for fh in self._ndjson.values():
+            fh.close()
+        self._ndjson.clear()
+        if self._metrics is not None:
+            self._metrics.close()
+            self._metrics = None
+
+
+_WORKER_CONFIG: TranslateConfig | None = None
+
+
+def _init_worker(config: TranslateConfig) -> None:
+    global _WORKER_CONFIG
+    _WORKER_CONFIG = config
+
+
+def _translate_chunk(texts: List[str]) -> List[TranslatedMessage]:
+    assert _WORKER_CONFIG is not None, "worker not initialised"
+    return [translate_message(text, _WORKER_CONFIG) for text in texts]
+
+
+def iter_translated(
+    messages: Iterable[tuple[str, str]],
+    config: TranslateConfig,
+    workers: int = 1,
+    chunk: int = 16,
+) -> Iterator[tuple[str, TranslatedMessage]]:
+    """Translate ``(name, text)`` pairs, yielding results in input order.
+
+    With ``workers > 1`` chunks of ``chunk`` messages go to a process pool;
+    at most ``2 * workers`` chunks are in flight, so memory stays bounded no
+    matter how large the input is.
+    """
+    if workers <= 1:
+        for name, text in messages:
+            yield name, translate_message(text, config)
+        return
+
+    source = iter(messages)
+    pending: deque[tuple[List[str], Future[List[TranslatedMessage]]]] = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,)) as pool:
+        while True:
+            batch = list(islice(source, max(1, chunk)))
+            if batch:
+                names = [name for name, _ in batch]
+                pending.append((names, pool.submit(_translate_chunk, [text for _, text in batch])))
+            if pending and (not batch or len(pending) >= 2 * workers):
+                names, future = pending.popleft()
+                yield from zip(names, future.result())
+            elif not batch:
+                break
+
+
+def translate(
+    input_path: str,
+    rules: str | None = None,
+    map_path: str | None = None,
+    bundle: str | None = None,
+    out: str = "out/",
+    server: str | None = None,
+    token: str | None = None,
+    validate: bool = False,
+    dry_run: bool = False,
+    message_mode: bool = False,
+    partner: str | None = None,
+    message_endpoint: str | None = None,
+    notify_url: str | None = None,
+    deidentify: bool = False,
+    workers: int = 1,
+    chunk: int = 16,
+) -> int:
+    """Translate HL7 messages to FHIR resources.
+
+    ``input_path`` may be a file, a directory or a glob; multi-message files
+    are split on MSH. Configuration is loaded once, messages are translated
+    across ``workers`` processes and every output goes through one set of
+    writers. Returns the number of messages translated.
+    """
+    config = TranslateConfig.load(
+        map_path,
+        partner,
+        rules=rules,
+        bundle=bundle,
+        message_mode=message_mode,
+        validate=validate,
+        server=server,
+        token=token,
+        deidentify=deidentify,
+    )
+    paths = expand_inputs(input_path)
+    if not paths:
+        raise FileNotFoundError(f"No HL7 input found for {input_path!r}")
+
+    count = 0
+    with _TranslateOutputs(out, config, dry_run, message_endpoint, notify_url) as outputs:
+        for name, result in iter_translated(iter_messages(paths), config, workers, chunk):
+            outputs.emit(name, result)
+            count += 1
+    return count
@@ -5,22 +5,29 @@ import socketserver
 from datetime import datetime
 from pathlib import Path
 
+from silhouette_core.interop.mllp_framing import MLLPFrameDecoder
+
 START_BLOCK = b"\x0b"
 END_BLOCK = b"\x1c"
 CARRIAGE_RETURN = b"\x0d"
 
 
+def _recv_frame(sock: socket.socket, decoder: MLLPFrameDecoder) -> bytes | None:
+    """Receive into ``decoder`` until one frame completes or the peer closes."""
+    while True:
+        nbytes = sock.recv_into(decoder.get_buffer())
+        if not nbytes:
+            return None
+        frames = decoder.buffer_updated(nbytes)
+        if frames:
+            return frames[0]
+
+
 class MLLPHandler(socketserver.BaseRequestHandler):
     def handle(self) -> None:
-        data = b""
-        while True:
-            chunk = self.request.recv(1024)
-            if not chunk:
-                break
-            data += chunk
-            if END_BLOCK in chunk:
-                break
-        message = data.strip(START_BLOCK + END_BLOCK + CARRIAGE_RETURN)
+        message = _recv_frame(self.request, MLLPFrameDecoder())
+        if message is None:
+            return
         out_dir = Path(self.server.out_dir)
         out_dir.mkdir(parents=True, exist_ok=True)
         ts = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
@@ -53,5 +60,7 @@ def send(host: str, port: int, message: bytes) -> bytes:
     frame = START_BLOCK + message + END_BLOCK + CARRIAGE_RETURN
     with socket.create_connection((host, port)) as sock:
         sock.sendall(frame)
-        ack = sock.recv(1024)
-    return ack
\ No newline at end of file
+        ack = _recv_frame(sock, MLLPFrameDecoder())
+    if ack is None:
+        raise ConnectionError("connection closed before an ACK frame arrived")
+    return START_BLOCK + ack + END_BLOCK + CARRIAGE_RETURN
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
 import uuid
 import datetime as dt
 import pathlib
@@ -35,8 +35,13 @@ def fhir_audit_event(action: str, outcome: str, who: str, what: str) -> Dict[str
 
 
 def emit_and_persist(event: Dict[str, Any]) -> None:
+    emit_and_persist_many([event])
+
+
+def emit_and_persist_many(events: Iterable[Dict[str, Any]]) -> None:
     with open(AUDIT_FILE, "a", encoding="utf-8") as f:
-        f.write(json.dumps(event) + "\n")
+        for event in events:
+            f.write(json.dumps(event) + "\n")
     _prune()
 
 
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event, select
+
+from engine.adapters.replay import ReplayAdapter
+from engine.contracts import Message, Result
+from engine.runner import EngineRunner
+from engine.runtime import PipelineRuntime
+from engine.spec import dump_pipeline_spec, load_pipeline_spec
+from insights.models import JobRecord, MessageRecord
+from insights.store import InsightsStore, get_store, reset_store
+
+PIPELINE_YAML = """
+version: 1
+name: replay-paging
+adapter:
+  type: sequence
+  config:
+    messages: []
+operators:
+  - type: echo
+sinks:
+  - type: memory
+"""
+
+
+def _make_store(tmp_path, monkeypatch) -> InsightsStore:
+    reset_store()
+    monkeypatch.setenv("INSIGHTS_DB_URL", f"sqlite:///{tmp_path / 'replay_paging.db'}")
+    store = get_store()
+    store.ensure_schema()
+    return store
+
+
+def _seed_run(store: InsightsStore, count: int) -> tuple[int, list[int]]:
+    run = store.start_run("source")
+    ids = store.record_results(
+        run_id=run.id,
+        results=[
+            Result(message=Message(id=f"s{idx}", raw=f"MSH|{idx}".encode())) for idx in range(count)
+        ],
+    )
+    return run.id, ids
+
+
+def _stored_ids(store: InsightsStore, run_id: int) -> list[str]:
+    with store.session() as session:
+        return list(
+            session.scalars(
+                select(MessageRecord.message_id)
+                .where(MessageRecord.run_id == run_id)
+                .order_by(MessageRecord.id)
+            )
+        )
+
+
+def test_replay_pages_release_the_session_between_pages(tmp_path, monkeypatch):
+    store = _make_store(tmp_path, monkeypatch)
+    run_id, _ = _seed_run(store, 7)
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, *args) -> None:
+        if "FROM engine_messages" in statement:
+            statements.append(statement)
+
+    adapter = ReplayAdapter(name="replay", run_id=run_id, page_size=3)
+
+    async def _collect() -> list[tuple[str, int]]:
+        seen = []
+        async for message in adapter.stream():
+            seen.append((message.id, store.engine.pool.checkedout()))
+        return seen
+
+    event.listen(store.engine, "before_cursor_execute", _capture)
+    try:
+        seen = asyncio.run(_collect())
+    finally:
+        event.remove(store.engine, "before_cursor_execute", _capture)
+
+    assert [message_id for message_id, _ in seen] == [f"s{idx}" for idx in range(7)]
+    assert all(checked_out == 0 for _, checked_out in seen)
+    assert len(statements) == 3
+    # Without a checkpoint consumer nothing is kept per yielded message.
+    assert not adapter._yielded
+    reset_store()
+
+
+def test_replay_resumes_after_id_and_acknowledges_contiguously(tmp_path, monkeypatch):
+    store = _make_store(tmp_path, monkeypatch)
+    run_id, ids = _seed_run(store, 6)
+
+    async def _collect(adapter: ReplayAdapter) -> list[Message]:
+        return [message async for message in adapter.stream()]
+
+    adapter = ReplayAdapter(
+        name="replay",
+        run_id=run_id,
+        page_size=2,
+        after_id=ids[1],
+        max_messages=3,
+        checkpointing=True,
+    )
+    messages = asyncio.run(_collect(adapter))
+    assert [message.id for message in messages] == ["s2", "s3", "s4"]
+    assert [message.meta["source_message_pk"] for message in messages] == ids[2:5]
+
+    # Out-of-order persistence only advances over the contiguous prefix.
+    assert adapter.acknowledge([ids[3]]) == ids[1]
+    assert adapter.acknowledge([ids[2]]) == ids[3]
+    assert adapter.acknowledge([ids[4]]) == ids[4]
+    assert adapter.acknowledged == 3
+    reset_store()
+
+
+def test_runner_resumes_replay_from_job_checkpoint(tmp_path, monkeypatch):
+    store = _make_store(tmp_path, monkeypatch)
+    source_run_id, source_ids = _seed_run(store, 6)
+    pipeline = store.save_pipeline(
+        name="replay-paging",
+        yaml=PIPELINE_YAML,
+        spec=dump_pipeline_spec(load_pipeline_spec(PIPELINE_YAML)),
+    )
+    job = store.enqueue_job(
+        pipeline_id=pipeline.id,
+        kind="replay",
+        payload={"replay_run_id": source_run_id, "page_size": 2},
+    )
+    runner = EngineRunner(store=store, concurrency=1)
+
+    # A previous worker persisted four replayed messages, checkpointed, then died.
+    leased = store.lease_jobs(
+        worker_id=runner.worker_id, now=datetime.utcnow(), lease_ttl_secs=30, limit=1
+    )
+    store.start_job(leased[0].id, runner.worker_id, now=datetime.utcnow())
+    output_run_id = store.start_run("replay-paging").id
+    store.record_results(
+        run_id=output_run_id,
+        results=[Result(message=Message(id=f"s{idx}", raw=b"MSH|")) for idx in range(4)],
+    )
+    checkpoint = {"run_id": output_run_id, "after_id": source_ids[3], "processed": 4}
+    assert store.checkpoint_job(job.id, runner.worker_id, checkpoint)
+    store.fail_job_and_maybe_retry(
+        job_id=job.id, error="worker died", now=datetime.utcnow(), backoff_secs=0
+    )
+
+    async def _execute() -> None:
+        leased = store.lease_jobs(
+            worker_id=runner.worker_id, now=datetime.utcnow(), lease_ttl_secs=30, limit=1
+        )
+        assert leased
+        sem = asyncio.Semaphore(1)
+        await sem.acquire()
+        await runner._execute_job(leased[0], sem)
+
+    asyncio.run(_execute())
+
+    completed = store.get_job(job.id)
+    assert completed.status == "succeeded"
+    assert completed.run_id == output_run_id
+    assert completed.checkpoint == {
+        "run_id": output_run_id,
+        "after_id": source_ids[-1],
+        "processed": 6,
+    }
+    assert _stored_ids(store, output_run_id) == [f"s{idx}" for idx in range(6)]
+
+    assert store.requeue_job(job.id)
+    assert store.get_job(job.id).checkpoint is None
+    reset_store()
+
+
+def test_failed_replay_attempt_is_retried_into_the_same_run(tmp_path, monkeypatch):
+    store = _make_store(tmp_path, monkeypatch)
+    source_run_id, _ = _seed_run(store, 3)
+    pipeline = store.save_pipeline(
+        name="replay-paging",
+        yaml=PIPELINE_YAML,
+        spec=dump_pipeline_spec(load_pipeline_spec(PIPELINE_YAML)),
+    )
+    job = store.enqueue_job(
+        pipeline_id=pipeline.id, kind="replay", payload={"replay_run_id": source_run_id}
+    )
+    runner = EngineRunner(store=store, concurrency=1)
+    run = PipelineRuntime.run
+    failures = [RuntimeError("transient")]
+
+    async def _flaky_run(self, *, max_messages=1):
+        if failures:
+            raise failures.pop()
+        return await run(self, max_messages=max_messages)
+
+    monkeypatch.setattr(PipelineRuntime, "run", _flaky_run)
+
+    async def _execute() -> None:
+        leased = store.lease_jobs(
+            worker_id=runner.worker_id, now=datetime.utcnow(), lease_ttl_secs=30, limit=1
+        )
+        assert leased
+        sem = asyncio.Semaphore(1)
+        await sem.acquire()
+        await runner._execute_job(leased[0], sem)
+
+    asyncio.run(_execute())
+    first = store.get_job(job.id)
+    assert first.status == "queued" and first.checkpoint["processed"] == 0
+    # Skip the retry backoff.
+    with store.session() as session:
+        session.get(JobRecord, job.id).scheduled_at = datetime.utcnow()
+    asyncio.run(_execute())
+
+    completed = store.get_job(job.id)
+    assert completed.status == "succeeded"
+    assert completed.run_id == first.checkpoint["run_id"]
+    assert store.summaries()["totals"]["runs"] == 2
+    reset_store()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from engine.spec import dump_pipeline_spec, load_pipeline_spec
+from insights.store import InsightsStore, reset_store
+
+PIPELINE_YAML = """
+version: 1
+name: lease-pipeline
+adapter:
+  type: sequence
+sinks:
+  - type: memory
+"""
+
+
+def _make_store(tmp_path) -> tuple[InsightsStore, int]:
+    reset_store()
+    store = InsightsStore.from_env(url=f"sqlite:///{tmp_path / 'leasing.db'}")
+    store.ensure_schema()
+    spec = dump_pipeline_spec(load_pipeline_spec(PIPELINE_YAML))
+    record = store.save_pipeline(name="lease-pipeline", yaml=PIPELINE_YAML, spec=spec)
+    return store, record.id
+
+
+@pytest.fixture(params=["lease_jobs", "_lease_jobs_fallback"])
+def lease(request):
+    return request.param
+
+
+def test_lease_claims_batch_in_queue_order(tmp_path, lease):
+    store, pipeline_id = _make_store(tmp_path)
+    jobs = [store.enqueue_job(pipeline_id=pipeline_id, priority=idx % 2) for idx in range(6)]
+    now = datetime.utcnow()
+
+    leased = getattr(store, lease)(worker_id="w1", now=now, lease_ttl_secs=30, limit=4)
+
+    high = [job.id for job in jobs if job.priority == 1]
+    low = [job.id for job in jobs if job.priority == 0]
+    assert [job.id for job in leased] == high + low[:1]
+    assert all(job.status == "leased" and job.leased_by == "w1" for job in leased)
+    assert all(job.lease_expires_at == now + timedelta(seconds=30) for job in leased)
+
+
+def test_competing_workers_never_share_jobs(tmp_path, lease):
+    store, pipeline_id = _make_store(tmp_path)
+    for _ in range(10):
+        store.enqueue_job(pipeline_id=pipeline_id)
+    now = datetime.utcnow()
+
+    first = getattr(store, lease)(worker_id="w1", now=now, lease_ttl_secs=30, limit=6)
+    second = getattr(store, lease)(worker_id="w2", now=now, lease_ttl_secs=30, limit=6)
+    third = getattr(store, lease)(worker_id="w3", now=now, lease_ttl_secs=30, limit=6)
+
+    assert len(first) == 6 and len(second) == 4 and third == []
+    assert not {job.id for job in first} & {job.id for job in second}
+
+
+def test_expired_leases_are_reclaimed(tmp_path, lease):
+    store, pipeline_id = _make_store(tmp_path)
+    job = store.enqueue_job(pipeline_id=pipeline_id)
+    now = datetime.utcnow()
+    assert getattr(store, lease)(worker_id="w1", now=now, lease_ttl_secs=5, limit=1)
+    assert getattr(store, lease)(worker_id="w2", now=now, lease_ttl_secs=5, limit=1) == []
+
+    later = now + timedelta(seconds=6)
+    reclaimed = getattr(store, lease)(worker_id="w2", now=later, lease_ttl_secs=5, limit=1)
+    assert [item.id for item in reclaimed] == [job.id]
+    assert reclaimed[0].leased_by == "w2"
+
+
+def test_lease_uses_single_update_statement(tmp_path):
+    store, pipeline_id = _make_store(tmp_path)
+    if not store.engine.dialect.update_returning:
+        pytest.skip("SQLite build lacks UPDATE ... RETURNING")
+    for _ in range(8):
+        store.enqueue_job(pipeline_id=pipeline_id)
+
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, *args):
+        statements.append(statement.lstrip().split(None, 1)[0].upper())
+
+    event.listen(store.engine, "before_cursor_execute", _capture)
+    try:
+        leased = store.lease_jobs(
+            worker_id="bulk", now=datetime.utcnow(), lease_ttl_secs=30, limit=8
+        )
+    finally:
+        event.remove(store.engine, "before_cursor_execute", _capture)
+
+    assert len(leased) == 8
+    assert statements == ["UPDATE"]
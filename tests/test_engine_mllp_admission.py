@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import random
+
+from engine.net.admission import AdmissionControl, CidrAllowlist, TokenBucket
+from engine.net.mllp_server import MLLPServer
+
+VT = b"\x0b"
+FS_CR = b"\x1c\x0d"
+
+
+def test_allowlist_matches_ipaddress_membership():
+    cidrs = ["10.0.0.0/8", "10.1.0.0/16", "192.168.1.0/25", "192.168.1.128/25", "2001:db8::/32", "bogus"]
+    allowlist = CidrAllowlist(cidrs)
+    networks = [ipaddress.ip_network(raw) for raw in cidrs[:-1]]
+
+    assert allowlist.invalid == ["bogus"]
+    # Nested and adjacent ranges collapse: 10/8, 192.168.1/24, 2001:db8::/32.
+    assert len(allowlist) == 3
+    rng = random.Random(7)
+    for _ in range(2000):
+        ip = ipaddress.IPv4Address(rng.choice([0x0A000000, 0xC0A80100, 0]) + rng.getrandbits(24))
+        assert (str(ip) in allowlist) == any(ip in net for net in networks if net.version == 4)
+    assert "2001:db8::1" in allowlist and "2001:db9::1" not in allowlist
+    assert "::ffff:10.2.3.4" in allowlist
+    assert "not-an-ip" not in allowlist
+    assert not CidrAllowlist([])
+
+
+def test_token_bucket_take_and_reserve():
+    bucket = TokenBucket(rate=2.0, burst=2.0)
+    start = bucket.stamp
+    assert bucket.take(start) and bucket.take(start)
+    assert not bucket.take(start)
+    assert bucket.take(start + 0.5)
+
+    assert bucket.reserve(start + 0.5) == 0.5
+    assert bucket.reserve(start + 0.5) == 1.0
+    assert not bucket.idle(start + 1.0) and bucket.idle(start + 2.5)
+
+
+def test_admission_caps_and_rates_are_counted():
+    control = AdmissionControl(max_connections=3, max_connections_per_peer=2)
+    assert control.admit("10.0.0.1") is None
+    assert control.admit("10.0.0.1") is None
+    assert control.admit("10.0.0.1") == "peer_limit"
+    assert control.admit("10.0.0.2") is None
+    assert control.admit("10.0.0.3") == "capacity"
+    control.release("10.0.0.1")
+    assert control.admit("10.0.0.3") is None
+
+    limited = AdmissionControl(connect_rate=1.0, connect_burst=2.0)
+    assert [limited.admit("10.0.0.9") for _ in range(3)] == [None, None, "rate"]
+
+    stats = control.stats()
+    assert stats["active_connections"] == 3 and stats["accepted_connections"] == 4
+    assert stats["rejected_peer_limit"] == 1 and stats["rejected_capacity"] == 1
+    assert limited.stats()["rejected_rate"] == 1
+
+
+def test_server_enforces_peer_cap_and_reloads_allowlist():
+    received: list[bytes] = []
+
+    async def _handler(payload: bytes, meta: dict[str, str]) -> None:
+        received.append(payload)
+
+    async def _exchange(port: int, payload: bytes | None = None) -> bytes:
+        # Rejected peers get ``AE`` straight away, so those calls only read.
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        if payload is not None:
+            writer.write(VT + payload + FS_CR)
+            await writer.drain()
+        ack = await asyncio.wait_for(reader.readuntil(FS_CR), 5)
+        writer.close()
+        await writer.wait_closed()
+        return ack[1:-2]
+
+    async def _run() -> tuple[bytes, bytes, bytes, dict[str, int]]:
+        server = MLLPServer(
+            host="127.0.0.1",
+            port=0,
+            allow_cidrs=["127.0.0.0/8"],
+            pipeline_id=None,
+            store=None,
+            message_handler=_handler,
+            admission=AdmissionControl(max_connections_per_peer=1),
+        )
+        await server.start()
+        port = server._server.sockets[0].getsockname()[1]
+        try:
+            # Hold one connection open so the next one hits the per-peer cap.
+            _, held = await asyncio.open_connection("127.0.0.1", port)
+            await asyncio.sleep(0.05)
+            capped = await _exchange(port)
+            held.close()
+            await held.wait_closed()
+            await asyncio.sleep(0.05)
+            accepted = await _exchange(port, b"MSH|ok")
+            server.allow_cidrs.remove("127.0.0.0/8")
+            denied = await _exchange(port)
+            return capped, accepted, denied, server.stats()
+        finally:
+            await server.stop()
+
+    capped, accepted, denied, stats = asyncio.run(_run())
+
+    assert (capped, accepted, denied) == (b"AE", b"AA", b"AE")
+    assert received == [b"MSH|ok"]
+    assert stats["rejected_peer_limit"] == 1 and stats["rejected_cidr"] == 1
+    assert stats["accepted_connections"] == 2 and stats["active_connections"] == 0
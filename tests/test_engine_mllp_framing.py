@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import subprocess
+import sys
+
+import pytest
+
+from engine.net.mllp_server import MLLPServer
+from silhouette_core.interop.mllp_framing import (
+    FS_CR,
+    VT,
+    FrameTooLargeError,
+    IncompleteFrameError,
+    MLLPFrameDecoder,
+    MLLPFrameProtocol,
+)
+
+
+def _payloads(rng: random.Random, count: int) -> list[bytes]:
+    return [bytes(rng.randrange(0x20, 0x7F) for _ in range(rng.randint(0, 3000))) for _ in range(count)]
+
+
+def test_decoder_is_independent_of_read_boundaries():
+    rng = random.Random(3)
+    payloads = _payloads(rng, 40)
+    stream = b"".join(b"noise" * (idx % 2) + VT + payload + FS_CR for idx, payload in enumerate(payloads))
+
+    for read_size in (1, 7, 512, 65536):
+        decoder = MLLPFrameDecoder(read_size=read_size)
+        frames: list[bytes] = []
+        for offset in range(0, len(stream), read_size):
+            chunk = stream[offset : offset + read_size]
+            buffer = decoder.get_buffer()
+            buffer[: len(chunk)] = chunk
+            frames.extend(decoder.buffer_updated(len(chunk)))
+        assert frames == payloads
+        assert decoder.discarded == 5 * 20 and decoder.buffered == 0 and not decoder.in_frame
+
+
+def test_decoder_limits_frames_without_buffering_them():
+    decoder = MLLPFrameDecoder(max_frame_bytes=10, read_size=8)
+    # A completed oversized frame is reported after the frames before it.
+    assert decoder.feed(VT + b"ok" + FS_CR + VT + b"x" * 20 + FS_CR) == [b"ok"]
+    with pytest.raises(FrameTooLargeError):
+        decoder.feed(VT + b"next" + FS_CR)
+    assert decoder.feed(b"") == [b"next"]
+
+    # An unterminated one is dropped as soon as it crosses the limit.
+    with pytest.raises(FrameTooLargeError) as excinfo:
+        decoder.feed(VT + b"y" * 50)
+    assert excinfo.value.limit == 10 and decoder.buffered == 0
+    assert decoder.feed(b"y" * 5 + FS_CR + VT + b"after" + FS_CR) == [b"after"]
+
+
+def test_buffered_protocol_pauses_and_reports_partial_frames():
+    async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(b"".join(VT + b"m%d" % idx + FS_CR for idx in range(20)) + VT + b"cut")
+        await writer.drain()
+        writer.close()
+
+    async def _run() -> tuple[list[bytes], bool]:
+        server = await asyncio.start_server(_serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_connection(
+            lambda: MLLPFrameProtocol(high_water=4), "127.0.0.1", port
+        )
+        await asyncio.sleep(0.05)
+        paused = protocol._paused
+        frames = []
+        with pytest.raises(IncompleteFrameError):
+            while True:
+                frames.append(await protocol.read_frame())
+        protocol.close()
+        server.close()
+        await server.wait_closed()
+        return frames, paused
+
+    frames, paused = asyncio.run(_run())
+    assert frames == [b"m%d" % idx for idx in range(20)]
+    assert paused
+
+
+def test_server_accepts_frames_beyond_the_stream_reader_limit():
+    received: list[int] = []
+
+    async def _handler(payload: bytes, meta: dict[str, str]) -> None:
+        received.append(len(payload))
+
+    async def _run() -> bytes:
+        server = MLLPServer(
+            host="127.0.0.1",
+            port=0,
+            allow_cidrs=["127.0.0.1/32"],
+            pipeline_id=None,
+            store=None,
+            message_handler=_handler,
+        )
+        await server.start()
+        port = server._server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(VT + b"MSH|" + b"x" * 200_000 + FS_CR)
+            await writer.drain()
+            ack = await asyncio.wait_for(reader.readuntil(FS_CR), 5)
+            writer.close()
+            await writer.wait_closed()
+            return ack
+        finally:
+            await server.stop()
+
+    assert asyncio.run(_run()) == VT + b"AA" + FS_CR
+    assert received == [200_004]
+
+
+def test_gateway_imports_without_the_engine_runtime():
+    code = (
+        "import sys, silhouette_core.pipelines.mllp_gateway\n"
+        "loaded = {name.split('.')[0] for name in sys.modules}\n"
+        "print(sorted(loaded & {'api', 'engine', 'insights', 'pydantic', 'sqlalchemy'}))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import pytest
+
+from engine.contracts import Message, Result
+from engine.sinks.mllp_target import MLLPTargetSink
+from insights.store import get_store, reset_store
+from silhouette_core.interop.mllp_pool import MLLPConnectionPool, MLLPNakError, ack_code
+
+VT = b"\x0b"
+FS_CR = b"\x1c\x0d"
+
+
+class _Peer:
+    """Asyncio MLLP peer recording frames per connection."""
+
+    def __init__(self, *, ack: bytes = b"MSA|AA|1", batch: int = 1, close_after_ack: bool = False):
+        self.ack = ack
+        self.batch = batch
+        self.close_after_ack = close_after_ack
+        self.connections: list[list[bytes]] = []
+        self.server: asyncio.AbstractServer | None = None
+
+    async def __aenter__(self) -> "_Peer":
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        frames: list[bytes] = []
+        self.connections.append(frames)
+        unacked = 0
+        try:
+            while True:
+                frame = await reader.readuntil(FS_CR)
+                frames.append(frame[1:-2])
+                unacked += 1
+                # ``batch`` > 1 only answers once several frames are pipelined.
+                if unacked < self.batch:
+                    continue
+                writer.write((VT + b"MSH|^~\\&\r" + self.ack + FS_CR) * unacked)
+                await writer.drain()
+                unacked = 0
+                if self.close_after_ack:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _result(idx: int) -> Result:
+    return Result(message=Message(id=str(idx), raw=f"MSH|^~\\&|SIL|{idx}".encode()))
+
+
+def test_pool_reuses_one_connection_for_sequential_sends():
+    async def _run() -> tuple[_Peer, MLLPConnectionPool, list[bytes]]:
+        async with _Peer() as peer:
+            pool = MLLPConnectionPool("127.0.0.1", peer.port)
+            acks = [await pool.send(f"m{idx}".encode()) for idx in range(5)]
+            await pool.close()
+            return peer, pool, acks
+
+    peer, pool, acks = asyncio.run(_run())
+    assert [len(frames) for frames in peer.connections] == [5]
+    assert pool.connects == 1 and pool.sent == 5
+    assert all(ack_code(ack) == "AA" for ack in acks)
+
+
+def test_pool_pipelines_frames_within_window():
+    async def _run() -> tuple[_Peer, list[bytes], dict]:
+        async with _Peer(batch=3) as peer:
+            pool = MLLPConnectionPool("127.0.0.1", peer.port, size=1, window=3)
+            futures = [await pool.submit(f"m{idx}".encode()) for idx in range(6)]
+            acks = await asyncio.wait_for(asyncio.gather(*futures), timeout=5)
+            stats = pool.stats()
+            await pool.close()
+            return peer, acks, stats
+
+    peer, acks, stats = asyncio.run(_run())
+    assert peer.connections == [[f"m{idx}".encode() for idx in range(6)]]
+    assert len(acks) == 6 and stats["in_flight"] == 0
+
+
+def test_pool_reconnects_when_peer_closes_between_messages():
+    async def _run() -> tuple[_Peer, MLLPConnectionPool]:
+        async with _Peer(close_after_ack=True) as peer:
+            pool = MLLPConnectionPool("127.0.0.1", peer.port, size=1)
+            for idx in range(3):
+                await asyncio.wait_for(pool.send(f"m{idx}".encode()), timeout=5)
+            return peer, pool
+
+    peer, pool = asyncio.run(_run())
+    assert [len(frames) for frames in peer.connections] == [1, 1, 1]
+    assert pool.connects == 3
+
+
+def test_pool_backs_off_then_gives_up_on_unreachable_target():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    pool = MLLPConnectionPool(
+        "127.0.0.1", port, connect_retries=2, backoff_initial=0.01, backoff_max=0.02
+    )
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(pool.send(b"MSH|"))
+    assert pool.connect_failures == 3 and pool.connects == 0
+
+
+def test_sink_resolves_target_once_and_surfaces_pipelined_naks(tmp_path, monkeypatch):
+    reset_store()
+    monkeypatch.setenv("INSIGHTS_DB_URL", f"sqlite:///{tmp_path / 'mllp_pool.db'}")
+    store = get_store()
+    store.ensure_schema()
+    lookups: list[str] = []
+    original = store.get_endpoint_by_name
+
+    def _counting(name: str):
+        lookups.append(name)
+        return original(name)
+
+    monkeypatch.setattr(store, "get_endpoint_by_name", _counting)
+
+    async def _run() -> None:
+        async with _Peer() as good, _Peer(ack=b"MSA|AE|1") as bad:
+            store.create_endpoint(
+                kind="mllp_out", name="good", pipeline_id=None,
+                config={"host": "127.0.0.1", "port": good.port},
+            )
+            store.create_endpoint(
+                kind="mllp_out", name="bad", pipeline_id=None,
+                config={"host": "127.0.0.1", "port": bad.port},
+            )
+            sink = MLLPTargetSink(name="mllp_target", target_name="good")
+            for idx in range(4):
+                await sink.write(_result(idx))
+            assert sink.stats()["connects"] == 1
+            await sink.close()
+
+            lenient = MLLPTargetSink(name="mllp_target", target_name="bad", window=4)
+            for idx in range(2):
+                await lenient.write(_result(idx))
+            await lenient.flush()
+            assert lenient.stats()["naks"] == 2
+            await lenient.close()
+
+            pipelined = MLLPTargetSink(
+                name="mllp_target", target_name="bad", window=4, fail_on_nak=True
+            )
+            for idx in range(2):
+                await pipelined.write(_result(idx))
+            with pytest.raises(MLLPNakError) as excinfo:
+                await pipelined.flush()
+            assert excinfo.value.code == "AE"
+            await pipelined.close()
+
+    asyncio.run(_run())
+    assert lookups == ["good", "bad", "bad"]
+    reset_store()
+
+
+def test_sink_rebuilds_its_pool_when_the_target_endpoint_moves(tmp_path, monkeypatch):
+    reset_store()
+    monkeypatch.setenv("INSIGHTS_DB_URL", f"sqlite:///{tmp_path / 'mllp_moved.db'}")
+    store = get_store()
+    store.ensure_schema()
+
+    async def _run() -> tuple[_Peer, _Peer]:
+        async with _Peer() as old, _Peer() as new:
+            endpoint = store.create_endpoint(
+                kind="mllp_out", name="target", pipeline_id=None,
+                config={"host": "127.0.0.1", "port": old.port},
+            )
+            sink = MLLPTargetSink(name="mllp_target", target_name="target")
+            await sink.write(_result(0))
+            await sink.flush()
+            await sink.write(_result(1))
+            await sink.flush()
+
+            store.update_endpoint(endpoint.id, config={"host": "127.0.0.1", "port": new.port})
+            await sink.write(_result(2))
+            await sink.flush()
+            await sink.close()
+            return old, new
+
+    old, new = asyncio.run(_run())
+    assert [len(frames) for frames in old.connections] == [2]
+    assert [len(frames) for frames in new.connections] == [1]
+    reset_store()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+from datetime import datetime
+
+from engine.net.endpoints import EndpointManager
+from engine.net.hl7_ack import build_ack
+from engine.net.mllp_server import BATCH_MS, MLLPServer
+from engine.spec import dump_pipeline_spec, load_pipeline_spec
+from insights.store import InsightsStore, get_store, reset_store
+from silhouette_core.interop.mllp_pool import ack_code
+
+VT = b"\x0b"
+FS_CR = b"\x1c\x0d"
+
+PIPELINE_YAML = """
+version: 1
+name: throughput
+adapter:
+  type: sequence
+  config:
+    messages: []
+operators: []
+sinks:
+  - type: memory
+"""
+
+
+def _message(idx: int) -> bytes:
+    return (
+        f"MSH|^~\\&|ADT|HOSP|ENGINE|SIL|20250101120000||ADT^A01^ADT_A01|MSG{idx:04d}|P|2.5.1\r"
+        f"PID|1||{idx}^^^HOSP^MR||DOE^JANE\r"
+    ).encode()
+
+
+def _make_store(tmp_path, monkeypatch) -> tuple[InsightsStore, int]:
+    reset_store()
+    monkeypatch.setenv("INSIGHTS_DB_URL", f"sqlite:///{tmp_path / 'throughput.db'}")
+    store = get_store()
+    store.ensure_schema()
+    pipeline = store.save_pipeline(
+        name="throughput",
+        yaml=PIPELINE_YAML,
+        spec=dump_pipeline_spec(load_pipeline_spec(PIPELINE_YAML)),
+    )
+    return store, pipeline.id
+
+
+def _server(store: InsightsStore, pipeline_id: int, **options) -> MLLPServer:
+    return MLLPServer(
+        host="127.0.0.1",
+        port=0,
+        allow_cidrs=["127.0.0.1/32"],
+        pipeline_id=pipeline_id,
+        store=store,
+        throughput=True,
+        **options,
+    )
+
+
+def _port(server: MLLPServer) -> int:
+    return server._server.sockets[0].getsockname()[1]
+
+
+async def _pipeline_frames(port: int, frames: list[bytes]) -> list[bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"".join(VT + frame + FS_CR for frame in frames))
+    await writer.drain()
+    acks = []
+    try:
+        for _ in frames:
+            acks.append((await asyncio.wait_for(reader.readuntil(FS_CR), 5))[1:-2])
+    except asyncio.IncompleteReadError:
+        pass
+    writer.close()
+    await writer.wait_closed()
+    return acks
+
+
+def test_build_ack_swaps_routing_and_echoes_control_id():
+    ack = build_ack(_message(7), now=datetime(2025, 1, 2, 3, 4, 5))
+    msh, msa = ack.rstrip(b"\r").split(b"\r")
+    fields = msh.split(b"|")
+
+    assert fields[2:6] == [b"ENGINE", b"SIL", b"ADT", b"HOSP"]
+    assert fields[6] == b"20250102030405"
+    assert fields[8] == b"ACK^A01^ACK"
+    assert fields[10:] == [b"P", b"2.5.1"]
+    assert msa == b"MSA|AA|MSG0007"
+
+    custom = build_ack(b"MSH#$~\\&#A#B#C#D#1##ORU$R01#42#T#2.3\rOBX#1", "AE", text="bad#field$x")
+    assert custom.split(b"\r")[1] == b"MSA#AE#42#badfieldx"
+    assert build_ack(b"PID|1") is None
+
+
+def test_staged_server_batches_commits_and_acks_in_order(tmp_path, monkeypatch):
+    store, pipeline_id = _make_store(tmp_path, monkeypatch)
+
+    async def _run() -> tuple[list[bytes], dict[str, int]]:
+        server = _server(store, pipeline_id, batch_size=5, batch_ms=50)
+        await server.start()
+        try:
+            acks = await _pipeline_frames(_port(server), [_message(idx) for idx in range(12)])
+            return acks, server.stats()
+        finally:
+            await server.stop()
+
+    acks, stats = asyncio.run(_run())
+
+    assert [ack_code(ack) for ack in acks] == ["AA"] * 12
+    assert [ack.split(b"\r")[1] for ack in acks] == [
+        f"MSA|AA|MSG{idx:04d}".encode() for idx in range(12)
+    ]
+    assert stats["committed"] == 12 and stats["batches"] < 12
+    assert len(store.list_jobs(status=["queued"], pipeline_id=pipeline_id, limit=0)) == 12
+    reset_store()
+
+
+def test_commit_policy_naks_batches_rejected_by_the_queue(tmp_path, monkeypatch):
+    store, pipeline_id = _make_store(tmp_path, monkeypatch)
+    monkeypatch.setenv("ENGINE_QUEUE_MAX_QUEUED_PER_PIPELINE", "3")
+
+    async def _run() -> list[bytes]:
+        server = _server(store, pipeline_id, batch_size=5, batch_ms=200)
+        await server.start()
+        try:
+            return await _pipeline_frames(_port(server), [_message(idx) for idx in range(5)])
+        finally:
+            await server.stop()
+
+    acks = asyncio.run(_run())
+
+    assert acks and ack_code(acks[0]) == "AE"
+    assert acks[0].split(b"\r")[1] == b"MSA|AE|MSG0000|queue full"
+    assert store.list_jobs(status=["queued"], pipeline_id=pipeline_id) == []
+    reset_store()
+
+
+def test_receive_policy_acks_before_the_batch_commits(tmp_path, monkeypatch):
+    store, pipeline_id = _make_store(tmp_path, monkeypatch)
+
+    async def _run() -> tuple[list[bytes], int]:
+        server = _server(store, pipeline_id, ack_policy="receive", batch_size=100, batch_ms=10_000)
+        await server.start()
+        try:
+            acks = await _pipeline_frames(_port(server), [_message(idx) for idx in range(3)])
+            queued_before_flush = len(store.list_jobs(status=["queued"], pipeline_id=pipeline_id))
+        finally:
+            await server.stop()
+        return acks, queued_before_flush
+
+    acks, queued_before_flush = asyncio.run(_run())
+
+    assert [ack_code(ack) for ack in acks] == ["AA"] * 3
+    assert queued_before_flush == 0
+    assert len(store.list_jobs(status=["queued"], pipeline_id=pipeline_id)) == 3
+    reset_store()
+
+
+def test_listener_config_with_null_batch_ms_uses_the_default(tmp_path, monkeypatch):
+    store, pipeline_id = _make_store(tmp_path, monkeypatch)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    endpoint = store.create_endpoint(
+        kind="mllp_in", name="null-batch", pipeline_id=pipeline_id,
+        config={"host": "127.0.0.1", "port": port, "mode": "throughput", "batch_ms": None},
+    )
+
+    async def _run() -> float:
+        manager = EndpointManager(store)
+        await manager.start_endpoint(endpoint.id)
+        try:
+            return manager._servers[endpoint.id].batch_ms
+        finally:
+            await manager.stop_endpoint(endpoint.id)
+
+    assert asyncio.run(_run()) == BATCH_MS
+    reset_store()
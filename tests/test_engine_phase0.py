@@ -89,6 +89,23 @@ def test_insights_summary_after_seed(tmp_path):
     assert any(item["count"] >= 1 for item in summary["by_rule"])
 
 
+def test_insights_summary_paging(tmp_path):
+    client, _ = _create_client(tmp_path, seed=True, db_name="paged.db")
+    try:
+        resp = client.get(
+            "/api/insights/summary", params={"limit": 1, "since": "2000-01-01T00:00:00"}
+        )
+        bad = client.get("/api/insights/summary", params={"limit": 0})
+    finally:
+        client.close()
+    assert resp.status_code == 200
+    summary = resp.json()
+    assert len(summary["by_run"]) == 1
+    assert summary["page"]["limit"] == 1
+    assert summary["page"]["total"] == summary["totals"]["runs"]
+    assert bad.status_code == 422
+
+
 def test_engine_nav_visible(tmp_path):
     client, _ = _create_client(tmp_path, seed=True, db_name="nav.db")
     try:
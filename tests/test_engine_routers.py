@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+import pytest
+
+from engine.contracts import Adapter, Message, Result, Sink
+from engine.registry import create_router, dump_registry
+from engine import routers
+from engine.routers import FieldPath, HashRouter, split_segments
+from engine.runtime import PipelineRuntime
+from engine.spec import load_pipeline_spec
+
+
+def _hl7(control_id: str, *, mrn: str, event: str = "ADT^A01", facility: str = "HOSP") -> bytes:
+    return (
+        f"MSH|^~\\&|SIL|{facility}|LAB|DEST|202501010101||{event}|{control_id}|P|2.5\r"
+        f"PID|1||{mrn}^^^MRN||Doe^John\r"
+    ).encode()
+
+
+@dataclass
+class _ListAdapter(Adapter):
+    name: str
+    payloads: list[bytes]
+
+    async def stream(self) -> AsyncIterator[Message]:
+        for idx, raw in enumerate(self.payloads):
+            yield Message(id=f"m{idx}", raw=raw)
+
+
+@dataclass
+class _NamedSink(Sink):
+    name: str
+    seen: list[str] = field(default_factory=list)
+
+    async def write(self, result: Result) -> None:
+        self.seen.append(result.message.id)
+
+
+def _run(router: dict, payloads: list[bytes], sinks: list[_NamedSink], **execution) -> None:
+    spec = load_pipeline_spec(
+        {
+            "name": "routed",
+            "adapter": {"type": "sequence"},
+            "router": router,
+            "execution": execution or {"mode": "serial"},
+        }
+    )
+    runtime = PipelineRuntime(
+        spec=spec,
+        adapter=_ListAdapter(name="list", payloads=payloads),
+        operators=[],
+        sinks=sinks,
+    )
+    asyncio.run(runtime.run(max_messages=None))
+
+
+def test_field_path_extracts_msh_and_components():
+    raw = _hl7("C1", mrn="12345", facility="NORTH")
+    assert FieldPath.parse("MSH-4").extract(raw) == "NORTH"
+    assert FieldPath.parse("msh-9.2").extract(raw) == "A01"
+    assert FieldPath.parse("PID-3.1").extract(raw) == "12345"
+    assert FieldPath.parse("PV1-2").extract(raw) == ""
+    segments = split_segments(raw)
+    assert FieldPath.parse("PID-3.1").lookup(segments) == "12345"
+    assert FieldPath.parse("PV1-2").lookup(segments) == ""
+    with pytest.raises(ValueError):
+        FieldPath.parse("PID3")
+
+
+def test_routers_registered():
+    routers = dump_registry()["routers"]
+    assert {"broadcast", "round-robin", "hash", "content"} <= set(routers)
+
+
+def test_broadcast_is_default():
+    sinks = [_NamedSink("a"), _NamedSink("b")]
+    _run({}, [_hl7("C1", mrn="1"), _hl7("C2", mrn="2")], sinks)
+    assert sinks[0].seen == sinks[1].seen == ["m0", "m1"]
+
+
+def test_round_robin_alternates_replicas():
+    sinks = [_NamedSink("a"), _NamedSink("b"), _NamedSink("audit")]
+    payloads = [_hl7(f"C{idx}", mrn=str(idx)) for idx in range(5)]
+    _run({"strategy": "round_robin", "config": {"sinks": ["a", "b"]}}, payloads, sinks)
+    assert sinks[0].seen == ["m0", "m2", "m4"]
+    assert sinks[1].seen == ["m1", "m3"]
+    assert sinks[2].seen == []
+
+
+def test_hash_router_is_sticky_per_patient_and_preserves_order():
+    sinks = [_NamedSink("shard-a"), _NamedSink("shard-b"), _NamedSink("shard-c")]
+    mrns = [str(100 + (idx % 7)) for idx in range(40)]
+    payloads = [_hl7(f"C{idx}", mrn=mrn) for idx, mrn in enumerate(mrns)]
+    _run(
+        {"strategy": "hash", "config": {"field": "PID-3.1"}},
+        payloads,
+        sinks,
+        mode="batched",
+        batch_size=8,
+        max_in_flight=4,
+    )
+
+    owner: dict[str, str] = {}
+    for sink in sinks:
+        assert sink.seen == sorted(sink.seen, key=lambda mid: int(mid[1:]))
+        for mid in sink.seen:
+            mrn = mrns[int(mid[1:])]
+            assert owner.setdefault(mrn, sink.name) == sink.name
+    assert sum(len(sink.seen) for sink in sinks) == 40
+    assert len(set(owner.values())) > 1
+
+
+def test_hash_ring_only_remaps_keys_owned_by_removed_sink():
+    full = [_NamedSink("a"), _NamedSink("b"), _NamedSink("c")]
+    reduced = full[:2]
+    ring_full = HashRouter(field_path=FieldPath.parse("PID-3.1"))
+    ring_full.bind(full)
+    ring_reduced = HashRouter(field_path=FieldPath.parse("PID-3.1"))
+    ring_reduced.bind(reduced)
+
+    for idx in range(200):
+        result = Result(message=Message(id=str(idx), raw=_hl7("C", mrn=str(idx))))
+        before = ring_full.route(result)[0]
+        after = ring_reduced.route(result)[0]
+        if before is not full[2]:
+            assert after is before
+
+
+def test_hash_router_rejects_non_positive_vnodes():
+    with pytest.raises(ValueError, match="vnodes must be positive"):
+        create_router("hash", {"vnodes": 0})
+    with pytest.raises(ValueError, match="vnodes must be positive"):
+        create_router("hash", {"vnodes": -4})
+    assert create_router("hash", {}).vnodes == 64
+
+
+def test_content_router_rules_and_default(monkeypatch):
+    splits: list[bytes] = []
+
+    def _counting_split(raw: bytes) -> dict[str, list[str]]:
+        splits.append(raw)
+        return split_segments(raw)
+
+    monkeypatch.setattr(routers, "split_segments", _counting_split)
+    sinks = [_NamedSink("adt"), _NamedSink("lab"), _NamedSink("catchall")]
+    payloads = [
+        _hl7("C0", mrn="1", event="ADT^A01"),
+        _hl7("C1", mrn="2", event="ORU^R01"),
+        _hl7("C2", mrn="3", event="SIU^S12"),
+        _hl7("C3", mrn="4", event="ADT^A08", facility="NORTH"),
+    ]
+    router = {
+        "strategy": "content",
+        "config": {
+            "match": "all",
+            "rules": [
+                {"field": "MSH-9.1", "equals": "ADT", "sinks": ["adt"]},
+                {"field": "MSH-9.1", "in": ["ORU", "ORM"], "sinks": [1]},
+                {"field": "MSH-4", "matches": "^NOR", "sinks": ["lab"]},
+            ],
+            "default": ["catchall"],
+        },
+    }
+    _run(router, payloads, sinks)
+    assert sinks[0].seen == ["m0", "m3"]
+    assert sinks[1].seen == ["m1", "m3"]
+    assert sinks[2].seen == ["m2"]
+    # Three rules, but each message is split only once.
+    assert splits == payloads
+
+
+def test_content_router_rejects_unknown_sink():
+    with pytest.raises(ValueError, match="unknown sink"):
+        _run(
+            {
+                "strategy": "content",
+                "config": {"rules": [{"field": "MSH-9.1", "equals": "ADT", "sinks": ["nope"]}]},
+            },
+            [],
+            [_NamedSink("adt")],
+        )
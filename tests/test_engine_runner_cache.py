@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from engine.builtins import get_memory_sinks, reset_memory_sinks
+from engine.contracts import Message, Result
+from engine.runner import EngineRunner
+from engine.runtime import PipelineRuntime, RuntimeCache
+from engine.spec import dump_pipeline_spec, load_pipeline_spec
+from insights.store import InsightsStore, reset_store
+
+
+def _pipeline_yaml(label: str) -> str:
+    return f"""
+version: 1
+name: cached
+adapter:
+  type: sequence
+  config:
+    messages:
+      - id: "c1"
+        text: hello
+operators:
+  - type: echo
+sinks:
+  - type: memory
+    config:
+      label: {label}
+"""
+
+
+def _make_store(tmp_path) -> tuple[InsightsStore, int]:
+    reset_store()
+    store = InsightsStore.from_env(url=f"sqlite:///{tmp_path / 'runner_cache.db'}")
+    store.ensure_schema()
+    yaml_body = _pipeline_yaml("first")
+    record = store.save_pipeline(
+        name="cached",
+        yaml=yaml_body,
+        spec=dump_pipeline_spec(load_pipeline_spec(yaml_body)),
+    )
+    return store, record.id
+
+
+def _execute_next(runner: EngineRunner, store: InsightsStore) -> None:
+    async def _run() -> None:
+        leased = store.lease_jobs(
+            worker_id=runner.worker_id, now=datetime.utcnow(), lease_ttl_secs=30, limit=1
+        )
+        assert leased
+        sem = asyncio.Semaphore(1)
+        await sem.acquire()
+        await runner._execute_job(leased[0], sem)
+
+    asyncio.run(_run())
+
+
+def test_runner_reuses_warm_runtime_until_spec_changes(tmp_path):
+    reset_memory_sinks()
+    store, pipeline_id = _make_store(tmp_path)
+    runner = EngineRunner(store=store, concurrency=1)
+
+    for _ in range(3):
+        store.enqueue_job(pipeline_id=pipeline_id, payload={"persist": False})
+        _execute_next(runner, store)
+
+    sinks = get_memory_sinks()
+    assert len(sinks) == 1
+    assert [result.message.id for result in sinks[0].store] == ["c1", "c1", "c1"]
+    assert runner.runtime_cache.stats() == {
+        "entries": 1,
+        "hits": 2,
+        "misses": 1,
+        "invalidations": 0,
+        "evictions": 0,
+    }
+
+    updated = _pipeline_yaml("second")
+    store.save_pipeline(
+        pipeline_id=pipeline_id,
+        name="cached",
+        yaml=updated,
+        spec=dump_pipeline_spec(load_pipeline_spec(updated)),
+    )
+    store.enqueue_job(pipeline_id=pipeline_id, payload={"persist": False})
+    _execute_next(runner, store)
+
+    sinks = get_memory_sinks()
+    assert [sink.name for sink in sinks] == ["first", "second"]
+    assert runner.runtime_cache.stats()["invalidations"] == 1
+    reset_memory_sinks()
+
+
+def test_runtime_cache_evicts_least_recently_used():
+    reset_memory_sinks()
+    cache = RuntimeCache(max_entries=2)
+    first = cache.get(1, _pipeline_yaml("one"))
+    cache.get(2, _pipeline_yaml("two"))
+    assert cache.get(1, _pipeline_yaml("one")) is first
+    cache.get(3, _pipeline_yaml("three"))
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.get(1, _pipeline_yaml("one")) is first
+    assert cache.get(2, _pipeline_yaml("two")) is not None
+    assert cache.stats()["misses"] == 4
+    reset_memory_sinks()
+
+
+def test_runtime_cache_closes_sinks_of_dropped_entries(monkeypatch):
+    from engine.builtins import _MemorySink
+
+    reset_memory_sinks()
+    closed: list[str] = []
+
+    async def _close(self) -> None:
+        closed.append(self.name)
+
+    monkeypatch.setattr(_MemorySink, "close", _close)
+
+    async def _run() -> None:
+        cache = RuntimeCache(max_entries=1)
+        cache.get(1, _pipeline_yaml("one"))
+        cache.get(2, _pipeline_yaml("two"))
+        cache.get(2, _pipeline_yaml("two-edited"))
+        await asyncio.sleep(0)
+
+    asyncio.run(_run())
+    assert closed == ["one", "two"]
+    reset_memory_sinks()
+
+
+def test_concurrent_runs_lease_their_own_sinks_and_router():
+    reset_memory_sinks()
+
+    async def _run() -> None:
+        warm = RuntimeCache(max_entries=1).get(1, _pipeline_yaml("one"))
+        first = warm.runtime()
+        second = warm.runtime()
+        assert first.sinks[0] is not second.sinks[0]
+        assert first.router is not second.router
+        assert first.operators[0] is second.operators[0]
+
+        await warm.release(first)
+        await warm.release(second, reuse=False)
+        third = warm.runtime()
+        assert third.sinks[0] is first.sinks[0]
+        assert third.router is first.router
+
+    asyncio.run(_run())
+    assert len(get_memory_sinks()) == 2
+    reset_memory_sinks()
+
+
+def test_failed_attempt_discards_its_partial_run(tmp_path, monkeypatch):
+    store, pipeline_id = _make_store(tmp_path)
+    runner = EngineRunner(store=store, concurrency=1)
+
+    async def _fail_midway(self, *, max_messages=1):
+        await self._persist_result(Result(message=Message(id="p1", raw=b"MSH|"), issues=[]))
+        raise RuntimeError("sink unavailable")
+
+    monkeypatch.setattr(PipelineRuntime, "run", _fail_midway)
+    job = store.enqueue_job(pipeline_id=pipeline_id, payload={"persist": True})
+    _execute_next(runner, store)
+
+    assert store.get_job(job.id).status == "queued"
+    assert store.summaries()["totals"] == {"runs": 0, "messages": 0, "issues": 0}
+
+
+def test_cancelled_attempt_discards_its_partial_run(tmp_path, monkeypatch):
+    store, pipeline_id = _make_store(tmp_path)
+    runner = EngineRunner(store=store, concurrency=1)
+    persisted = asyncio.Event()
+
+    async def _hang_midway(self, *, max_messages=1):
+        await self._persist_result(Result(message=Message(id="p1", raw=b"MSH|"), issues=[]))
+        persisted.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(PipelineRuntime, "run", _hang_midway)
+    store.enqueue_job(pipeline_id=pipeline_id, payload={"persist": True})
+
+    async def _run() -> None:
+        leased = store.lease_jobs(
+            worker_id=runner.worker_id, now=datetime.utcnow(), lease_ttl_secs=30, limit=1
+        )
+        sem = asyncio.Semaphore(1)
+        await sem.acquire()
+        task = asyncio.ensure_future(runner._execute_job(leased[0], sem))
+        await asyncio.wait_for(persisted.wait(), timeout=5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_run())
+    assert store.summaries()["totals"] == {"runs": 0, "messages": 0, "issues": 0}
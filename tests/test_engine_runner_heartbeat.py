@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from engine.runner import EngineRunner, _ActiveJob
+from engine.spec import dump_pipeline_spec, load_pipeline_spec
+from insights.store import InsightsStore, reset_store
+
+PIPELINE_YAML = """
+version: 1
+name: heartbeat
+adapter:
+  type: sequence
+  config:
+    messages:
+      - id: "h1"
+        text: hello
+sinks:
+  - type: memory
+"""
+
+
+def _make_store(tmp_path) -> tuple[InsightsStore, int]:
+    reset_store()
+    store = InsightsStore.from_env(url=f"sqlite:///{tmp_path / 'heartbeat.db'}")
+    store.ensure_schema()
+    spec = dump_pipeline_spec(load_pipeline_spec(PIPELINE_YAML))
+    record = store.save_pipeline(name="heartbeat", yaml=PIPELINE_YAML, spec=spec)
+    return store, record.id
+
+
+@dataclass
+class _FakeRuntime:
+    processed: int
+
+    def metrics(self) -> dict:
+        return {"processed": self.processed, "in_flight": 2}
+
+
+def test_reaper_requeues_lapsed_leases(tmp_path):
+    store, pipeline_id = _make_store(tmp_path)
+    waiting = store.enqueue_job(pipeline_id=pipeline_id)
+    crashed = store.enqueue_job(pipeline_id=pipeline_id)
+    exhausted = store.enqueue_job(pipeline_id=pipeline_id, max_attempts=1)
+    now = datetime.utcnow()
+    store.lease_jobs(worker_id="w1", now=now, lease_ttl_secs=5, limit=3)
+    store.start_job(crashed.id, "w1", now=now)
+    store.start_job(exhausted.id, "w1", now=now)
+
+    assert store.reap_expired_leases(now + timedelta(seconds=4)) == []
+    reaped = store.reap_expired_leases(now + timedelta(seconds=6))
+
+    assert {job.id for job in reaped} == {waiting.id, crashed.id, exhausted.id}
+    assert (store.get_job(waiting.id).status, store.get_job(waiting.id).attempts) == ("queued", 0)
+    requeued = store.get_job(crashed.id)
+    assert (requeued.status, requeued.attempts, requeued.leased_by) == ("queued", 1, None)
+    assert "lease expired" in requeued.last_error
+    assert store.get_job(exhausted.id).status == "dead"
+
+
+def test_heartbeat_extends_lease_and_records_progress(tmp_path):
+    store, pipeline_id = _make_store(tmp_path)
+    job = store.enqueue_job(pipeline_id=pipeline_id)
+    runner = EngineRunner(store=store, concurrency=1, lease_ttl_secs=30)
+    now = datetime.utcnow()
+    store.lease_jobs(worker_id=runner.worker_id, now=now, lease_ttl_secs=1, limit=1)
+    runner._active[job.id] = _ActiveJob(job_id=job.id, runtime=_FakeRuntime(processed=7))
+
+    runner.heartbeat()
+
+    record = store.get_job(job.id)
+    assert record.lease_expires_at >= now + timedelta(seconds=29)
+    assert record.heartbeat_at is not None
+    assert record.progress["processed"] == 7 and record.progress["in_flight"] == 2
+
+
+def test_heartbeat_cancels_job_whose_lease_was_lost(tmp_path):
+    store, pipeline_id = _make_store(tmp_path)
+    job = store.enqueue_job(pipeline_id=pipeline_id)
+    runner = EngineRunner(store=store, concurrency=1)
+    store.lease_jobs(worker_id=runner.worker_id, now=datetime.utcnow(), lease_ttl_secs=30, limit=1)
+
+    async def _scenario() -> bool:
+        task = asyncio.create_task(asyncio.sleep(30))
+        runner._active[job.id] = _ActiveJob(job_id=job.id, task=task)
+        store.cancel_job(job.id)
+        runner.heartbeat()
+        await asyncio.gather(task, return_exceptions=True)
+        return task.cancelled()
+
+    assert asyncio.run(_scenario())
+    assert job.id not in runner._active
+
+
+def test_runner_recovers_job_from_crashed_worker(tmp_path):
+    store, pipeline_id = _make_store(tmp_path)
+    job = store.enqueue_job(pipeline_id=pipeline_id, payload={"persist": False})
+    now = datetime.utcnow()
+    store.lease_jobs(worker_id="gone:1", now=now, lease_ttl_secs=1, limit=1)
+    store.start_job(job.id, "gone:1", now=now)
+    runner = EngineRunner(
+        store=store,
+        concurrency=1,
+        poll_interval=30,
+        lease_ttl_secs=2,
+        heartbeat_interval=0.5,
+        reap_interval=0.2,
+    )
+
+    async def _scenario() -> None:
+        task = asyncio.create_task(runner.run_forever())
+        try:
+            for _ in range(200):
+                if store.get_job(job.id).status == "succeeded":
+                    break
+                await asyncio.sleep(0.025)
+        finally:
+            await runner.stop()
+            await asyncio.wait_for(task, 5)
+
+    asyncio.run(_scenario())
+    record = store.get_job(job.id)
+    assert record.status == "succeeded"
+    assert record.attempts == 1
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from engine.runner import EngineRunner
+from engine.spec import dump_pipeline_spec, load_pipeline_spec
+from insights import notify
+from insights.store import InsightsStore, reset_store
+
+PIPELINE_YAML = """
+version: 1
+name: wakeup
+adapter:
+  type: sequence
+  config:
+    messages:
+      - id: "w1"
+        text: hello
+sinks:
+  - type: memory
+"""
+
+
+def _make_store(tmp_path) -> tuple[InsightsStore, int]:
+    reset_store()
+    store = InsightsStore.from_env(url=f"sqlite:///{tmp_path / 'wakeup.db'}")
+    store.ensure_schema()
+    spec = dump_pipeline_spec(load_pipeline_spec(PIPELINE_YAML))
+    record = store.save_pipeline(name="wakeup", yaml=PIPELINE_YAML, spec=spec)
+    return store, record.id
+
+
+def test_enqueue_wakes_idle_runner_without_waiting_for_poll(tmp_path):
+    notify.set_channels([notify.LocalNotifier()])
+    store, pipeline_id = _make_store(tmp_path)
+    runner = EngineRunner(store=store, concurrency=1, poll_interval=30)
+
+    async def _scenario() -> float:
+        task = asyncio.create_task(runner.run_forever())
+        await asyncio.sleep(0.1)  # let the runner go idle on an empty queue
+
+        # Producers typically live on another thread (API handlers, MLLP server).
+        holder: dict[str, int] = {}
+        producer = threading.Thread(
+            target=lambda: holder.update(
+                job=store.enqueue_job(pipeline_id=pipeline_id, payload={"persist": False}).id
+            )
+        )
+        started = time.perf_counter()
+        producer.start()
+        producer.join()
+        while store.get_job(holder["job"]).status != "succeeded":
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        await runner.stop()
+        await asyncio.wait_for(task, 5)
+        return elapsed
+
+    try:
+        assert asyncio.run(_scenario()) < 2
+    finally:
+        notify.set_channels(None)
+
+
+def test_socket_notifier_reaches_other_subscribers(tmp_path):
+    producer = notify.SocketNotifier(tmp_path)
+
+    async def _scenario() -> None:
+        event = asyncio.Event()
+        unsubscribe = await notify.SocketNotifier(tmp_path).subscribe(event)
+        try:
+            assert len(list(tmp_path.glob("*.port"))) == 1
+            producer.notify()
+            await asyncio.wait_for(event.wait(), 2)
+        finally:
+            unsubscribe()
+        assert list(tmp_path.glob("*.port")) == []
+
+    try:
+        asyncio.run(_scenario())
+    finally:
+        producer.close()
+
+
+def test_idle_poll_backs_off_only_with_remote_channel(tmp_path):
+    store, _ = _make_store(tmp_path)
+    try:
+        notify.set_channels([notify.LocalNotifier()])
+        assert EngineRunner(store=store, poll_interval=0.5).max_poll_interval == 0.5
+        notify.set_channels([notify.LocalNotifier(), notify.SocketNotifier(tmp_path)])
+        assert EngineRunner(store=store, poll_interval=0.5).max_poll_interval == 5.0
+    finally:
+        notify.set_channels(None)
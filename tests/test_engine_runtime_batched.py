@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+import pytest
+
+from engine.contracts import Adapter, Message, Operator, Result, Sink
+from engine.runtime import PipelineRuntime
+from engine.spec import load_pipeline_spec
+
+
+def _spec(**execution):
+    return load_pipeline_spec(
+        {
+            "name": "batched",
+            "adapter": {"type": "sequence"},
+            "execution": {"mode": "batched", **execution},
+        }
+    )
+
+
+@dataclass
+class _ListAdapter(Adapter):
+    name: str
+    count: int
+
+    async def stream(self) -> AsyncIterator[Message]:
+        for idx in range(self.count):
+            await asyncio.sleep(0)
+            yield Message(id=f"m{idx}", raw=f"payload-{idx}".encode())
+
+
+@dataclass
+class _SlowOperator(Operator):
+    name: str = "slow"
+    active: int = 0
+    peak: int = 0
+
+    async def process(self, msg: Message) -> Result:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(random.uniform(0, 0.005))
+        finally:
+            self.active -= 1
+        return Result(message=msg)
+
+
+@dataclass
+class _RecordingSink(Sink):
+    name: str = "recording"
+    seen: list[str] = field(default_factory=list)
+
+    async def write(self, result: Result) -> None:
+        await asyncio.sleep(random.uniform(0, 0.002))
+        self.seen.append(result.message.id)
+
+
+def test_execution_spec_defaults_and_validation():
+    spec = load_pipeline_spec({"name": "default", "adapter": {"type": "sequence"}})
+    assert spec.execution.mode == "serial"
+    assert spec.execution.ordering == "strict"
+
+    tuned = _spec(batch_size=4, max_in_flight=2, ordering=" Unordered ")
+    assert tuned.execution.batch_size == 4
+    assert tuned.execution.ordering == "unordered"
+
+    with pytest.raises(ValueError):
+        _spec(mode="warp")
+    with pytest.raises(ValueError):
+        _spec(max_in_flight=0)
+
+
+def test_batched_runtime_preserves_sink_order_under_concurrency():
+    operator = _SlowOperator()
+    sinks = [_RecordingSink(), _RecordingSink()]
+    runtime = PipelineRuntime(
+        spec=_spec(batch_size=10, max_in_flight=4),
+        adapter=_ListAdapter(name="list", count=25),
+        operators=[operator],
+        sinks=sinks,
+    )
+
+    results = asyncio.run(runtime.run(max_messages=None))
+
+    expected = [f"m{idx}" for idx in range(25)]
+    assert [result.message.id for result in results] == expected
+    assert all(sink.seen == expected for sink in sinks)
+    assert 1 < operator.peak <= 4
+
+
+def test_batched_runtime_unordered_and_max_messages():
+    persisted: list[str] = []
+
+    async def _persist(result: Result) -> None:
+        persisted.append(result.message.id)
+
+    sink = _RecordingSink()
+    runtime = PipelineRuntime(
+        spec=_spec(batch_size=3, max_in_flight=3, ordering="unordered"),
+        adapter=_ListAdapter(name="list", count=20),
+        operators=[_SlowOperator()],
+        sinks=[sink],
+        persist_result=_persist,
+    )
+
+    results = asyncio.run(runtime.run(max_messages=7))
+
+    expected = [f"m{idx}" for idx in range(7)]
+    assert [result.message.id for result in results] == expected
+    assert sorted(sink.seen) == sorted(expected)
+    assert persisted == expected
+
+
+def test_batched_runtime_reports_in_flight_operators():
+    operator = _SlowOperator()
+    runtime = PipelineRuntime(
+        spec=_spec(batch_size=8, max_in_flight=3),
+        adapter=_ListAdapter(name="list", count=16),
+        operators=[operator],
+        sinks=[_RecordingSink()],
+    )
+    observed: list[int] = []
+    process = operator.process
+
+    async def _observe(msg: Message) -> Result:
+        observed.append(runtime.metrics()["in_flight"])
+        return await process(msg)
+
+    operator.process = _observe  # type: ignore[method-assign]
+    asyncio.run(runtime.run(max_messages=None))
+
+    assert 1 < max(observed) <= 3
+    assert runtime.metrics()["in_flight"] == 0
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+import pytest
+
+from engine.contracts import Adapter, Message, Operator, Result, Sink
+from engine.runtime import PipelineRuntime
+from engine.spec import load_pipeline_spec
+
+
+def _spec(**execution):
+    return load_pipeline_spec(
+        {
+            "name": "staged",
+            "adapter": {"type": "sequence"},
+            "execution": {"mode": "staged", **execution},
+        }
+    )
+
+
+@dataclass
+class _CountingAdapter(Adapter):
+    name: str
+    count: int
+    produced: int = 0
+
+    async def stream(self) -> AsyncIterator[Message]:
+        for idx in range(self.count):
+            self.produced += 1
+            yield Message(id=f"m{idx}", raw=b"x")
+
+
+@dataclass
+class _Operator(Operator):
+    name: str = "op"
+    fail_on: str | None = None
+
+    async def process(self, msg: Message) -> Result:
+        await asyncio.sleep(0)
+        if msg.id == self.fail_on:
+            raise RuntimeError("operator exploded")
+        return Result(message=msg)
+
+
+@dataclass
+class _GatedSink(Sink):
+    name: str = "gated"
+    gate: asyncio.Event | None = None
+    seen: list[str] = field(default_factory=list)
+
+    async def write(self, result: Result) -> None:
+        if self.gate is not None:
+            await self.gate.wait()
+        await asyncio.sleep(0)
+        self.seen.append(result.message.id)
+
+
+def test_execution_spec_watermark_defaults_and_validation():
+    spec = _spec(queue_size=10)
+    assert spec.execution.high_water == 10
+    assert spec.execution.low_water == 5
+
+    with pytest.raises(ValueError):
+        _spec(queue_size=4, high_water=8)
+    with pytest.raises(ValueError):
+        _spec(queue_size=8, high_water=4, low_water=4)
+
+
+def test_staged_runtime_pauses_adapter_when_sink_lags():
+    async def _run() -> None:
+        adapter = _CountingAdapter(name="counting", count=60)
+        sink = _GatedSink(gate=asyncio.Event())
+        runtime = PipelineRuntime(
+            spec=_spec(queue_size=4, high_water=4, low_water=1, max_in_flight=2),
+            adapter=adapter,
+            operators=[_Operator()],
+            sinks=[sink],
+        )
+        task = asyncio.create_task(runtime.run(max_messages=None))
+        for _ in range(500):
+            await asyncio.sleep(0)
+            snapshot = runtime.metrics()
+            if snapshot["adapter_paused"] and snapshot["stages"]["egress"]["paused"]:
+                break
+        paused = runtime.metrics()
+        assert paused["adapter_paused"] is True
+        assert paused["stages"]["ingress"]["depth"] >= 4
+        assert paused["stages"]["egress"]["paused"] is True
+        # The adapter is held back instead of draining the whole source.
+        assert adapter.produced < 60
+
+        sink.gate.set()
+        results = await asyncio.wait_for(task, timeout=5)
+
+        expected = [f"m{idx}" for idx in range(60)]
+        assert [result.message.id for result in results] == expected
+        assert sink.seen == expected
+        metrics = runtime.metrics()
+        assert metrics["processed"] == 60
+        assert metrics["in_flight"] == 0
+        assert metrics["adapter_paused"] is False
+        assert metrics["adapter_stalls"] >= 1
+        assert metrics["stages"]["ingress"]["peak_depth"] <= 4
+        assert metrics["stages"]["egress"]["stalls"] >= 1
+
+    asyncio.run(_run())
+
+
+def test_staged_runtime_unordered_respects_max_messages():
+    persisted: list[str] = []
+
+    async def _persist(result: Result) -> None:
+        persisted.append(result.message.id)
+
+    sink = _GatedSink()
+    runtime = PipelineRuntime(
+        spec=_spec(queue_size=3, max_in_flight=3, ordering="unordered"),
+        adapter=_CountingAdapter(name="counting", count=20),
+        operators=[_Operator()],
+        sinks=[sink],
+        persist_result=_persist,
+    )
+
+    results = asyncio.run(runtime.run(max_messages=9))
+
+    expected = [f"m{idx}" for idx in range(9)]
+    assert [result.message.id for result in results] == expected
+    assert sorted(sink.seen) == sorted(expected)
+    assert sorted(persisted) == sorted(expected)
+
+
+def test_staged_runtime_propagates_operator_errors():
+    runtime = PipelineRuntime(
+        spec=_spec(queue_size=2, max_in_flight=2),
+        adapter=_CountingAdapter(name="counting", count=50),
+        operators=[_Operator(fail_on="m5")],
+        sinks=[_GatedSink()],
+    )
+
+    with pytest.raises(RuntimeError, match="operator exploded"):
+        asyncio.run(asyncio.wait_for(runtime.run(max_messages=None), timeout=5))
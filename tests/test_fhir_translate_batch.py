@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+import silhouette_core.skills.audit as audit
+from silhouette_core.cli import main
+from silhouette_core.pipelines import hl7_to_fhir
+
+ADT = Path("tests/data/hl7/adt_a01.hl7").read_text(encoding="utf-8")
+FIXTURE = Path("tests/fixtures/hl7/sample_adt_a01.hl7").read_text(encoding="utf-8")
+
+
+def _corpus(tmp_path: Path) -> Path:
+    src = tmp_path / "in"
+    (src / "nested").mkdir(parents=True)
+    # Three messages in one file, MLLP-framed and separated by bare CRs.
+    framed = "".join(f"\x0b{text.strip()}\r\x1c\r" for text in (ADT, FIXTURE, ADT.replace("MSG00001", "MSG00099")))
+    (src / "batch.hl7").write_text(framed, encoding="utf-8", newline="")
+    (src / "nested" / "adt_a01.hl7").write_text(ADT, encoding="utf-8")
+    (src / "notes.txt").write_text(ADT, encoding="utf-8")
+    return src
+
+
+def _translate(tmp_path: Path, src: Path, name: str, **kwargs) -> Path:
+    out = tmp_path / name
+    hl7_to_fhir.translate(
+        input_path=str(src),
+        map_path="maps/adt_uscore.yaml",
+        bundle="transaction",
+        out=str(out),
+        dry_run=True,
+        **kwargs,
+    )
+    return out
+
+
+def _outputs(out: Path) -> dict[str, str]:
+    files = {}
+    for path in sorted(out.rglob("*.*")):
+        text = path.read_text(encoding="utf-8")
+        if path.suffix in (".json", ".ndjson"):
+            lines = [json.loads(line) for line in text.splitlines()] if path.suffix == ".ndjson" else [json.loads(text)]
+            for doc in lines:
+                for res in [doc] + [e["resource"] for e in doc.get("entry", [])]:
+                    res.pop("recorded", None)
+            text = json.dumps(lines)
+        files[path.relative_to(out).as_posix()] = text
+    return files
+
+
+def test_split_messages_keeps_each_msh_block(tmp_path):
+    src = _corpus(tmp_path)
+    messages = list(hl7_to_fhir.split_messages(src / "batch.hl7"))
+    assert len(messages) == 3
+    assert "".join(messages) == (src / "batch.hl7").read_bytes().decode("utf-8")
+
+    names = [name for name, _ in hl7_to_fhir.iter_messages(hl7_to_fhir.expand_inputs(src))]
+    assert names == ["batch_0001", "batch_0002", "batch_0003", "adt_a01"]
+    assert hl7_to_fhir.expand_inputs(str(src / "**" / "*.hl7")) == hl7_to_fhir.expand_inputs(src)
+
+
+def test_directory_batch_matches_single_file_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(audit, "AUDIT_FILE", tmp_path / "audit.ndjson")
+    src = _corpus(tmp_path)
+
+    serial = _translate(tmp_path, src, "serial")
+    bundles = sorted(p.name for p in (serial / "fhir" / "bundles").iterdir())
+    assert bundles == ["adt_a01.json", "batch_0001.json", "batch_0002.json", "batch_0003.json"]
+    patients = (serial / "fhir" / "ndjson" / "Patient.ndjson").read_text(encoding="utf-8").splitlines()
+    assert len(patients) == 4
+    assert len((serial / "metrics.csv").read_text(encoding="utf-8").splitlines()) == 5
+    assert len(audit.AUDIT_FILE.read_text(encoding="utf-8").splitlines()) == 4
+
+    single = _translate(tmp_path, src / "nested" / "adt_a01.hl7", "single")
+    assert _outputs(single)["fhir/bundles/adt_a01.json"] == _outputs(serial)["fhir/bundles/adt_a01.json"]
+    assert _outputs(serial)["fhir/bundles/batch_0001.json"] == _outputs(serial)["fhir/bundles/adt_a01.json"]
+
+    pooled = _translate(tmp_path, src, "pooled", workers=2, chunk=1)
+    assert _outputs(pooled) == _outputs(serial)
+
+
+def test_cli_translates_glob_and_reports_missing_input(tmp_path):
+    src = _corpus(tmp_path)
+    runner = CliRunner()
+    base = ["fhir", "translate", "--map", "maps/adt_uscore.yaml", "--dry-run", "--out", str(tmp_path / "cli")]
+
+    result = runner.invoke(main, [*base, "--in", str(src / "*.hl7"), "--workers", "2"])
+    assert result.exit_code == 0, result.output
+    assert len(list((tmp_path / "cli" / "fhir" / "bundles").glob("batch_*.json"))) == 3
+
+    result = runner.invoke(main, [*base, "--in", str(tmp_path / "missing" / "*.hl7")])
+    assert result.exit_code != 0
+    assert "No HL7 input found" in result.output
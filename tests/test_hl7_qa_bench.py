@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+
+from scripts.bench_hl7_qa import CorpusGenerator, compare, generate_corpus, main, run_key
+from tools.hl7_qa import fast_split_messages, msh_fields_from_raw
+
+
+def test_corpus_is_deterministic_and_follows_the_mix(tmp_path):
+    first, second = tmp_path / "a.hl7", tmp_path / "b.hl7"
+    options = {"seed": 9, "mix": "ADT=1,ORU=3", "obr": 2, "obx": 3, "repeats": 2}
+    generate_corpus(first, 400, **options)
+    generate_corpus(second, 400, **options)
+    assert first.read_bytes() == second.read_bytes()
+
+    messages = fast_split_messages(first.read_bytes())
+    roots = [msh_fields_from_raw(raw)["msg_root"] for raw in messages]
+    assert len(messages) == 400 and set(roots) == {"ADT", "ORU"}
+    assert 0.65 < roots.count("ORU") / 400 < 0.85
+
+    oru = CorpusGenerator(seed=1, mix="ORU=1", obr=2, obx=3, repeats=2).message(0).split(b"\r")
+    assert sum(seg.startswith(b"OBR|") for seg in oru) == 2
+    assert sum(seg.startswith(b"OBX|") for seg in oru) == 6
+    assert next(seg for seg in oru if seg.startswith(b"PID|")).split(b"|")[3].count(b"~") == 1
+
+
+def test_compare_flags_only_regressions_past_thresholds():
+    current = {"engine": "fast", "messages": 10, "workers": "0", "chunk": 5,
+               "msgs_per_sec": 70.0, "p50_ms": 1.0, "p99_ms": 1.4, "peak_rss_mb": 40.0}
+    baseline = {
+        "thresholds": {"msgs_per_sec_drop_pct": 20, "p99_ms_rise_pct": 50},
+        "results": {run_key(current): {"msgs_per_sec": 100.0, "p50_ms": 1.0, "p99_ms": 1.0, "peak_rss_mb": 40.0}},
+    }
+
+    failures = compare([current], baseline)
+    assert len(failures) == 1 and "msgs_per_sec" in failures[0]
+    assert compare([{**current, "messages": 11}], baseline) == []
+
+
+def test_run_writes_and_checks_a_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    argv = ["run", "--messages", "200", "--engines", "fast", "--workers", "0", "--chunk", "50",
+            "--latency-sample", "100", "--baseline", str(baseline)]
+
+    assert main(argv + ["--update-baseline"]) == 0
+    stored = json.loads(baseline.read_text(encoding="utf-8"))
+    (result,) = stored["results"].values()
+    assert result["msgs_per_sec"] > 0 and result["p99_ms"] >= result["p50_ms"]
+
+    result["msgs_per_sec"] *= 100
+    baseline.write_text(json.dumps(stored), encoding="utf-8")
+    assert main(argv) == 1
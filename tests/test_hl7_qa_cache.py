@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from tools.hl7_qa import IssueSet, ResultCache, fast_split_messages, main
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hl7"
+RULES = Path(__file__).parent / "hl7" / "rules" / "rules.yaml"
+
+
+def _run(tmp_path: Path, capsys, corpus: Path, *extra: str) -> tuple[str, dict[str, int]]:
+    report = tmp_path / "report.jsonl"
+    argv = [str(corpus), "--rules", str(RULES), "--report", str(report), "--max-print", "0", *extra]
+    assert main(argv) == 0
+    stats = dict(re.findall(r"(\w+)=(\d+)", capsys.readouterr().out.split("[cache]")[-1]))
+    return report.read_text(encoding="utf-8"), {key: int(value) for key, value in stats.items()}
+
+
+def test_cached_runs_replay_identical_reports(tmp_path, capsys):
+    corpus = tmp_path / "corpus.hl7"
+    corpus.write_bytes(b"\n".join(path.read_bytes() for path in sorted(FIXTURES.glob("*.hl7")) * 2))
+    cache = ["--cache-dir", str(tmp_path / "cache")]
+    expected, _ = _run(tmp_path, capsys, corpus)
+
+    first, stats = _run(tmp_path, capsys, corpus, *cache)
+    assert first == expected and stats["misses"] == 16
+    assert stats["entries"] == len(set(fast_split_messages(corpus.read_bytes())))
+
+    shared = ["--workers", "2", "--chunk", "3", "--shared-input"]
+    for extra in ([], ["--workers", "2", "--chunk", "3"], shared, shared):
+        again, stats = _run(tmp_path, capsys, corpus, *cache, *extra)
+        assert again == expected
+    # --shared-input hashes raw spans; a repeat run replays them all.
+    assert stats["hits"] == 16 and stats["misses"] == 0
+
+    # Hits replayed in the parent still honour --only.
+    only = ["--only", "ADT_A01,ORU^R01"]
+    selected, _ = _run(tmp_path, capsys, corpus, *only)
+    again, stats = _run(tmp_path, capsys, corpus, *cache, *shared, *only)
+    assert again == selected and stats["hits"] == 6 and stats["misses"] == 0
+
+    # Any setting that shapes the results gets its own keys.
+    _, stats = _run(tmp_path, capsys, corpus, *cache, "--max-errors-per-msg", "1")
+    assert stats["hits"] == 0 and stats["misses"] == 16
+
+
+def test_eviction_drops_least_recently_used_runs(tmp_path):
+    result = ({"msg_type": "ORU_R01", "msg_ctrl_id": "C", "version": "2.5"}, IssueSet(errors=["x" * 200]))
+    old = [b"old%04d" % i + bytes(8) for i in range(500)]
+    new = [b"new%04d" % i + bytes(8) for i in range(500)]
+    for keys in (old, new):
+        cache = ResultCache(tmp_path, b"plan", max_bytes=0)
+        cache.store([(key, result) for key in keys])
+        cache.close()
+
+    cache = ResultCache(tmp_path, b"plan", max_bytes=cache.stats.size_bytes // 2)
+    cache.close()
+    assert cache.stats.evicted > 500
+
+    cache = ResultCache(tmp_path, b"plan", max_bytes=0)
+    assert cache.lookup(old) == {}
+    assert cache.lookup(new)[new[-1]] == result
+    cache.close()
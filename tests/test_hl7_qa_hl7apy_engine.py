@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("hl7apy")
+
+import hl7apy
+import hl7apy.core
+from hl7apy.exceptions import HL7apyException
+
+from tools.hl7_qa import RulePlan, RuleSet, ValidationContext, hl7apy_engine, main, validate_message
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hl7"
+RULES = Path(__file__).parent / "hl7" / "rules" / "rules.yaml"
+MESSAGE = (
+    "MSH|^~\\&|APP|FAC|RCV|RF|20240101120000||ORU^R01|C1|P|2.5\r"
+    "PID|1||123^^^H^MR||DOE^J||19800101|M\r"
+    "XX1|1"
+)
+
+
+def test_engine_is_built_once_and_caches_lookups():
+    engine = hl7apy_engine("none")
+    assert hl7apy_engine("none") is engine
+
+    engine.parse(MESSAGE.rsplit("\r", 1)[0])
+    assert hl7apy.core.is_base_datatype.cache_info().hits > 0
+
+    first = hl7apy.find_reference("PID", (hl7apy.core.Segment,), "2.5")
+    again = hl7apy.find_reference("PID", [hl7apy.core.Segment], "2.5")
+    assert first == again and first is not again
+
+
+def test_lazy_parse_skips_segments_the_rules_do_not_read():
+    with pytest.raises(HL7apyException, match="XX1"):
+        hl7apy_engine("none").parse(MESSAGE, frozenset({"MSH", "PID"}))
+
+    parsed = hl7apy_engine("none", mode="lazy").parse(MESSAGE, frozenset({"MSH", "PID"}))
+    assert [seg.name for seg in parsed.children] == ["MSH", "PID"]
+
+    plan = RulePlan.compile(RuleSet.load(RULES))
+    lazy = ValidationContext(quiet_parse=True, hl7apy_validation="none", engine_pref="hl7apy", hl7apy_parse="lazy")
+    _, issues = validate_message(MESSAGE.encode(), plan, max_errors_per_msg=50, ctx=lazy)
+    assert not any("parse_error" in str(issue) for issue in issues.errors)
+
+
+def test_cli_lazy_report_matches_full_on_fixtures(tmp_path):
+    corpus = tmp_path / "corpus.hl7"
+    corpus.write_bytes(b"\n".join(path.read_bytes() for path in sorted(FIXTURES.glob("*.hl7"))))
+    reports = []
+    for mode in ("full", "lazy"):
+        report = tmp_path / f"{mode}.csv"
+        argv = [str(corpus), "--rules", str(RULES), "--engine", "hl7apy", "--hl7apy-parse", mode,
+                "--report", str(report), "--max-print", "0"]
+        assert main(argv) == 0
+        reports.append(report.read_text(encoding="utf-8"))
+
+    assert reports[1] == reports[0]
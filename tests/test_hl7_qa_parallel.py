@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from tools.hl7_qa import iter_ordered_results, main
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hl7"
+RULES = Path(__file__).parent / "hl7" / "rules" / "rules.yaml"
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_ordered_results_follow_input_and_bound_inflight():
+    rng = random.Random(7)
+    delays = [rng.random() / 200 for _ in range(60)]
+    yielded = 0
+    high_water = 0
+
+    def work(chunk, scale):
+        time.sleep(delays[chunk])
+        return chunk * scale
+
+    with _CountingExecutor(max_workers=4) as ex:
+        out = []
+        for result in iter_ordered_results(ex, work, range(60), 10, max_inflight=5):
+            out.append(result)
+            yielded += 1
+            high_water = max(high_water, ex.submitted - yielded + 1)
+
+    assert out == [idx * 10 for idx in range(60)]
+    assert high_water <= 5
+
+
+def test_ordered_results_surface_worker_errors():
+    release = threading.Event()
+
+    def work(chunk):
+        if chunk == 2:
+            raise ValueError("bad chunk")
+        release.wait(1)
+        return chunk
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        results = iter_ordered_results(ex, work, range(10), max_inflight=3)
+        release.set()
+        with pytest.raises(ValueError, match="bad chunk"):
+            list(results)
+
+
+def test_cli_workers_report_matches_serial(tmp_path):
+    corpus = tmp_path / "corpus.hl7"
+    corpus.write_bytes(b"\n".join(path.read_bytes() for path in sorted(FIXTURES.glob("*.hl7")) * 4))
+    reports = []
+    for extra in ([], ["--workers", "2", "--chunk", "3", "--max-inflight", "2"]):
+        report = tmp_path / f"report{len(reports)}.csv"
+        argv = [str(corpus), "--rules", str(RULES), "--report", str(report), "--max-print", "0"]
+        assert main(argv + extra) == 0
+        reports.append(report.read_text(encoding="utf-8"))
+
+    assert reports[1] == reports[0]
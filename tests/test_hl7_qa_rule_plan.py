@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from tools.hl7_qa import (
+    FieldPath,
+    RulePlan,
+    RuleSet,
+    ValidationContext,
+    build_msg_index,
+    fast_split_messages,
+    validate_message,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hl7"
+RULES = Path(__file__).parent / "hl7" / "rules" / "rules.yaml"
+CTX = ValidationContext(quiet_parse=True, hl7apy_validation="none", engine_pref="auto")
+
+
+def _messages() -> list[bytes]:
+    return [msg for path in sorted(FIXTURES.glob("*.hl7")) for msg in fast_split_messages(path.read_bytes())]
+
+
+def test_compiled_plan_survives_pickling_and_matches_ruleset():
+    rules = RuleSet.load(RULES)
+    plan = pickle.loads(pickle.dumps(RulePlan.compile(rules)))
+
+    for raw in _messages():
+        head, issues = validate_message(raw, plan, max_errors_per_msg=50, ctx=CTX)
+        expected_head, expected_issues = validate_message(raw, rules, max_errors_per_msg=50, ctx=CTX)
+        assert head == expected_head
+        assert issues == expected_issues
+
+
+def test_plan_dispatches_by_root_and_limits_indexed_segments():
+    rules = RuleSet.from_dict(
+        {
+            "default_profile": "fallback",
+            "profiles": {
+                "first": {"types": ["ORU"], "policies": {"required_fields": ["PID-3.1"]}},
+                "second": {"types": ["ORU", "ADT"]},
+                "fallback": {"timestamps": {"fields": ["EVN-2"]}},
+            },
+        }
+    )
+    plan = RulePlan.compile(rules)
+
+    assert plan.select("ORU").name == "first"
+    assert plan.select("ADT").name == "second"
+    assert plan.select("MDM").name == "fallback" and plan.select("").name == "fallback"
+    assert plan.select("ORU").segments == frozenset({"MSH", "PID"})
+    assert plan.select("MDM").segments == frozenset({"MSH", "EVN"})
+
+
+def test_field_paths_apply_msh_offset_and_components():
+    idx_pack = build_msg_index(b"MSH|^~\\&|APP|FAC\rPID|1||123^^^HOSP&1.2&ISO~456\r")
+
+    assert FieldPath.parse("MSH-1").values(idx_pack) == ["|"]
+    assert FieldPath.parse("MSH-3").values(idx_pack) == ["APP"]
+    assert FieldPath.parse("PID-3.1").values(idx_pack) == ["123", "456"]
+    assert FieldPath.parse("PID-3.4.2").values(idx_pack) == ["1.2"]
+
+
+def test_invalid_field_specs_fail_at_compile_time():
+    rules = RuleSet.from_dict({"profiles": {"bad": {"types": ["ORU"], "policies": {"required_fields": ["pid3"]}}}})
+
+    with pytest.raises(ValueError, match="Invalid field spec"):
+        RulePlan.compile(rules)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from tools.hl7_qa import IssueSet, main, pack_results, scan_message_spans, unpack_results
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hl7"
+RULES = Path(__file__).parent / "hl7" / "rules" / "rules.yaml"
+
+
+def _corpus() -> bytes:
+    return b"\n".join(path.read_bytes() for path in sorted(FIXTURES.glob("*.hl7")) * 3)
+
+
+def _report(tmp_path: Path, corpus: Path, *extra: str) -> str:
+    report = tmp_path / f"report{len(list(tmp_path.glob('report*')))}.jsonl"
+    argv = [str(corpus), "--rules", str(RULES), "--report", str(report), "--max-print", "0", *extra]
+    assert main(argv) == 0
+    return report.read_text(encoding="utf-8")
+
+
+def test_packed_results_round_trip():
+    issues = IssueSet()
+    issues.add_err("PID-3.1 missing", 1, spec="PID-3.1", expected="required")
+    issues.add_err("second error", 1)
+    issues.add_warn("naïve value ✓", spec="OBX-5", value="")
+    results = [({"msg_type": "ORU_R01", "msg_ctrl_id": "C1", "version": "2.5"}, issues), None,
+               ({"msg_type": "", "msg_ctrl_id": "", "version": ""}, IssueSet())]
+
+    assert list(unpack_results(pack_results(results))) == results
+    assert list(unpack_results(pack_results([]))) == []
+
+
+def test_shared_input_report_matches_serial(tmp_path):
+    corpus = tmp_path / "corpus.hl7"
+    corpus.write_bytes(b"\xef\xbb\xbf\x0b" + _corpus().replace(b"\nMSH", b"\x1c\r\n\x0bMSH"))
+    spans = scan_message_spans(corpus)
+    assert spans is not None and len(spans) // 2 == 24
+
+    for extra in ([], ["--only", "ORU_R01,ADT^A01", "--start", "2", "--limit", "15"]):
+        serial = _report(tmp_path, corpus, *extra)
+        shared = _report(tmp_path, corpus, "--workers", "2", "--chunk", "4", "--shared-input", *extra)
+        assert shared == serial
+
+
+def test_shared_input_falls_back_for_utf16(tmp_path, capsys):
+    corpus = tmp_path / "corpus16.hl7"
+    corpus.write_bytes(_corpus().decode("utf-8").encode("utf-16"))
+    assert scan_message_spans(corpus) is None
+
+    shared = _report(tmp_path, corpus, "--workers", "2", "--shared-input")
+    assert "--shared-input needs" in capsys.readouterr().err
+    assert shared == _report(tmp_path, corpus)
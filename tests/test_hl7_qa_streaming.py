@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from tools.hl7_qa import (
+    fast_split_messages,
+    iter_message_spans,
+    iter_messages,
+    main,
+    read_file_bytes,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hl7"
+RULES = Path(__file__).parent / "hl7" / "rules" / "rules.yaml"
+
+_MSG = b"MSH|^~\\&|A|B|C|D|20240101||ADT^A01|%d|P|2.5\r\nPID|1||%d\r\n"
+
+
+def _write(tmp_path: Path, blob: bytes) -> Path:
+    path = tmp_path / "input.hl7"
+    path.write_bytes(blob)
+    return path
+
+
+@pytest.mark.parametrize(
+    "blob",
+    [
+        b"".join(_MSG % (idx, idx) for idx in range(50)),
+        b"\xef\xbb\xbf" + b"".join(b"\x0b" + _MSG % (idx, idx) + b"\x1c\r" for idx in range(50)),
+        b"junk\x00\n\x0bmsh|x\nPID|1\n\x1c\x00MSH\x00|^~\\&\rZMSH|no\nMSH",
+        b"",
+    ],
+    ids=["crlf", "mllp-bom", "edge", "empty"],
+)
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_streaming_split_matches_whole_file_split(tmp_path, blob, use_mmap):
+    path = _write(tmp_path, blob)
+    expected = fast_split_messages(read_file_bytes(path))
+
+    for window in (64, 1 << 20):
+        assert list(iter_messages(path, window=window, use_mmap=use_mmap)) == expected
+
+
+def test_spans_address_raw_bytes_and_outgrow_the_window(tmp_path):
+    big = b"MSH|^~\\&|BIG\rOBX|" + b"x" * 5000 + b"\r"
+    blob = _MSG % (1, 1) + big + _MSG % (2, 2)
+    path = _write(tmp_path, blob)
+
+    for use_mmap in (True, False):
+        spans = list(iter_message_spans(path, window=256, use_mmap=use_mmap))
+        assert [blob[off : off + size] for off, size in spans] == [_MSG % (1, 1), big, _MSG % (2, 2)]
+
+
+def test_utf16_input_keeps_first_message(tmp_path):
+    text = "MSH|^~\\&|A\rPID|1\r\nMSH|^~\\&|B\rPID|2\r"
+    path = _write(tmp_path, b"\xff\xfe" + text.encode("utf-16-le"))
+
+    expected = [b"MSH|^~\\&|A\rPID|1\r", b"MSH|^~\\&|B\rPID|2\r"]
+    assert fast_split_messages(read_file_bytes(path)) == expected
+    assert list(iter_messages(path, window=64)) == expected
+
+
+def test_cli_stream_report_matches_default(tmp_path):
+    corpus = b"\n".join(path.read_bytes() for path in sorted(FIXTURES.glob("*.hl7")) * 3)
+    path = _write(tmp_path, corpus)
+    reports = []
+    for extra in ([], ["--stream"], ["--stream", "--no-mmap", "--stream-window-mb", "0.01"]):
+        report = tmp_path / f"report{len(reports)}.jsonl"
+        argv = [str(path), "--rules", str(RULES), "--report", str(report), "--start", "2", "--limit", "15"]
+        assert main(argv + ["--max-print", "0"] + extra) == 0
+        reports.append(report.read_text(encoding="utf-8"))
+
+    assert reports[0].count("\n") == 15
+    assert reports[1] == reports[0] and reports[2] == reports[0]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from engine.adapters.replay import ReplayAdapter
+from engine.contracts import Message, Result
+from insights import payloads
+from insights.models import MessageRecord, PayloadBlobRecord
+from insights.store import InsightsStore, get_store, reset_store
+
+_HL7 = (
+    "MSH|^~\\&|SIL|HOSP|LAB|HOSP|20250101120000||ADT^A01|{idx}|P|2.5\r"
+    "EVN|A01|20250101120000\r"
+    "PID|1||{idx}^^^HOSP^MR||DOE^JANE||19800101|F\r"
+    "PV1|1|I|WARD^101^1\r"
+)
+
+
+def _payload(idx: int) -> bytes:
+    return _HL7.format(idx=idx).encode()
+
+
+def _load_backfill():
+    path = Path(__file__).resolve().parents[1] / "scripts" / "backfill_message_payloads.py"
+    spec = importlib.util.spec_from_file_location("backfill_message_payloads", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _make_store(tmp_path, monkeypatch, fmt: str) -> InsightsStore:
+    reset_store()
+    monkeypatch.setenv("INSIGHTS_DB_URL", f"sqlite:///{tmp_path / 'payloads.db'}")
+    monkeypatch.setenv("INSIGHTS_PAYLOAD_FORMAT", fmt)
+    store = get_store()
+    store.ensure_schema()
+    return store
+
+
+def _replay(run_id: int) -> list[bytes]:
+    async def _collect() -> list[bytes]:
+        return [message.raw async for message in ReplayAdapter(name="replay", run_id=run_id).stream()]
+
+    return asyncio.run(_collect())
+
+
+@pytest.mark.parametrize("codec", ["raw", "zlib"])
+def test_codec_round_trip_with_dictionary(codec):
+    samples = [_payload(idx) for idx in range(50)]
+    dictionary = payloads.train_dictionary(samples, codec="zlib") if codec == "zlib" else None
+    encoder = payloads.PayloadCodec(codec, dictionary_id=7, dictionary=dictionary)
+
+    encoded = encoder.encode(samples[3])
+
+    assert encoded.digest == payloads.payload_digest(samples[3])
+    assert encoded.size == len(samples[3])
+    assert payloads.decode_payload(encoded.codec, encoded.data, dictionary) == samples[3]
+    if codec == "zlib":
+        assert encoded.dictionary_id == 7
+        assert len(encoded.data) < len(payloads.PayloadCodec("zlib").encode(samples[3]).data)
+
+
+@pytest.mark.parametrize("fmt", ["raw", "zlib"])
+def test_blob_payloads_dedupe_and_replay(tmp_path, monkeypatch, fmt):
+    store = _make_store(tmp_path, monkeypatch, fmt)
+    run = store.start_run("blobs")
+    raws = [_payload(idx % 3) for idx in range(9)]
+    store.record_results(
+        run_id=run.id,
+        results=[Result(message=Message(id=f"m{idx}", raw=raw)) for idx, raw in enumerate(raws)],
+    )
+    store.record_result(run_id=run.id, result=Result(message=Message(id="m9", raw=raws[0])))
+
+    with store.session() as session:
+        assert session.scalar(select(func.count(PayloadBlobRecord.id))) == 3
+        assert session.scalar(
+            select(func.count(MessageRecord.id)).where(MessageRecord.payload.is_not(None))
+        ) == 0
+
+    assert _replay(run.id) == raws + [raws[0]]
+    reset_store()
+
+
+def test_backfill_moves_legacy_rows_and_back(tmp_path, monkeypatch):
+    backfill = _load_backfill()
+    store = _make_store(tmp_path, monkeypatch, "base64")
+    raws = [_payload(idx % 4) for idx in range(10)]
+    run_id = store.persist_run_results(
+        pipeline_name="legacy",
+        results=[Result(message=Message(id=f"m{idx}", raw=raw)) for idx, raw in enumerate(raws)],
+    )
+
+    stats = backfill.backfill(store, fmt="zlib", batch=3, train_dictionary=10)
+
+    assert stats["messages"] == 10 and stats["dictionary_id"] is not None
+    with store.session() as session:
+        blobs = session.scalars(select(PayloadBlobRecord)).all()
+        assert len(blobs) == 4
+        assert {blob.dictionary_id for blob in blobs} == {stats["dictionary_id"]}
+    assert _replay(run_id) == raws
+    assert backfill.backfill(store, fmt="zlib")["messages"] == 0
+
+    assert backfill.backfill(store, fmt="base64", batch=4)["messages"] == 10
+    with store.session() as session:
+        assert session.scalar(
+            select(func.count(MessageRecord.id)).where(MessageRecord.payload_blob_id.is_not(None))
+        ) == 0
+    assert _replay(run_id) == raws
+    reset_store()
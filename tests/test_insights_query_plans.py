@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from engine.adapters.replay import ReplayAdapter
+from engine.contracts import Issue, Message, Result
+from engine.ml_assist import _fetch_issue_counts
+from insights.store import InsightsStore, get_store, reset_store
+
+NOW = datetime(2025, 11, 25, 12, 0, 0)
+
+
+@pytest.fixture
+def seeded(tmp_path, monkeypatch):
+    reset_store()
+    monkeypatch.setenv("INSIGHTS_DB_URL", f"sqlite:///{tmp_path / 'plans.db'}")
+    store = get_store()
+    store.ensure_schema()
+    pipeline = store.save_pipeline(name="plans", yaml="version: 1\n", spec={})
+    for idx in range(5):
+        store.enqueue_job(pipeline_id=pipeline.id, priority=idx % 2, scheduled_at=NOW)
+    run = store.start_run("plans")
+    store.record_results(
+        run_id=run.id,
+        results=[
+            Result(
+                message=Message(id=f"m{idx}", raw=b"MSH|"),
+                issues=[Issue(severity="error", code="E1", segment="PID")],
+            )
+            for idx in range(5)
+        ],
+    )
+    yield store, run.id
+    reset_store()
+
+
+@pytest.fixture
+def store(seeded) -> InsightsStore:
+    return seeded[0]
+
+
+def _query_plans(store: InsightsStore, action) -> list[str]:
+    """Run ``action`` and return the EXPLAIN QUERY PLAN of each SELECT/UPDATE it issued."""
+
+    statements: list[tuple[str, tuple]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append((statement, parameters))
+
+    event.listen(store.engine, "before_cursor_execute", _capture)
+    try:
+        action()
+    finally:
+        event.remove(store.engine, "before_cursor_execute", _capture)
+
+    plans = []
+    with store.engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append("\n".join(row[-1] for row in rows))
+    return plans
+
+
+def _assert_uses(plan: str, *indexes: str, table: str) -> None:
+    for index in indexes:
+        assert f"INDEX {index}" in plan, plan
+    assert f"SCAN {table}\n" not in f"{plan}\n", plan
+
+
+@pytest.mark.parametrize("lease", ["lease_jobs", "_lease_jobs_fallback"])
+def test_job_leasing_searches_indexes(store, lease):
+    plans = _query_plans(
+        store, lambda: getattr(store, lease)(worker_id="w", now=NOW, lease_ttl_secs=5, limit=2)
+    )
+    _assert_uses(
+        plans[0],
+        "ix_engine_jobs_status_sched_prio",
+        "ix_engine_jobs_status_lease",
+        table="engine_jobs",
+    )
+
+
+def test_reaper_and_job_listing_use_indexes(store):
+    (reap,) = _query_plans(store, lambda: store.reap_expired_leases(NOW))
+    _assert_uses(reap, "ix_engine_jobs_status_lease", table="engine_jobs")
+
+    (by_status,) = _query_plans(store, lambda: store.list_jobs(status=["queued"]))
+    _assert_uses(by_status, "ix_engine_jobs_queue_order", table="engine_jobs")
+    assert "TEMP B-TREE" not in by_status
+
+    (by_pipeline,) = _query_plans(store, lambda: store.list_jobs(pipeline_id=1))
+    _assert_uses(by_pipeline, "ix_engine_jobs_pipeline_status", table="engine_jobs")
+
+
+def test_replay_reads_run_in_index_order(seeded):
+    store, run_id = seeded
+
+    async def _drain() -> None:
+        async for _ in ReplayAdapter(name="replay", run_id=run_id).stream():
+            pass
+
+    (plan,) = _query_plans(store, lambda: asyncio.run(_drain()))
+    _assert_uses(plan, "ix_engine_messages_run", table="engine_messages")
+    assert "TEMP B-TREE" not in plan
+
+
+def test_per_run_and_anomaly_rollups_use_indexes(store):
+    plans = _query_plans(store, store.summaries)
+    per_run = [plan for plan in plans if "(run_id=?)" in plan]
+    assert per_run
+    for plan in per_run:
+        _assert_uses(plan, "ix_engine_messages_run", table="engine_messages")
+    assert any("ix_engine_issues_message_severity (message_id=?)" in plan for plan in per_run)
+
+    (anomaly,) = _query_plans(
+        store,
+        lambda: _fetch_issue_counts(store, "plans", NOW - timedelta(days=30), datetime.utcnow()),
+    )
+    _assert_uses(
+        anomaly,
+        "ix_engine_runs_pipeline_created",
+        "ix_engine_messages_run",
+        "ix_engine_issues_message_code",
+        table="engine_runs",
+    )
+    assert "SCAN engine_issues" not in anomaly
+
+
+def test_endpoint_message_listing_uses_index(store):
+    (plan,) = _query_plans(store, lambda: store.list_endpoint_messages(endpoint_id=1))
+    _assert_uses(plan, "ix_engine_endpoint_messages_endpoint", table="engine_endpoint_messages")
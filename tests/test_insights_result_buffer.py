@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import event, select
+
+from engine.contracts import Issue, Message, Result
+from insights.models import IssueRecord, MessageRecord
+from insights.store import InsightsStore, reset_store
+
+
+def _make_store(tmp_path) -> InsightsStore:
+    reset_store()
+    store = InsightsStore.from_env(url=f"sqlite:///{tmp_path / 'buffer.db'}")
+    store.ensure_schema()
+    return store
+
+
+def _result(idx: int) -> Result:
+    issues = [Issue(severity="error", code=f"E{idx}", segment="PID", field=idx)] * (idx % 3)
+    return Result(message=Message(id=f"m{idx}", raw=f"MSH|{idx}".encode()), issues=issues)
+
+
+def _stored(store: InsightsStore, run_id: int) -> list[tuple[str, list[str]]]:
+    with store.session() as session:
+        messages = session.execute(
+            select(MessageRecord).where(MessageRecord.run_id == run_id).order_by(MessageRecord.id)
+        ).scalars()
+        rows = []
+        for message in messages:
+            codes = session.execute(
+                select(IssueRecord.code).where(IssueRecord.message_id == message.id)
+            ).scalars()
+            rows.append((message.message_id, list(codes)))
+        return rows
+
+
+@pytest.mark.parametrize("returning", [True, False])
+def test_record_results_inserts_batch_in_one_transaction(tmp_path, monkeypatch, returning):
+    store = _make_store(tmp_path)
+    monkeypatch.setattr(
+        store.engine.dialect, "insert_executemany_returning_sort_by_parameter_order", returning
+    )
+    run = store.start_run("bulk")
+    commits: list[object] = []
+
+    def _capture(conn) -> None:
+        commits.append(conn)
+
+    event.listen(store.engine, "commit", _capture)
+    try:
+        ids = store.record_results(run_id=run.id, results=[_result(idx) for idx in range(6)])
+    finally:
+        event.remove(store.engine, "commit", _capture)
+
+    assert len(ids) == 6 and len(commits) == 1
+    assert _stored(store, run.id) == [
+        (f"m{idx}", [f"E{idx}"] * (idx % 3)) for idx in range(6)
+    ]
+
+
+def test_buffer_flushes_every_n_messages_and_on_close(tmp_path):
+    store = _make_store(tmp_path)
+    run = store.start_run("buffered")
+    with store.result_buffer(run.id, max_messages=4, max_delay_ms=0) as buffer:
+        for idx in range(10):
+            buffer.add(_result(idx))
+        assert (buffer.flushes, buffer.pending) == (2, 2)
+    assert (buffer.flushes, buffer.written) == (3, 10)
+    assert [row[0] for row in _stored(store, run.id)] == [f"m{idx}" for idx in range(10)]
+
+
+def test_buffer_timer_flushes_stalled_tail(tmp_path):
+    store = _make_store(tmp_path)
+    run = store.start_run("timed")
+    buffer = store.result_buffer(run.id, max_messages=100, max_delay_ms=20)
+
+    async def _scenario() -> None:
+        for idx in range(3):
+            await buffer(_result(idx))
+        assert buffer.pending == 3
+        await asyncio.sleep(0.1)
+
+    asyncio.run(_scenario())
+    assert (buffer.pending, buffer.flushes) == (0, 1)
+    assert len(_stored(store, run.id)) == 3
+
+
+def test_buffer_keeps_failed_batch_and_reraises_timer_error(tmp_path, monkeypatch):
+    store = _make_store(tmp_path)
+    run = store.start_run("flaky")
+    buffer = store.result_buffer(run.id, max_messages=100, max_delay_ms=20)
+    record_results = store.record_results
+    failures = [RuntimeError("database is locked")]
+
+    def _flaky(**kwargs):
+        if failures:
+            raise failures.pop()
+        return record_results(**kwargs)
+
+    monkeypatch.setattr(store, "record_results", _flaky)
+
+    async def _scenario() -> None:
+        for idx in range(3):
+            await buffer(_result(idx))
+        await asyncio.sleep(0.1)
+
+    asyncio.run(_scenario())
+    assert buffer.pending == 3
+    with pytest.raises(RuntimeError, match="database is locked"):
+        buffer.add(_result(3))
+
+    buffer.close()
+    assert [row[0] for row in _stored(store, run.id)] == ["m0", "m1", "m2"]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import importlib.util
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, update
+
+from engine.contracts import Issue, Message, Result
+from insights.models import RunRecord, RunSummaryRecord
+from insights.store import InsightsStore, reset_store
+
+BASE = datetime(2025, 11, 1, 8, 0, 0)
+
+
+def _load_sync_script():
+    path = Path(__file__).resolve().parents[1] / "scripts" / "sync_run_summaries.py"
+    spec = importlib.util.spec_from_file_location("sync_run_summaries", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _make_store(tmp_path, *, rollup: bool) -> InsightsStore:
+    reset_store()
+    store = InsightsStore.from_env(url=f"sqlite:///{tmp_path / 'summaries.db'}")
+    store.summary_rollup = rollup
+    store.ensure_schema()
+    return store
+
+
+def _seed(store: InsightsStore) -> list[int]:
+    run_ids = []
+    for day in range(4):
+        pipeline = "adt" if day % 2 == 0 else "lab"
+        run = store.start_run(pipeline)
+        with store.session() as session:
+            for model, key in (
+                (RunRecord, RunRecord.id),
+                (RunSummaryRecord, RunSummaryRecord.run_id),
+            ):
+                session.execute(
+                    update(model).where(key == run.id).values(created_at=BASE + timedelta(days=day))
+                )
+        results = [
+            Result(
+                message=Message(id=f"{day}-{idx}", raw=b"MSH|"),
+                issues=[Issue(severity="error", code="E1")] * (idx % 2)
+                + [Issue(severity="warning", code="W1")] * day
+                + [Issue(severity="passed", code="ok")],
+            )
+            for idx in range(day + 1)
+        ]
+        store.record_results(run_id=run.id, results=results[:1])
+        for result in results[1:]:
+            store.record_result(run_id=run.id, result=result)
+        run_ids.append(run.id)
+    return run_ids
+
+
+def _count_selects(store: InsightsStore, action) -> int:
+    selects: list[str] = []
+
+    def _capture(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(store.engine, "before_cursor_execute", _capture)
+    try:
+        action()
+    finally:
+        event.remove(store.engine, "before_cursor_execute", _capture)
+    return len(selects)
+
+
+@pytest.mark.parametrize("rollup", [False, True])
+def test_summaries_match_per_run_counts(tmp_path, rollup):
+    store = _make_store(tmp_path, rollup=rollup)
+    run_ids = _seed(store)
+
+    summary = store.summaries()
+
+    assert summary["totals"] == {"runs": 4, "messages": 10, "issues": 34}
+    assert [item["run_id"] for item in summary["by_run"]] == run_ids[::-1]
+    latest = summary["by_run"][0]
+    assert latest["pipeline"] == "lab" and latest["messages"] == 4
+    assert latest["issues"] == {"error": 2, "warning": 12, "passed": 4}
+    assert summary["by_run"][-1]["issues"] == {"error": 0, "warning": 0, "passed": 1}
+
+
+@pytest.mark.parametrize("rollup", [False, True])
+def test_summaries_page_and_window(tmp_path, rollup):
+    store = _make_store(tmp_path, rollup=rollup)
+    run_ids = _seed(store)
+
+    page = store.summaries(limit=2, offset=1)
+    assert [item["run_id"] for item in page["by_run"]] == [run_ids[2], run_ids[1]]
+    assert page["page"] == {"limit": 2, "offset": 1, "total": 4}
+
+    window = store.summaries(since=BASE + timedelta(days=1), until=BASE + timedelta(days=3))
+    assert [item["run_id"] for item in window["by_run"]] == [run_ids[2], run_ids[1]]
+    assert window["totals"] == {"runs": 2, "messages": 5, "issues": 15}
+    assert {rule["code"] for rule in window["by_rule"]} == {"E1", "W1", "ok"}
+
+    lab = store.summaries(pipeline="lab")
+    assert [item["run_id"] for item in lab["by_run"]] == [run_ids[3], run_ids[1]]
+
+
+def test_summaries_query_count_is_constant(tmp_path):
+    store = _make_store(tmp_path, rollup=False)
+    _seed(store)
+    few = _count_selects(store, store.summaries)
+    _seed(store)
+    _seed(store)
+    assert _count_selects(store, store.summaries) == few <= 3
+
+
+def test_rollup_backfills_runs_recorded_before_it_was_enabled(tmp_path):
+    store = _make_store(tmp_path, rollup=False)
+    run_ids = _seed(store)
+    expected = store.summaries()
+
+    # Writes maintain the rollup whether or not reads use it.
+    store.summary_rollup = True
+    assert store.summaries() == expected
+
+    # Simulate rows left behind by older writers: one missing, one stale.
+    with store.session() as session:
+        session.execute(RunSummaryRecord.__table__.delete().where(RunSummaryRecord.run_id == run_ids[1]))
+        session.execute(
+            update(RunSummaryRecord).where(RunSummaryRecord.run_id == run_ids[2]).values(messages=1)
+        )
+    assert store.summaries() != expected
+
+    # Opening the store does not scan the run tables; repair is explicit.
+    reopened = InsightsStore.from_env(url=store.url)
+    reopened.summary_rollup = True
+    reopened.ensure_schema()
+    assert reopened.summaries() != expected
+    assert _load_sync_script().main(["--url", store.url]) == 0
+    assert reopened.summaries() == expected
+    assert reopened.sync_run_summaries() == 0
+
+    assert store.rebuild_run_summaries() == 4
+    assert store.summaries() == expected
+
+    store.summary_rollup = False
+    store.record_result(
+        run_id=run_ids[0],
+        result=Result(message=Message(id="late", raw=b"MSH|"), issues=[Issue("error", "E2")]),
+    )
+    store.summary_rollup = True
+    oldest = store.summaries()["by_run"][-1]
+    assert oldest["messages"] == 2 and oldest["issues"]["error"] == 1
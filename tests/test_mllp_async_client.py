@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import threading
+
+from silhouette_core.interop.mllp import send_mllp_batch, send_mllp_batch_async
+from silhouette_core.interop.mllp_framing import FS_CR, VT, StreamFrameReader
+from silhouette_core.interop.mllp_pool import MLLPConnectionPool, message_control_id
+
+
+def _message(idx: int) -> str:
+    return f"MSH|^~\\&|SIL|LAB|EHR|HOSP|202501010000||ORU^R01|CTRL{idx}|P|2.5\rOBX|1|TX|||{idx}\r"
+
+
+class _Peer:
+    """ACKs by MSH-10; ``reorder`` answers each pair of frames in reverse."""
+
+    def __init__(self, *, reorder: bool = False, drop_first: bool = False, nak: str | None = None):
+        self.reorder = reorder
+        self.drop_first = drop_first
+        self.nak = nak
+        self.connections = 0
+        self.frames: list[bytes] = []
+        self.server: asyncio.AbstractServer | None = None
+
+    async def __aenter__(self) -> "_Peer":
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    def _ack(self, frame: bytes) -> bytes:
+        control_id = message_control_id(frame) or b""
+        code = b"AE" if self.nak and control_id == self.nak.encode() else b"AA"
+        return VT + b"MSH|^~\\&|EHR|HOSP|SIL|LAB|20250101||ACK|A1|P|2.5\rMSA|" + code + b"|" + control_id + FS_CR
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        frames = StreamFrameReader(reader)
+        held: list[bytes] = []
+        try:
+            while (frame := await frames.read_frame()) is not None:
+                self.frames.append(frame)
+                if self.drop_first and self.connections == 1:
+                    break
+                held.append(frame)
+                if self.reorder and len(held) < 2:
+                    continue
+                for item in reversed(held):
+                    writer.write(self._ack(item))
+                held.clear()
+                await writer.drain()
+            for item in held:
+                writer.write(self._ack(item))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def test_batch_correlates_out_of_order_acks_by_control_id():
+    async def _run():
+        async with _Peer(reorder=True, nak="CTRL3") as peer:
+            pool = MLLPConnectionPool("127.0.0.1", peer.port, size=1, window=4)
+            results = await send_mllp_batch_async(
+                "127.0.0.1", peer.port, [_message(idx) for idx in range(6)], pool=pool
+            )
+            await pool.close()
+            return peer, results
+
+    peer, results = asyncio.run(_run())
+    assert peer.connections == 1 and len(peer.frames) == 6
+    assert [result.control_id for result in results] == [f"CTRL{idx}" for idx in range(6)]
+    assert all(result.correlated for result in results)
+    assert [result.code for result in results] == ["AA", "AA", "AA", "AE", "AA", "AA"]
+    # A NAK is an answer, not a transport failure: it is not resent.
+    assert all(result.attempts == 1 and result.error is None for result in results)
+
+
+def test_batch_retries_transport_failures_on_a_new_connection():
+    async def _run():
+        async with _Peer(drop_first=True) as peer:
+            pool = MLLPConnectionPool("127.0.0.1", peer.port, size=1, window=2)
+            results = await send_mllp_batch_async(
+                "127.0.0.1", peer.port, [_message(idx) for idx in range(3)],
+                pool=pool, retries=1, retry_backoff=0.01,
+            )
+            await pool.close()
+            return peer, results
+
+    peer, results = asyncio.run(_run())
+    assert peer.connections == 2
+    assert [result.code for result in results] == ["AA"] * 3
+    assert results[0].attempts == 2 and all(result.correlated for result in results)
+
+
+def test_blocking_wrapper_returns_ack_text_per_message():
+    async def _start():
+        peer = _Peer()
+        await peer.__aenter__()
+        return peer
+
+    loop = asyncio.new_event_loop()
+    peer = loop.run_until_complete(_start())
+    try:
+        # The wrapper runs its own loop, so serve the peer from a thread.
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        acks = send_mllp_batch("127.0.0.1", peer.port, [_message(1), _message(2)], timeout=5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(peer.__aexit__(None, None, None))
+        loop.close()
+    assert [ack.split("\r")[1] for ack in acks] == ["MSA|AA|CTRL1", "MSA|AA|CTRL2"]
+
+
+def test_shared_pools_are_keyed_by_their_options():
+    from silhouette_core.interop import mllp_pool
+
+    async def _run():
+        narrow = mllp_pool.shared_pool("127.0.0.1", 2575, window=1, ack_timeout=5.0)
+        wide = mllp_pool.shared_pool("127.0.0.1", 2575, window=8, ack_timeout=5.0)
+        again = mllp_pool.shared_pool("127.0.0.1", 2575, ack_timeout=5.0, window=1)
+        assert narrow is again and narrow is not wide
+        # Another caller's options never retune a pool that is in use.
+        assert narrow.window == 1 and wide.window == 8
+        await mllp_pool.close_shared_pools()
+        return narrow
+
+    narrow = asyncio.run(_run())
+    assert narrow._closed and not mllp_pool._SHARED
+
+
+def test_least_recently_used_shared_pool_is_closed_past_the_limit(monkeypatch):
+    from silhouette_core.interop import mllp_pool
+
+    monkeypatch.setattr(mllp_pool, "SHARED_POOL_LIMIT", 2)
+
+    async def _run():
+        async with _Peer() as peer:
+            first = mllp_pool.shared_pool("127.0.0.1", peer.port, window=1)
+            second = mllp_pool.shared_pool("127.0.0.1", peer.port, window=2)
+            await second.send(_message(1).encode())
+            assert mllp_pool.shared_pool("127.0.0.1", peer.port, window=1) is first
+            mllp_pool.shared_pool("127.0.0.1", peer.port, window=3)
+            await asyncio.sleep(0)
+            keys = [key[2] for key in mllp_pool._SHARED]
+            evicted = (second._closed, second.stats()["open"])
+            await mllp_pool.close_shared_pools()
+            return keys, evicted
+
+    keys, evicted = asyncio.run(_run())
+    assert keys == [(("window", 1),), (("window", 3),)]
+    assert evicted == (True, 0)
+
+
+def test_interop_router_closes_shared_pools_on_shutdown():
+    from fastapi import FastAPI
+
+    from api import interop_gen
+
+    app = FastAPI()
+    app.include_router(interop_gen.router)
+    assert interop_gen._close_mllp_pools in app.router.on_shutdown
+
+
+def test_interop_client_imports_without_the_engine_runtime():
+    code = (
+        "import sys, silhouette_core.interop.mllp\n"
+        "loaded = {name.split('.')[0] for name in sys.modules}\n"
+        "print(sorted(loaded & {'api', 'engine', 'insights', 'pydantic', 'sqlalchemy'}))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
@@ -2,15 +2,16 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 import api.interop_gen as ig
+from silhouette_core.interop.mllp import MLLPSendResult
 
 app = FastAPI()
 app.include_router(ig.router)
 client = TestClient(app)
 
 def test_mllp_send_accepts_string_and_splits_blank_lines(monkeypatch):
-    def fake_send(host, port, messages, timeout=5.0):
-        return [f"ACK-{i}" for i, _ in enumerate(messages)]
-    monkeypatch.setattr(ig, "send_mllp_batch", fake_send)
+    async def fake_send(host, port, messages, timeout=5.0, **_):
+        return [MLLPSendResult(index=i, control_id=None, ack=f"ACK-{i}") for i, _ in enumerate(messages)]
+    monkeypatch.setattr(ig, "send_mllp_batch_async", fake_send)
 
     payload = {
         "host": "127.0.0.1",
@@ -27,3 +28,24 @@ def test_mllp_send_accepts_string_and_splits_blank_lines(monkeypatch):
     data = r.json()
     assert data["sent"] == 2
     assert len(data["acks"]) == 2
+
+
+def test_mllp_send_does_not_retry_by_default_and_rejects_bad_options(monkeypatch):
+    calls = []
+
+    async def fake_send(host, port, messages, **kwargs):
+        calls.append(kwargs)
+        return [MLLPSendResult(index=i, control_id=None, ack="ACK") for i, _ in enumerate(messages)]
+
+    monkeypatch.setattr(ig, "send_mllp_batch_async", fake_send)
+    base = {"host": "127.0.0.1", "port": 2575, "messages": "MSH|^~\\&|A|B|C|D|1||ADT^A01|X|P|2.4"}
+
+    assert client.post("/api/interop/mllp/send", json=base).status_code == 200
+    assert calls[-1]["retries"] == 0 and calls[-1]["window"] == 8
+    assert client.post("/api/interop/mllp/send", json={**base, "retries": 2}).status_code == 200
+    assert calls[-1]["retries"] == 2
+
+    for bad in ({"window": "wide"}, {"window": 0}, {"retries": "x"}, {"retries": -1}):
+        r = client.post("/api/interop/mllp/send", json={**base, **bad})
+        assert r.status_code == 400, bad
+    assert len(calls) == 2
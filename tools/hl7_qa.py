@@ -12,9 +12,11 @@ HL7 QA: rules-aware, per-message validator (profiles + policies)
 - Large I/O buffers
 - CSV or JSONL reporting
 - Progress, start/limit, message-type filtering
-- Optional parallel execution (process pool)
+- Optional parallel execution (process pool; --shared-input keeps message text out of task pickles)
+- Optional result cache (--cache-dir): unchanged messages are replayed from earlier runs
 - hl7apy controls:
     * --hl7apy-validation {none|tolerant|strict}  (default: none)
+    * --hl7apy-parse {full|lazy}  (default: full; lazy parses only the segments the rules read)
     * --no-quiet-parse to show hl7apy logs/warnings (default: suppressed)
 
 Timestamp policy (rules.yaml → timestamps.mode):
@@ -34,21 +36,39 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
 import io
 import json
 import logging
+import marshal
 import os
 import re
+import sqlite3
+import struct
 import sys
 import warnings
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from contextlib import contextmanager, redirect_stderr, redirect_stdout
-from dataclasses import dataclass, field
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack, contextmanager, redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from multiprocessing import cpu_count
 from pathlib import Path
 from time import perf_counter
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import mmap
+except ImportError:  # pragma: no cover
+    mmap = None  # type: ignore[assignment]
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None  # type: ignore[assignment]
 
 # ---------- Optional: PyYAML for rules ----------
 try:
@@ -76,17 +96,21 @@ UTF16_BE_BOM = b"\xfe\xff"
 # Start of buffer (\A) OR immediately after \r or \n, then 'MSH' and any FS byte.
 MSH_START_RE = re.compile(br'(?:(?<=\r)|(?<=\n)|\A)MSH.', re.I)
 
+# Bytes dropped during normalization (NUL, MLLP VT/FS, GS, RS).
+_JUNK_BYTES = b"\x00\x0b\x1c\x1d\x1e"
+
+def normalize_message(raw: bytes | bytearray | memoryview) -> bytes:
+    """Newlines -> CR and MLLP/control bytes removed, as in ``_normalize_blob``."""
+    return bytes(raw).replace(b"\r\n", b"\r").replace(b"\n", b"\r").translate(None, _JUNK_BYTES)
+
 def _normalize_blob(blob: bytes) -> bytes:
     if blob.startswith(UTF8_BOM):
         blob = blob[len(UTF8_BOM):]
     if blob.startswith(UTF16_LE_BOM):
-        blob = blob.decode("utf-16-le", errors="ignore").encode("utf-8", errors="ignore")
+        blob = blob[2:].decode("utf-16-le", errors="ignore").encode("utf-8", errors="ignore")
     elif blob.startswith(UTF16_BE_BOM):
-        blob = blob.decode("utf-16-be", errors="ignore").encode("utf-8", errors="ignore")
-    blob = blob.replace(b"\r\n", b"\r").replace(b"\n", b"\r")
-    for ch in (b"\x00", b"\x0b", b"\x1c", b"\x1d", b"\x1e"):
-        blob = blob.replace(ch, b"")
-    return blob
+        blob = blob[2:].decode("utf-16-be", errors="ignore").encode("utf-8", errors="ignore")
+    return normalize_message(blob)
 
 def fast_split_messages(blob: bytes) -> List[bytes]:
     blob = _normalize_blob(blob)
@@ -100,6 +124,179 @@ def read_file_bytes(path: str | Path) -> bytes:
     with open(path, "rb", buffering=1024 * 1024) as fh:
         return fh.read()
 
+
+# ---------- Streaming input (constant memory) ----------
+#
+# The streaming reader never holds the whole file. It finds message starts in
+# the raw bytes and normalizes each message on its own, so peak memory is one
+# window plus the largest message. A raw "MSH" starts a message when, ignoring
+# the bytes normalization drops, it follows a newline or the start of data.
+
+STREAM_WINDOW = 16 * 1024 * 1024
+_STREAM_MSH_RE = re.compile(br'MSH(?=[\x00\x0b\x1c\x1d\x1e]*[^\x00\x0b\x1c\x1d\x1e])', re.I)
+_JUNK_SET = frozenset(_JUNK_BYTES)
+_SIGNIFICANT_RE = re.compile(br'[^\x00\x0b\x1c\x1d\x1e]')
+
+def _is_message_start(buf, pos: int, floor: int, at_floor: bool) -> bool:
+    while pos > floor and buf[pos - 1] in _JUNK_SET:
+        pos -= 1
+    return buf[pos - 1] in (0x0D, 0x0A) if pos > floor else at_floor
+
+class _SpanScanner:
+    """Split a byte stream fed in chunks into raw message spans.
+
+    ``feed`` yields ``(offset, view)`` pairs; a view is only valid until the
+    next one is requested. The buffer keeps just the open message (or the
+    last significant byte before it) and compacts in place between chunks.
+    """
+
+    def __init__(self, window: int = STREAM_WINDOW) -> None:
+        self.buf = bytearray(max(window, 64))
+        self.filled = 0
+        self.base = 0         # stream offset of buf[0]
+        self.current = -1     # buffer index of the open message start
+        self.scan = 0         # where the next search starts
+        self.at_start = True  # only droppable bytes precede buf[0]
+
+    def feed(self, chunk: bytes | memoryview):
+        size = len(chunk)
+        self._reserve(size)
+        self.buf[self.filled:self.filled + size] = chunk
+        self.filled += size
+        yield from self._scan()
+
+    def finish(self):
+        yield from self._scan()
+        if self.current >= 0:
+            yield self.base + self.current, memoryview(self.buf)[self.current:self.filled]
+            self.current = -1
+
+    def _scan(self):
+        buf = self.buf
+        for match in _STREAM_MSH_RE.finditer(buf, self.scan, self.filled):
+            start = match.start()
+            if not _is_message_start(buf, start, 0, self.at_start):
+                continue
+            if self.current >= 0:
+                yield self.base + self.current, memoryview(buf)[self.current:start]
+            self.current = start
+        # A start may straddle the end of the data: "MSH" plus droppable bytes.
+        tail = self.filled
+        while tail > self.scan and buf[tail - 1] in _JUNK_SET:
+            tail -= 1
+        self.scan = max(self.scan, tail - 3, self.current + 1)
+
+    def _reserve(self, size: int) -> None:
+        if len(self.buf) - self.filled >= size:
+            return
+        buf = self.buf
+        keep = self.current
+        if keep < 0:
+            keep = self.scan - 1
+            while keep >= 0 and buf[keep] in _JUNK_SET:
+                keep -= 1
+            keep = keep if keep >= 0 else self.scan
+        if keep:
+            if self.at_start:
+                self.at_start = _SIGNIFICANT_RE.search(buf, 0, keep) is None
+            live = self.filled - keep
+            view = memoryview(buf)
+            view[:live] = view[keep:self.filled]
+            view.release()
+            self.base += keep
+            self.filled = live
+            self.scan -= keep
+            if self.current >= 0:
+                self.current -= keep
+        if len(buf) - self.filled < size:
+            # One message is larger than the window: grow instead of splitting it.
+            grown = bytearray(max(len(buf) * 2, self.filled + size))
+            grown[:self.filled] = memoryview(buf)[:self.filled]
+            self.buf = grown
+
+def _iter_window_raw(fh, head: bytes, window: int):
+    scanner = _SpanScanner(window)
+    chunk = bytearray(min(window, 4 * 1024 * 1024))
+    view = memoryview(chunk)
+    if head.startswith(UTF8_BOM):
+        head = head[len(UTF8_BOM):]
+    yield from scanner.feed(head)
+    while True:
+        n = fh.readinto(chunk)
+        if not n:
+            break
+        yield from scanner.feed(view[:n])
+    yield from scanner.finish()
+
+def _iter_utf16_raw(path: str | Path, encoding: str, window: int):
+    # Offsets refer to the UTF-8 transcoded stream.
+    scanner = _SpanScanner(window)
+    with open(path, "r", encoding=encoding, errors="ignore", newline="") as fh:
+        if fh.read(1) != "\ufeff":
+            fh.seek(0)
+        while True:
+            text = fh.read(window // 4 or 1)
+            if not text:
+                break
+            yield from scanner.feed(text.encode("utf-8", errors="ignore"))
+    yield from scanner.finish()
+
+def _iter_mmap_raw(mm: "mmap.mmap", begin: int, window: int):
+    for start, end in _iter_mmap_spans(mm, begin, window):
+        yield start, mm[start:end]
+
+def _iter_mmap_spans(mm: "mmap.mmap", begin: int, window: int):
+    release = getattr(mm, "madvise", None)
+    if release is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    dontneed = getattr(mmap, "MADV_DONTNEED", None) if release is not None else None
+    released = 0
+    prev = -1
+    for match in _STREAM_MSH_RE.finditer(mm, begin):
+        start = match.start()
+        if not _is_message_start(mm, start, begin, True):
+            continue
+        if prev >= 0:
+            yield prev, start
+        prev = start
+        if dontneed is not None and start - released >= window:
+            # Drop consumed pages so resident memory stays at one window.
+            upto = (start // mmap.PAGESIZE) * mmap.PAGESIZE
+            mm.madvise(dontneed, released, upto - released)
+            released = upto
+    if prev >= 0:
+        yield prev, len(mm)
+
+def _iter_raw_messages(path: str | Path, *, window: int = STREAM_WINDOW, use_mmap: bool = True):
+    with open(path, "rb", buffering=0) as fh:
+        head = fh.read(4)
+        if head.startswith(UTF16_LE_BOM) or head.startswith(UTF16_BE_BOM):
+            encoding = "utf-16-le" if head.startswith(UTF16_LE_BOM) else "utf-16-be"
+            yield from _iter_utf16_raw(path, encoding, window)
+            return
+        size = os.fstat(fh.fileno()).st_size
+        if use_mmap and mmap is not None and size > 0:
+            begin = len(UTF8_BOM) if head.startswith(UTF8_BOM) else 0
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from _iter_mmap_raw(mm, begin, window)
+            return
+        yield from _iter_window_raw(fh, head, window)
+
+def iter_message_spans(path: str | Path, *, window: int = STREAM_WINDOW, use_mmap: bool = True):
+    """Yield ``(offset, length)`` of each raw message without loading the file."""
+    for offset, raw in _iter_raw_messages(path, window=window, use_mmap=use_mmap):
+        yield offset, len(raw)
+
+def iter_messages(path: str | Path, *, window: int = STREAM_WINDOW, use_mmap: bool = True):
+    """Yield normalized messages with memory bounded by ``window``.
+
+    Produces the same messages as ``fast_split_messages(read_file_bytes(path))``.
+    The file is memory-mapped when possible and read in ``window``-sized
+    chunks otherwise (pipes, ``use_mmap=False``, UTF-16 input).
+    """
+    for _, raw in _iter_raw_messages(path, window=window, use_mmap=use_mmap):
+        yield normalize_message(raw)
+
 def ensure_text(b: bytes) -> str:
     return b.decode("utf-8", errors="ignore")
 
@@ -113,10 +310,10 @@ def _detect_fs_and_encs(first_line: str) -> Tuple[str, str, str, str]:
     return fs, comp, rep, sub
 
 def msh_fields_from_raw(raw: bytes) -> Dict[str, str]:
-    text = ensure_text(raw)
-    first_line = text.split("\r", 1)[0]
-    fs, comp, rep, sub = _detect_fs_and_encs(first_line)
-    parts = first_line.split(fs)
+    first_line = ensure_text(raw).split("\r", 1)[0]
+    return _msh_header(first_line.split(_detect_fs_and_encs(first_line)[0]))
+
+def _msh_header(parts: List[str]) -> Dict[str, str]:
     def get(i: int) -> str:
         return parts[i] if len(parts) > i else ""
     msg_type_raw = get(8)
@@ -175,12 +372,107 @@ def suppress_hl7apy_output(enabled: bool = True):
         yield
 
 def parse_hl7(text: str, *, quiet: bool = True, validation: str = "none"):
-    lvl = _map_validation_level(validation)
-    from hl7apy.parser import parse_message as _parse_message
-    with suppress_hl7apy_output(quiet):
-        if lvl is not None:
-            return _parse_message(text, find_groups=False, validation_level=lvl)
-        return _parse_message(text, find_groups=False)
+    return hl7apy_engine(validation, quiet=quiet).parse(text)
+
+
+# =======================================================================
+# hl7apy engine (per-process setup, cached lookups, lazy parse)
+# =======================================================================
+
+HL7APY_PARSE_MODES = ("full", "lazy")
+
+_HL7APY_LOOKUPS_CACHED = False
+
+def cache_hl7apy_lookups() -> None:
+    """
+    Memoize hl7apy's library/reference lookups in every hl7apy module that
+    imported them by name. Plain hl7apy re-resolves the version library via
+    importlib for each element it builds; the answers only depend on
+    (name, type, version). Idempotent.
+    """
+    global _HL7APY_LOOKUPS_CACHED
+    if _HL7APY_LOOKUPS_CACHED:
+        return
+    import hl7apy
+    import hl7apy.core
+    import hl7apy.factories  # noqa: F401  (patched below via sys.modules)
+    import hl7apy.parser  # noqa: F401
+    import hl7apy.validation  # noqa: F401
+
+    find_cached = lru_cache(maxsize=None)(hl7apy.find_reference)
+
+    def find_reference(name, element_types, version):
+        # hl7apy builds a fresh dict per call; hand out copies of the cached one.
+        return dict(find_cached(name, tuple(element_types), version))
+
+    originals = {
+        "load_library": hl7apy.load_library,
+        "load_reference": hl7apy.load_reference,
+        "find_reference": hl7apy.find_reference,
+        "is_base_datatype": hl7apy.core.is_base_datatype,
+    }
+    cached = {
+        "load_library": lru_cache(maxsize=None)(hl7apy.load_library),
+        "load_reference": lru_cache(maxsize=None)(hl7apy.load_reference),
+        "find_reference": find_reference,
+        "is_base_datatype": lru_cache(maxsize=None)(hl7apy.core.is_base_datatype),
+    }
+    for mod_name, mod in list(sys.modules.items()):
+        if mod is None or mod_name.split(".")[0] != "hl7apy":
+            continue
+        for attr, func in originals.items():
+            if getattr(mod, attr, None) is func:
+                setattr(mod, attr, cached[attr])
+    _HL7APY_LOOKUPS_CACHED = True
+
+class HL7apyEngine:
+    """
+    hl7apy parsing with its per-process setup done once: validation level,
+    cached lookups and an output sink. ``mode="lazy"`` parses only the MSH
+    and the segments a profile reads; strict validation always parses the
+    full message because grammar checks need every segment.
+    """
+
+    def __init__(self, validation: str = "none", *, quiet: bool = True, mode: str = "full"):
+        if mode not in HL7APY_PARSE_MODES:
+            raise ValueError(f"Unknown hl7apy parse mode: {mode}")
+        from hl7apy.parser import parse_message
+        cache_hl7apy_lookups()
+        self._parse_message = parse_message
+        self.level = _map_validation_level(validation)
+        self.lazy = mode == "lazy" and validation.lower() != "strict"
+        self._sink = open(os.devnull, "w") if quiet else None
+        self._silenced = False
+
+    def silence_process(self) -> None:
+        """Send this process's stdout/stderr to the sink for good (pool workers)."""
+        if self._sink is not None:
+            sys.stdout = sys.stderr = self._sink
+            self._silenced = True
+
+    def parse(self, text: str, segments: Optional[FrozenSet[str]] = None) -> "Message":
+        if self.lazy and segments is not None:
+            lines = text.lstrip().split("\r")
+            text = "\r".join(lines[:1] + [ln for ln in lines[1:] if ln[:3] in segments])
+        if self._sink is None or self._silenced:
+            return self._parse(text)
+        with redirect_stderr(self._sink), redirect_stdout(self._sink):
+            return self._parse(text)
+
+    def _parse(self, text: str) -> "Message":
+        if self.level is not None:
+            return self._parse_message(text, find_groups=False, validation_level=self.level)
+        return self._parse_message(text, find_groups=False)
+
+_HL7APY_ENGINES: Dict[Tuple[str, bool, str], HL7apyEngine] = {}
+
+def hl7apy_engine(validation: str = "none", *, quiet: bool = True, mode: str = "full") -> HL7apyEngine:
+    """Return this process's engine for the given settings, creating it once."""
+    key = (validation, quiet, mode)
+    engine = _HL7APY_ENGINES.get(key)
+    if engine is None:
+        engine = _HL7APY_ENGINES[key] = HL7apyEngine(validation, quiet=quiet, mode=mode)
+    return engine
 
 
 # =======================================================================
@@ -359,6 +651,7 @@ class RuleSet:
 
 _FIELD_SPEC_RE = re.compile(r'^([A-Z0-9]{3})-(\d+)(?:\.(\d+))?(?:\.(\d+))?$')
 
+@lru_cache(maxsize=1024)
 def parse_field_spec(spec: str) -> Tuple[str, int, Optional[int], Optional[int]]:
     m = _FIELD_SPEC_RE.match(spec.strip())
     if not m:
@@ -440,25 +733,77 @@ def values_from_raw(raw: bytes, spec: str) -> List[str]:
                             out.append(subs[sub_i - 1])
     return [v.strip() for v in out if v.strip()]
 
+@dataclass(frozen=True)
+class FieldPath:
+    """A field spec parsed once, with MSH's off-by-one indexing applied."""
+    spec: str
+    seg: str
+    pos: int                   # index into the split segment
+    comp: Optional[int] = None
+    sub: Optional[int] = None
+    separator: bool = False    # MSH-1: the field separator itself
+
+    @staticmethod
+    def parse(spec: str) -> "FieldPath":
+        seg, fld, comp, sub = parse_field_spec(spec)
+        if seg == "MSH":
+            return FieldPath(spec, seg, fld - 1, comp, sub, separator=fld == 1)
+        return FieldPath(spec, seg, fld, comp, sub)
+
+    def values(self, idx_pack: Tuple[Dict[str, List[List[str]]], str, str, str, str]) -> List[str]:
+        idx, fs, comp, rep, sub = idx_pack
+        instances = idx.get(self.seg)
+        if not instances:
+            return []
+        pos, comp_i, sub_i = self.pos, self.comp, self.sub
+        out: List[str] = []
+        for fields in instances:
+            if self.separator:
+                fval = fs
+            elif len(fields) <= pos:
+                continue
+            else:
+                fval = fields[pos]
+            for f_rep in (fval.split(rep) if rep in fval else (fval,)):
+                if comp_i is not None:
+                    comps = f_rep.split(comp)
+                    if len(comps) < comp_i:
+                        continue
+                    f_rep = comps[comp_i - 1]
+                    if sub_i is not None:
+                        subs = f_rep.split(sub)
+                        if len(subs) < sub_i:
+                            continue
+                        f_rep = subs[sub_i - 1]
+                f_rep = f_rep.strip()
+                if f_rep:
+                    out.append(f_rep)
+        return out
+
 # ---------- (RE)ADDED: build the fast ER7 index ----------
-def build_msg_index(raw: bytes) -> Tuple[Dict[str, List[List[str]]], str, str, str, str]:
+def build_msg_index(raw: bytes, segments: Optional[FrozenSet[str]] = None) -> Tuple[Dict[str, List[List[str]]], str, str, str, str]:
     """
     Return (index, fs, comp, rep, sub)
     index: { 'SEG': [ fields_list_per_segment_instance ] }
+    Only segments in ``segments`` are split when it is given.
     """
-    text = ensure_text(raw)
-    lines = text.split("\r")
+    return _index_lines(ensure_text(raw).split("\r"), segments)
+
+def _index_lines(lines: List[str], segments: Optional[FrozenSet[str]] = None,
+                 first_fields: Optional[List[str]] = None) -> Tuple[Dict[str, List[List[str]]], str, str, str, str]:
     if not lines or not lines[0].startswith("MSH"):
         return {}, "|", "^", "~", "&"
     fs, comp, rep, sub = _detect_fs_and_encs(lines[0])
     idx: Dict[str, List[List[str]]] = {}
-    for ln in lines:
+    for i, ln in enumerate(lines):
         if len(ln) < 4 or ln[3:4] != fs:
             continue
         seg = ln[0:3]
+        if segments is not None and seg not in segments:
+            continue
         if not seg or not seg.isalnum() or not seg[0].isupper():
             continue
-        fields = ln.split(fs)
+        fields = first_fields if i == 0 and first_fields is not None else ln.split(fs)
         idx.setdefault(seg, []).append(fields)
     return idx, fs, comp, rep, sub
 
@@ -466,38 +811,9 @@ def build_msg_index(raw: bytes) -> Tuple[Dict[str, List[List[str]]], str, str, s
 def values_from_index(idx: Dict[str, List[List[str]]],
                       fs: str, comp: str, rep: str, sub: str,
                       spec: str) -> List[str]:
-    seg, fld, comp_i, sub_i = parse_field_spec(spec)
-    out: List[str] = []
-    for fields in idx.get(seg, []):
-        # SPECIAL: MSH has off-by-one indexing because MSH-1 is the separator itself
-        if seg == "MSH":
-            if fld == 1:
-                fval = fs
-            else:
-                pos = fld - 1
-                if len(fields) <= pos:
-                    continue
-                fval = fields[pos]
-        else:
-            if len(fields) <= fld:
-                continue
-            fval = fields[fld]
-        for f_rep in fval.split(rep):
-            if comp_i is None:
-                out.append(f_rep)
-            else:
-                comps = f_rep.split(comp)
-                if len(comps) >= comp_i:
-                    cval = comps[comp_i - 1]
-                    if sub_i is None:
-                        out.append(cval)
-                    else:
-                        subs = cval.split(sub)
-                        if len(subs) >= sub_i:
-                            out.append(subs[sub_i - 1])
-    return [v.strip() for v in out if v.strip()]
+    return FieldPath.parse(spec).values((idx, fs, comp, rep, sub))
 
-def get_values(spec: str,
+def get_values(spec: Union[str, FieldPath],
                engine: str,
                raw: bytes,
                idx_pack: Optional[Tuple[Dict[str, List[List[str]]], str, str, str, str]] = None,
@@ -506,17 +822,17 @@ def get_values(spec: str,
     Unified accessor so rule logic doesn't care which engine is in use.
     'fast' uses the ER7 index; 'hl7apy' uses parsed tree with raw fallback.
     """
+    path = spec if isinstance(spec, FieldPath) else FieldPath.parse(spec)
     if engine == "fast":
         if idx_pack is None:
             idx_pack = build_msg_index(raw)
-        idx, fs, comp, rep, sub = idx_pack
-        return values_from_index(idx, fs, comp, rep, sub, spec)
+        return path.values(idx_pack)
     else:
         vals: List[str] = []
         if parsed is not None:
-            vals = values_from_parsed(parsed, spec)
+            vals = values_from_parsed(parsed, path.spec)
         if not vals:
-            vals = values_from_raw(raw, spec)
+            vals = values_from_raw(raw, path.spec)
         return vals
 
 
@@ -526,8 +842,11 @@ def get_values(spec: str,
 
 NUMERIC_RE = re.compile(r'^[+-]?(\d+(\.\d+)?|\.\d+)$')
 
+_TS_SPLIT_RE = re.compile(r'^(\d{4,14})(.*)$')
+_TS_BASE_RE = re.compile(r'^(\d{4,14})')
+
 def _slice_ts_base(ts: str) -> Tuple[str, str]:
-    m = re.match(r'^(\d{4,14})(.*)$', ts)
+    m = _TS_SPLIT_RE.match(ts)
     if not m:
         return "", ""
     return m.group(1), m.group(2)
@@ -606,6 +925,126 @@ class IssueSet:
         self.items.append(IssueItem(kind="warning", message=msg, **meta))
 
 
+# =======================================================================
+# Compiled rule plan (built once per process, picklable)
+# =======================================================================
+
+# Field paths used by the fixed policies, parsed once at import.
+_P = {spec: FieldPath.parse(spec) for spec in (
+    "PID-3.1", "PID-3.4", "PID-3.5", "OBR-2.1", "OBR-3.1", "OBR-4.1", "OBR-4.3",
+    "OBR-24", "OBR-25", "OBX-2", "OBX-3.1", "OBX-3.3", "OBX-5", "OBX-5.1", "OBX-11",
+    "TXA-2.1", "TXA-2.3", "PV1-2",
+)}
+
+# Segments each policy reads, so the index only splits what a profile needs.
+_POLICY_SEGMENTS = {
+    "require_pid3_shape": ("PID",),
+    "require_obr2_or_obr3": ("OBR",),
+    "obr4_coded": ("OBR",),
+    "obr25_allowed": ("OBR",),
+    "obx11_allowed": ("OBX",),
+    "obx3_coded": ("OBX",),
+    "obx5_required_unless_status_in_empty_allows": ("OBX",),
+    "obx2_vs_obx5_typecheck": ("OBX",),
+    "txa2_coded": ("TXA",),
+    "require_pv1_2_encounter_class": ("PV1",),
+}
+
+@dataclass(frozen=True)
+class TimestampPlan:
+    fields: Tuple[FieldPath, ...]
+    allowed_lengths: FrozenSet[int]
+    compliant_lengths: FrozenSet[int]
+    calendar: bool
+    allowed_str: str
+    compliant_str: str
+
+@dataclass(frozen=True)
+class ProfilePlan:
+    name: str
+    engine: Optional[str]
+    segments: FrozenSet[str]
+    checks: FrozenSet[str]                # enabled policy names
+    timestamps: Optional[TimestampPlan]
+    required: Tuple[FieldPath, ...]
+    obr24: FrozenSet[str]
+    result_status: FrozenSet[str]
+    obx11_empty_allows: FrozenSet[str]
+    encounter_class: FrozenSet[str]
+    obx5_ts_lengths: FrozenSet[int]       # lengths accepted for OBX-2 TS/DT/DTM
+    expected: Dict[str, str]              # pre-rendered "expected" report strings
+
+    @staticmethod
+    def compile(profile: Profile) -> "ProfilePlan":
+        pol, allowed = profile.policies, profile.allowed
+        checks = frozenset(name for name in _POLICY_SEGMENTS if getattr(pol, name))
+        segments = {"MSH"}
+        for name in checks:
+            segments.update(_POLICY_SEGMENTS[name])
+        if allowed.obr24:
+            segments.add("OBR")
+
+        ts_plan = None
+        ts_cfg = profile.timestamps
+        if ts_cfg and ts_cfg.mode != "off":
+            fields = tuple(FieldPath.parse(spec) for spec in (ts_cfg.fields or DEFAULT_TS_FIELDS))
+            segments.update(path.seg for path in fields)
+            ts_plan = TimestampPlan(
+                fields=fields,
+                allowed_lengths=frozenset(ts_cfg.allowed_lengths),
+                compliant_lengths=frozenset(ts_cfg.compliant_lengths),
+                calendar=ts_cfg.mode == "calendar",
+                allowed_str=f"allowed lengths: {sorted(ts_cfg.allowed_lengths)}",
+                compliant_str=f"compliant lengths: {sorted(ts_cfg.allowed_lengths)}",
+            )
+        required = tuple(FieldPath.parse(spec) for spec in pol.required_fields)
+        segments.update(path.seg for path in required)
+
+        obx5_ts = profile.timestamps.allowed_lengths if profile.timestamps else _TS_BASE_ALLOWED_DEFAULT
+        return ProfilePlan(
+            name=profile.name,
+            engine=profile.engine,
+            segments=frozenset(segments),
+            checks=checks,
+            timestamps=ts_plan,
+            required=required,
+            obr24=frozenset(allowed.obr24),
+            result_status=frozenset(allowed.result_status),
+            obx11_empty_allows=frozenset(allowed.obx11_empty_allows),
+            encounter_class=frozenset(allowed.encounter_class),
+            obx5_ts_lengths=frozenset(obx5_ts),
+            expected={
+                "obr24": f"allowed: {allowed.obr24}",
+                "result_status": f"allowed: {allowed.result_status}",
+                "obx11_empty_allows": f"required unless OBX-11 ∈ {allowed.obx11_empty_allows}",
+                "encounter_class": f"allowed: {allowed.encounter_class}",
+                "obx5_ts": f"TS {sorted(obx5_ts)}",
+            },
+        )
+
+@dataclass(frozen=True)
+class RulePlan:
+    """A ``RuleSet`` compiled for validation: parsed field paths, the
+    segments each profile reads, and a message-root dispatch table.
+    Compile once per process (or once in the parent and pickle it)."""
+    by_root: Dict[str, ProfilePlan] = field(default_factory=dict)
+    default: Optional[ProfilePlan] = None
+
+    @staticmethod
+    def compile(rules: RuleSet) -> "RulePlan":
+        plans = {name: ProfilePlan.compile(p) for name, p in rules.profiles.items()}
+        by_root: Dict[str, ProfilePlan] = {}
+        for name, p in rules.profiles.items():
+            for root in p.types:
+                if root:
+                    by_root.setdefault(root, plans[name])  # first profile listing a root wins
+        default = plans.get(rules.default_profile) if rules.default_profile else None
+        return RulePlan(by_root=by_root, default=default)
+
+    def select(self, msg_root: str) -> Optional[ProfilePlan]:
+        return self.by_root.get(msg_root, self.default) if msg_root else self.default
+
+
 # =======================================================================
 # Message validation (per profile)
 # =======================================================================
@@ -615,53 +1054,68 @@ class ValidationContext:
     quiet_parse: bool
     hl7apy_validation: str
     engine_pref: str  # "auto" | "fast" | "hl7apy"
+    hl7apy_parse: str = "full"  # "full" | "lazy"
+
+    def hl7apy(self) -> HL7apyEngine:
+        return hl7apy_engine(self.hl7apy_validation, quiet=self.quiet_parse, mode=self.hl7apy_parse)
 
 def validate_message(
     raw: bytes,
-    rules: RuleSet,
+    rules: Union[RuleSet, RulePlan],
     max_errors_per_msg: int,
     ctx: ValidationContext,
 ) -> Tuple[Dict[str, str], IssueSet]:
-    hdr = msh_fields_from_raw(raw)
+    plan = rules if isinstance(rules, RulePlan) else RulePlan.compile(rules)
+    text = ensure_text(raw)
+    lines = text.split("\r")
+    first_fields = lines[0].split(_detect_fs_and_encs(lines[0])[0])
+    hdr = _msh_header(first_fields)
+    head = {"msg_type": hdr["msg_type"], "msg_ctrl_id": hdr["msg_ctrl_id"], "version": hdr["version"]}
     issues = IssueSet()
 
-    profile = rules.select_profile_for_root(hdr.get("msg_root", ""))
+    profile = plan.select(hdr["msg_root"])
     if profile is None:
-        return {"msg_type": hdr["msg_type"], "msg_ctrl_id": hdr["msg_ctrl_id"], "version": hdr["version"]}, issues
+        return head, issues
 
     engine_eff = ctx.engine_pref if ctx.engine_pref != "auto" else (profile.engine or "fast")
 
-    idx_pack = build_msg_index(raw)
+    idx_pack = None
     parsed: Optional["Message"] = None
-    if engine_eff == "hl7apy":
+    if engine_eff == "fast":
+        idx_pack = _index_lines(lines, profile.segments, first_fields)
+    elif engine_eff == "hl7apy":
         if not HL7APY_AVAILABLE:
             issues.add_err("hl7apy not installed; cannot use hl7apy engine", max_errors_per_msg)
         else:
-            with suppress_hl7apy_output(ctx.quiet_parse):
-                try:
-                    parsed = parse_hl7(ensure_text(raw), quiet=ctx.quiet_parse, validation=ctx.hl7apy_validation)
-                except HL7apyException as e:
-                    issues.add_err(f"parse_error: {e}", max_errors_per_msg)
+            try:
+                parsed = ctx.hl7apy().parse(text, profile.segments)
+            except HL7apyException as e:
+                issues.add_err(f"parse_error: {e}", max_errors_per_msg)
+
+    if idx_pack is not None:
+        def values(path: FieldPath) -> List[str]:
+            return path.values(idx_pack)
+    else:
+        def values(path: FieldPath) -> List[str]:
+            return get_values(path, engine_eff, raw, None, parsed)
 
     # ---------------- Timestamps ----------------
-    if profile.timestamps and profile.timestamps.mode != "off":
-        ts_cfg = profile.timestamps
-        ts_fields = ts_cfg.fields if ts_cfg.fields else list(DEFAULT_TS_FIELDS)
-        allowed_str = f"allowed lengths: {sorted(ts_cfg.allowed_lengths)}"
-        compliant_str = f"compliant lengths: {sorted(ts_cfg.allowed_lengths)}"
-        for spec in ts_fields:
-            for v in get_values(spec, engine_eff, raw, idx_pack, parsed):
+    ts = profile.timestamps
+    if ts is not None:
+        for path in ts.fields:
+            spec = path.spec
+            for v in values(path):
                 if not v:
                     continue
-                ok_len, why_len = ts_length_ok(v, ts_cfg.allowed_lengths)
+                ok_len, why_len = ts_length_ok(v, ts.allowed_lengths)
                 if not ok_len:
                     issues.add_err(
                         f"{spec} invalid TS '{v}': {why_len}",
                         max_errors_per_msg,
-                        spec=spec, value=v, expected=allowed_str
+                        spec=spec, value=v, expected=ts.allowed_str
                     )
                     continue
-                if ts_cfg.mode == "calendar":
+                if ts.calendar:
                     ok_cal, why_cal = ts_calendar_ok(v)
                     if not ok_cal:
                         issues.add_err(
@@ -669,142 +1123,543 @@ def validate_message(
                             max_errors_per_msg,
                             spec=spec, value=v, expected="calendar-valid date/time"
                         )
-                m = re.match(r'^(\d{4,14})', v)
+                m = _TS_BASE_RE.match(v)
                 base_len = len(m.group(1)) if m else len(v)
-                if base_len not in ts_cfg.compliant_lengths:
+                if base_len not in ts.compliant_lengths:
                     issues.add_warn(
                         f"{spec} TS length {base_len} accepted but non-compliant",
-                        spec=spec, value=v, expected=compliant_str
+                        spec=spec, value=v, expected=ts.compliant_str
                     )
 
     # ---------------- Policies & allowed values ----------------
-    pol = profile.policies
-    allowed = profile.allowed
-
-    if pol.required_fields:
-        for spec in pol.required_fields:
-            if not any(get_values(spec, engine_eff, raw, idx_pack, parsed)):
-                issues.add_err(f"{spec} required but missing/empty",
-                               max_errors_per_msg, spec=spec, value="", expected="non-empty")
-
-    if pol.require_pid3_shape:
-        ok_shape = (any(get_values("PID-3.1", engine_eff, raw, idx_pack, parsed)) and
-                    (any(get_values("PID-3.4", engine_eff, raw, idx_pack, parsed)) or
-                     any(get_values("PID-3.5", engine_eff, raw, idx_pack, parsed))))
+    checks = profile.checks
+    expected = profile.expected
+
+    for path in profile.required:
+        if not any(values(path)):
+            issues.add_err(f"{path.spec} required but missing/empty",
+                           max_errors_per_msg, spec=path.spec, value="", expected="non-empty")
+
+    if "require_pid3_shape" in checks:
+        ok_shape = (any(values(_P["PID-3.1"])) and
+                    (any(values(_P["PID-3.4"])) or any(values(_P["PID-3.5"]))))
         if not ok_shape:
             issues.add_err("PID-3 shape invalid: require .1 and (.4 or .5)",
                            max_errors_per_msg, spec="PID-3", expected="PID-3.1 and (PID-3.4 or PID-3.5)")
 
-    if pol.require_obr2_or_obr3:
-        has2 = any(get_values("OBR-2.1", engine_eff, raw, idx_pack, parsed))
-        has3 = any(get_values("OBR-3.1", engine_eff, raw, idx_pack, parsed))
-        if not (has2 or has3):
+    if "require_obr2_or_obr3" in checks:
+        if not (any(values(_P["OBR-2.1"])) or any(values(_P["OBR-3.1"]))):
             issues.add_err("OBR requires at least one of OBR-2 (placer) or OBR-3 (filler)",
                            max_errors_per_msg, spec="OBR-2|OBR-3", expected="OBR-2.1 or OBR-3.1 present")
 
-    if pol.obr4_coded:
-        has41 = any(get_values("OBR-4.1", engine_eff, raw, idx_pack, parsed))
-        has43 = any(get_values("OBR-4.3", engine_eff, raw, idx_pack, parsed))
-        if not (has41 and has43):
+    if "obr4_coded" in checks:
+        if not (any(values(_P["OBR-4.1"])) and any(values(_P["OBR-4.3"]))):
             issues.add_err("OBR-4 must be coded (requires .1 id and .3 system)",
                            max_errors_per_msg, spec="OBR-4", expected="OBR-4.1 and OBR-4.3 present")
 
-    if pol.obr25_allowed and allowed.result_status:
-        for v in get_values("OBR-25", engine_eff, raw, idx_pack, parsed):
-            if v and v not in allowed.result_status:
+    if "obr25_allowed" in checks and profile.result_status:
+        for v in values(_P["OBR-25"]):
+            if v and v not in profile.result_status:
                 issues.add_err(f"OBR-25 result_status '{v}' not allowed",
                                max_errors_per_msg, spec="OBR-25", value=v,
-                               expected=f"allowed: {allowed.result_status}")
+                               expected=expected["result_status"])
 
-    if allowed.obr24:
-        for v in get_values("OBR-24", engine_eff, raw, idx_pack, parsed):
-            if v and v not in allowed.obr24:
+    if profile.obr24:
+        for v in values(_P["OBR-24"]):
+            if v and v not in profile.obr24:
                 issues.add_err(f"OBR-24 specimen_action_code '{v}' not in allowed list",
                                max_errors_per_msg, spec="OBR-24", value=v,
-                               expected=f"allowed: {allowed.obr24}")
+                               expected=expected["obr24"])
 
-    if pol.obx11_allowed and allowed.result_status:
-        for v in get_values("OBX-11", engine_eff, raw, idx_pack, parsed):
-            if v and v not in allowed.result_status:
+    if "obx11_allowed" in checks and profile.result_status:
+        for v in values(_P["OBX-11"]):
+            if v and v not in profile.result_status:
                 issues.add_err(f"OBX-11 result_status '{v}' not allowed",
                                max_errors_per_msg, spec="OBX-11", value=v,
-                               expected=f"allowed: {allowed.result_status}")
+                               expected=expected["result_status"])
 
-    if pol.obx5_required_unless_status_in_empty_allows:
-        obx11 = get_values("OBX-11", engine_eff, raw, idx_pack, parsed)
-        obx5  = get_values("OBX-5.1", engine_eff, raw, idx_pack, parsed) or \
-                get_values("OBX-5",   engine_eff, raw, idx_pack, parsed)
-        if any(v and v not in allowed.obx11_empty_allows for v in obx11) and not any(obx5):
+    if "obx5_required_unless_status_in_empty_allows" in checks:
+        obx11 = values(_P["OBX-11"])
+        obx5 = values(_P["OBX-5.1"]) or values(_P["OBX-5"])
+        if any(v and v not in profile.obx11_empty_allows for v in obx11) and not any(obx5):
             issues.add_err("OBX-5 required unless OBX-11 in empty-allows",
                            max_errors_per_msg, spec="OBX-5",
-                           expected=f"required unless OBX-11 ∈ {allowed.obx11_empty_allows}")
+                           expected=expected["obx11_empty_allows"])
 
-    if pol.obx3_coded:
-        has31 = any(get_values("OBX-3.1", engine_eff, raw, idx_pack, parsed))
-        has33 = any(get_values("OBX-3.3", engine_eff, raw, idx_pack, parsed))
-        if not (has31 and has33):
+    if "obx3_coded" in checks:
+        if not (any(values(_P["OBX-3.1"])) and any(values(_P["OBX-3.3"]))):
             issues.add_err("OBX-3 must be coded (requires .1 id and .3 system)",
                            max_errors_per_msg, spec="OBX-3", expected="OBX-3.1 and OBX-3.3 present")
 
-    if pol.obx2_vs_obx5_typecheck:
-        for t in (v.strip().upper() for v in get_values("OBX-2", engine_eff, raw, idx_pack, parsed)):
+    if "obx2_vs_obx5_typecheck" in checks:
+        for t in (v.strip().upper() for v in values(_P["OBX-2"])):
             if not t:
                 continue
-            obx5_val = next(iter(get_values("OBX-5", engine_eff, raw, idx_pack, parsed)), "")
+            obx5_val = next(iter(values(_P["OBX-5"])), "")
             if t == "NM":
                 if not obx5_val or not NUMERIC_RE.match(obx5_val):
                     issues.add_err("OBX-2=NM requires OBX-5 numeric",
                                    max_errors_per_msg, spec="OBX-5", value=obx5_val, expected="numeric")
             elif t in ("TS","DT","DTM"):
-                ok_len, why_len = ts_length_ok(obx5_val, profile.timestamps.allowed_lengths if profile.timestamps else _TS_BASE_ALLOWED_DEFAULT)
+                ok_len, why_len = ts_length_ok(obx5_val, profile.obx5_ts_lengths)
                 if not ok_len:
                     issues.add_err(f"OBX-2={t} requires OBX-5 TS-valid: '{obx5_val}' ({why_len})",
                                    max_errors_per_msg, spec="OBX-5", value=obx5_val,
-                                   expected=f"TS {sorted(profile.timestamps.allowed_lengths if profile.timestamps else _TS_BASE_ALLOWED_DEFAULT)}")
+                                   expected=expected["obx5_ts"])
             elif t in ("CE","CWE"):
-                if not any(get_values("OBX-5.1", engine_eff, raw, idx_pack, parsed)):
+                if not any(values(_P["OBX-5.1"])):
                     issues.add_err("OBX-2=CE/CWE requires OBX-5.1 coded id",
                                    max_errors_per_msg, spec="OBX-5.1", expected="coded id present")
 
-    if pol.txa2_coded:
-        has21 = any(get_values("TXA-2.1", engine_eff, raw, idx_pack, parsed))
-        has23 = any(get_values("TXA-2.3", engine_eff, raw, idx_pack, parsed))
-        if not (has21 and has23):
+    if "txa2_coded" in checks:
+        if not (any(values(_P["TXA-2.1"])) and any(values(_P["TXA-2.3"]))):
             issues.add_err("TXA-2 must be coded (requires .1 id and .3 system)",
                            max_errors_per_msg, spec="TXA-2", expected="TXA-2.1 and TXA-2.3 present")
 
-    if pol.require_pv1_2_encounter_class:
-        pv1_2_vals = get_values("PV1-2", engine_eff, raw, idx_pack, parsed)
+    if "require_pv1_2_encounter_class" in checks:
+        pv1_2_vals = values(_P["PV1-2"])
         if not any(pv1_2_vals):
             issues.add_err("PV1-2 (encounter/patient class) required but missing/empty",
                            max_errors_per_msg, spec="PV1-2", expected="non-empty")
-        elif allowed.encounter_class:
+        elif profile.encounter_class:
             for v in pv1_2_vals:
-                if v and v not in allowed.encounter_class:
+                if v and v not in profile.encounter_class:
                     issues.add_err(f"PV1-2 encounter class '{v}' not in allowed set",
                                    max_errors_per_msg, spec="PV1-2", value=v,
-                                   expected=f"allowed: {allowed.encounter_class}")
+                                   expected=expected["encounter_class"])
 
-    return {"msg_type": hdr["msg_type"], "msg_ctrl_id": hdr["msg_ctrl_id"], "version": hdr["version"]}, issues
+    return head, issues
 
 
 # =======================================================================
 # Parallel worker
 # =======================================================================
 
-def _worker_validate_chunk(
-    chunk: List[bytes],
-    rules_dict: Dict[str, Any],
-    max_errors_per_msg: int,
-    ctx: ValidationContext,
-) -> List[Tuple[Dict[str, str], IssueSet]]:
+# Set once per worker process by _init_worker: (plan, max_errors_per_msg, ctx).
+_WORKER_STATE: Optional[Tuple[RulePlan, int, ValidationContext]] = None
+
+def _init_worker(plan: RulePlan, max_errors_per_msg: int, ctx: ValidationContext) -> None:
+    global _WORKER_STATE
     configure_hl7apy_logging(quiet=ctx.quiet_parse)
-    rules = RuleSet.from_dict(rules_dict)
-    out: List[Tuple[Dict[str, str], IssueSet]] = []
-    for raw in chunk:
-        head, iss = validate_message(raw, rules, max_errors_per_msg=max_errors_per_msg, ctx=ctx)
-        out.append((head, iss))
-    return out
+    if HL7APY_AVAILABLE and ctx.engine_pref != "fast":
+        ctx.hl7apy().silence_process()
+    _WORKER_STATE = (plan, max_errors_per_msg, ctx)
+
+def _worker_validate_chunk(chunk: List[bytes]) -> bytes:
+    plan, max_errors_per_msg, ctx = _WORKER_STATE
+    return pack_results(validate_message(raw, plan, max_errors_per_msg=max_errors_per_msg, ctx=ctx) for raw in chunk)
+
+def _worker_validate_spans(indices: Sequence[int]) -> bytes:
+    plan, max_errors_per_msg, ctx = _WORKER_STATE
+    reader = _SHARED_INPUT
+
+    def results():
+        for raw in reader.messages(indices):
+            if reader.only and not message_type_selected(raw, reader.only):
+                yield None
+            else:
+                yield validate_message(raw, plan, max_errors_per_msg=max_errors_per_msg, ctx=ctx)
+    return pack_results(results())
+
+def _iter_chunks(msgs: Iterable[bytes], size: int) -> Iterator[List[bytes]]:
+    it = iter(msgs)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_ordered_results(executor, fn, chunks: Iterable[Any], *args: Any, max_inflight: int) -> Iterator[Any]:
+    """Yield ``fn(chunk, *args)`` for each chunk, in input order, as soon as possible.
+
+    Finished chunks wait in a reorder buffer until every earlier chunk has
+    been yielded. Submitted plus buffered chunks never exceed
+    ``max_inflight``, so memory is bounded no matter how long the input is;
+    a slow chunk stalls submission rather than letting results pile up.
+    """
+    max_inflight = max(int(max_inflight), 1)
+    source = iter(chunks)
+    pending: Dict[Any, int] = {}   # future -> chunk sequence number
+    ready: Dict[int, Any] = {}     # sequence number -> finished result
+    next_seq = submitted = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) + len(ready) < max_inflight:
+                chunk = next(source, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending[executor.submit(fn, chunk, *args)] = submitted
+                submitted += 1
+            if next_seq == submitted and exhausted:
+                return
+            if next_seq not in ready:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    ready[pending.pop(fut)] = fut.result()
+            while next_seq in ready:
+                yield ready.pop(next_seq)
+                next_seq += 1
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+def message_type_selected(raw: bytes, only: FrozenSet[str]) -> bool:
+    """``--only`` filter: normalized (ORU_R01) or raw (ORU^R01) MSH-9 match."""
+    hdr = msh_fields_from_raw(raw)
+    return hdr["msg_type"] in only or hdr["msg_type_raw"] in only
+
+
+# ---------- Compact results ----------
+#
+# Workers send a chunk's results back as one bytes blob rather than a pickled
+# list of dicts and dataclasses: a uint32 record stream referring into a
+# per-chunk string table, since rule messages, specs and expected values
+# repeat across a chunk. Reference 0 is None. Native byte order; the blob
+# never leaves the host.
+
+_PACK_HEAD = struct.Struct("<II")  # record words, table strings
+
+def pack_results(results: Iterable[Optional[Tuple[Dict[str, str], IssueSet]]]) -> bytes:
+    """Encode ``validate_message`` results; ``None`` marks a message filtered out."""
+    refs: Dict[str, int] = {}
+    table: List[bytes] = []
+
+    def ref(value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        idx = refs.get(value)
+        if idx is None:
+            table.append(value.encode("utf-8", "surrogatepass"))
+            idx = refs[value] = len(table)
+        return idx
+
+    words = array("I")
+    for result in results:
+        if result is None:
+            words.append(0)
+            continue
+        head, issues = result
+        words.extend((1, ref(head["msg_type"]), ref(head["msg_ctrl_id"]), ref(head["version"]),
+                      len(issues.errors), len(issues.warnings), len(issues.items)))
+        words.extend([ref(msg) for msg in issues.errors])
+        words.extend([ref(msg) for msg in issues.warnings])
+        for it in issues.items:
+            words.extend((it.kind == "warning", ref(it.message), ref(it.spec), ref(it.value), ref(it.expected)))
+    lengths = array("I", [len(item) for item in table])
+    return b"".join((_PACK_HEAD.pack(len(words), len(table)), words.tobytes(), lengths.tobytes(), *table))
+
+def unpack_results(blob: bytes) -> Iterator[Optional[Tuple[Dict[str, str], IssueSet]]]:
+    """Inverse of ``pack_results``."""
+    n_words, n_strings = _PACK_HEAD.unpack_from(blob)
+    pos = _PACK_HEAD.size
+    words = array("I")
+    words.frombytes(blob[pos:pos + n_words * words.itemsize])
+    pos += n_words * words.itemsize
+    lengths = array("I")
+    lengths.frombytes(blob[pos:pos + n_strings * lengths.itemsize])
+    pos += n_strings * lengths.itemsize
+    table: List[Optional[str]] = [None]
+    for size in lengths:
+        end = pos + size
+        table.append(blob[pos:end].decode("utf-8", "surrogatepass"))
+        pos = end
+
+    kinds = ("error", "warning")
+    nxt = iter(words.tolist()).__next__
+    for flag in iter(nxt, None):  # ends when the words run out
+        if not flag:
+            yield None
+            continue
+        head = {"msg_type": table[nxt()], "msg_ctrl_id": table[nxt()], "version": table[nxt()]}
+        n_err, n_warn, n_items = nxt(), nxt(), nxt()
+        errors = [table[nxt()] for _ in range(n_err)]
+        warns = [table[nxt()] for _ in range(n_warn)]
+        items = [IssueItem(kinds[nxt()], table[nxt()], table[nxt()], table[nxt()], table[nxt()])
+                 for _ in range(n_items)]
+        yield head, IssueSet(errors, warns, items)
+
+
+# ---------- Shared-memory input ----------
+#
+# With --shared-input the parent never ships message text to workers. It
+# scans the file once for message spans and publishes them as an int64
+# (offset, length) table in shared memory; each worker maps the input file
+# itself, so tasks are index ranges and file pages are shared through the
+# OS page cache.
+
+def scan_message_spans(path: str | Path, *, window: int = STREAM_WINDOW) -> Optional[array]:
+    """Flat ``array('q')`` of (offset, length) pairs for each raw message in ``path``.
+
+    None when file offsets cannot address the messages (UTF-16 input) or the
+    file cannot be memory-mapped.
+    """
+    if mmap is None or shared_memory is None:
+        return None
+    spans = array("q")
+    with open(path, "rb", buffering=0) as fh:
+        head = fh.read(4)
+        if head.startswith(UTF16_LE_BOM) or head.startswith(UTF16_BE_BOM):
+            return None  # offsets would refer to the transcoded stream
+        if os.fstat(fh.fileno()).st_size == 0:
+            return spans
+        begin = len(UTF8_BOM) if head.startswith(UTF8_BOM) else 0
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start, end in _iter_mmap_spans(mm, begin, window):
+                spans.append(start)
+                spans.append(end - start)
+    return spans
+
+class SharedSpans:
+    """Parent side: a span table published in shared memory for the pool."""
+
+    def __init__(self, spans: array) -> None:
+        size = len(spans) * spans.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.shm.buf[:size] = memoryview(spans).cast("B")
+        self.count = len(spans) // 2
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+def _iter_span_ranges(start: int, end: int, size: int) -> Iterator[range]:
+    for lo in range(start, end, size):
+        yield range(lo, min(lo + size, end))
+
+_SPAN = struct.Struct("=qq")  # one (offset, length) entry of the span table
+
+class _SharedInputReader:
+    """Worker side: attaches to the span table and maps the input file."""
+
+    def __init__(self, path: str, shm_name: str, only: Optional[FrozenSet[str]]) -> None:
+        self.only = only
+        self._fh = open(path, "rb", buffering=0)
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._shm = shared_memory.SharedMemory(name=shm_name)
+
+    def messages(self, indices: Iterable[int]) -> Iterator[bytes]:
+        buf, mm, span = self._shm.buf, self._mm, _SPAN
+        for i in indices:
+            offset, length = span.unpack_from(buf, i * span.size)
+            yield normalize_message(mm[offset:offset + length])
+
+# Set by _init_shared_worker in --shared-input pools.
+_SHARED_INPUT: Optional[_SharedInputReader] = None
+
+def _init_shared_worker(plan: RulePlan, max_errors_per_msg: int, ctx: ValidationContext,
+                        path: str, shm_name: str, only: Optional[FrozenSet[str]]) -> None:
+    global _SHARED_INPUT
+    _init_worker(plan, max_errors_per_msg, ctx)
+    _SHARED_INPUT = _SharedInputReader(path, shm_name, only)
+
+
+# =======================================================================
+# Result cache (incremental runs)
+# =======================================================================
+#
+# Opt-in with --cache-dir. Results are stored per message as marshal
+# records, keyed by (plan key, message hash), so unchanged messages are
+# replayed instead of validated. The plan key covers everything else that
+# shapes a result: the compiled rules, --max-errors-per-msg, the engine
+# settings, this module's source and the Python/marshal version. A message is hashed as it is at hand
+# (normalized, or raw with --shared-input); either way the bytes determine
+# the result. Least recently used rows are evicted past --cache-max-mb.
+
+RESULT_CACHE_FILE = "hl7_qa_cache.sqlite"
+RESULT_CACHE_VERSION = 1
+_CACHE_BATCH = 500  # keys per lookup query (SQLite variable limit)
+_CACHE_COMMIT_SECS = 30.0
+
+def _canonical(obj: Any) -> Any:
+    """JSON-ready form of a plan with sets sorted, stable across processes."""
+    if is_dataclass(obj):
+        return [type(obj).__name__, {f.name: _canonical(getattr(obj, f.name)) for f in fields(obj)}]
+    if isinstance(obj, (set, frozenset)):
+        return sorted((_canonical(item) for item in obj), key=repr)
+    if isinstance(obj, dict):
+        return {str(key): _canonical(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(item) for item in obj]
+    return obj
+
+def plan_cache_key(plan: RulePlan, max_errors_per_msg: int, ctx: ValidationContext) -> bytes:
+    """Digest of everything besides the message that determines its result."""
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        h.update(Path(__file__).read_bytes())
+    except OSError:  # pragma: no cover
+        pass
+    hl7apy_version = None
+    if HL7APY_AVAILABLE and ctx.engine_pref != "fast":
+        import hl7apy
+        hl7apy_version = getattr(hl7apy, "__version__", "?")
+    h.update(json.dumps([RESULT_CACHE_VERSION, list(sys.version_info[:2]), marshal.version, _canonical(plan),
+                         int(max_errors_per_msg), _canonical(ctx), hl7apy_version],
+                        sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return h.digest()
+
+def message_cache_key(raw: bytes) -> bytes:
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+def _encode_cached(result: Tuple[Dict[str, str], IssueSet]) -> bytes:
+    head, issues = result
+    return marshal.dumps((head["msg_type"], head["msg_ctrl_id"], head["version"], issues.errors, issues.warnings,
+                          [(it.kind, it.message, it.spec, it.value, it.expected) for it in issues.items]))
+
+def _decode_cached(blob: bytes) -> Tuple[Dict[str, str], IssueSet]:
+    msg_type, ctrl_id, version, errors, warns, items = marshal.loads(blob)
+    head = {"msg_type": msg_type, "msg_ctrl_id": ctrl_id, "version": version}
+    return head, IssueSet(errors, warns, [IssueItem(*item) for item in items])
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    def summary(self) -> str:
+        looked_up = self.hits + self.misses
+        rate = (100.0 * self.hits / looked_up) if looked_up else 0.0
+        return (f"[cache] hits={self.hits} misses={self.misses} hit_rate={rate:.1f}% stored={self.stored} "
+                f"evicted={self.evicted} entries={self.entries} size={self.size_bytes / (1024 * 1024):.1f}MiB")
+
+class ResultCache:
+    """SQLite-backed per-message result store with LRU eviction."""
+
+    def __init__(self, cache_dir: str | Path, plan_key: bytes, max_bytes: int) -> None:
+        path = Path(cache_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path / RESULT_CACHE_FILE
+        self.plan_key = plan_key
+        self.max_bytes = max(int(max_bytes), 0)
+        self.stats = CacheStats()
+        self.con = sqlite3.connect(self.path)
+        self.con.execute("PRAGMA auto_vacuum=INCREMENTAL")  # only takes effect on a new file
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute("PRAGMA synchronous=NORMAL")
+        self.con.execute("PRAGMA cache_size=-65536")  # 64 MiB: keys are hashes, so writes scatter
+        self.con.execute(
+            """
+        CREATE TABLE IF NOT EXISTS results (
+          plan_key BLOB NOT NULL,
+          msg_key BLOB NOT NULL,
+          result BLOB NOT NULL,
+          last_used INTEGER NOT NULL,
+          PRIMARY KEY (plan_key, msg_key)
+        ) WITHOUT ROWID
+        """
+        )
+        # last_used holds a run counter (kept in user_version), so LRU order is exact.
+        self.stamp = self.con.execute("PRAGMA user_version").fetchone()[0] + 1
+        self.con.execute(f"PRAGMA user_version={self.stamp}")
+        self.con.commit()
+        self._committed = perf_counter()
+
+    def lookup(self, keys: Sequence[bytes]) -> Dict[bytes, Tuple[Dict[str, str], IssueSet]]:
+        """Cached results for ``keys``; hits are marked used by this run."""
+        found: Dict[bytes, bytes] = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), _CACHE_BATCH):
+            batch = unique[i:i + _CACHE_BATCH]
+            rows = self.con.execute(
+                f"SELECT msg_key, result FROM results WHERE plan_key=? AND msg_key IN ({','.join('?' * len(batch))})",
+                (self.plan_key, *batch),
+            )
+            found.update(rows)
+        if found:
+            self.con.executemany(
+                "UPDATE results SET last_used=? WHERE plan_key=? AND msg_key=? AND last_used<?",
+                [(self.stamp, self.plan_key, key, self.stamp) for key in found],
+            )
+        hits = {key: _decode_cached(blob) for key, blob in found.items()}
+        n_hits = sum(1 for key in keys if key in hits)
+        self.stats.hits += n_hits
+        self.stats.misses += len(keys) - n_hits
+        return hits
+
+    def store(self, results: Sequence[Tuple[bytes, Tuple[Dict[str, str], IssueSet]]]) -> None:
+        if results:
+            self.con.executemany(
+                "INSERT OR REPLACE INTO results (plan_key, msg_key, result, last_used) VALUES (?,?,?,?)",
+                [(self.plan_key, key, _encode_cached(result), self.stamp) for key, result in results],
+            )
+            self.stats.stored += len(results)
+        # Commit in large batches: each commit rewrites every page touched since the last one.
+        if perf_counter() - self._committed >= _CACHE_COMMIT_SECS:
+            self.con.commit()
+            self._committed = perf_counter()
+
+    def _live_bytes(self) -> int:
+        page_size = self.con.execute("PRAGMA page_size").fetchone()[0]
+        pages = self.con.execute("PRAGMA page_count").fetchone()[0]
+        free = self.con.execute("PRAGMA freelist_count").fetchone()[0]
+        return (pages - free) * page_size
+
+    def evict(self) -> None:
+        """Drop least recently used rows until the store is back under 90% of the limit."""
+        size = self._live_bytes()
+        entries = self.con.execute("SELECT count(*) FROM results").fetchone()[0]
+        if self.max_bytes and size > self.max_bytes and entries:
+            per_row = size / entries
+            excess = min(entries, int((size - 0.9 * self.max_bytes) / per_row) + 1)
+            self.con.execute(
+                "DELETE FROM results WHERE (plan_key, msg_key) IN "
+                "(SELECT plan_key, msg_key FROM results ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self.con.commit()
+            self.con.execute("PRAGMA incremental_vacuum")
+            self.stats.evicted += excess
+            entries -= excess
+            size = self._live_bytes()
+        self.stats.entries = entries
+        self.stats.size_bytes = size
+
+    def close(self) -> None:
+        self.con.commit()
+        self.evict()
+        self.con.close()
+
+def _cached_chunks(cache: ResultCache, chunks: Iterable[Sequence[Any]], pending: deque,
+                   raw_of=None, only: Optional[FrozenSet[str]] = None) -> Iterator[List[Any]]:
+    """Yield each chunk minus its cache hits; ``pending`` queues what ``_merge_cached`` needs.
+
+    ``only`` drops unselected messages here, before lookup, so hits never
+    bypass the ``--only`` filter that workers apply to what they validate.
+    """
+    for chunk in chunks:
+        raws = [raw_of(item) for item in chunk] if raw_of else chunk
+        if only:
+            kept = [(item, raw) for item, raw in zip(chunk, raws)
+                    if message_type_selected(normalize_message(raw), only)]
+            chunk, raws = [item for item, _ in kept], [raw for _, raw in kept]
+        keys = [message_cache_key(raw) for raw in raws]
+        hits = cache.lookup(keys)
+        pending.append((keys, hits))
+        yield [item for item, key in zip(chunk, keys) if key not in hits]
+
+def _merge_cached(cache: ResultCache, pending: deque, computed: Iterable[Optional[Tuple[Dict[str, str], IssueSet]]]):
+    """Interleave a chunk's computed results with its hits, in input order, and store the new ones."""
+    keys, hits = pending.popleft()
+    computed = iter(computed)
+    fresh = []
+    for key in keys:
+        item = hits.get(key)
+        if item is None:
+            item = next(computed)
+            if item is not None:  # filtered out by --only in a worker
+                fresh.append((key, item))
+        yield item
+    cache.store(fresh)
 
 
 # =======================================================================
@@ -896,8 +1751,25 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     g.add_argument("--full-parse", action="store_true", help="Alias for --engine hl7apy")
     p.add_argument("--no-quiet-parse", action="store_true", help="Show hl7apy logs (default: suppressed)")
     p.add_argument("--hl7apy-validation", choices=["none","tolerant","strict"], default="none")
+    p.add_argument("--hl7apy-parse", choices=list(HL7APY_PARSE_MODES), default="full",
+                   help="hl7apy: 'full' parses every segment; 'lazy' only MSH and the segments the rules read "
+                        "(parse errors in other segments are not reported; strict validation always parses full).")
     p.add_argument("--workers", default="0", help="'auto' or integer (0 = no parallel)")
     p.add_argument("--chunk", type=int, default=200)
+    p.add_argument("--max-inflight", type=int, default=0,
+                   help="Chunks submitted or awaiting ordered output at once (0 = 2 x workers)")
+    p.add_argument("--cache-dir", default=None,
+                   help="Reuse per-message results from earlier runs stored here (keyed by message + rules hash)")
+    p.add_argument("--cache-max-mb", type=float, default=1024,
+                   help="With --cache-dir, evict least recently used results past this size (default: 1024)")
+    p.add_argument("--shared-input", action="store_true",
+                   help="With --workers, workers map the input file and read message spans from shared memory "
+                        "instead of receiving message text")
+    p.add_argument("--stream", action="store_true",
+                   help="Read the input incrementally (mmap/windowed) instead of loading it whole")
+    p.add_argument("--stream-window-mb", type=float, default=STREAM_WINDOW / (1024 * 1024),
+                   help="Window size for --stream reads (default: 16)")
+    p.add_argument("--no-mmap", action="store_true", help="With --stream, use buffered reads instead of mmap")
     return p.parse_args(argv)
 
 
@@ -905,6 +1777,18 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
 # Main
 # =======================================================================
 
+def _resolve_workers(value: Union[str, int]) -> int:
+    """--workers: 'auto' (CPUs - 1), an integer, or 0 / anything else for serial."""
+    if isinstance(value, str):
+        w = value.strip().lower()
+        if w == "auto":
+            return max(1, cpu_count() - 1)
+        try:
+            return max(int(w), 0)
+        except ValueError:
+            return 0
+    return max(int(value), 0)
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parse_args(argv)
 
@@ -921,38 +1805,77 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     quiet_parse = not args.no_quiet_parse
     configure_hl7apy_logging(quiet=quiet_parse)
     hl7apy_validation = args.hl7apy_validation
-    ctx = ValidationContext(quiet_parse=quiet_parse, hl7apy_validation=hl7apy_validation, engine_pref=engine_pref)
-
-    blob = read_file_bytes(args.input)
-    msgs = fast_split_messages(blob)
-    total = len(msgs)
-    if total == 0:
-        print("[error] No messages found (no 'MSH' anchors).", file=sys.stderr)
-        return 1
+    ctx = ValidationContext(quiet_parse=quiet_parse, hl7apy_validation=hl7apy_validation, engine_pref=engine_pref,
+                            hl7apy_parse=args.hl7apy_parse)
 
+    max_workers = _resolve_workers(args.workers)
     start = max(0, int(args.start))
-    end = total if args.limit <= 0 else min(total, start + int(args.limit))
-    if start >= total:
-        print(f"[error] --start={start} >= total messages ({total})", file=sys.stderr)
-        return 1
-    work_msgs = msgs[start:end]
+    seen = 0
+    spans: Optional[array] = None
+    if args.shared_input and max_workers > 0:
+        window = max(int(args.stream_window_mb * 1024 * 1024), 64 * 1024)
+        spans = scan_message_spans(args.input, window=window)
+        if spans is None:
+            print("[warn] --shared-input needs a memory-mappable, non-UTF-16 file; sending messages to workers instead.",
+                  file=sys.stderr)
+
+    if spans is not None:
+        # Workers read their own slices; only the span table is kept here.
+        total = seen = len(spans) // 2
+        if total == 0:
+            print("[error] No messages found (no 'MSH' anchors).", file=sys.stderr)
+            return 1
+        end = total if args.limit <= 0 else min(total, start + int(args.limit))
+        if start >= total:
+            print(f"[error] --start={start} >= total messages ({total})", file=sys.stderr)
+            return 1
+        work_msgs: Iterable[bytes] = ()
+    elif args.stream:
+        # Messages are produced lazily; totals are only known at the end.
+        window = max(int(args.stream_window_mb * 1024 * 1024), 64 * 1024)
+        source = iter_messages(args.input, window=window, use_mmap=not args.no_mmap)
+        first = next(source, None)
+        if first is None:
+            print("[error] No messages found (no 'MSH' anchors).", file=sys.stderr)
+            return 1
+
+        def counted() -> Iterator[bytes]:
+            nonlocal seen
+            seen = 1
+            yield first
+            for raw in source:
+                seen += 1
+                yield raw
+
+        stop = None if args.limit <= 0 else start + int(args.limit)
+        work_msgs = islice(counted(), start, stop)
+    else:
+        blob = read_file_bytes(args.input)
+        msgs = fast_split_messages(blob)
+        del blob
+        total = seen = len(msgs)
+        if total == 0:
+            print("[error] No messages found (no 'MSH' anchors).", file=sys.stderr)
+            return 1
+
+        end = total if args.limit <= 0 else min(total, start + int(args.limit))
+        if start >= total:
+            print(f"[error] --start={start} >= total messages ({total})", file=sys.stderr)
+            return 1
+        work_msgs = msgs[start:end]
 
     if args.rules:
         print(f"[rules] using: {Path(args.rules).resolve()}")
         rules = RuleSet.load(args.rules)
     else:
         rules = RuleSet()
+    plan = RulePlan.compile(rules)
 
-    only_set: Optional[set[str]] = None
+    only_set: Optional[FrozenSet[str]] = None
     if args.only:
-        only_set = {x.strip() for x in args.only.split(",") if x.strip()}
-        if only_set:
-            filtered = []
-            for raw in work_msgs:
-                hdr = msh_fields_from_raw(raw)
-                if hdr["msg_type"] in only_set or hdr["msg_type_raw"] in only_set:
-                    filtered.append(raw)
-            work_msgs = filtered
+        only_set = frozenset(x.strip() for x in args.only.split(",") if x.strip()) or None
+        if only_set and spans is None:
+            work_msgs = filter(lambda raw: message_type_selected(raw, only_set), work_msgs)
 
     writer_csv: Optional[csv.writer] = None
     fh_report: Optional[io.TextIOBase] = None
@@ -995,43 +1918,72 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             rate = (i / dt) if dt else 0.0
             print(f"    [progress] {i} msgs  elapsed={dt:.1f}s  rate={rate:.1f} msg/s")
             last_prog = now
+            if fh_report:
+                fh_report.flush()
 
-    # parallel?
-    parallel = False
-    max_workers = 0
-    if isinstance(args.workers, str):
-        w = args.workers.strip().lower()
-        if w == "auto":
-            max_workers = max(1, cpu_count()-1); parallel = True
-        else:
-            try:
-                max_workers = int(w); parallel = max_workers > 0
-            except Exception:
-                parallel = False
-    else:
-        max_workers = int(args.workers); parallel = max_workers > 0
+    max_errors = int(args.max_errors_per_msg)
+    cache: Optional[ResultCache] = None
+    if args.cache_dir:
+        cache = ResultCache(args.cache_dir, plan_cache_key(plan, max_errors, ctx),
+                            max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    pending: deque = deque()  # per-chunk cache keys/hits, oldest first
 
-    if parallel:
-        chunks: List[List[bytes]] = []
+    if max_workers > 0:
         ch = int(args.chunk) if int(args.chunk) > 0 else 200
-        for i in range(0, len(work_msgs), ch):
-            chunks.append(work_msgs[i:i+ch])
-        rules_dict = rules.to_dict()
-        collected: List[Tuple[Dict[str, str], IssueSet]] = []
-        with ProcessPoolExecutor(max_workers=max_workers) as ex:
-            futs = [ex.submit(_worker_validate_chunk, c, rules_dict, int(args.max_errors_per_msg), ctx)
-                    for c in chunks]
+
+        max_inflight = int(args.max_inflight) if int(args.max_inflight) > 0 else 2 * max_workers
+
+        def run_parallel():
+            # Rows are written in input order as each chunk's predecessors
+            # finish; input is read only as fast as it is validated.
             done = 0
-            for fut in as_completed(futs):
-                res = fut.result()
-                collected.extend(res)
-                done += len(res)
-                maybe_progress(done)
-        results_iter = collected
+            shared = SharedSpans(spans) if spans is not None else None
+            with ExitStack() as stack:
+                if shared is not None:
+                    stack.callback(shared.close)
+                # The compiled plan reaches each worker once, via the initializer.
+                state = (plan, max_errors, ctx)
+                if shared is not None:
+                    pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_shared_worker,
+                                               initargs=(*state, str(args.input), shared.name, only_set))
+                    fn, chunks = _worker_validate_spans, _iter_span_ranges(start, end, ch)
+                    if cache is not None:
+                        # Hash the raw spans through our own map of the file.
+                        fh = stack.enter_context(open(args.input, "rb", buffering=0))
+                        mm = stack.enter_context(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+                        raw_of = lambda i: mm[spans[2 * i]:spans[2 * i] + spans[2 * i + 1]]  # noqa: E731
+                        chunks = _cached_chunks(cache, chunks, pending, raw_of, only_set)
+                else:
+                    pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=state)
+                    fn, chunks = _worker_validate_chunk, _iter_chunks(work_msgs, ch)
+                    if cache is not None:
+                        chunks = _cached_chunks(cache, chunks, pending)
+                with pool as ex:
+                    for blob in iter_ordered_results(ex, fn, chunks, max_inflight=max_inflight):
+                        items = unpack_results(blob)
+                        if cache is not None:
+                            items = _merge_cached(cache, pending, items)
+                        for item in items:
+                            if item is None:
+                                continue
+                            done += 1
+                            maybe_progress(done)
+                            yield item
+        results_iter = run_parallel()
+    elif cache is not None:
+        def gen_cached():
+            i = 0
+            for chunk in _cached_chunks(cache, _iter_chunks(work_msgs, _CACHE_BATCH), pending):
+                computed = [validate_message(raw, plan, max_errors_per_msg=max_errors, ctx=ctx) for raw in chunk]
+                for item in _merge_cached(cache, pending, computed):
+                    i += 1
+                    maybe_progress(i)
+                    yield item
+        results_iter = gen_cached()
     else:
         def gen():
             for i, raw in enumerate(work_msgs, 1):
-                head, iss = validate_message(raw, rules, max_errors_per_msg=int(args.max_errors_per_msg), ctx=ctx)
+                head, iss = validate_message(raw, plan, max_errors_per_msg=max_errors, ctx=ctx)
                 maybe_progress(i)
                 yield head, iss
         results_iter = gen()
@@ -1052,6 +2004,12 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 
     if fh_report:
         fh_report.close()
+    if cache is not None:
+        cache.close()
+    if args.stream and start >= seen:
+        print(f"[error] --start={start} >= total messages ({seen})", file=sys.stderr)
+        return 1
+    if fh_report:
         try:
             print(f"[report] wrote: {Path(report_path).resolve()}")
         except Exception:
@@ -1060,6 +2018,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     dt = perf_counter() - t0
     rate = (n_proc / dt) if dt else 0.0
     print(f"[summary] msgs={n_proc} elapsed={dt:.1f}s rate={rate:.1f} msg/s errors={tot_err} warnings={tot_warn}")
+    if cache is not None:
+        print(cache.stats.summary())
     return 0
 
 